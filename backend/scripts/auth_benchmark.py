@@ -0,0 +1,74 @@
+"""
+Auth overhead benchmark for require_auth
+Measures the per-request cost of validate_token_from_event with the verified
+token cache cold (full HS256 verify every call) and warm (cache hit)
+
+Usage (from backend/):
+    python scripts/auth_benchmark.py --requests 10000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.jwt_auth import clear_token_cache, create_access_token, validate_token_from_event
+
+
+def measure(event: dict, requests: int, cached: bool) -> list:
+    """
+    Time validate_token_from_event calls
+
+    Args:
+        event: Lambda event carrying the Authorization header
+        requests: Number of calls to time
+        cached: Keep the cache between calls (False clears it every call)
+
+    Returns:
+        Per-call timings in microseconds
+    """
+    clear_token_cache()
+    validate_token_from_event(event)  # warm imports and, when cached, the entry
+
+    timings = []
+    for _ in range(requests):
+        if not cached:
+            clear_token_cache()
+        start = time.perf_counter()
+        payload = validate_token_from_event(event)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+        assert payload is not None
+    return timings
+
+
+def summarize(label: str, timings: list) -> None:
+    ordered = sorted(timings)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"{label:<22}median {statistics.median(ordered):>8.1f} us   p99 {p99:>8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=10000, help='Calls per scenario')
+    args = parser.parse_args()
+
+    # decode_token logs every successful decode; keep logging out of the numbers
+    logging.disable(logging.CRITICAL)
+
+    token = create_access_token('usr_benchmark', 'benchmark@example.com')
+    event = {'headers': {'Authorization': f'Bearer {token}'}}
+
+    uncached = measure(event, args.requests, cached=False)
+    cached = measure(event, args.requests, cached=True)
+
+    summarize('without cache', uncached)
+    summarize('with cache', cached)
+    print(f"speedup (median)      {statistics.median(uncached) / statistics.median(cached):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+bcrypt work factor benchmark
+Times hash_password at increasing costs on this machine, scales the result to
+the CPU share of a Lambda memory size and recommends the highest cost whose
+estimated hashing time stays within the target latency
+
+Lambda allocates CPU in proportion to memory: 1,769 MB is one full vCPU and
+bcrypt is single threaded, so sizes above that do not hash any faster.
+
+Usage (from backend/):
+    python scripts/bcrypt_cost.py --target-ms 250 --memory-mb 256
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+# Memory size at which a Lambda function gets one full vCPU
+FULL_VCPU_MEMORY_MB = 1769
+
+# OWASP minimum recommended bcrypt work factor
+MIN_RECOMMENDED_ROUNDS = 10
+
+
+def lambda_cpu_factor(memory_mb: int) -> float:
+    """
+    Slowdown of single-threaded work on a Lambda of the given memory size
+    relative to one full vCPU
+
+    Args:
+        memory_mb: Lambda memory size in MB
+
+    Returns:
+        Multiplier applied to locally measured times (>= 1.0)
+    """
+    return max(1.0, FULL_VCPU_MEMORY_MB / memory_mb)
+
+
+def time_cost(rounds: int, samples: int) -> float:
+    """Median milliseconds to hash a password at the given cost"""
+    from models.user import hash_password
+
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hash_password('Benchmark-Password-123!', rounds=rounds)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def pick_rounds(estimates: dict, target_ms: float) -> int:
+    """
+    Highest cost whose estimated Lambda time fits in the target
+
+    Args:
+        estimates: Mapping of rounds to estimated Lambda milliseconds
+        target_ms: Target hashing latency
+
+    Returns:
+        Recommended work factor (lowest measured cost if none fits)
+    """
+    fitting = [rounds for rounds, ms in estimates.items() if ms <= target_ms]
+    return max(fitting) if fitting else min(estimates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target-ms', type=float, default=250, help='Target hashing latency on Lambda')
+    parser.add_argument('--memory-mb', type=int,
+                        default=int(os.environ.get('LAMBDA_MEMORY_SIZE', '128')),
+                        help='Lambda memory size (terraform lambda_memory_size)')
+    parser.add_argument('--min-rounds', type=int, default=8)
+    parser.add_argument('--max-rounds', type=int, default=14)
+    parser.add_argument('--samples', type=int, default=3)
+    args = parser.parse_args()
+
+    factor = lambda_cpu_factor(args.memory_mb)
+    estimates = {}
+
+    print(f"Lambda memory {args.memory_mb} MB -> CPU factor {factor:.2f}x, target {args.target_ms:.0f} ms")
+    print(f"{'rounds':>6}{'local ms':>12}{'lambda ms':>12}")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        local_ms = time_cost(rounds, args.samples)
+        estimates[rounds] = local_ms * factor
+        print(f"{rounds:>6}{local_ms:>12.1f}{estimates[rounds]:>12.1f}")
+        # Each extra round doubles the cost; stop once far past the target
+        if estimates[rounds] > args.target_ms * 2:
+            break
+
+    recommended = pick_rounds(estimates, args.target_ms)
+    print(f"\nRecommended BCRYPT_ROUNDS={recommended}")
+    if recommended < MIN_RECOMMENDED_ROUNDS:
+        print(f"Warning: below the recommended minimum of {MIN_RECOMMENDED_ROUNDS}; "
+              f"consider more memory for the auth function or a higher target")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Cold start measurement for both deployment layouts
+Runs each Lambda entry module in a fresh interpreter (what Lambda does on a
+cold start) and reports init time for the per-resource functions versus the
+single-function entry point
+
+Usage (from backend/):
+    python scripts/cold_start.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# One Lambda per handler module (terraform default)
+PER_FUNCTION_MODULES = [
+    'handlers.health',
+    'handlers.auth',
+    'handlers.users',
+    'handlers.accounts',
+    'handlers.cards',
+    'handlers.transactions',
+    'handlers.dashboard',
+    'handlers.budgets',
+]
+
+# Single-function deployment mode
+SINGLE_FUNCTION_MODULE = 'handlers.app'
+
+# Init = import the handler module; first request = one routed 404 so router
+# and response code paths are exercised without touching DynamoDB
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+module = __import__({module!r}, fromlist=['lambda_handler'])
+t1 = time.perf_counter()
+module.lambda_handler({{'httpMethod': 'GET', 'path': '/__cold_start_probe__', 'headers': {{}}}}, None)
+t2 = time.perf_counter()
+print(json.dumps({{'init_ms': (t1 - t0) * 1000, 'first_request_ms': (t2 - t1) * 1000}}))
+"""
+
+
+def measure_module(module: str, runs: int) -> dict:
+    """
+    Measure cold init of a handler module in fresh interpreters
+
+    Args:
+        module: Dotted module path of the Lambda handler
+        runs: Number of fresh processes to sample
+
+    Returns:
+        Dict with median init and first request times in milliseconds
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = SRC_DIR
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module)],
+            env=env, capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    return {
+        'module': module,
+        'init_ms': round(statistics.median(s['init_ms'] for s in samples), 1),
+        'first_request_ms': round(statistics.median(s['first_request_ms'] for s in samples), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--json', action='store_true', help='Print machine readable output')
+    args = parser.parse_args()
+
+    per_function = [measure_module(module, args.runs) for module in PER_FUNCTION_MODULES]
+    single = measure_module(SINGLE_FUNCTION_MODULE, args.runs)
+
+    report = {
+        'per_function': per_function,
+        'per_function_total_init_ms': round(sum(m['init_ms'] for m in per_function), 1),
+        'per_function_warm_pools': len(per_function),
+        'single_function': single,
+        'single_function_warm_pools': 1,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'module':<26}{'init ms':>10}{'1st req ms':>12}")
+    for m in per_function:
+        print(f"{m['module']:<26}{m['init_ms']:>10}{m['first_request_ms']:>12}")
+    print(f"{'-' * 48}")
+    print(f"{'per-function (sum)':<26}{report['per_function_total_init_ms']:>10}"
+          f"   ({len(per_function)} warm pools)")
+    print(f"{single['module']:<26}{single['init_ms']:>10}{single['first_request_ms']:>12}"
+          f"   (1 warm pool)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Import-time profiler for Lambda handler modules
+Runs `python -X importtime` for each handler in a fresh interpreter, parses
+the report and checks it against a per-handler startup budget
+
+Usage (from backend/):
+    python scripts/import_budget.py              # report for every handler
+    python scripts/import_budget.py --top 15     # include slowest imports
+    python scripts/import_budget.py --check      # exit 1 when over budget
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Cumulative import budget per handler module in milliseconds. Generous enough
+# for a cold Lambda sandbox; the point is catching regressions such as a heavy
+# dependency creeping back into module scope
+HANDLER_BUDGETS_MS: Dict[str, float] = {
+    'handlers.health': 150,
+    'handlers.auth': 1500,
+    'handlers.users': 1500,
+    'handlers.accounts': 1500,
+    'handlers.cards': 1500,
+    'handlers.transactions': 1500,
+    'handlers.dashboard': 1500,
+    'handlers.budgets': 1500,
+    'handlers.app': 2000,
+}
+
+# Dependencies that must only be imported by the routes that use them.
+# bcrypt is not listed: cryptography (via PyJWT) imports it for SSH keys
+LAZY_MODULES = ('email_validator', 'fastapi')
+
+# import time:      self [us] |  cumulative | imported package
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parse `python -X importtime` output
+
+    Args:
+        stderr: Raw stderr of the interpreter
+
+    Returns:
+        List of entries with module, self_us, cumulative_us and depth
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            'module': module,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(indent) - 1) // 2,
+        })
+    return entries
+
+
+def profile_module(module: str) -> Dict:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Args:
+        module: Dotted module path
+
+    Returns:
+        Report with total_ms, loaded modules and parsed entries
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = SRC_DIR
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = parse_importtime(result.stderr)
+    target = next((e for e in reversed(entries) if e['module'] == module), None)
+    total_us = target['cumulative_us'] if target else sum(e['self_us'] for e in entries)
+
+    return {
+        'module': module,
+        'total_ms': total_us / 1000,
+        'loaded': {e['module'] for e in entries},
+        'entries': entries,
+    }
+
+
+def top_level_packages(report: Dict, limit: int) -> List[Dict]:
+    """Aggregate cumulative time per package imported directly by the handler module"""
+    entries = report['entries']
+    index = max((i for i, e in enumerate(entries) if e['module'] == report['module']), default=None)
+    if index is None:
+        return []
+
+    # importtime prints children before their parent, one indent level deeper
+    depth = entries[index]['depth']
+    totals: Dict[str, int] = {}
+    for entry in reversed(entries[:index]):
+        if entry['depth'] <= depth:
+            break
+        if entry['depth'] == depth + 1:
+            package = entry['module'].split('.')[0]
+            totals[package] = totals.get(package, 0) + entry['cumulative_us']
+
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{'package': name, 'ms': us / 1000} for name, us in ranked]
+
+
+def check_budget(report: Dict, budget_ms: Optional[float] = None) -> List[str]:
+    """
+    Check a profile against its budget and lazy-import rules
+
+    Args:
+        report: Result of profile_module
+        budget_ms: Override for the configured budget
+
+    Returns:
+        List of violations (empty when within budget)
+    """
+    violations = []
+    budget = budget_ms if budget_ms is not None else HANDLER_BUDGETS_MS.get(report['module'])
+    if budget is not None and report['total_ms'] > budget:
+        violations.append(f"{report['module']}: {report['total_ms']:.1f} ms > budget {budget:.0f} ms")
+    for lazy in LAZY_MODULES:
+        if lazy in report['loaded']:
+            violations.append(f"{report['module']}: imports {lazy} at module load")
+    return violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', help='Handler modules (default: all budgets)')
+    parser.add_argument('--top', type=int, default=5, help='Slowest top-level packages to show')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 on violations')
+    args = parser.parse_args()
+
+    violations = []
+    for module in args.modules or list(HANDLER_BUDGETS_MS):
+        report = profile_module(module)
+        budget = HANDLER_BUDGETS_MS.get(module)
+        budget_label = f"{budget:.0f} ms" if budget is not None else "n/a"
+        print(f"{module:<24}{report['total_ms']:>9.1f} ms  (budget {budget_label})")
+        for package in top_level_packages(report, args.top):
+            print(f"    {package['package']:<28}{package['ms']:>9.1f} ms")
+        violations.extend(check_budget(report))
+
+    if violations:
+        print("\nViolations:")
+        for violation in violations:
+            print(f"  - {violation}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,7 @@ Manages bank accounts and financial accounts
 
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 import secrets
 from decimal import Decimal
@@ -13,6 +13,10 @@ from decimal import Decimal
 from utils.responses import create_response
 from utils.dynamodb_client import DynamoDBClient
 from utils.jwt_auth import require_auth, TokenPayload
+from utils.etag import check_not_modified, record_write
+from utils.cascade import schedule_cascade
+from utils.fx import convert_totals, get_rate_table, parse_target_currency
+from utils.router import Router
 from models.account import (
     AccountCreate, AccountUpdate, AccountResponse, 
     AccountBalance, AccountListResponse
@@ -25,6 +29,10 @@ def generate_account_id() -> str:
     """Generate a unique account ID"""
     return f"acc_{secrets.token_hex(8)}"
 
+def generate_adjustment_id() -> str:
+    """Generate a unique balance adjustment ID"""
+    return f"adj_{secrets.token_hex(8)}"
+
 @require_auth
 def create_account_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
@@ -65,6 +73,7 @@ def create_account_handler(event: Dict[str, Any], context: Any, user_data: Token
         # Save to database
         db_client = DynamoDBClient()
         created_account = db_client.create_account(db_data)
+        record_write(db_client, user_id)
         
         # Prepare response
         response_data = AccountResponse(
@@ -98,11 +107,75 @@ def create_account_handler(event: Dict[str, Any], context: Any, user_data: Token
         logger.error(f"Error creating account: {e}")
         return create_response(500, {"error": "Internal server error"})
 
+def build_account_list(accounts: list, convert_to: Optional[str] = None) -> AccountListResponse:
+    """
+    Build the account list response with active count and balances by currency
+
+    With convert_to the per-currency totals are also converted and summed in
+    that currency (one FX factor per currency, not per account).
+    """
+    # Convert to response models
+    account_responses = []
+    total_balance_by_currency = {}
+    active_count = 0
+    
+    for account in accounts:
+        account_response = AccountResponse(
+            account_id=account['account_id'],
+            user_id=account['user_id'],
+            name=account['name'],
+            account_type=account['account_type'],
+            bank_name=account['bank_name'],
+            bank_code=account.get('bank_code'),
+            currency=account['currency'],
+            current_balance=account['current_balance'],
+            is_active=account['is_active'],
+            description=account.get('description'),
+            color=account.get('color'),
+            created_at=account['created_at'],
+            updated_at=account['updated_at']
+        )
+        account_responses.append(account_response)
+        
+        # Count active accounts
+        if account['is_active']:
+            active_count += 1
+            
+            # Sum balances by currency (only active accounts)
+            currency = account['currency']
+            balance = account['current_balance']
+            if currency in total_balance_by_currency:
+                total_balance_by_currency[currency] += balance
+            else:
+                total_balance_by_currency[currency] = balance
+    
+    # Round balances to 2 decimal places
+    for currency in total_balance_by_currency:
+        total_balance_by_currency[currency] = round(total_balance_by_currency[currency], 2)
+    
+    conversion = {}
+    if convert_to:
+        fx_table = get_rate_table()
+        conversion = {
+            'converted_currency': convert_to,
+            'converted_total_balance': convert_totals(total_balance_by_currency, convert_to, fx_table),
+            'fx_rates_as_of': fx_table['as_of']
+        }
+    
+    # Prepare response
+    return AccountListResponse(
+        accounts=account_responses,
+        total_count=len(account_responses),
+        active_count=active_count,
+        total_balance_by_currency=total_balance_by_currency,
+        **conversion
+    )
+
 @require_auth
 def list_accounts_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
     List all accounts for the authenticated user
-    GET /accounts
+    GET /accounts?convert_to=MXN
     """
     try:
         user_id = user_data.user_id
@@ -111,60 +184,24 @@ def list_accounts_handler(event: Dict[str, Any], context: Any, user_data: TokenP
         # Get query parameters
         query_params = event.get('queryStringParameters') or {}
         include_inactive = query_params.get('include_inactive', 'false').lower() == 'true'
+        convert_to = parse_target_currency(query_params.get('convert_to'))
         
-        # Get accounts from database
+        # Answer conditional GETs from the user's data version
         db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+        
+        # Get accounts from database
         accounts = db_client.list_user_accounts(user_id, include_inactive)
         
-        # Convert to response models
-        account_responses = []
-        total_balance_by_currency = {}
-        active_count = 0
-        
-        for account in accounts:
-            account_response = AccountResponse(
-                account_id=account['account_id'],
-                user_id=account['user_id'],
-                name=account['name'],
-                account_type=account['account_type'],
-                bank_name=account['bank_name'],
-                bank_code=account.get('bank_code'),
-                currency=account['currency'],
-                current_balance=account['current_balance'],
-                is_active=account['is_active'],
-                description=account.get('description'),
-                color=account.get('color'),
-                created_at=account['created_at'],
-                updated_at=account['updated_at']
-            )
-            account_responses.append(account_response)
-            
-            # Count active accounts
-            if account['is_active']:
-                active_count += 1
-                
-                # Sum balances by currency (only active accounts)
-                currency = account['currency']
-                balance = account['current_balance']
-                if currency in total_balance_by_currency:
-                    total_balance_by_currency[currency] += balance
-                else:
-                    total_balance_by_currency[currency] = balance
-        
-        # Round balances to 2 decimal places
-        for currency in total_balance_by_currency:
-            total_balance_by_currency[currency] = round(total_balance_by_currency[currency], 2)
+        response_data = build_account_list(accounts, convert_to)
         
-        # Prepare response
-        response_data = AccountListResponse(
-            accounts=account_responses,
-            total_count=len(account_responses),
-            active_count=active_count,
-            total_balance_by_currency=total_balance_by_currency
-        )
-        
-        return create_response(200, response_data.model_dump())
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
         
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        return create_response(400, {"error": str(e)})
     except Exception as e:
         logger.error(f"Error listing accounts: {e}")
         return create_response(500, {"error": "Internal server error"})
@@ -246,6 +283,7 @@ def update_account_handler(event: Dict[str, Any], context: Any, user_data: Token
         # Update in database
         db_client = DynamoDBClient()
         updated_account = db_client.update_account(user_id, account_id, db_update_data)
+        record_write(db_client, user_id)
         
         # Convert to response model
         response_data = AccountResponse(
@@ -307,6 +345,14 @@ def delete_account_handler(event: Dict[str, Any], context: Any, user_data: Token
         if not success:
             return create_response(404, {"error": "Account not found"})
         
+        record_write(db_client, user_id)
+        
+        # Remove the account's transactions in the background when the cascade job is deployed
+        try:
+            schedule_cascade('account', user_id, account_id)
+        except Exception as e:
+            logger.error(f"Error scheduling cascade delete for account {account_id}: {e}")
+        
         return create_response(200, {
             "message": "Account deleted successfully",
             "account_id": account_id
@@ -343,8 +389,11 @@ def update_balance_handler(event: Dict[str, Any], context: Any, user_data: Token
             user_id, 
             account_id, 
             Decimal(str(balance_data.amount)),
-            datetime.now().isoformat()
+            datetime.now().isoformat(),
+            adjustment_id=generate_adjustment_id(),
+            description=balance_data.description
         )
+        record_write(db_client, user_id)
         
         # Convert to response model
         response_data = AccountResponse(
@@ -387,35 +436,27 @@ def update_balance_handler(event: Dict[str, Any], context: Any, user_data: Token
         logger.error(f"Error updating account balance: {e}")
         return create_response(500, {"error": "Internal server error"})
 
+# Routes are compiled once per container
+# The @require_auth decorator on each handler will handle authentication automatically
+router = Router(globals())
+router.add('POST', '/accounts', 'create_account_handler')
+router.add('GET', '/accounts', 'list_accounts_handler')
+router.add('GET', '/accounts/{account_id}', 'get_account_handler')
+router.add('PUT', '/accounts/{account_id}', 'update_account_handler')
+router.add('DELETE', '/accounts/{account_id}', 'delete_account_handler')
+router.add('PATCH', '/accounts/{account_id}/balance', 'update_balance_handler')
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler for account operations
     Routes requests to appropriate handlers based on HTTP method and path
     """
     try:
-        http_method = event['httpMethod']
-        path = event['path']
-        
-        # Remove API Gateway stage prefix if present
-        if path.startswith('/api'):
-            path = path[4:]  # Remove '/api'
-        
-        # Route to appropriate handler
-        # The @require_auth decorator will handle authentication automatically
-        if path == '/accounts' and http_method == 'POST':
-            return create_account_handler(event, context)
-        elif path == '/accounts' and http_method == 'GET':
-            return list_accounts_handler(event, context)
-        elif path.startswith('/accounts/') and path.count('/') == 2 and http_method == 'GET':
-            return get_account_handler(event, context)
-        elif path.startswith('/accounts/') and path.count('/') == 2 and http_method == 'PUT':
-            return update_account_handler(event, context)
-        elif path.startswith('/accounts/') and path.count('/') == 2 and http_method == 'DELETE':
-            return delete_account_handler(event, context)
-        elif path.endswith('/balance') and http_method == 'PATCH':
-            return update_balance_handler(event, context)
-        else:
+        response = router.dispatch(event, context)
+        if response is None:
             return create_response(404, {"error": "Endpoint not found"})
+        return response
             
     except Exception as e:
         logger.error(f"Unhandled error in lambda_handler: {e}")
@@ -0,0 +1,46 @@
+"""
+Single entry point for all API resources
+Used by the single-function deployment mode: one Lambda (and one warm pool)
+serves every route through the shared precompiled router
+"""
+
+import logging
+from typing import Dict, Any
+
+from utils.responses import create_response
+from utils.router import Router, ANY_METHOD
+from handlers import accounts, auth, budgets, cards, dashboard, health, transactions, users
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Resource modules with template routers are merged into one trie; auth,
+# users and health keep their own dispatch and are mounted as a whole
+router = Router()
+router.include(accounts.router)
+router.include(budgets.router)
+router.include(cards.router)
+router.include(dashboard.router)
+router.include(transactions.router)
+router.add(ANY_METHOD, '/auth/{proxy+}', auth.lambda_handler)
+router.add(ANY_METHOD, '/users', users.lambda_handler)
+router.add(ANY_METHOD, '/users/{user_id}', users.lambda_handler)
+router.add('GET', '/health', health.lambda_handler)
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Main Lambda handler for the single-function deployment
+    Routes every API request to its resource handler
+    """
+    try:
+        response = router.dispatch(event, context)
+        if response is None:
+            logger.warning(f"Route not found: {event.get('httpMethod')} {event.get('path')}")
+            return create_response(404, {"error": "Endpoint not found"})
+        return response
+
+    except Exception as e:
+        logger.error(f"Unhandled error in app lambda_handler: {e}")
+        return create_response(500, {"error": "Internal server error"})
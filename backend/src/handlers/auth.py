@@ -5,7 +5,9 @@ Implements login, register, and refresh token endpoints
 
 import json
 import logging
+import os
 import sys
+from datetime import datetime, timedelta
 from typing import Dict, Any
 
 # Configure logging first
@@ -17,6 +19,7 @@ try:
     from utils.responses import create_response, internal_server_error_response
     from utils.dynamodb_client import DynamoDBClient
     from utils.jwt_auth import create_token_response
+    from utils.rate_limiter import TokenBucketLimiter
     from models import User, UserCreate, UserLogin, create_user_from_input
     logger.info("✅ All local imports successful")
 except ImportError as e:
@@ -26,6 +29,27 @@ except ImportError as e:
 # DynamoDB client
 db_client = DynamoDBClient()
 
+# Account lockout after consecutive wrong passwords
+MAX_FAILED_LOGIN_ATTEMPTS = int(os.environ.get('MAX_FAILED_LOGIN_ATTEMPTS', '5'))
+LOGIN_LOCKOUT_MINUTES = int(os.environ.get('LOGIN_LOCKOUT_MINUTES', '15'))
+
+# Per-container login rate limits (burst size and sustained attempts per minute)
+LOGIN_EMAIL_BURST = float(os.environ.get('LOGIN_EMAIL_BURST', '5'))
+LOGIN_EMAIL_PER_MINUTE = float(os.environ.get('LOGIN_EMAIL_PER_MINUTE', '5'))
+LOGIN_IP_BURST = float(os.environ.get('LOGIN_IP_BURST', '20'))
+LOGIN_IP_PER_MINUTE = float(os.environ.get('LOGIN_IP_PER_MINUTE', '20'))
+
+email_limiter = TokenBucketLimiter(LOGIN_EMAIL_BURST, LOGIN_EMAIL_PER_MINUTE / 60)
+ip_limiter = TokenBucketLimiter(LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60)
+
+def too_many_attempts_response(retry_after: int) -> Dict[str, Any]:
+    """429 response with a Retry-After hint"""
+    return create_response(
+        429,
+        {"error": "Too many login attempts, try again later"},
+        headers={'Retry-After': str(max(1, retry_after))}
+    )
+
 def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
     """
     Main handler for all authentication operations
@@ -51,7 +75,8 @@ def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
         if http_method == 'POST':
             # POST /auth/login - Authentication
             if path.endswith('/login'):
-                return login_user_handler(body_data)
+                source_ip = (event.get('requestContext') or {}).get('identity', {}).get('sourceIp')
+                return login_user_handler(body_data, source_ip)
             # POST /auth/refresh - Token refresh
             elif path.endswith('/refresh'):
                 return refresh_token_handler(body_data)
@@ -118,9 +143,12 @@ def register_user_handler(data: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Error during user registration: {str(e)}", exc_info=True)
         return internal_server_error_response("Registration failed")
 
-def login_user_handler(data: Dict[str, Any]) -> Dict[str, Any]:
+def login_user_handler(data: Dict[str, Any], source_ip: str = None) -> Dict[str, Any]:
     """
     Authenticate user and return JWT tokens
+    
+    Requests over the per-IP or per-email rate limit and logins to a locked
+    account are rejected with 429 before the password is verified.
     """
     try:
         logger.info(f"Login attempt for email: {data.get('email', 'N/A')}")
@@ -131,6 +159,17 @@ def login_user_handler(data: Dict[str, Any]) -> Dict[str, Any]:
         # Normalize email
         email_normalized = login_data.email.lower()
         
+        # Cheap in-container pre-filter, before any DynamoDB read or bcrypt work
+        if source_ip:
+            allowed, retry_after = ip_limiter.allow(source_ip)
+            if not allowed:
+                logger.warning(f"Login rate limit exceeded for IP: {source_ip}")
+                return too_many_attempts_response(retry_after)
+        allowed, retry_after = email_limiter.allow(email_normalized)
+        if not allowed:
+            logger.warning(f"Login rate limit exceeded for email: {email_normalized}")
+            return too_many_attempts_response(retry_after)
+        
         # Get user from database
         user = db_client.get_user_by_email(email_normalized)
         if not user:
@@ -142,13 +181,44 @@ def login_user_handler(data: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning(f"Login attempt for inactive user: {email_normalized}")
             return create_response(401, {"error": "User account not found or disabled"})
         
+        # Locked after too many failed attempts
+        blocked_until = user.get('blocked_until')
+        if blocked_until:
+            remaining = (datetime.fromisoformat(blocked_until) - datetime.now()).total_seconds()
+            if remaining > 0:
+                logger.warning(f"Login attempt for locked user: {email_normalized}")
+                return too_many_attempts_response(int(remaining) + 1)
+        
         # Verify password
-        from models.user import verify_password
+        from models.user import verify_password, password_needs_rehash, hash_password
         stored_password_hash = user.get('password_hash', '')
         if not verify_password(login_data.password, stored_password_hash):
             logger.warning(f"Failed login attempt for email: {email_normalized}")
+            lockout_until = datetime.now() + timedelta(minutes=LOGIN_LOCKOUT_MINUTES)
+            # Counting the attempt never turns a rejected login into a server error
+            try:
+                db_client.record_failed_login(
+                    user['user_id'],
+                    int(user.get('failed_login_attempts', 0)),
+                    MAX_FAILED_LOGIN_ATTEMPTS,
+                    lockout_until.isoformat(),
+                    seen_blocked_until=blocked_until
+                )
+            except Exception as e:
+                logger.error(f"Error recording failed login for user {user['user_id']}: {str(e)}")
             return create_response(401, {"error": "Invalid credentials"})
         
+        # Upgrade/downgrade the hash when BCRYPT_ROUNDS changed; never fails the login
+        if password_needs_rehash(stored_password_hash):
+            try:
+                db_client.rehash_password(
+                    user['user_id'],
+                    stored_password_hash,
+                    hash_password(login_data.password)
+                )
+            except Exception as e:
+                logger.error(f"Error rehashing password for user {user['user_id']}: {str(e)}")
+        
         # Record successful login (resets failed attempts and updates last login)
         db_client.successful_login(user['user_id'])
         
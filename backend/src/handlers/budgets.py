@@ -0,0 +1,233 @@
+"""
+Budget handlers for AWS Lambda
+Monthly spending limits per category; the spent counters are maintained by
+the transaction write paths, so every read here is a single query
+"""
+
+import json
+import logging
+from typing import Dict, Any
+from datetime import datetime
+
+from utils.responses import create_response
+from utils.dynamodb_client import DynamoDBClient
+from utils.jwt_auth import require_auth, TokenPayload
+from utils.etag import check_not_modified, record_write
+from utils.router import Router
+from utils.budgets import budget_status, month_spending
+from models.budget import BudgetCreate, BudgetUpdate, BudgetResponse, BudgetListResponse
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+def build_budget_response(budget: Dict[str, Any]) -> BudgetResponse:
+    """Convert a budget item to its response with the current month's status"""
+    return BudgetResponse(
+        category=budget['category'],
+        amount=float(budget['amount']),
+        currency=budget.get('currency', 'MXN'),
+        alert_threshold=float(budget['alert_threshold']),
+        created_at=budget['created_at'],
+        updated_at=budget['updated_at'],
+        **budget_status(budget)
+    )
+
+
+@require_auth
+def create_budget_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Create a budget for a category
+    POST /budgets
+
+    The counter starts with what was already spent this month.
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Creating budget for user: {user_id}")
+
+        body = json.loads(event.get('body') or '{}')
+        budget_data = BudgetCreate(**body)
+
+        db_client = DynamoDBClient()
+        if db_client.get_budget(user_id, budget_data.category):
+            return create_response(409, {"error": "A budget already exists for this category"})
+
+        now = datetime.now()
+        period = now.strftime('%Y-%m')
+        accounts = [account for account in db_client.list_user_accounts(user_id, include_inactive=True)
+                    if account.get('currency', 'MXN') == budget_data.currency]
+        spending = month_spending(db_client, user_id, accounts, period)
+
+        budget = db_client.create_budget({
+            'user_id': user_id,
+            **budget_data.model_dump(),
+            'period': period,
+            'spent': spending.get((budget_data.category, budget_data.currency), 0),
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat()
+        })
+        record_write(db_client, user_id)
+
+        return create_response(201, {
+            "message": "Budget created successfully",
+            "budget": build_budget_response(budget).model_dump()
+        })
+
+    except json.JSONDecodeError:
+        logger.error("Invalid JSON in request body")
+        return create_response(400, {"error": "Invalid JSON format"})
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        return create_response(400, {"error": str(e)})
+    except Exception as e:
+        logger.error(f"Error creating budget: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def get_budgets_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get the user's budgets with this month's spending
+    GET /budgets
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting budgets for user: {user_id}")
+
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        budgets = sorted(
+            (build_budget_response(budget) for budget in db_client.list_budgets(user_id)),
+            key=lambda budget: -budget.percent_used
+        )
+        response_data = BudgetListResponse(
+            budgets=budgets,
+            total_count=len(budgets),
+            over_budget_count=sum(1 for budget in budgets if budget.is_over_budget),
+            alerts=[budget.category for budget in budgets if budget.is_over_threshold]
+        )
+
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting budgets: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def get_budget_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get one category budget
+    GET /budgets/{category}
+    """
+    try:
+        user_id = user_data.user_id
+        category = event['pathParameters']['category']
+
+        budget = DynamoDBClient().get_budget(user_id, category)
+        if not budget:
+            return create_response(404, {"error": "Budget not found"})
+
+        return create_response(200, {"budget": build_budget_response(budget).model_dump()})
+
+    except KeyError:
+        logger.error("Missing category in path parameters")
+        return create_response(400, {"error": "Category is required"})
+    except Exception as e:
+        logger.error(f"Error getting budget: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def update_budget_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Update a budget's limit or alert threshold
+    PUT /budgets/{category}
+    """
+    try:
+        user_id = user_data.user_id
+        category = event['pathParameters']['category']
+
+        body = json.loads(event.get('body') or '{}')
+        update_data = BudgetUpdate(**body)
+
+        db_client = DynamoDBClient()
+        budget = db_client.update_budget(user_id, category, {
+            **update_data.model_dump(exclude_none=True),
+            'updated_at': datetime.now().isoformat()
+        })
+        if not budget:
+            return create_response(404, {"error": "Budget not found"})
+        record_write(db_client, user_id)
+
+        return create_response(200, {
+            "message": "Budget updated successfully",
+            "budget": build_budget_response(budget).model_dump()
+        })
+
+    except KeyError:
+        logger.error("Missing category in path parameters")
+        return create_response(400, {"error": "Category is required"})
+    except json.JSONDecodeError:
+        logger.error("Invalid JSON in request body")
+        return create_response(400, {"error": "Invalid JSON format"})
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        return create_response(400, {"error": str(e)})
+    except Exception as e:
+        logger.error(f"Error updating budget: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def delete_budget_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Delete a budget
+    DELETE /budgets/{category}
+    """
+    try:
+        user_id = user_data.user_id
+        category = event['pathParameters']['category']
+
+        db_client = DynamoDBClient()
+        if not db_client.delete_budget(user_id, category):
+            return create_response(404, {"error": "Budget not found"})
+        record_write(db_client, user_id)
+
+        return create_response(200, {"message": "Budget deleted successfully"})
+
+    except KeyError:
+        logger.error("Missing category in path parameters")
+        return create_response(400, {"error": "Category is required"})
+    except Exception as e:
+        logger.error(f"Error deleting budget: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+router = Router(globals())
+router.add('POST', '/budgets', 'create_budget_handler')
+router.add('GET', '/budgets', 'get_budgets_handler')
+router.add('GET', '/budgets/{category}', 'get_budget_handler')
+router.add('PUT', '/budgets/{category}', 'update_budget_handler')
+router.add('DELETE', '/budgets/{category}', 'delete_budget_handler')
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Main Lambda handler for budgets API
+    Routes requests to appropriate handler functions
+    """
+    try:
+        response = router.dispatch(event, context)
+        if response is None:
+            logger.warning(f"Route not found: {event.get('httpMethod')} {event.get('path')}")
+            return create_response(404, {"error": "Route not found"})
+        return response
+
+    except Exception as e:
+        logger.error(f"Lambda handler error: {e}")
+        return create_response(500, {"error": "Internal server error"})
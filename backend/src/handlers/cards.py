@@ -13,9 +13,14 @@ from decimal import Decimal
 from utils.responses import create_response
 from utils.dynamodb_client import DynamoDBClient
 from utils.jwt_auth import require_auth, TokenPayload
+from utils.etag import check_not_modified, record_write
+from utils.router import Router
+from utils.billing_cycle import billing_cycle, clamp_day, cycle_bounds, parse_cycle
+from utils.cascade import schedule_cascade
 from models.card import (
     CardCreate, CardUpdate, CardResponse, CardTransaction, 
-    CardPayment, CardBill, CardListResponse
+    CardPayment, CardBill, CardListResponse,
+    CardTransactionResponse, CardCycleTransactionsResponse
 )
 
 logger = logging.getLogger()
@@ -29,6 +34,13 @@ def generate_bill_id() -> str:
     """Generate a unique bill ID"""
     return f"bill_{secrets.token_hex(8)}"
 
+def generate_card_transaction_id() -> str:
+    """Generate a unique card transaction ID"""
+    return f"ctxn_{secrets.token_hex(8)}"
+
+# Transaction types that increase the card debt; the rest reduce it
+CARD_CHARGE_TYPES = ('purchase', 'fee', 'interest')
+
 def calculate_available_credit(credit_limit: float, current_balance: float) -> float:
     """Calculate available credit"""
     if credit_limit is None:
@@ -48,17 +60,36 @@ def days_until_payment_due(payment_due_date: int) -> int:
         return None
     
     today = date.today()
-    due_date = date(today.year, today.month, payment_due_date)
+    due_date = clamp_day(today.year, today.month, payment_due_date)
     
     # If due date has passed this month, calculate for next month
     if due_date < today:
         if today.month == 12:
-            due_date = date(today.year + 1, 1, payment_due_date)
+            due_date = clamp_day(today.year + 1, 1, payment_due_date)
         else:
-            due_date = date(today.year, today.month + 1, payment_due_date)
+            due_date = clamp_day(today.year, today.month + 1, payment_due_date)
     
     return (due_date - today).days
 
+def statement_fields(card: Dict[str, Any], payment_due_date: int) -> Dict[str, Any]:
+    """
+    Figures precomputed by the statement engine, with days until due
+    Falls back to the payment_due_date day while no statement is pending
+    """
+    next_payment_due = card.get('next_payment_due')
+    if next_payment_due and date.fromisoformat(next_payment_due) >= date.today():
+        days_due = (date.fromisoformat(next_payment_due) - date.today()).days
+    else:
+        days_due = days_until_payment_due(payment_due_date)
+    
+    statement_balance = card.get('statement_balance')
+    return {
+        'days_until_due': days_due,
+        'statement_balance': float(statement_balance) if statement_balance is not None else None,
+        'next_payment_due': next_payment_due,
+        'last_statement_cycle': card.get('last_statement_cycle')
+    }
+
 @require_auth
 def create_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
@@ -106,6 +137,7 @@ def create_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
         # Save to database
         db_client = DynamoDBClient()
         created_card = db_client.create_card(db_data)
+        record_write(db_client, user_id)
         
         # Calculate additional fields for response
         available_credit = calculate_available_credit(
@@ -151,6 +183,94 @@ def create_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
         logger.error(f"Error creating card: {str(e)}")
         return create_response(500, {"error": "Internal server error"})
 
+def build_card_list(cards: list) -> CardListResponse:
+    """
+    Build the card list response with debt and available credit by currency
+    Malformed items are skipped
+    """
+    # Convert to response format
+    card_responses = []
+    total_debt_by_currency = {}
+    total_available_credit = {}
+    active_count = 0
+    
+    for card in cards:
+        # Defensive: skip malformed or incomplete items but keep processing others
+        try:
+            # Calculate additional fields
+            credit_limit = float(card.get('credit_limit', 0)) if card.get('credit_limit') else None
+            current_balance = float(card.get('current_balance', 0))
+            available_credit = calculate_available_credit(credit_limit or 0, current_balance) if credit_limit else None
+
+            # Convert payment_due_date from Decimal to int if it exists
+            payment_due_date = card.get('payment_due_date')
+            payment_due_date_int = int(payment_due_date) if payment_due_date is not None else None
+
+            # Convert cut_off_date from Decimal to int if it exists
+            cut_off_date = card.get('cut_off_date')
+            cut_off_date_int = int(cut_off_date) if cut_off_date is not None else None
+
+            # Build response, using .get with fallbacks to avoid KeyError
+            card_response = CardResponse(
+                card_id=card.get('card_id', ''),
+                user_id=card.get('user_id', ''),
+                name=card.get('name', ''),
+                card_type=card.get('card_type', ''),
+                card_network=card.get('card_network', ''),
+                bank_name=card.get('bank_name', ''),
+                credit_limit=credit_limit,
+                current_balance=current_balance,
+                available_credit=available_credit,
+                minimum_payment=float(card.get('minimum_payment')) if card.get('minimum_payment') else None,
+                payment_due_date=payment_due_date_int,
+                cut_off_date=cut_off_date_int,
+                apr=float(card.get('apr')) if card.get('apr') else None,
+                annual_fee=float(card.get('annual_fee')) if card.get('annual_fee') else None,
+                rewards_program=card.get('rewards_program'),
+                currency=card.get('currency', 'MXN'),
+                color=card.get('color'),
+                description=card.get('description'),
+                status=card.get('status', 'inactive'),
+                **statement_fields(card, payment_due_date_int),
+                created_at=card.get('created_at', ''),
+                updated_at=card.get('updated_at', '')
+            )
+
+            card_responses.append(card_response)
+
+            # Calculate totals
+            currency = card.get('currency', 'MXN')
+            if card.get('status') == 'active':
+                active_count += 1
+
+                # Total debt (current balance)
+                if currency not in total_debt_by_currency:
+                    total_debt_by_currency[currency] = 0.0
+                total_debt_by_currency[currency] += current_balance
+
+                # Available credit
+                if available_credit and available_credit > 0:
+                    if currency not in total_available_credit:
+                        total_available_credit[currency] = 0.0
+                    total_available_credit[currency] += available_credit
+
+        except Exception as e:
+            logger.error(f"Skipping malformed card item during list: {e} - item: {card}")
+            # Skip this item and continue with others
+            continue
+    
+    # Sort cards by created_at (newest first)
+    card_responses.sort(key=lambda x: x.created_at, reverse=True)
+    
+    # Prepare response
+    return CardListResponse(
+        cards=card_responses,
+        total_count=len(card_responses),
+        active_count=active_count,
+        total_debt_by_currency=total_debt_by_currency,
+        total_available_credit=total_available_credit
+    )
+
 @require_auth
 def get_cards_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
@@ -168,8 +288,13 @@ def get_cards_handler(event: Dict[str, Any], context: Any, user_data: TokenPaylo
         # Default behavior: do NOT include inactive cards unless explicitly requested
         include_inactive = status_filter == 'inactive'
         
-        # Get cards from database
+        # Answer conditional GETs from the user's data version
         db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+        
+        # Get cards from database
         cards = db_client.list_user_cards(user_id, include_inactive=include_inactive)
         
         # Apply filters
@@ -178,91 +303,9 @@ def get_cards_handler(event: Dict[str, Any], context: Any, user_data: TokenPaylo
         if card_type_filter:
             cards = [card for card in cards if card.get('card_type') == card_type_filter]
         
-        # Convert to response format
-        card_responses = []
-        total_debt_by_currency = {}
-        total_available_credit = {}
-        active_count = 0
-        
-        for card in cards:
-            # Defensive: skip malformed or incomplete items but keep processing others
-            try:
-                # Calculate additional fields
-                credit_limit = float(card.get('credit_limit', 0)) if card.get('credit_limit') else None
-                current_balance = float(card.get('current_balance', 0))
-                available_credit = calculate_available_credit(credit_limit or 0, current_balance) if credit_limit else None
-
-                # Convert payment_due_date from Decimal to int if it exists
-                payment_due_date = card.get('payment_due_date')
-                payment_due_date_int = int(payment_due_date) if payment_due_date is not None else None
-                days_due = days_until_payment_due(payment_due_date_int)
-
-                # Convert cut_off_date from Decimal to int if it exists
-                cut_off_date = card.get('cut_off_date')
-                cut_off_date_int = int(cut_off_date) if cut_off_date is not None else None
-
-                # Build response, using .get with fallbacks to avoid KeyError
-                card_response = CardResponse(
-                    card_id=card.get('card_id', ''),
-                    user_id=card.get('user_id', ''),
-                    name=card.get('name', ''),
-                    card_type=card.get('card_type', ''),
-                    card_network=card.get('card_network', ''),
-                    bank_name=card.get('bank_name', ''),
-                    credit_limit=credit_limit,
-                    current_balance=current_balance,
-                    available_credit=available_credit,
-                    minimum_payment=float(card.get('minimum_payment')) if card.get('minimum_payment') else None,
-                    payment_due_date=payment_due_date_int,
-                    cut_off_date=cut_off_date_int,
-                    apr=float(card.get('apr')) if card.get('apr') else None,
-                    annual_fee=float(card.get('annual_fee')) if card.get('annual_fee') else None,
-                    rewards_program=card.get('rewards_program'),
-                    currency=card.get('currency', 'MXN'),
-                    color=card.get('color'),
-                    description=card.get('description'),
-                    status=card.get('status', 'inactive'),
-                    days_until_due=days_due,
-                    created_at=card.get('created_at', ''),
-                    updated_at=card.get('updated_at', '')
-                )
-
-                card_responses.append(card_response)
-
-                # Calculate totals
-                currency = card.get('currency', 'MXN')
-                if card.get('status') == 'active':
-                    active_count += 1
-
-                    # Total debt (current balance)
-                    if currency not in total_debt_by_currency:
-                        total_debt_by_currency[currency] = 0.0
-                    total_debt_by_currency[currency] += current_balance
-
-                    # Available credit
-                    if available_credit and available_credit > 0:
-                        if currency not in total_available_credit:
-                            total_available_credit[currency] = 0.0
-                        total_available_credit[currency] += available_credit
-
-            except Exception as e:
-                logger.error(f"Skipping malformed card item during list: {e} - item: {card}")
-                # Skip this item and continue with others
-                continue
-        
-        # Sort cards by created_at (newest first)
-        card_responses.sort(key=lambda x: x.created_at, reverse=True)
-        
-        # Prepare response
-        response_data = CardListResponse(
-            cards=card_responses,
-            total_count=len(card_responses),
-            active_count=active_count,
-            total_debt_by_currency=total_debt_by_currency,
-            total_available_credit=total_available_credit
-        )
+        response_data = build_card_list(cards)
         
-        return create_response(200, response_data.model_dump())
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
         
     except Exception as e:
         logger.error(f"Error getting cards: {str(e)}")
@@ -301,7 +344,6 @@ def get_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPayloa
         # Convert payment_due_date from Decimal to int if it exists
         payment_due_date = card.get('payment_due_date')
         payment_due_date_int = int(payment_due_date) if payment_due_date is not None else None
-        days_due = days_until_payment_due(payment_due_date_int)
         
         # Convert cut_off_date from Decimal to int if it exists
         cut_off_date = card.get('cut_off_date')
@@ -328,7 +370,7 @@ def get_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPayloa
             color=card.get('color'),
             description=card.get('description'),
             status=card['status'],
-            days_until_due=days_due,
+            **statement_fields(card, payment_due_date_int),
             created_at=card['created_at'],
             updated_at=card['updated_at']
         )
@@ -399,6 +441,8 @@ def update_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
         if not updated_card:
             return create_response(404, {"error": "Card not found"})
         
+        record_write(db_client, user_id)
+        
         # Calculate additional fields
         credit_limit = float(updated_card.get('credit_limit', 0)) if updated_card.get('credit_limit') else None
         current_balance = float(updated_card.get('current_balance', 0))
@@ -407,7 +451,6 @@ def update_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
         # Convert payment_due_date from Decimal to int if it exists
         payment_due_date = updated_card.get('payment_due_date')
         payment_due_date_int = int(payment_due_date) if payment_due_date is not None else None
-        days_due = days_until_payment_due(payment_due_date_int)
         
         # Convert cut_off_date from Decimal to int if it exists
         cut_off_date = updated_card.get('cut_off_date')
@@ -434,7 +477,7 @@ def update_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
             color=updated_card.get('color'),
             description=updated_card.get('description'),
             status=updated_card['status'],
-            days_until_due=days_due,
+            **statement_fields(updated_card, payment_due_date_int),
             created_at=updated_card['created_at'],
             updated_at=updated_card['updated_at']
         )
@@ -470,6 +513,14 @@ def delete_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
         if not success:
             return create_response(404, {"error": "Card not found"})
         
+        record_write(db_client, user_id)
+        
+        # Remove the card's billing cycles and statements in the background when the cascade job is deployed
+        try:
+            schedule_cascade('card', user_id, card_id=card_id)
+        except Exception as e:
+            logger.error(f"Error scheduling cascade delete for card {card_id}: {e}")
+        
         logger.info(f"Card deleted successfully: {card_id}")
         return create_response(200, {"message": "Card deleted successfully"})
         
@@ -477,6 +528,60 @@ def delete_card_handler(event: Dict[str, Any], context: Any, user_data: TokenPay
         logger.error(f"Error deleting card: {str(e)}")
         return create_response(500, {"error": "Internal server error"})
 
+def parse_transaction_date(value: str) -> datetime:
+    """Parse an ISO date/datetime (default now); raises ValueError when malformed"""
+    if not value:
+        return datetime.now()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid transaction date: {value}")
+
+def card_cut_off_day(card: Dict[str, Any]) -> int:
+    """Card cut-off day as int (DynamoDB returns Decimal), None when not set"""
+    cut_off_day = card.get('cut_off_date')
+    return int(cut_off_day) if cut_off_day is not None else None
+
+def record_card_transaction(db_client: DynamoDBClient, user_id: str, card: Dict[str, Any],
+                            transaction_type: str, amount: float, description: str,
+                            transaction_date: str = None) -> Dict[str, Any]:
+    """
+    Persist a card transaction in its billing cycle and apply it to the card balance
+
+    Returns:
+        The stored transaction item
+    """
+    when = parse_transaction_date(transaction_date)
+    amount = abs(Decimal(str(amount)))
+    balance_delta = amount if transaction_type in CARD_CHARGE_TYPES else -amount
+
+    return db_client.create_card_transaction({
+        'card_transaction_id': generate_card_transaction_id(),
+        'card_id': card['card_id'],
+        'user_id': user_id,
+        'cycle': billing_cycle(when.date(), card_cut_off_day(card)),
+        'transaction_type': transaction_type,
+        'amount': amount,
+        'balance_delta': balance_delta,
+        'description': description,
+        'transaction_date': when.isoformat(),
+        'created_at': datetime.now().isoformat()
+    })
+
+def build_card_transaction_response(item: Dict[str, Any]) -> CardTransactionResponse:
+    """Build the API model for a stored card transaction"""
+    return CardTransactionResponse(
+        card_transaction_id=item['card_transaction_id'],
+        card_id=item['card_id'],
+        cycle=item['cycle'],
+        transaction_type=item['transaction_type'],
+        amount=float(item['amount']),
+        balance_delta=float(item['balance_delta']),
+        description=item['description'],
+        transaction_date=item['transaction_date'],
+        created_at=item['created_at']
+    )
+
 @require_auth
 def add_card_transaction_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
@@ -501,28 +606,25 @@ def add_card_transaction_handler(event: Dict[str, Any], context: Any, user_data:
         if not card:
             return create_response(404, {"error": "Card not found"})
         
-        # Update card balance
-        current_balance = float(card.get('current_balance', 0))
-        
         # For purchases, fees, interest: add to balance (increase debt)
         # For payments, cashback, refunds: subtract from balance (reduce debt)
-        if transaction_data.transaction_type in ['purchase', 'fee', 'interest']:
-            new_balance = current_balance + abs(transaction_data.amount)
-        else:  # payment, cashback, refund
-            new_balance = current_balance - abs(transaction_data.amount)
-        
-        # Update card balance
-        update_fields = {
-            'current_balance': Decimal(str(new_balance)),
-            'updated_at': datetime.now().isoformat()
-        }
+        # The transaction is stored in its billing cycle and the balance is changed with an atomic ADD
+        item = record_card_transaction(
+            db_client, user_id, card,
+            transaction_data.transaction_type,
+            transaction_data.amount,
+            transaction_data.description,
+            transaction_data.transaction_date
+        )
+        record_write(db_client, user_id)
         
-        db_client.update_card(user_id, card_id, update_fields)
+        new_balance = float(card.get('current_balance', 0)) + float(item['balance_delta'])
         
         logger.info(f"Transaction added successfully to card: {card_id}")
         return create_response(200, {
             "message": "Transaction added successfully",
-            "new_balance": new_balance
+            "new_balance": new_balance,
+            "transaction": build_card_transaction_response(item).model_dump()
         })
         
     except ValueError as e:
@@ -532,6 +634,56 @@ def add_card_transaction_handler(event: Dict[str, Any], context: Any, user_data:
         logger.error(f"Error adding transaction: {str(e)}")
         return create_response(500, {"error": "Internal server error"})
 
+@require_auth
+def get_card_transactions_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    List a card's transactions for one billing cycle (default: the current one)
+    GET /cards/{card_id}/transactions?cycle=2025-10
+    """
+    try:
+        user_id = user_data.user_id
+        card_id = event['pathParameters']['card_id']
+        query_params = event.get('queryStringParameters') or {}
+        
+        db_client = DynamoDBClient()
+        card = db_client.get_card_by_id(user_id, card_id)
+        
+        if not card:
+            return create_response(404, {"error": "Card not found"})
+        
+        cut_off_day = card_cut_off_day(card)
+        if query_params.get('cycle'):
+            try:
+                cycle = parse_cycle(query_params['cycle'])
+            except ValueError:
+                return create_response(400, {"error": "cycle must be in yyyy-mm format"})
+        else:
+            cycle = billing_cycle(date.today(), cut_off_day)
+        
+        items = db_client.list_card_cycle_transactions(user_id, card_id, cycle)
+        transactions = [build_card_transaction_response(item) for item in items]
+        
+        charges = sum(t.balance_delta for t in transactions if t.balance_delta > 0)
+        credits = -sum(t.balance_delta for t in transactions if t.balance_delta < 0)
+        cycle_start, cycle_end = cycle_bounds(cycle, cut_off_day)
+        
+        response_data = CardCycleTransactionsResponse(
+            card_id=card_id,
+            cycle=cycle,
+            cycle_start=cycle_start.isoformat(),
+            cycle_end=cycle_end.isoformat(),
+            transactions=transactions,
+            total_charges=round(charges, 2),
+            total_credits=round(credits, 2),
+            net_change=round(charges - credits, 2)
+        )
+        
+        return create_response(200, response_data.model_dump())
+        
+    except Exception as e:
+        logger.error(f"Error listing card transactions: {str(e)}")
+        return create_response(500, {"error": "Internal server error"})
+
 @require_auth
 def make_card_payment_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
@@ -556,23 +708,24 @@ def make_card_payment_handler(event: Dict[str, Any], context: Any, user_data: To
         if not card:
             return create_response(404, {"error": "Card not found"})
         
-        # Update card balance (subtract payment from balance)
-        current_balance = float(card.get('current_balance', 0))
-        new_balance = current_balance - payment_data.amount
-        
-        # Update card balance
-        update_fields = {
-            'current_balance': Decimal(str(new_balance)),
-            'updated_at': datetime.now().isoformat()
-        }
+        # Store the payment and subtract it from the balance atomically
+        item = record_card_transaction(
+            db_client, user_id, card,
+            'payment',
+            payment_data.amount,
+            payment_data.description or 'Card payment',
+            payment_data.payment_date
+        )
+        record_write(db_client, user_id)
         
-        db_client.update_card(user_id, card_id, update_fields)
+        new_balance = float(card.get('current_balance', 0)) + float(item['balance_delta'])
         
         logger.info(f"Payment made successfully for card: {card_id}")
         return create_response(200, {
             "message": "Payment made successfully",
             "payment_amount": payment_data.amount,
-            "new_balance": new_balance
+            "new_balance": new_balance,
+            "transaction": build_card_transaction_response(item).model_dump()
         })
         
     except ValueError as e:
@@ -582,6 +735,18 @@ def make_card_payment_handler(event: Dict[str, Any], context: Any, user_data: To
         logger.error(f"Error making payment: {str(e)}")
         return create_response(500, {"error": "Internal server error"})
 
+# Routes are compiled once per container
+# The @require_auth decorator on each handler will handle authentication automatically
+router = Router(globals())
+router.add('POST', '/cards', 'create_card_handler')
+router.add('GET', '/cards', 'get_cards_handler')
+router.add('GET', '/cards/{card_id}', 'get_card_handler')
+router.add('PUT', '/cards/{card_id}', 'update_card_handler')
+router.add('DELETE', '/cards/{card_id}', 'delete_card_handler')
+router.add('POST', '/cards/{card_id}/transactions', 'add_card_transaction_handler')
+router.add('GET', '/cards/{card_id}/transactions', 'get_card_transactions_handler')
+router.add('POST', '/cards/{card_id}/payment', 'make_card_payment_handler')
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -591,40 +756,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         logger.info(f"Cards handler - Event: {json.dumps(event, default=str)}")
         
-        http_method = event.get('httpMethod')
-        path = event.get('path', '').rstrip('/')
-        
-        # Remove API Gateway stage prefix if present
-        if path.startswith('/api'):
-            path = path[4:]  # Remove '/api'
-        
-        # Route to appropriate handler
-        # The @require_auth decorator will handle authentication automatically
-        if path == '/cards' and http_method == 'POST':
-            return create_card_handler(event, context)
-        elif path == '/cards' and http_method == 'GET':
-            return get_cards_handler(event, context)
-        elif path.startswith('/cards/') and http_method == 'GET':
-            # Check if it's a specific card or has additional path segments
-            path_parts = [p for p in path.split('/') if p]  # Remove empty parts
-            if len(path_parts) == 2:  # /cards/{card_id}
-                return get_card_handler(event, context)
-        elif path.startswith('/cards/') and http_method == 'PUT':
-            path_parts = [p for p in path.split('/') if p]
-            if len(path_parts) == 2:  # /cards/{card_id}
-                return update_card_handler(event, context)
-        elif path.startswith('/cards/') and http_method == 'DELETE':
-            path_parts = [p for p in path.split('/') if p]
-            if len(path_parts) == 2:  # /cards/{card_id}
-                return delete_card_handler(event, context)
-        elif path.endswith('/transactions') and http_method == 'POST':
-            return add_card_transaction_handler(event, context)
-        elif path.endswith('/payment') and http_method == 'POST':
-            return make_card_payment_handler(event, context)
-        else:
+        response = router.dispatch(event, context)
+        if response is None:
             # Route not found
-            logger.warning(f"Route not found: {http_method} {path}")
+            logger.warning(f"Route not found: {event.get('httpMethod')} {event.get('path')}")
             return create_response(404, {"error": "Route not found"})
+        return response
         
     except Exception as e:
         logger.error(f"Lambda handler error: {str(e)}")
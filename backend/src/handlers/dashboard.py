@@ -0,0 +1,480 @@
+"""
+Dashboard handler for AWS Lambda
+Serves accounts, cards, recent transactions, net worth and the month summary
+from a single query over the user's partition instead of three separate
+endpoints, and the precomputed insights (detected subscriptions, cash-flow
+forecast, net-worth history, spending distributions)
+"""
+
+import heapq
+import logging
+from typing import Dict, Any, Optional, get_args
+from datetime import date, datetime, timedelta
+
+from utils.responses import create_response
+from utils.dynamodb_client import DynamoDBClient
+from utils.jwt_auth import require_auth, TokenPayload
+from utils.etag import check_not_modified
+from utils.fx import convert_totals, get_rate_table, parse_target_currency
+from utils.forecast import (
+    DEFAULT_FORECAST_DAYS,
+    MAX_FORECAST_DAYS,
+    build_forecast,
+    cache_forecast,
+    get_cached_forecast
+)
+from utils.net_worth import snapshot_series
+from utils.spend_distribution import describe_distribution
+from utils.router import Router
+from handlers.accounts import build_account_list
+from handlers.cards import build_card_list
+from handlers.transactions import build_transaction_response, summarize_in_currency, summarize_transactions
+from models.forecast import ForecastResponse
+from models.net_worth import NetWorthHistoryResponse
+from models.spending import SpendingDistributionResponse
+from models.transaction import AlertListResponse, TransactionCategory
+from models.subscription import SubscriptionResponse, SubscriptionListResponse
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Recent transactions returned by default and at most
+DEFAULT_RECENT_TRANSACTIONS = 10
+MAX_RECENT_TRANSACTIONS = 50
+
+# Sort key ranges of the user partition the dashboard reads (in sk order)
+DASHBOARD_SK_PREFIXES = ['ACCOUNT#', 'CARD#', 'TRANSACTION#']
+
+# Days of net-worth history returned by default and at most
+DEFAULT_NETWORTH_DAYS = 365
+MAX_NETWORTH_DAYS = 366 * 5
+
+# Months of spending merged by default
+DEFAULT_SPENDING_MONTHS = 12
+
+# Alerts returned by default and at most
+DEFAULT_ALERTS = 50
+MAX_ALERTS = 200
+
+# Charges per month of each subscription frequency
+MONTHLY_FACTORS = {'weekly': 52 / 12, 'monthly': 1.0, 'yearly': 1 / 12}
+
+
+def split_partition(items: list, month_start: str, now: str) -> Dict[str, list]:
+    """
+    Split partition items by entity_type in a single pass
+
+    Args:
+        items: Raw items from query_user_partition
+        month_start: ISO timestamp of the first instant of the month
+        now: ISO timestamp closing the month window
+
+    Returns:
+        Dict with active accounts, valid active cards, all transactions,
+        the transactions inside the month window and every account's currency
+    """
+    accounts, cards, transactions, month_transactions = [], [], [], []
+    currency_by_account = {}
+
+    for item in items:
+        entity_type = item.get('entity_type')
+
+        if entity_type == 'account':
+            currency_by_account[item.get('account_id')] = item.get('currency', 'MXN')
+            if item.get('is_active', True):
+                accounts.append(item)
+        elif entity_type == 'card':
+            if item.get('status') == 'active' and DynamoDBClient.is_valid_card(item):
+                cards.append(item)
+        elif entity_type == 'transaction':
+            for key in ('amount', 'account_balance_after'):
+                if key in item:
+                    item[key] = float(item[key])
+            transactions.append(item)
+            if month_start <= item.get('transaction_date', '') <= now:
+                month_transactions.append(item)
+
+    return {
+        'accounts': accounts,
+        'cards': cards,
+        'transactions': transactions,
+        'month_transactions': month_transactions,
+        'currency_by_account': currency_by_account
+    }
+
+
+def build_net_worth(account_totals: Dict[str, float], card_debt: Dict[str, float],
+                    convert_to: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Net worth by currency (active account balances less card debt)
+
+    Args:
+        account_totals: Balance of active accounts by currency
+        card_debt: Debt of active cards by currency
+        convert_to: Also total every currency in this one
+
+    Returns:
+        Dict with by_currency, and total/currency/fx_rates_as_of when converted
+    """
+    by_currency = dict(account_totals)
+    for currency, debt in card_debt.items():
+        by_currency[currency] = by_currency.get(currency, 0.0) - debt
+    net_worth = {
+        'by_currency': {currency: round(amount, 2) for currency, amount in sorted(by_currency.items())},
+        'currency': None,
+        'total': None,
+        'fx_rates_as_of': None
+    }
+    if convert_to:
+        fx_table = get_rate_table()
+        net_worth.update(currency=convert_to, total=convert_totals(by_currency, convert_to, fx_table),
+                         fx_rates_as_of=fx_table['as_of'])
+    return net_worth
+
+
+@require_auth
+def get_dashboard_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get the dashboard for the authenticated user
+    GET /dashboard?recent=10&convert_to=MXN
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting dashboard for user: {user_id}")
+
+        query_params = event.get('queryStringParameters') or {}
+        try:
+            recent = int(query_params.get('recent', DEFAULT_RECENT_TRANSACTIONS))
+        except ValueError:
+            return create_response(400, {"error": "recent must be an integer"})
+        if not 0 <= recent <= MAX_RECENT_TRANSACTIONS:
+            return create_response(400, {"error": f"recent must be between 0 and {MAX_RECENT_TRANSACTIONS}"})
+        try:
+            convert_to = parse_target_currency(query_params.get('convert_to'))
+        except ValueError as e:
+            return create_response(400, {"error": str(e)})
+
+        # Answer conditional GETs from the user's data version
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        now = datetime.now()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+        items = db_client.query_user_partition(user_id, sk_prefixes=DASHBOARD_SK_PREFIXES)
+        parts = split_partition(items, month_start, now.isoformat())
+
+        recent_transactions = heapq.nlargest(
+            recent,
+            parts['transactions'],
+            key=lambda t: (t.get('transaction_date', ''), t.get('created_at', ''))
+        )
+
+        accounts = build_account_list(parts['accounts'], convert_to)
+        cards = build_card_list(parts['cards'])
+        month_label = now.strftime('%Y-%m')
+        if convert_to:
+            summary = summarize_in_currency(parts['month_transactions'], month_label,
+                                            parts['currency_by_account'], convert_to)
+        else:
+            summary = summarize_transactions(parts['month_transactions'], month_label)
+
+        response_data = {
+            'accounts': accounts.model_dump(),
+            'cards': cards.model_dump(),
+            'net_worth': build_net_worth(accounts.total_balance_by_currency, cards.total_debt_by_currency,
+                                         convert_to),
+            'recent_transactions': [
+                build_transaction_response(t).model_dump() for t in recent_transactions
+            ],
+            'summary': summary.model_dump()
+        }
+
+        return create_response(200, response_data, {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting dashboard: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+def build_subscription_list(items: list) -> SubscriptionListResponse:
+    """Convert stored SUBSCRIPTION# items to the list response"""
+    subscriptions = [
+        SubscriptionResponse(**{
+            **item,
+            'average_amount': float(item['average_amount']),
+            'last_amount': float(item['last_amount']),
+            'occurrences': int(item['occurrences']),
+            'interval_mean_days': float(item['interval_mean_days']),
+            'interval_stddev_days': float(item['interval_stddev_days'])
+        })
+        for item in items
+    ]
+    subscriptions.sort(key=lambda sub: (not sub.is_active, -sub.average_amount * MONTHLY_FACTORS[sub.frequency]))
+
+    monthly_totals: Dict[str, float] = {}
+    for sub in subscriptions:
+        if sub.is_active:
+            monthly = sub.average_amount * MONTHLY_FACTORS[sub.frequency]
+            monthly_totals[sub.currency] = round(monthly_totals.get(sub.currency, 0.0) + monthly, 2)
+
+    return SubscriptionListResponse(
+        subscriptions=subscriptions,
+        total_count=len(subscriptions),
+        monthly_totals=monthly_totals,
+        analyzed_at=max((sub.detected_at for sub in subscriptions), default=None)
+    )
+
+
+@require_auth
+def get_subscriptions_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get the recurring payments detected in the user's history
+    GET /subscriptions
+
+    Reads the SUBSCRIPTION# items stored by the detect_subscriptions job;
+    the ledger itself is not read.
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting subscriptions for user: {user_id}")
+
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        response_data = build_subscription_list(db_client.list_subscriptions(user_id))
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting subscriptions: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def get_forecast_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Project the user's balances for the next days
+    GET /forecast?days=90
+
+    The forecast is cached per container under the ETag, which changes with
+    the data version and the date, so repeated views do not recompute it.
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting forecast for user: {user_id}")
+
+        query_params = event.get('queryStringParameters') or {}
+        try:
+            days = int(query_params.get('days', DEFAULT_FORECAST_DAYS))
+        except ValueError:
+            return create_response(400, {"error": "days must be an integer"})
+        if not 1 <= days <= MAX_FORECAST_DAYS:
+            return create_response(400, {"error": f"days must be between 1 and {MAX_FORECAST_DAYS}"})
+
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        response_data = get_cached_forecast(etag)
+        if response_data is None:
+            response_data = ForecastResponse(**build_forecast(db_client, user_id, days)).model_dump()
+            cache_forecast(etag, response_data)
+
+        return create_response(200, response_data, {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting forecast: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def get_net_worth_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get the user's daily net-worth snapshots
+    GET /net-worth?date_from=2024-10-01&date_to=2025-10-01&convert_to=MXN
+
+    One sort key range query over the NETWORTH#{date} items written by the
+    net_worth_snapshot job (default: the last year).
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting net-worth history for user: {user_id}")
+
+        query_params = event.get('queryStringParameters') or {}
+        try:
+            date_to = date.fromisoformat(query_params['date_to']) if query_params.get('date_to') else date.today()
+            date_from = (date.fromisoformat(query_params['date_from']) if query_params.get('date_from')
+                         else date_to - timedelta(days=DEFAULT_NETWORTH_DAYS))
+            convert_to = parse_target_currency(query_params.get('convert_to'))
+        except ValueError as e:
+            return create_response(400, {"error": str(e)})
+        if date_from > date_to:
+            return create_response(400, {"error": "date_from must not be after date_to"})
+        if (date_to - date_from).days > MAX_NETWORTH_DAYS:
+            return create_response(400, {"error": f"The range cannot exceed {MAX_NETWORTH_DAYS} days"})
+
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        snapshots = db_client.list_net_worth_snapshots(user_id, date_from.isoformat(), date_to.isoformat())
+        fx_table = get_rate_table() if convert_to else None
+        series = snapshot_series(snapshots, convert_to, fx_table)
+        response_data = NetWorthHistoryResponse(
+            date_from=date_from.isoformat(),
+            date_to=date_to.isoformat(),
+            snapshots=series,
+            count=len(series),
+            currency=convert_to,
+            fx_rates_as_of=fx_table['as_of'] if fx_table else None
+        )
+
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting net-worth history: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+def month_offset(period: str, months: int) -> str:
+    """YYYY-MM of the month a number of months after (or before) period"""
+    year, month = divmod(int(period[:4]) * 12 + int(period[5:7]) - 1 + months, 12)
+    return f'{year:04d}-{month + 1:02d}'
+
+
+def parse_period(value: str) -> str:
+    """Validate a YYYY-MM query parameter"""
+    try:
+        datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM")
+    return value
+
+
+@require_auth
+def get_spending_distribution_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get the distribution of expense amounts of a category
+    GET /spending?category=groceries&period_from=2025-01&period_to=2025-10&currency=MXN
+
+    Merges the monthly SPENDDIST# items of the range, so the cost is one
+    small item per month rather than the category's transactions.
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting spending distribution for user: {user_id}")
+
+        query_params = event.get('queryStringParameters') or {}
+        category = query_params.get('category')
+        if category and category not in get_args(TransactionCategory):
+            return create_response(400, {"error": f"Invalid category '{category}'"})
+        currency = query_params.get('currency', 'MXN').upper()
+        try:
+            period_to = parse_period(query_params.get('period_to') or datetime.now().strftime('%Y-%m'))
+            period_from = parse_period(query_params.get('period_from')
+                                       or month_offset(period_to, 1 - DEFAULT_SPENDING_MONTHS))
+        except ValueError as e:
+            return create_response(400, {"error": str(e)})
+        if period_from > period_to:
+            return create_response(400, {"error": "period_from must not be after period_to"})
+
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        items = db_client.list_spend_distributions(user_id, currency, category, period_from, period_to)
+        response_data = SpendingDistributionResponse(
+            category=category,
+            currency=currency,
+            period_from=period_from,
+            period_to=period_to,
+            months=len(items),
+            **describe_distribution(items)
+        )
+
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting spending distribution: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+@require_auth
+def get_alerts_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
+    """
+    Get the transactions flagged as unusual when they were written
+    GET /alerts?date_from=2025-09-01&date_to=2025-10-31&limit=50
+
+    Reads the sparse ALERT# index, which holds only the flagged transactions.
+    """
+    try:
+        user_id = user_data.user_id
+        logger.info(f"Getting alerts for user: {user_id}")
+
+        query_params = event.get('queryStringParameters') or {}
+        try:
+            limit = int(query_params.get('limit', DEFAULT_ALERTS))
+            date_from = date.fromisoformat(query_params['date_from']) if query_params.get('date_from') else None
+            date_to = date.fromisoformat(query_params['date_to']) if query_params.get('date_to') else None
+        except ValueError:
+            return create_response(400, {"error": "limit must be an integer and dates YYYY-MM-DD"})
+        if not 1 <= limit <= MAX_ALERTS:
+            return create_response(400, {"error": f"limit must be between 1 and {MAX_ALERTS}"})
+        if date_from and date_to and date_from > date_to:
+            return create_response(400, {"error": "date_from must not be after date_to"})
+
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+
+        range_kwargs = {}
+        if date_from:
+            range_kwargs['date_from'] = date_from.isoformat()
+        if date_to:
+            range_kwargs['date_to'] = date_to.isoformat()
+        alerts = db_client.list_alerts(user_id, limit=limit, **range_kwargs)
+        response_data = AlertListResponse(
+            alerts=[build_transaction_response(alert) for alert in alerts],
+            count=len(alerts),
+            date_from=range_kwargs.get('date_from'),
+            date_to=range_kwargs.get('date_to')
+        )
+
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
+
+    except Exception as e:
+        logger.error(f"Error getting alerts: {e}")
+        return create_response(500, {"error": "Internal server error"})
+
+
+router = Router(globals())
+router.add('GET', '/dashboard', 'get_dashboard_handler')
+router.add('GET', '/subscriptions', 'get_subscriptions_handler')
+router.add('GET', '/forecast', 'get_forecast_handler')
+router.add('GET', '/net-worth', 'get_net_worth_handler')
+router.add('GET', '/spending', 'get_spending_distribution_handler')
+router.add('GET', '/alerts', 'get_alerts_handler')
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Main Lambda handler for the dashboard API
+    """
+    try:
+        response = router.dispatch(event, context)
+        if response is None:
+            logger.warning(f"Route not found: {event.get('httpMethod')} {event.get('path')}")
+            return create_response(404, {"error": "Endpoint not found"})
+        return response
+
+    except Exception as e:
+        logger.error(f"Unhandled error in dashboard lambda_handler: {e}")
+        return create_response(500, {"error": "Internal server error"})
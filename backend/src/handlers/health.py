@@ -1,94 +1,40 @@
 """
 Health check handler with dependency verification
+Dependency versions are read from installed package metadata instead of
+importing the packages, so the health route stays cheap on cold starts
 """
 
 import json
 import logging
-import sys
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Any
 
 # Configure logging
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
 
-def lambda_handler(event: Dict[str, Any], context) -> Dict[str, Any]:
-    """
-    Health check endpoint with dependency verification
+# Distributions reported by the health check
+DEPENDENCIES = ("pydantic", "boto3", "bcrypt", "PyJWT", "email-validator")
+
+
+@lru_cache(maxsize=1)
+def get_dependency_versions() -> Dict[str, str]:
     """
-    logger.info("Health check initiated")
+    Get installed versions of critical dependencies without importing them
     
-    health_status = {
-        "status": "healthy",
-        "timestamp": context.aws_request_id if context else "local",
-        "dependencies": {},
-        "python_info": {
-            "version": sys.version,
-            "path": sys.path[:3],  # First 3 paths to avoid too much data
-            "lambda_layer_paths": [path for path in sys.path if '/opt/' in path]  # Show Lambda layer paths
-        }
-    }
-    
-    # Test critical dependencies
-    dependencies_to_test = [
-        ("pydantic", "pydantic"),
-        ("boto3", "boto3"),
-        ("fastapi", "fastapi"),
-        ("bcrypt", "bcrypt"),
-    ]
+    Returns:
+        Mapping of distribution name to version (or "missing")
+    """
+    from importlib import metadata
     
-    for dep_name, import_name in dependencies_to_test:
+    versions = {}
+    for name in DEPENDENCIES:
         try:
-            module = __import__(import_name)
-            version = getattr(module, '__version__', 'unknown')
-            health_status["dependencies"][dep_name] = {
-                "status": "✅ available",
-                "version": version
-            }
-            logger.info(f"✅ {dep_name} v{version} imported successfully")
-        except ImportError as e:
-            health_status["dependencies"][dep_name] = {
-                "status": "❌ missing",
-                "error": str(e)
-            }
-            health_status["status"] = "degraded"
-            logger.error(f"❌ Failed to import {dep_name}: {e}")
-    
-    # Test local imports
-    try:
-        from utils.responses import create_response
-        from utils.dynamodb_client import DynamoDBClient
-        health_status["local_imports"] = "✅ successful"
-        logger.info("✅ Local imports successful")
-    except ImportError as e:
-        health_status["local_imports"] = f"❌ failed: {str(e)}"
-        health_status["status"] = "unhealthy"
-        logger.error(f"❌ Local import failed: {e}")
-    
-    # Return appropriate response
-    try:
-        from utils.responses import create_response
-        return create_response(200, health_status)
-    except ImportError:
-        # Fallback response if utils.responses is not available
-        return {
-            'statusCode': 200,
-            'body': json.dumps(health_status),
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            }
-        }
-
-import json
-import logging
-from datetime import datetime, timezone
-from typing import Dict, Any
-
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = "missing"
+    return versions
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -110,7 +56,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "message": "Finance Tracker API is running",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "version": "1.0.0",
-            "environment": "dev"  # TODO: Get from environment variables
+            "environment": "dev",  # TODO: Get from environment variables
+            "dependencies": get_dependency_versions()
         }
         
         return {
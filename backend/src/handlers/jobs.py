@@ -0,0 +1,286 @@
+"""
+Background jobs for AWS Lambda
+Invoked asynchronously (or manually with `aws lambda invoke`), not through API Gateway
+"""
+
+import logging
+import time
+from datetime import date, timedelta
+from typing import Dict, Any
+
+from utils.dynamodb_client import DynamoDBClient
+from utils.accrual import run_accrual
+from utils.budgets import rebuild_all_budgets, rebuild_budgets
+from utils.cascade import run_cascade, CascadeError
+from utils.net_worth import snapshot_net_worth
+from utils.spend_distribution import rebuild_spend_distributions
+from utils.reconciliation import (
+    RECONCILE_SCAN_SEGMENTS,
+    reconcile_accounts,
+    scan_accounts
+)
+from utils.recurring import run_recurring
+from utils.reminders import send_payment_reminders
+from utils.statements import close_due_statements, close_statement
+from utils.subscriptions import detect_all_subscriptions, detect_subscriptions
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Time kept free before the Lambda timeout to finish in-flight accounts
+RECONCILE_SAFETY_MARGIN_SECONDS = 60
+
+
+def cascade_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Export and/or delete a user's, an account's or a card's items
+
+    Event:
+        {"action": "cascade", "scope": "user" | "account" | "card", "user_id": "...",
+         "account_id": "...", "card_id": "...", "export": false}
+        {"action": "export", "user_id": "..."}  -- export only, nothing deleted
+    """
+    export_only = event.get('action') == 'export'
+    return run_cascade(
+        DynamoDBClient(),
+        scope=event.get('scope', 'user'),
+        user_id=event['user_id'],
+        account_id=event.get('account_id'),
+        export=export_only or bool(event.get('export')),
+        delete=not export_only,
+        card_id=event.get('card_id')
+    )
+
+
+def reconcile_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Recompute ledger balances and report (or repair) drift
+
+    Event:
+        {"action": "reconcile", "user_id": "...", "account_id": "...",
+         "repair": false, "segments": 4}
+        Without user_id every account is reconciled through a parallel scan;
+        no new account is started once the invocation is close to its timeout.
+    """
+    db_client = DynamoDBClient()
+    user_id = event.get('user_id')
+
+    if event.get('account_id'):
+        account = db_client.get_account_by_id(user_id, event['account_id']) if user_id else None
+        if not account:
+            raise ValueError(f"Account not found: {event['account_id']}")
+        accounts = [account]
+    elif user_id:
+        accounts = db_client.list_user_accounts(user_id, include_inactive=True)
+    else:
+        accounts = scan_accounts(db_client, int(event.get('segments', RECONCILE_SCAN_SEGMENTS)))
+
+    deadline = None
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        remaining = context.get_remaining_time_in_millis() / 1000 - RECONCILE_SAFETY_MARGIN_SECONDS
+        deadline = time.monotonic() + max(remaining, 0)
+
+    return reconcile_accounts(db_client, accounts, repair=bool(event.get('repair')), deadline=deadline)
+
+
+def index_users_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Backfill the sparse ENTITY#user index for users created before it existed
+
+    Event:
+        {"action": "index_users", "segments": 4}
+    """
+    db_client = DynamoDBClient()
+    users = db_client.parallel_scan(
+        segments=int(event.get('segments', RECONCILE_SCAN_SEGMENTS)),
+        filter_expression='entity_type = :type AND is_active = :active AND attribute_not_exists(gsi2_pk)',
+        expression_values={':type': 'user', ':active': True},
+        projection=['user_id', 'created_at']
+    )
+    indexed = sum(1 for user in users if db_client.index_user(user['user_id'], user['created_at']))
+    logger.info(f"Indexed {indexed} users")
+    return {'indexed': indexed}
+
+
+def close_statements_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Close the billing cycles whose cut-off has passed
+
+    Event:
+        {"action": "close_statements", "date": "2025-10-15"}
+        Cards whose cut-off was on date (default: yesterday) get their statement.
+        {"action": "close_statements", "user_id": "...", "card_id": "...", "cycle": "2025-10"}
+        Closes one card cycle (backfills).
+    """
+    db_client = DynamoDBClient()
+
+    if event.get('card_id'):
+        card = db_client.get_card_by_id(event['user_id'], event['card_id'])
+        if not card:
+            raise ValueError(f"Card not found: {event['card_id']}")
+        statement, created = close_statement(db_client, card, event['cycle'])
+        return {'created': created, 'statement_balance': float(statement['statement_balance']),
+                'minimum_payment': float(statement['minimum_payment'])}
+
+    on = date.fromisoformat(event['date']) if event.get('date') else date.today() - timedelta(days=1)
+    return close_due_statements(db_client, on)
+
+
+def index_cards_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Backfill the sparse CUTOFF#{dd} and DUE#{dd} indexes for cards created before them
+
+    Event:
+        {"action": "index_cards", "segments": 4}
+    """
+    db_client = DynamoDBClient()
+    cards = db_client.parallel_scan(
+        segments=int(event.get('segments', RECONCILE_SCAN_SEGMENTS)),
+        filter_expression=(
+            'entity_type = :type AND #status = :active AND ('
+            '(attribute_exists(cut_off_date) AND attribute_not_exists(gsi2_pk)) OR '
+            '(attribute_exists(payment_due_date) AND attribute_not_exists(gsi3_pk)))'
+        ),
+        expression_values={':type': 'card', ':active': 'active'},
+        expression_names={'#status': 'status'}
+    )
+    indexed = sum(1 for card in cards if db_client._sync_card_indexes(card) is not card)
+    logger.info(f"Indexed {indexed} cards")
+    return {'indexed': indexed}
+
+
+def accrue_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Post interest and annual fees for the cycles closed on a date
+
+    Event:
+        {"action": "accrue", "date": "2025-10-15", "batch_size": 25}
+        Runs after close_statements for the same date (default: yesterday);
+        re-running a date never charges a card twice.
+    """
+    on = date.fromisoformat(event['date']) if event.get('date') else date.today() - timedelta(days=1)
+    return run_accrual(DynamoDBClient(), on, batch_size=event.get('batch_size'))
+
+
+def payment_reminders_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Publish reminders for the cards whose payment is due soon
+
+    Event:
+        {"action": "payment_reminders", "date": "2025-10-01", "days_ahead": [3, 1]}
+        Reads only the DUE#{dd} index partitions of the reminder dates.
+    """
+    today = date.fromisoformat(event['date']) if event.get('date') else None
+    days_ahead = [int(days) for days in event['days_ahead']] if event.get('days_ahead') else None
+    return send_payment_reminders(DynamoDBClient(), today=today, days_ahead=days_ahead)
+
+
+def recurring_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Materialize the recurring transactions due since the previous run
+
+    Event:
+        {"action": "recurring", "date": "2025-10-01"}
+        Reads the RECUR#{date} index from the day after the last run up to
+        date (default: today), so missed days are caught up.
+    """
+    today = date.fromisoformat(event['date']) if event.get('date') else None
+    return run_recurring(DynamoDBClient(), today=today)
+
+
+def detect_subscriptions_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Detect recurring payments and store them as SUBSCRIPTION# items
+
+    Event:
+        {"action": "detect_subscriptions", "user_id": "...", "date": "2025-10-01"}
+        Without user_id every active user of the ENTITY#user index is analyzed.
+    """
+    db_client = DynamoDBClient()
+    today = date.fromisoformat(event['date']) if event.get('date') else None
+    if event.get('user_id'):
+        return detect_subscriptions(db_client, event['user_id'], today=today)
+    return detect_all_subscriptions(db_client, today=today)
+
+
+def rebuild_budgets_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Recompute budget spent counters from the transaction history
+
+    Event:
+        {"action": "rebuild_budgets", "user_id": "...", "period": "2025-10"}
+        Run after changing which transactions count against a budget, or to
+        repair counters; without user_id every active user is rebuilt.
+    """
+    db_client = DynamoDBClient()
+    period = event.get('period')
+    if event.get('user_id'):
+        return rebuild_budgets(db_client, event['user_id'], period)
+    return rebuild_all_budgets(db_client, period)
+
+
+def net_worth_snapshot_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Store each user's NETWORTH#{date} snapshot
+
+    Event:
+        {"action": "net_worth_snapshot", "date": "2025-10-01", "user_id": "..."}
+        Without user_id every active user is snapshotted; re-running a date
+        overwrites its snapshots.
+    """
+    snapshot_date = date.fromisoformat(event['date']) if event.get('date') else None
+    user_ids = [event['user_id']] if event.get('user_id') else None
+    return snapshot_net_worth(DynamoDBClient(), snapshot_date, user_ids=user_ids)
+
+
+def rebuild_spend_distributions_job(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+    """
+    Recompute a user's SPENDDIST# items from the transaction history
+
+    Event:
+        {"action": "rebuild_spend_distributions", "user_id": "..."}
+        Backfills history recorded before the distributions existed, or
+        after changing the sketch accuracy.
+    """
+    return rebuild_spend_distributions(DynamoDBClient(), event['user_id'])
+
+
+JOBS = {
+    'cascade': cascade_job,
+    'export': cascade_job,
+    'reconcile': reconcile_job,
+    'index_users': index_users_job,
+    'close_statements': close_statements_job,
+    'index_cards': index_cards_job,
+    'accrue': accrue_job,
+    'payment_reminders': payment_reminders_job,
+    'recurring': recurring_job,
+    'detect_subscriptions': detect_subscriptions_job,
+    'rebuild_budgets': rebuild_budgets_job,
+    'net_worth_snapshot': net_worth_snapshot_job,
+    'rebuild_spend_distributions': rebuild_spend_distributions_job,
+}
+
+
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Main Lambda handler for background jobs
+    Dispatches on event['action']
+    """
+    action = event.get('action')
+    job = JOBS.get(action)
+    if job is None:
+        logger.error(f"Unknown job action: {action}")
+        return {'status': 'error', 'error': f"Unknown action: {action}"}
+
+    try:
+        result = job(event, context)
+        return {'status': 'ok', 'action': action, 'result': result}
+
+    except (KeyError, ValueError) as e:
+        logger.error(f"Invalid {action} job event: {e}")
+        return {'status': 'error', 'error': f"Invalid event: {e}"}
+    except CascadeError as e:
+        # Raise so the async invocation is retried / sent to the DLQ
+        logger.error(f"Cascade job incomplete: {e}")
+        raise
@@ -5,9 +5,10 @@ Implements complete transaction CRUD and analytics using Single Table Design
 
 import json
 import logging
+import re
 import uuid
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 # Set up logging
@@ -18,12 +19,20 @@ try:
     from utils.responses import create_response
     from utils.dynamodb_client import DynamoDBClient
     from utils.jwt_auth import require_auth, TokenPayload
+    from utils.etag import check_not_modified, record_write
+    from utils.budgets import record_budget_spend
+    from utils.spend_distribution import record_spend_distribution
+    from utils.anomaly import anomaly_fields, check_transaction, record_expense_stats
+    from utils.fx import conversion_factors, convert_breakdowns, get_rate_table, parse_target_currency
+    from utils.recurring import first_run_date, template_index_date
+    from utils.router import Router
     from models.transaction import (
         TransactionCreate, 
         TransactionUpdate, 
         TransactionResponse, 
         TransactionListResponse,
         TransactionSummary,
+        MultiPeriodSummaryResponse,
         TransactionFilter
     )
     from models.account import AccountResponse
@@ -32,6 +41,23 @@ except ImportError as e:
     logger.error(f"❌ Import error: {e}")
     raise
 
+# Attribute read by each list sort option
+SORT_ATTRIBUTES = {
+    'date': 'transaction_date',
+    'amount': 'amount',
+    'description': 'description',
+    'created_at': 'created_at'
+}
+
+# Periods one multi-period summary compares at most
+MAX_SUMMARY_PERIODS = 12
+
+# Longest rolling window of ?periods=last_N_days
+MAX_SUMMARY_DAYS = 366 * 5
+
+# Attributes read for a multi-period summary
+SUMMARY_ATTRIBUTES = ['transaction_id', 'account_id', 'account_name', 'amount', 'category', 'transaction_date']
+
 def generate_transaction_id() -> str:
     """Generate a unique transaction ID"""
     return f"txn_{uuid.uuid4().hex[:12]}"
@@ -100,6 +126,11 @@ def create_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
         
         new_balance = current_balance + balance_change
         
+        # Recurring transactions are the template the recurring job materializes from
+        next_run = None
+        if transaction_data.is_recurring and transaction_data.recurring_frequency:
+            next_run = first_run_date(transaction_date, transaction_data.recurring_frequency)
+        
         # Prepare transaction data for database
         db_transaction_data = {
             'transaction_id': transaction_id,
@@ -121,10 +152,16 @@ def create_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
             'account_balance_after': new_balance,
             'is_recurring': transaction_data.is_recurring,
             'recurring_frequency': transaction_data.recurring_frequency,
+            'next_run_date': next_run,
+            'recurring_index_date': template_index_date(next_run) if next_run else None,
             'created_at': now,
             'updated_at': now
         }
         
+        # Score the expense against the running category statistics so any flags go in the same write
+        anomaly_check = check_transaction(db_client, user_id, db_transaction_data, account.get('currency', 'MXN'))
+        db_transaction_data.update(anomaly_fields(anomaly_check))
+        
         # Create the transaction
         created_transaction = db_client.create_transaction(db_transaction_data)
         
@@ -135,6 +172,12 @@ def create_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
         }
         db_client.update_account(user_id, transaction_data.account_id, update_fields)
         
+        # Count the expense against its category budget and distribution (atomic ADDs, no read)
+        record_budget_spend(db_client, user_id, created_transaction, account.get('currency', 'MXN'))
+        record_spend_distribution(db_client, user_id, created_transaction, account.get('currency', 'MXN'))
+        record_expense_stats(db_client, user_id, created_transaction, account.get('currency', 'MXN'),
+                             anomaly_check['stats_item'])
+        
         # If it's a transfer, create the corresponding transaction in destination account
         if (transaction_data.transaction_type == 'transfer' and 
             transaction_data.destination_account_id and 
@@ -179,6 +222,8 @@ def create_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
             }
             db_client.update_account(user_id, transaction_data.destination_account_id, dest_update_fields)
         
+        record_write(db_client, user_id)
+        
         # Prepare response
         response_data = TransactionResponse(
             transaction_id=created_transaction['transaction_id'],
@@ -198,6 +243,8 @@ def create_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
             destination_account_id=created_transaction.get('destination_account_id'),
             destination_account_name=created_transaction.get('destination_account_name'),
             account_balance_after=created_transaction['account_balance_after'],
+            anomaly_flags=created_transaction.get('anomaly_flags'),
+            anomaly_score=created_transaction.get('anomaly_score'),
             created_at=created_transaction['created_at'],
             updated_at=created_transaction['updated_at']
         )
@@ -217,6 +264,32 @@ def create_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
         logger.error(f"Error creating transaction: {e}")
         return create_response(500, {"error": "Internal server error"})
 
+def build_transaction_response(transaction: Dict[str, Any]) -> TransactionResponse:
+    """Convert a stored transaction item to its response model"""
+    return TransactionResponse(
+        transaction_id=transaction['transaction_id'],
+        user_id=transaction['user_id'],
+        account_id=transaction['account_id'],
+        account_name=transaction['account_name'],
+        amount=transaction['amount'],
+        description=transaction['description'],
+        transaction_type=transaction['transaction_type'],
+        category=transaction['category'],
+        status=transaction['status'],
+        transaction_date=transaction['transaction_date'],
+        reference_number=transaction.get('reference_number'),
+        notes=transaction.get('notes'),
+        tags=transaction.get('tags', []),
+        location=transaction.get('location'),
+        destination_account_id=transaction.get('destination_account_id'),
+        destination_account_name=transaction.get('destination_account_name'),
+        account_balance_after=transaction['account_balance_after'],
+        anomaly_flags=transaction.get('anomaly_flags'),
+        anomaly_score=transaction.get('anomaly_score'),
+        created_at=transaction['created_at'],
+        updated_at=transaction['updated_at']
+    )
+
 @require_auth
 def list_transactions_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
@@ -259,7 +332,15 @@ def list_transactions_handler(event: Dict[str, Any], context: Any, user_data: To
         if filter_data.tags:
             filters['tags'] = filter_data.tags
         
-        transactions = db_client.list_user_transactions(user_id, filters)
+        # Sparse fieldsets: read only requested attributes plus those needed
+        # for sorting and the income/expense totals
+        projection = None
+        if filter_data.fields:
+            projection = filter_data.fields + [
+                SORT_ATTRIBUTES[filter_data.sort_by], 'amount', 'transaction_type'
+            ]
+        
+        transactions = db_client.list_user_transactions(user_id, filters, projection=projection)
         
         # Apply sorting
         if filter_data.sort_by == 'date':
@@ -306,31 +387,30 @@ def list_transactions_handler(event: Dict[str, Any], context: Any, user_data: To
         end_idx = start_idx + filter_data.per_page
         paginated_transactions = transactions[start_idx:end_idx]
         
+        # Sparse fieldsets skip the full response model and emit only requested keys
+        # (null when the stored item lacks one; every optional field defaults to None)
+        if filter_data.fields:
+            response_data = TransactionListResponse(
+                transactions=[],
+                total_count=total_count,
+                page=filter_data.page,
+                per_page=filter_data.per_page,
+                total_pages=total_pages,
+                total_income=round(total_income, 2),
+                total_expenses=round(total_expenses, 2),
+                net_amount=round(net_amount, 2)
+            ).model_dump()
+            response_data['transactions'] = [
+                {
+                    field: transaction.get(field)
+                    for field in filter_data.fields
+                }
+                for transaction in paginated_transactions
+            ]
+            return create_response(200, response_data, event=event)
+        
         # Convert to response models
-        transaction_responses = []
-        for transaction in paginated_transactions:
-            response = TransactionResponse(
-                transaction_id=transaction['transaction_id'],
-                user_id=transaction['user_id'],
-                account_id=transaction['account_id'],
-                account_name=transaction['account_name'],
-                amount=transaction['amount'],
-                description=transaction['description'],
-                transaction_type=transaction['transaction_type'],
-                category=transaction['category'],
-                status=transaction['status'],
-                transaction_date=transaction['transaction_date'],
-                reference_number=transaction.get('reference_number'),
-                notes=transaction.get('notes'),
-                tags=transaction.get('tags', []),
-                location=transaction.get('location'),
-                destination_account_id=transaction.get('destination_account_id'),
-                destination_account_name=transaction.get('destination_account_name'),
-                account_balance_after=transaction['account_balance_after'],
-                created_at=transaction['created_at'],
-                updated_at=transaction['updated_at']
-            )
-            transaction_responses.append(response)
+        transaction_responses = [build_transaction_response(t) for t in paginated_transactions]
         
         # Prepare response
         response_data = TransactionListResponse(
@@ -344,7 +424,7 @@ def list_transactions_handler(event: Dict[str, Any], context: Any, user_data: To
             net_amount=round(net_amount, 2)
         )
         
-        return create_response(200, response_data.model_dump())
+        return create_response(200, response_data.model_dump(), event=event)
         
     except ValueError as e:
         logger.error(f"Validation error: {e}")
@@ -448,6 +528,19 @@ def update_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
         # Update transaction
         updated_transaction = db_client.update_transaction(user_id, transaction_id, allowed_updates)
         
+        # A new category moves the expense between budgets and distributions
+        if updated_transaction['category'] != existing_transaction['category']:
+            account = db_client.get_account_by_id(user_id, existing_transaction['account_id'])
+            currency = account.get('currency', 'MXN') if account else 'MXN'
+            record_budget_spend(db_client, user_id, existing_transaction, currency, reverse=True)
+            record_budget_spend(db_client, user_id, updated_transaction, currency)
+            record_spend_distribution(db_client, user_id, existing_transaction, currency, reverse=True)
+            record_spend_distribution(db_client, user_id, updated_transaction, currency)
+            record_expense_stats(db_client, user_id, existing_transaction, currency, reverse=True)
+            record_expense_stats(db_client, user_id, updated_transaction, currency)
+        
+        record_write(db_client, user_id)
+        
         # Convert to response model
         response_data = TransactionResponse(
             transaction_id=updated_transaction['transaction_id'],
@@ -541,6 +634,11 @@ def delete_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
         if not success:
             return create_response(404, {"error": "Transaction not found"})
         
+        record_budget_spend(db_client, user_id, transaction, account.get('currency', 'MXN'), reverse=True)
+        record_spend_distribution(db_client, user_id, transaction, account.get('currency', 'MXN'), reverse=True)
+        record_expense_stats(db_client, user_id, transaction, account.get('currency', 'MXN'), reverse=True)
+        record_write(db_client, user_id)
+        
         return create_response(200, {
             "message": "Transaction deleted successfully",
             "account_balance_after_deletion": new_balance
@@ -553,20 +651,288 @@ def delete_transaction_handler(event: Dict[str, Any], context: Any, user_data: T
         logger.error(f"Error deleting transaction: {e}")
         return create_response(500, {"error": "Internal server error"})
 
+def summarize_transactions(transactions: list, period_label: str) -> TransactionSummary:
+    """
+    Aggregate income, expenses, categories and per-account activity
+    """
+    # Calculate summary metrics
+    total_income = 0.0
+    total_expenses = 0.0
+    income_by_category = {}
+    expenses_by_category = {}
+    activity_by_account = {}
+    
+    for transaction in transactions:
+        amount = transaction['amount']
+        category = transaction['category']
+        account_name = transaction['account_name']
+        account_id_key = transaction['account_id']
+        
+        # Initialize account activity tracking
+        if account_id_key not in activity_by_account:
+            activity_by_account[account_id_key] = {
+                'account_name': account_name,
+                'total_income': 0.0,
+                'total_expenses': 0.0,
+                'transaction_count': 0,
+                'net_amount': 0.0
+            }
+        
+        activity_by_account[account_id_key]['transaction_count'] += 1
+        
+        if amount > 0:
+            # Income
+            total_income += amount
+            activity_by_account[account_id_key]['total_income'] += amount
+            
+            if category in income_by_category:
+                income_by_category[category] += amount
+            else:
+                income_by_category[category] = amount
+        else:
+            # Expense
+            expense_amount = abs(amount)
+            total_expenses += expense_amount
+            activity_by_account[account_id_key]['total_expenses'] += expense_amount
+            
+            if category in expenses_by_category:
+                expenses_by_category[category] += expense_amount
+            else:
+                expenses_by_category[category] = expense_amount
+        
+        # Calculate net for account
+        activity_by_account[account_id_key]['net_amount'] = (
+            activity_by_account[account_id_key]['total_income'] - 
+            activity_by_account[account_id_key]['total_expenses']
+        )
+    
+    # Round all values
+    total_income = round(total_income, 2)
+    total_expenses = round(total_expenses, 2)
+    net_amount = round(total_income - total_expenses, 2)
+    
+    # Round category totals
+    for category in income_by_category:
+        income_by_category[category] = round(income_by_category[category], 2)
+    for category in expenses_by_category:
+        expenses_by_category[category] = round(expenses_by_category[category], 2)
+    
+    # Round account activity
+    for account_id_key in activity_by_account:
+        activity_by_account[account_id_key]['total_income'] = round(activity_by_account[account_id_key]['total_income'], 2)
+        activity_by_account[account_id_key]['total_expenses'] = round(activity_by_account[account_id_key]['total_expenses'], 2)
+        activity_by_account[account_id_key]['net_amount'] = round(activity_by_account[account_id_key]['net_amount'], 2)
+    
+    # Prepare response
+    return TransactionSummary(
+        period=period_label,
+        total_income=total_income,
+        total_expenses=total_expenses,
+        net_amount=net_amount,
+        transaction_count=len(transactions),
+        income_by_category=income_by_category,
+        expenses_by_category=expenses_by_category,
+        activity_by_account=activity_by_account,
+        top_expense_categories=top_categories(expenses_by_category),
+        top_income_categories=top_categories(income_by_category)
+    )
+
+def top_categories(amount_by_category: Dict[str, float], limit: int = 5) -> list:
+    """
+    Largest categories of a breakdown, highest amount first
+    """
+    return sorted(
+        [{'category': k, 'amount': v} for k, v in amount_by_category.items()],
+        key=lambda x: x['amount'],
+        reverse=True
+    )[:limit]
+
+def summarize_in_currency(transactions: list, period_label: str, currency_by_account: Dict[str, str],
+                          convert_to: str) -> TransactionSummary:
+    """
+    Summary of transactions from accounts in several currencies, expressed in one
+    
+    Transactions are summarized per account currency first and only those
+    aggregates are converted, so the rate table is applied once per currency
+    instead of once per transaction.
+    
+    Args:
+        transactions: Transactions of the period
+        period_label: Period label of the summary
+        currency_by_account: Currency of each account_id
+        convert_to: Currency of the converted totals
+    
+    Returns:
+        TransactionSummary with currency and the unconverted totals_by_currency
+    """
+    groups = {}
+    for transaction in transactions:
+        currency = currency_by_account.get(transaction['account_id'], 'MXN')
+        groups.setdefault(currency, []).append(transaction)
+    summaries = {currency: summarize_transactions(group, period_label) for currency, group in groups.items()}
+    
+    fx_table = get_rate_table()
+    factors = conversion_factors(summaries, convert_to, fx_table)
+    
+    def converted(field: str) -> float:
+        return round(sum(float(getattr(summary, field)) * factors[currency]
+                         for currency, summary in summaries.items()), 2)
+    
+    activity_by_account = {}
+    for currency, summary in summaries.items():
+        for account_id_key, activity in summary.activity_by_account.items():
+            activity_by_account[account_id_key] = {
+                **activity,
+                **{key: round(activity[key] * factors[currency], 2)
+                   for key in ('total_income', 'total_expenses', 'net_amount')}
+            }
+    
+    income_by_category = convert_breakdowns(
+        {currency: summary.income_by_category for currency, summary in summaries.items()}, factors
+    )
+    expenses_by_category = convert_breakdowns(
+        {currency: summary.expenses_by_category for currency, summary in summaries.items()}, factors
+    )
+    total_income = converted('total_income')
+    total_expenses = converted('total_expenses')
+    
+    return TransactionSummary(
+        period=period_label,
+        total_income=total_income,
+        total_expenses=total_expenses,
+        net_amount=round(total_income - total_expenses, 2),
+        transaction_count=len(transactions),
+        income_by_category=income_by_category,
+        expenses_by_category=expenses_by_category,
+        activity_by_account=activity_by_account,
+        top_expense_categories=top_categories(expenses_by_category),
+        top_income_categories=top_categories(income_by_category),
+        currency=convert_to,
+        totals_by_currency={
+            currency: {
+                'total_income': float(summary.total_income),
+                'total_expenses': float(summary.total_expenses),
+                'net_amount': float(summary.net_amount)
+            }
+            for currency, summary in sorted(summaries.items())
+        },
+        fx_rates_as_of=fx_table['as_of']
+    )
+
+def summary_period_bounds(period: str, now: datetime) -> Tuple[str, str]:
+    """
+    Start (inclusive) and end (exclusive) days (YYYY-MM-DD) of one entry of ?periods=
+    
+    Accepts a month (2025-10), a year (2025) or a rolling window of days
+    ending today (last_30_days: from 30 days ago through today, at most
+    MAX_SUMMARY_DAYS days).
+    """
+    try:
+        rolling = re.fullmatch(r'last_(\d+)_days', period)
+        if re.fullmatch(r'\d{4}-\d{2}', period):
+            start = datetime.strptime(period, '%Y-%m').date()
+            end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        elif re.fullmatch(r'\d{4}', period):
+            start = datetime(int(period), 1, 1).date()
+            end = start.replace(year=start.year + 1)
+        elif rolling and 0 < int(rolling.group(1)) <= MAX_SUMMARY_DAYS:
+            end = now.date() + timedelta(days=1)
+            start = now.date() - timedelta(days=int(rolling.group(1)))
+        else:
+            raise ValueError(period)
+    except ValueError:
+        raise ValueError(f"Invalid period '{period}': use YYYY-MM, YYYY or last_N_days "
+                         f"(N up to {MAX_SUMMARY_DAYS})")
+    return start.isoformat(), end.isoformat()
+
+def bucket_by_period(transactions: list, bounds: Dict[str, Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Put each transaction in every period containing its date, in one pass
+    
+    Dates are compared by day, so date-only and full ISO timestamps land in
+    the same period.
+    
+    Args:
+        transactions: Transactions read once for the whole set of periods
+        bounds: Start (inclusive) and end (exclusive) day of each period label
+    
+    Returns:
+        Transactions by period label, in the order of bounds
+    """
+    buckets = {label: [] for label in bounds}
+    for transaction in transactions:
+        transaction_date = transaction['transaction_date'][:10]
+        for label, (start, end) in bounds.items():
+            if start <= transaction_date < end:
+                buckets[label].append(transaction)
+    return buckets
+
+def summarize_periods(db_client, user_id: str, periods: List[str], account_id: Optional[str] = None,
+                      convert_to: Optional[str] = None) -> MultiPeriodSummaryResponse:
+    """
+    Summaries of several periods from a single read of the transactions
+    
+    The transactions between the earliest start and the latest end are read
+    once (only the attributes the summary uses) and bucketed into every
+    matching period, so comparing this month, last month and the same month
+    last year costs one query instead of three.
+    """
+    now = datetime.now()
+    bounds = {period: summary_period_bounds(period, now) for period in periods}
+    filters = {
+        'date_from': min(start for start, _ in bounds.values()),
+        'date_to': max(end for _, end in bounds.values())
+    }
+    if account_id:
+        filters['account_id'] = account_id
+    transactions = db_client.list_user_transactions(user_id, filters, projection=SUMMARY_ATTRIBUTES)
+    
+    currency_by_account = {}
+    if convert_to:
+        currency_by_account = {
+            account['account_id']: account.get('currency', 'MXN')
+            for account in db_client.list_user_accounts(user_id, include_inactive=True)
+        }
+    summaries = []
+    for period, bucket in bucket_by_period(transactions, bounds).items():
+        if convert_to:
+            summaries.append(summarize_in_currency(bucket, period, currency_by_account, convert_to))
+        else:
+            summaries.append(summarize_transactions(bucket, period))
+    return MultiPeriodSummaryResponse(periods=list(bounds), summaries=summaries)
+
 @require_auth
 def get_transaction_summary_handler(event: Dict[str, Any], context: Any, user_data: TokenPayload) -> Dict[str, Any]:
     """
     Get transaction summary/analytics
-    GET /transactions/summary
+    GET /transactions/summary?convert_to=MXN
+    GET /transactions/summary?periods=2025-09,2025-10,2024-10,last_90_days
+    
+    Without convert_to amounts are added as stored, whatever their currency.
+    With periods one summary per period is returned, in the order given.
     """
     try:
         user_id = user_data.user_id
         logger.info(f"Getting transaction summary for user: {user_id}")
         
+        # Answer conditional GETs from the user's data version
+        db_client = DynamoDBClient()
+        etag, not_modified = check_not_modified(db_client, user_id, event)
+        if not_modified:
+            return not_modified
+        
         # Parse query parameters for period
         query_params = event.get('queryStringParameters') or {}
         period = query_params.get('period', 'current_month')
         account_id = query_params.get('account_id')  # Optional account filter
+        convert_to = parse_target_currency(query_params.get('convert_to'))
+        
+        if query_params.get('periods'):
+            periods = list(dict.fromkeys(p.strip() for p in query_params['periods'].split(',') if p.strip()))
+            if not 1 <= len(periods) <= MAX_SUMMARY_PERIODS:
+                return create_response(400, {"error": f"periods must list 1 to {MAX_SUMMARY_PERIODS} periods"})
+            response_data = summarize_periods(db_client, user_id, periods, account_id, convert_to)
+            return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
         
         # Calculate date range based on period
         now = datetime.now()
@@ -575,7 +941,6 @@ def get_transaction_summary_handler(event: Dict[str, Any], context: Any, user_da
             date_to = now.isoformat()
             period_label = f"{now.strftime('%Y-%m')}"
         elif period == 'last_30_days':
-            from datetime import timedelta
             date_from = (now - timedelta(days=30)).isoformat()
             date_to = now.isoformat()
             period_label = "last_30_days"
@@ -598,7 +963,6 @@ def get_transaction_summary_handler(event: Dict[str, Any], context: Any, user_da
                 return create_response(400, {"error": "date_from and date_to are required for custom period"})
         
         # Get filtered transactions
-        db_client = DynamoDBClient()
         filters = {
             'date_from': date_from,
             'date_to': date_to
@@ -609,102 +973,16 @@ def get_transaction_summary_handler(event: Dict[str, Any], context: Any, user_da
         
         transactions = db_client.list_user_transactions(user_id, filters)
         
-        # Calculate summary metrics
-        total_income = 0.0
-        total_expenses = 0.0
-        income_by_category = {}
-        expenses_by_category = {}
-        activity_by_account = {}
-        
-        for transaction in transactions:
-            amount = transaction['amount']
-            category = transaction['category']
-            account_name = transaction['account_name']
-            account_id_key = transaction['account_id']
-            
-            # Initialize account activity tracking
-            if account_id_key not in activity_by_account:
-                activity_by_account[account_id_key] = {
-                    'account_name': account_name,
-                    'total_income': 0.0,
-                    'total_expenses': 0.0,
-                    'transaction_count': 0,
-                    'net_amount': 0.0
-                }
-            
-            activity_by_account[account_id_key]['transaction_count'] += 1
-            
-            if amount > 0:
-                # Income
-                total_income += amount
-                activity_by_account[account_id_key]['total_income'] += amount
-                
-                if category in income_by_category:
-                    income_by_category[category] += amount
-                else:
-                    income_by_category[category] = amount
-            else:
-                # Expense
-                expense_amount = abs(amount)
-                total_expenses += expense_amount
-                activity_by_account[account_id_key]['total_expenses'] += expense_amount
-                
-                if category in expenses_by_category:
-                    expenses_by_category[category] += expense_amount
-                else:
-                    expenses_by_category[category] = expense_amount
-            
-            # Calculate net for account
-            activity_by_account[account_id_key]['net_amount'] = (
-                activity_by_account[account_id_key]['total_income'] - 
-                activity_by_account[account_id_key]['total_expenses']
-            )
-        
-        # Round all values
-        total_income = round(total_income, 2)
-        total_expenses = round(total_expenses, 2)
-        net_amount = round(total_income - total_expenses, 2)
-        
-        # Round category totals
-        for category in income_by_category:
-            income_by_category[category] = round(income_by_category[category], 2)
-        for category in expenses_by_category:
-            expenses_by_category[category] = round(expenses_by_category[category], 2)
-        
-        # Round account activity
-        for account_id_key in activity_by_account:
-            activity_by_account[account_id_key]['total_income'] = round(activity_by_account[account_id_key]['total_income'], 2)
-            activity_by_account[account_id_key]['total_expenses'] = round(activity_by_account[account_id_key]['total_expenses'], 2)
-            activity_by_account[account_id_key]['net_amount'] = round(activity_by_account[account_id_key]['net_amount'], 2)
-        
-        # Get top categories
-        top_expense_categories = sorted(
-            [{'category': k, 'amount': v} for k, v in expenses_by_category.items()],
-            key=lambda x: x['amount'],
-            reverse=True
-        )[:5]
-        
-        top_income_categories = sorted(
-            [{'category': k, 'amount': v} for k, v in income_by_category.items()],
-            key=lambda x: x['amount'],
-            reverse=True
-        )[:5]
+        if convert_to:
+            currency_by_account = {
+                account['account_id']: account.get('currency', 'MXN')
+                for account in db_client.list_user_accounts(user_id, include_inactive=True)
+            }
+            response_data = summarize_in_currency(transactions, period_label, currency_by_account, convert_to)
+        else:
+            response_data = summarize_transactions(transactions, period_label)
         
-        # Prepare response
-        response_data = TransactionSummary(
-            period=period_label,
-            total_income=total_income,
-            total_expenses=total_expenses,
-            net_amount=net_amount,
-            transaction_count=len(transactions),
-            income_by_category=income_by_category,
-            expenses_by_category=expenses_by_category,
-            activity_by_account=activity_by_account,
-            top_expense_categories=top_expense_categories,
-            top_income_categories=top_income_categories
-        )
-        
-        return create_response(200, response_data.model_dump())
+        return create_response(200, response_data.model_dump(), {"ETag": etag}, event=event)
         
     except ValueError as e:
         logger.error(f"Validation error: {e}")
@@ -713,36 +991,27 @@ def get_transaction_summary_handler(event: Dict[str, Any], context: Any, user_da
         logger.error(f"Error getting transaction summary: {e}")
         return create_response(500, {"error": "Internal server error"})
 
+# Routes are compiled once per container; literal /summary takes precedence over {transaction_id}
+router = Router(globals())
+router.add('POST', '/transactions', 'create_transaction_handler')
+router.add('GET', '/transactions', 'list_transactions_handler')
+router.add('GET', '/transactions/summary', 'get_transaction_summary_handler')
+router.add('GET', '/transactions/{transaction_id}', 'get_transaction_handler')
+router.add('PUT', '/transactions/{transaction_id}', 'update_transaction_handler')
+router.add('DELETE', '/transactions/{transaction_id}', 'delete_transaction_handler')
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler for transaction operations
     Routes requests to appropriate handlers based on HTTP method and path
     """
     try:
-        http_method = event['httpMethod']
-        path = event['path']
-        
-        # Remove API Gateway stage prefix if present
-        if path.startswith('/api'):
-            path = path[4:]  # Remove '/api'
-        
-        logger.info(f"Processing {http_method} {path}")
-        
-        # Route to appropriate handler
-        if path == '/transactions' and http_method == 'POST':
-            return create_transaction_handler(event, context)
-        elif path == '/transactions' and http_method == 'GET':
-            return list_transactions_handler(event, context)
-        elif path == '/transactions/summary' and http_method == 'GET':
-            return get_transaction_summary_handler(event, context)
-        elif path.startswith('/transactions/') and path.count('/') == 2 and http_method == 'GET':
-            return get_transaction_handler(event, context)
-        elif path.startswith('/transactions/') and path.count('/') == 2 and http_method == 'PUT':
-            return update_transaction_handler(event, context)
-        elif path.startswith('/transactions/') and path.count('/') == 2 and http_method == 'DELETE':
-            return delete_transaction_handler(event, context)
-        else:
+        logger.info(f"Processing {event['httpMethod']} {event['path']}")
+        
+        response = router.dispatch(event, context)
+        if response is None:
             return create_response(404, {"error": "Endpoint not found"})
+        return response
             
     except Exception as e:
         logger.error(f"Unhandled error in lambda_handler: {e}")
@@ -31,7 +31,8 @@ try:
     # Local imports with error handling
     from utils.responses import create_response, internal_server_error_response
     from utils.dynamodb_client import DynamoDBClient
-    from utils.jwt_auth import create_token_response, require_auth, validate_token_from_event
+    from utils.jwt_auth import create_token_response, require_auth, validate_token_from_event, revoke_user_tokens
+    from utils.cascade import schedule_cascade
     from models import User, UserCreate, UserUpdate, create_user_from_input
     logger.info("✅ All local imports successful")
 except ImportError as e:
@@ -203,6 +204,10 @@ def update_user_handler(user_id: str, data: Dict[str, Any], event: Dict[str, Any
         # Update the user
         updated_user = db_client.update_user(user_id, update_data)
         
+        # Tokens issued with the old password must not keep authenticating
+        if user_update.new_password:
+            revoke_user_tokens(user_id)
+        
         # Convert to User model for response (without password)
         user_response = User.from_dynamodb_item(updated_user)
         
@@ -264,6 +269,15 @@ def delete_user_handler(user_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
         updated_at = datetime.now().isoformat()
         db_client.delete_user(user_id, updated_at)
         
+        # Cached tokens of a deleted account must not keep authenticating
+        revoke_user_tokens(user_id)
+        
+        # Hard-delete the partition in the background when the cascade job is deployed
+        try:
+            schedule_cascade('user', user_id)
+        except Exception as e:
+            logger.error(f"Error scheduling cascade delete for user {user_id}: {str(e)}")
+        
         logger.info(f"User deleted successfully: {user_id}")
         return create_response(200, {
             "message": "User account deleted successfully",
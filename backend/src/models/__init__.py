@@ -1,9 +1,25 @@
 """Data Models Package"""
 
-from .user import User, UserCreate, UserUpdate, UserLogin, generate_user_id, create_user_from_input, verify_password, hash_password
-from .account import AccountCreate, AccountUpdate, AccountResponse, AccountBalance, AccountListResponse, AccountType, BankCode
+import importlib
 
-__all__ = [
-    'User', 'UserCreate', 'UserUpdate', 'UserLogin', 'generate_user_id', 'create_user_from_input', 'verify_password', 'hash_password',
-    'AccountCreate', 'AccountUpdate', 'AccountResponse', 'AccountBalance', 'AccountListResponse', 'AccountType', 'BankCode'
-]
+# Names are resolved lazily (PEP 562) so importing one model module, e.g.
+# models.account, does not load the user models (email-validator, bcrypt)
+_EXPORTS = {
+    'User': 'user', 'UserCreate': 'user', 'UserUpdate': 'user', 'UserLogin': 'user',
+    'generate_user_id': 'user', 'create_user_from_input': 'user',
+    'verify_password': 'user', 'hash_password': 'user',
+    'AccountCreate': 'account', 'AccountUpdate': 'account', 'AccountResponse': 'account',
+    'AccountBalance': 'account', 'AccountListResponse': 'account',
+    'AccountType': 'account', 'BankCode': 'account'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
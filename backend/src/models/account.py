@@ -164,3 +164,6 @@ class AccountListResponse(BaseModel):
     total_count: int = Field(..., description="Total number of accounts")
     active_count: int = Field(..., description="Number of active accounts")
     total_balance_by_currency: dict[str, float] = Field(..., description="Total balance grouped by currency")
+    converted_currency: Optional[str] = Field(None, description="Currency requested with convert_to")
+    converted_total_balance: Optional[float] = Field(None, description="Active balances converted to converted_currency")
+    fx_rates_as_of: Optional[str] = Field(None, description="Date of the FX rates used for the conversion")
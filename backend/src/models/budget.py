@@ -0,0 +1,69 @@
+"""
+Budget models for validation using Pydantic
+Monthly spending limits per transaction category
+"""
+
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+
+from models.transaction import TransactionCategory
+
+
+class BudgetCreate(BaseModel):
+    """Model for creating a budget"""
+    category: TransactionCategory = Field(..., description="Category whose expenses count against the budget")
+    amount: float = Field(..., gt=0, description="Monthly spending limit")
+    currency: str = Field(default="MXN", description="Currency of the limit; only accounts in it count")
+    alert_threshold: float = Field(default=0.8, gt=0, le=1, description="Share of the limit that raises an alert")
+
+    @field_validator('currency')
+    @classmethod
+    def validate_currency(cls, v):
+        valid_currencies = ['MXN', 'USD', 'EUR', 'CAD', 'GBP', 'JPY']
+        if v.upper() not in valid_currencies:
+            raise ValueError(f'Currency must be one of: {", ".join(valid_currencies)}')
+        return v.upper()
+
+    @field_validator('amount')
+    @classmethod
+    def validate_amount(cls, v):
+        if v > 999999999.99:
+            raise ValueError('Amount must be at most 999,999,999.99')
+        return round(v, 2)
+
+
+class BudgetUpdate(BaseModel):
+    """Model for updating a budget"""
+    amount: Optional[float] = Field(None, gt=0, description="Monthly spending limit")
+    alert_threshold: Optional[float] = Field(None, gt=0, le=1, description="Share of the limit that raises an alert")
+
+    @field_validator('amount')
+    @classmethod
+    def validate_amount(cls, v):
+        if v is not None and v > 999999999.99:
+            raise ValueError('Amount must be at most 999,999,999.99')
+        return round(v, 2) if v is not None else v
+
+
+class BudgetResponse(BaseModel):
+    """Model for budget response"""
+    category: str = Field(..., description="Budgeted category")
+    amount: float = Field(..., description="Monthly spending limit")
+    currency: str = Field(..., description="Currency of the limit")
+    period: str = Field(..., description="Month the spent counter belongs to (YYYY-MM)")
+    spent: float = Field(..., description="Expenses counted this period")
+    remaining: float = Field(..., description="Limit minus spent (negative when over budget)")
+    percent_used: float = Field(..., description="Spent as a percentage of the limit")
+    alert_threshold: float = Field(..., description="Share of the limit that raises an alert")
+    is_over_threshold: bool = Field(..., description="Spent reached the alert threshold")
+    is_over_budget: bool = Field(..., description="Spent exceeds the limit")
+    created_at: str = Field(..., description="Creation timestamp")
+    updated_at: str = Field(..., description="Last update timestamp")
+
+
+class BudgetListResponse(BaseModel):
+    """Model for listing budgets response"""
+    budgets: list[BudgetResponse] = Field(..., description="Budgets of the current period")
+    total_count: int = Field(..., description="Number of budgets")
+    over_budget_count: int = Field(..., description="Budgets whose spent exceeds the limit")
+    alerts: list[str] = Field(..., description="Categories at or over their alert threshold")
@@ -166,6 +166,9 @@ class CardResponse(BaseModel):
     description: Optional[str] = Field(None, description="Card description/notes")
     status: CardStatus = Field(..., description="Card status")
     days_until_due: Optional[int] = Field(None, description="Days until next payment due")
+    statement_balance: Optional[float] = Field(None, description="Balance of the last closed statement")
+    next_payment_due: Optional[str] = Field(None, description="Due date of the last closed statement")
+    last_statement_cycle: Optional[str] = Field(None, description="Billing cycle of the last closed statement")
     created_at: str = Field(..., description="Creation timestamp")
     updated_at: str = Field(..., description="Last update timestamp")
 
@@ -200,6 +203,29 @@ class CardPayment(BaseModel):
             raise ValueError('Payment amount must be less than 999,999,999.99')
         return round(v, 2)
 
+class CardTransactionResponse(BaseModel):
+    """Model for a stored card transaction"""
+    card_transaction_id: str = Field(..., description="Unique card transaction identifier")
+    card_id: str = Field(..., description="Associated card ID")
+    cycle: str = Field(..., description="Billing cycle (yyyy-mm) closed by the card cut-off date")
+    transaction_type: str = Field(..., description="Type of transaction")
+    amount: float = Field(..., description="Transaction amount (always positive)")
+    balance_delta: float = Field(..., description="Change applied to the card balance")
+    description: str = Field(..., description="Transaction description")
+    transaction_date: str = Field(..., description="Transaction date")
+    created_at: str = Field(..., description="Creation timestamp")
+
+class CardCycleTransactionsResponse(BaseModel):
+    """Model for the transactions of one billing cycle"""
+    card_id: str = Field(..., description="Associated card ID")
+    cycle: str = Field(..., description="Billing cycle (yyyy-mm)")
+    cycle_start: str = Field(..., description="First day of the cycle")
+    cycle_end: str = Field(..., description="Cut-off date closing the cycle")
+    transactions: list[CardTransactionResponse] = Field(..., description="Transactions in date order")
+    total_charges: float = Field(..., description="Purchases, fees and interest")
+    total_credits: float = Field(..., description="Payments, cashback and refunds")
+    net_change: float = Field(..., description="Net change of the card balance in the cycle")
+
 class CardBill(BaseModel):
     """Model for monthly card bill"""
     bill_id: str = Field(..., description="Unique bill identifier")
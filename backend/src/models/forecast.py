@@ -0,0 +1,36 @@
+"""
+Forecast models using Pydantic
+Day-by-day balance projection from recurring transactions and card payments
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
+
+
+class ForecastEvent(BaseModel):
+    """Model for a projected movement"""
+    date: str = Field(..., description="Projected date (ISO format)")
+    amount: float = Field(..., description="Signed amount (negative for outflows)")
+    description: str = Field(..., description="Recurring transaction or card")
+    source: Literal["recurring", "card_payment"] = Field(..., description="Origin of the movement")
+
+
+class CurrencyForecast(BaseModel):
+    """Model for the projection of one currency"""
+    currency: str = Field(..., description="Currency of the balances")
+    starting_balance: float = Field(..., description="Sum of the active account balances today")
+    ending_balance: float = Field(..., description="Projected balance on the last day")
+    min_balance: float = Field(..., description="Lowest projected balance")
+    min_balance_date: str = Field(..., description="First day with the lowest balance")
+    first_negative_date: Optional[str] = Field(None, description="First day the balance goes below zero")
+    daily_balances: List[float] = Field(..., description="End-of-day balance, index 0 being start_date")
+    events: List[ForecastEvent] = Field(..., description="Projected movements by date")
+
+
+class ForecastResponse(BaseModel):
+    """Model for the cash-flow forecast"""
+    start_date: str = Field(..., description="First projected day")
+    end_date: str = Field(..., description="Last projected day")
+    days: int = Field(..., description="Days projected after start_date")
+    currencies: List[CurrencyForecast] = Field(..., description="One projection per currency")
+    generated_at: str = Field(..., description="When the projection was computed")
@@ -0,0 +1,27 @@
+"""
+Net-worth models using Pydantic
+Daily NETWORTH# snapshots of account balances and card debt
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+class NetWorthSnapshot(BaseModel):
+    """Model for one day's net worth"""
+    date: str = Field(..., description="Snapshot day (YYYY-MM-DD)")
+    net_worth_by_currency: Dict[str, float] = Field(..., description="Account balances less card debt by currency")
+    assets_by_currency: Dict[str, float] = Field(..., description="Active account balances by currency")
+    liabilities_by_currency: Dict[str, float] = Field(..., description="Active card balances by currency")
+    by_account_type: Dict[str, Dict[str, float]] = Field(..., description="Amount by account type and currency (cards negative)")
+    total: Optional[float] = Field(None, description="Net worth converted to currency (convert_to)")
+
+
+class NetWorthHistoryResponse(BaseModel):
+    """Model for a net-worth series"""
+    date_from: str = Field(..., description="First day of the range")
+    date_to: str = Field(..., description="Last day of the range")
+    snapshots: List[NetWorthSnapshot] = Field(..., description="Snapshots in the range, oldest first")
+    count: int = Field(..., description="Number of snapshots")
+    currency: Optional[str] = Field(None, description="Currency of total (convert_to)")
+    fx_rates_as_of: Optional[str] = Field(None, description="Date of the FX rates used for total")
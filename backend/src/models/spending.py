@@ -0,0 +1,29 @@
+"""
+Spending distribution models using Pydantic
+Quantiles and histograms of expense amounts merged from SPENDDIST# items
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+
+class HistogramBucket(BaseModel):
+    """Model for one fixed histogram bucket"""
+    min: float = Field(..., description="Lower edge (inclusive)")
+    max: Optional[float] = Field(None, description="Upper edge (exclusive), None for the last bucket")
+    count: int = Field(..., description="Expenses in the bucket")
+
+
+class SpendingDistributionResponse(BaseModel):
+    """Model for the distribution of expense amounts over a range of months"""
+    category: Optional[str] = Field(None, description="Category, None for every category")
+    currency: str = Field(..., description="Currency of the amounts")
+    period_from: str = Field(..., description="First month (YYYY-MM)")
+    period_to: str = Field(..., description="Last month (YYYY-MM)")
+    count: int = Field(..., description="Number of expenses")
+    total: float = Field(..., description="Sum of the expenses")
+    mean: Optional[float] = Field(None, description="Average expense")
+    quantiles: Dict[str, float] = Field(..., description="Approximate quantiles (p50, p90, ...) within the sketch accuracy")
+    outlier_threshold: Optional[float] = Field(None, description="Expenses above p75 + 1.5 IQR are unusual")
+    histogram: List[HistogramBucket] = Field(..., description="Fixed-bucket histogram")
+    months: int = Field(..., description="Monthly items merged")
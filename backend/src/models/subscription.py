@@ -0,0 +1,38 @@
+"""
+Subscription models using Pydantic
+Recurring payments detected from the transaction history
+"""
+
+from pydantic import BaseModel, Field
+from typing import Dict, Optional, Literal
+
+# Periods the detector recognizes
+SubscriptionFrequency = Literal["weekly", "monthly", "yearly"]
+
+
+class SubscriptionResponse(BaseModel):
+    """Model for a detected recurring payment"""
+    subscription_id: str = Field(..., description="Hash of account, normalized description and amount band")
+    description: str = Field(..., description="Description of the latest charge")
+    account_id: str = Field(..., description="Account charged")
+    account_name: Optional[str] = Field(None, description="Account name")
+    currency: str = Field(..., description="Account currency")
+    frequency: SubscriptionFrequency = Field(..., description="Detected period")
+    average_amount: float = Field(..., description="Average charge")
+    last_amount: float = Field(..., description="Latest charge")
+    occurrences: int = Field(..., description="Charges found")
+    first_date: str = Field(..., description="Date of the first charge")
+    last_date: str = Field(..., description="Date of the latest charge")
+    next_expected_date: str = Field(..., description="Expected date of the next charge")
+    interval_mean_days: float = Field(..., description="Mean days between charges")
+    interval_stddev_days: float = Field(..., description="Standard deviation of the days between charges")
+    is_active: bool = Field(..., description="False when the last expected charge did not arrive")
+    detected_at: str = Field(..., description="When the analysis ran")
+
+
+class SubscriptionListResponse(BaseModel):
+    """Model for the subscription list"""
+    subscriptions: list[SubscriptionResponse] = Field(..., description="Active first, then by amount")
+    total_count: int = Field(..., description="Number of subscriptions")
+    monthly_totals: Dict[str, float] = Field(..., description="Active subscriptions as a monthly amount, per currency")
+    analyzed_at: Optional[str] = Field(None, description="When the history was last analyzed")
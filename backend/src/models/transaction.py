@@ -204,6 +204,9 @@ class TransactionResponse(BaseModel):
     # For recurring transactions
     is_recurring: bool = False
     recurring_frequency: Optional[str] = None
+    # Set when the anomaly detector flagged the transaction at write time
+    anomaly_flags: Optional[list[str]] = None
+    anomaly_score: Optional[float] = None
 
     @field_serializer('amount')
     def serialize_amount(self, v):
@@ -220,6 +223,13 @@ class TransactionResponse(BaseModel):
             return Decimal(str(v)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
         return v
 
+class AlertListResponse(BaseModel):
+    """Model for the transactions flagged by the anomaly detector"""
+    alerts: list[TransactionResponse] = Field(..., description="Flagged transactions, most recent first")
+    count: int = Field(..., description="Number of alerts returned")
+    date_from: Optional[str] = Field(None, description="First day of the range (YYYY-MM-DD)")
+    date_to: Optional[str] = Field(None, description="Last day of the range (YYYY-MM-DD)")
+
 class TransactionListResponse(BaseModel):
     """Model for listing transactions response"""
     transactions: list[TransactionResponse] = Field(..., description="List of transactions")
@@ -291,6 +301,15 @@ class TransactionSummary(BaseModel):
     # Top categories
     top_expense_categories: list[Dict[str, Any]] = Field(default_factory=list, description="Top expense categories")
     top_income_categories: list[Dict[str, Any]] = Field(default_factory=list, description="Top income categories")
+    # Currency conversion (convert_to)
+    currency: Optional[str] = Field(None, description="Currency of the totals when converted with convert_to")
+    totals_by_currency: Dict[str, Dict[str, float]] = Field(default_factory=dict, description="Unconverted income, expenses and net by account currency")
+    fx_rates_as_of: Optional[str] = Field(None, description="Date of the FX rates used for the conversion")
+
+class MultiPeriodSummaryResponse(BaseModel):
+    """Model for summaries of several periods computed from one read"""
+    periods: list[str] = Field(..., description="Periods requested (YYYY-MM, YYYY or last_N_days)")
+    summaries: list[TransactionSummary] = Field(..., description="One summary per period, in the order requested")
 
 class TransactionFilter(BaseModel):
     """Model for transaction filtering and search"""
@@ -308,6 +327,31 @@ class TransactionFilter(BaseModel):
     per_page: int = Field(default=50, ge=1, le=100, description="Items per page")
     sort_by: Literal["date", "amount", "description", "created_at"] = Field(default="date", description="Sort field")
     sort_order: Literal["asc", "desc"] = Field(default="desc", description="Sort order")
+    fields: Optional[list[str]] = Field(None, description="Sparse fieldset: only return these transaction fields")
+
+    @field_validator('fields', mode='before')
+    @classmethod
+    def validate_fields(cls, v):
+        if v is None:
+            return v
+        # Accept comma separated query string values (?fields=a,b,c)
+        if isinstance(v, str):
+            v = v.split(',')
+        
+        fields = []
+        for field in v:
+            field = field.strip()
+            if field and field not in fields:
+                fields.append(field)
+        
+        if not fields:
+            return None
+        
+        invalid = [f for f in fields if f not in TransactionResponse.model_fields]
+        if invalid:
+            raise ValueError(f"Invalid fields: {', '.join(invalid)}")
+        
+        return fields
 
     @field_validator('amount_min', 'amount_max', mode='before')
     @classmethod
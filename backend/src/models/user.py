@@ -6,12 +6,21 @@ Defines data structure and validations for users
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 from typing import Optional
 from datetime import datetime
+import os
 import uuid
 import re
-import bcrypt
+
+# bcrypt work factor for new hashes (library default is 12). Changing it makes
+# existing hashes get rehashed on the user's next successful login.
+# Pick a value for the auth Lambda memory size with scripts/bcrypt_cost.py
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
 
 class UserBase(BaseModel):
     """Base model for users"""
+    # EmailStr pulls in email-validator when the schema is built; defer it to
+    # first validation so handlers that never validate users skip the import
+    model_config = ConfigDict(defer_build=True)
+    
     name: str = Field(..., min_length=2, max_length=100, description="Full name of the user")
     email: EmailStr = Field(..., description="Valid email of the user")
     currency: str = Field(default="MXN", pattern="^[A-Z]{3}$", description="Currency code in ISO format (e.g: MXN, USD)")
@@ -130,6 +139,7 @@ class UserUpdate(BaseModel):
             raise ValueError("Must provide new password")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "name": "Bryan Torres Updated",
@@ -148,6 +158,7 @@ class UserLogin(BaseModel):
     password: str = Field(..., min_length=8, description="User password")
     
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "email": "bryan@example.com",
@@ -222,17 +233,20 @@ def generate_user_id() -> str:
     """
     return f"usr_{uuid.uuid4().hex[:12]}"
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Generate password hash using bcrypt
     
     Args:
         password: Plain text password
+        rounds: Work factor (defaults to BCRYPT_ROUNDS)
         
     Returns:
         str: Password hash
     """
-    salt = bcrypt.gensalt()
+    import bcrypt  # Imported on the routes that hash passwords only
+    
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -247,8 +261,38 @@ def verify_password(password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password is correct
     """
+    import bcrypt  # Imported on the routes that verify passwords only
+    
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Get the work factor stored in a bcrypt hash ($2b$<rounds>$...)
+    
+    Args:
+        hashed_password: Stored hash
+        
+    Returns:
+        int: Work factor, or None if the hash is not a bcrypt hash
+    """
+    parts = hashed_password.split('$') if hashed_password else []
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was created with a different work factor
+    
+    Args:
+        hashed_password: Stored hash
+        
+    Returns:
+        bool: True if the hash should be replaced on next successful login
+    """
+    rounds = get_hash_rounds(hashed_password)
+    return rounds is not None and rounds != BCRYPT_ROUNDS
+
 def create_user_from_input(user_data: UserCreate) -> dict:
     """
     Create user dictionary from UserCreate for storing in DynamoDB
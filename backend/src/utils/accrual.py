@@ -0,0 +1,268 @@
+"""
+Batch interest and fee accrual for credit cards
+Sweeps the cards whose cut-off was on a date through the sparse CUTOFF#{dd}
+index, computes interest (revolving balance x APR / 12) and annual fees for
+the whole batch at once and applies them with batched conditional
+TransactWriteItems, at most once per card and cycle. Cards whose statement
+was not closed yet are saved in the job state and retried by later runs
+"""
+
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Any, Iterator, List, Optional
+
+from utils.billing_cycle import billing_cycle
+from utils.etag import record_write
+from utils.statements import iter_cut_off_cards, next_cycle
+
+logger = logging.getLogger(__name__)
+
+# Cards per TransactWriteItems (up to 3 actions each, DynamoDB allows 100)
+ACCRUAL_BATCH_SIZE = min(int(os.environ.get('ACCRUAL_BATCH_SIZE', '25')), 33)
+
+# Days a card waiting for its statement keeps being retried
+ACCRUAL_PENDING_DAYS = int(os.environ.get('ACCRUAL_PENDING_DAYS', '31'))
+
+ACCRUAL_JOB = 'accrual'
+
+CENT = Decimal('0.01')
+MONTHS_PER_YEAR = Decimal('12')
+
+
+def _decimal_column(cards: List[Dict[str, Any]], attribute: str) -> List[Decimal]:
+    return [Decimal(str(card.get(attribute) or 0)) for card in cards]
+
+
+def compute_accruals(cards: List[Dict[str, Any]], on: date) -> List[Dict[str, Any]]:
+    """
+    Interest and annual fee for a batch of cards whose cycle closed on a date
+
+    Interest is charged on the revolving balance of the cycle's statement, so
+    cards whose statement is not closed yet are left pending for a later run.
+    The annual fee is charged in the cut-off of the card's anniversary month.
+
+    Returns:
+        One accrual per card with cycle, interest, fee and status
+    """
+    cycles = [billing_cycle(on, int(card['cut_off_date'])) for card in cards]
+    revolving = _decimal_column(cards, 'revolving_balance')
+    monthly_rates = [apr / 100 / MONTHS_PER_YEAR for apr in _decimal_column(cards, 'apr')]
+    annual_fees = _decimal_column(cards, 'annual_fee')
+
+    # Whole batch in column passes (numpy is not a dependency; Decimal keeps cents exact)
+    interest = [(balance * rate).quantize(CENT, rounding=ROUND_HALF_UP)
+                for balance, rate in zip(revolving, monthly_rates)]
+    anniversary = [card.get('created_at', '')[:7] < cycle and card.get('created_at', '')[5:7] == cycle[5:7]
+                   for card, cycle in zip(cards, cycles)]
+    fees = [fee if due else Decimal('0') for fee, due in zip(annual_fees, anniversary)]
+
+    accruals = []
+    for card, cycle, card_interest, fee in zip(cards, cycles, interest, fees):
+        if card.get('last_accrual_cycle', '') >= cycle:
+            status = 'already_accrued'
+        elif card.get('last_statement_cycle') != cycle:
+            status = 'pending_statement'
+        elif not card_interest and not fee:
+            status = 'nothing_due'
+        else:
+            status = 'due'
+        accruals.append({'card': card, 'cycle': cycle, 'interest': card_interest, 'fee': fee, 'status': status})
+    return accruals
+
+
+def accrual_actions(db_client, accrual: Dict[str, Any], on: date) -> List[Dict[str, Any]]:
+    """
+    TransactWriteItems actions applying one card's accrual
+
+    Charges are posted on the first day of the next cycle with deterministic
+    ids, and the card update only succeeds if the cycle was not accrued yet.
+    """
+    card = accrual['card']
+    cycle = accrual['cycle']
+    posted_on = datetime.combine(on + timedelta(days=1), datetime.min.time()).isoformat()
+    now = datetime.now().isoformat()
+
+    actions = []
+    for transaction_type, amount, description in (
+        ('interest', accrual['interest'], f'Interest {cycle}'),
+        ('fee', accrual['fee'], f'Annual fee {cycle}'),
+    ):
+        if not amount:
+            continue
+        item = db_client.card_transaction_item({
+            'card_transaction_id': f'ctxn_{transaction_type}_{cycle}',
+            'card_id': card['card_id'],
+            'user_id': card['user_id'],
+            'cycle': next_cycle(cycle),
+            'transaction_type': transaction_type,
+            'amount': amount,
+            'balance_delta': amount,
+            'description': description,
+            'transaction_date': posted_on,
+            'created_at': now
+        })
+        actions.append({'Put': {'TableName': db_client.table_name, 'Item': item,
+                                'ConditionExpression': 'attribute_not_exists(pk)'}})
+
+    actions.append({'Update': {
+        'TableName': db_client.table_name,
+        'Key': {'pk': f"USER#{card['user_id']}", 'sk': f"CARD#{card['card_id']}"},
+        'UpdateExpression': 'ADD current_balance :total SET last_accrual_cycle = :cycle, updated_at = :timestamp',
+        'ExpressionAttributeValues': {
+            ':total': accrual['interest'] + accrual['fee'],
+            ':cycle': cycle,
+            ':timestamp': now
+        },
+        'ConditionExpression': 'attribute_exists(pk) AND '
+                               '(attribute_not_exists(last_accrual_cycle) OR last_accrual_cycle < :cycle)'
+    }})
+    return actions
+
+
+def apply_batch(db_client, accruals: List[Dict[str, Any]], on: date) -> Dict[str, Any]:
+    """
+    Apply a batch of accruals in one TransactWriteItems
+
+    When the transaction is cancelled, the cards whose conditions failed
+    (accrued concurrently) are dropped and the rest is retried once; cards
+    still not applied after the retry count as failed.
+
+    Returns:
+        Dict with the applied accruals and the already_accrued and failed counts
+    """
+    client = db_client.table.meta.client
+    pending = list(accruals)
+    result = {'applied': [], 'already_accrued': 0, 'failed': 0}
+
+    for _ in range(2):
+        if not pending:
+            return result
+        actions, owners = [], []
+        for index, accrual in enumerate(pending):
+            card_actions = accrual_actions(db_client, accrual, on)
+            actions.extend(card_actions)
+            owners.extend([index] * len(card_actions))
+
+        try:
+            client.transact_write_items(TransactItems=actions)
+            result['applied'] = pending
+            return result
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons') or []
+            failed = {owners[i] for i, reason in enumerate(reasons)
+                      if reason.get('Code') == 'ConditionalCheckFailed'}
+            if not failed:
+                raise
+            logger.warning(f"Skipping {len(failed)} cards accrued concurrently")
+            result['already_accrued'] += len(failed)
+            pending = [accrual for index, accrual in enumerate(pending) if index not in failed]
+
+    logger.error(f"Accrual batch kept conflicting, {len(pending)} cards not applied")
+    result['failed'] = len(pending)
+    return result
+
+
+def iter_pending_cards(db_client, pending: List[Dict[str, Any]], on: date) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the cards a previous run left waiting for their statement, grouped by cut-off
+
+    Entries for the cut-off being swept are skipped (the sweep reads them) and
+    entries older than ACCRUAL_PENDING_DAYS are dropped.
+
+    Yields:
+        Dicts with the cut-off date and its cards
+    """
+    by_cut_off: Dict[str, List[Dict[str, Any]]] = {}
+    oldest = (on - timedelta(days=ACCRUAL_PENDING_DAYS)).isoformat()
+    for entry in pending:
+        if entry['cut_off'] == on.isoformat():
+            continue
+        if entry['cut_off'] < oldest:
+            logger.warning(f"Card {entry['card_id']} dropped from accrual retries: no statement since {entry['cut_off']}")
+            continue
+        card = db_client.get_card_by_id(entry['user_id'], entry['card_id'])
+        if card and card.get('status', 'active') == 'active':
+            by_cut_off.setdefault(entry['cut_off'], []).append(card)
+    for cut_off, cards in sorted(by_cut_off.items()):
+        yield {'cut_off': date.fromisoformat(cut_off), 'cards': cards}
+
+
+def run_accrual(db_client, on: date, batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Accrue interest and fees for every card whose cut-off was on a date
+
+    Cards left pending_statement by earlier runs are retried first, each
+    with its own cut-off, and the ones still pending are saved for the next
+    run. Users with applied accruals get their data version bumped.
+
+    Args:
+        db_client: DynamoDBClient
+        on: Cut-off date
+        batch_size: Cards per batch (default ACCRUAL_BATCH_SIZE)
+
+    Returns:
+        Summary with counts per status, totals and cards per second
+    """
+    started = time.perf_counter()
+    batch_size = min(batch_size or ACCRUAL_BATCH_SIZE, 33)
+    counts = {'cards': 0, 'retried': 0, 'applied': 0, 'already_accrued': 0, 'pending_statement': 0,
+              'nothing_due': 0, 'failed': 0}
+    totals = {'interest': Decimal('0'), 'fees': Decimal('0')}
+    still_pending: Dict[tuple, Dict[str, Any]] = {}
+    users = set()
+
+    def flush(batch: List[Dict[str, Any]], cut_off: date) -> None:
+        due = []
+        for accrual in compute_accruals(batch, cut_off):
+            if accrual['status'] == 'due':
+                due.append(accrual)
+                continue
+            counts[accrual['status']] += 1
+            if accrual['status'] == 'pending_statement':
+                card = accrual['card']
+                still_pending[(card['card_id'], cut_off)] = {
+                    'user_id': card['user_id'], 'card_id': card['card_id'], 'cut_off': cut_off.isoformat()
+                }
+        result = apply_batch(db_client, due, cut_off)
+        counts['applied'] += len(result['applied'])
+        counts['already_accrued'] += result['already_accrued']
+        counts['failed'] += result['failed']
+        for accrual in result['applied']:
+            users.add(accrual['card']['user_id'])
+            totals['interest'] += accrual['interest']
+            totals['fees'] += accrual['fee']
+
+    def sweep(cards: Iterator[Dict[str, Any]], cut_off: date) -> int:
+        batch, read = [], 0
+        for card in cards:
+            read += 1
+            batch.append(card)
+            if len(batch) == batch_size:
+                flush(batch, cut_off)
+                batch = []
+        if batch:
+            flush(batch, cut_off)
+        return read
+
+    for group in iter_pending_cards(db_client, db_client.get_job_state(ACCRUAL_JOB).get('pending', []), on):
+        counts['retried'] += sweep(iter(group['cards']), group['cut_off'])
+    counts['cards'] = sweep(iter_cut_off_cards(db_client, on), on)
+    db_client.put_job_state(ACCRUAL_JOB, {'pending': list(still_pending.values())})
+
+    for user_id in users:
+        record_write(db_client, user_id)
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        'cut_off': on.isoformat(),
+        **counts,
+        'interest': float(totals['interest']),
+        'fees': float(totals['fees']),
+        'duration_ms': round(elapsed * 1000, 1),
+        'cards_per_second': round(counts['cards'] / elapsed, 1) if elapsed else None
+    }
+    logger.info(f"Accrual finished: {summary}")
+    return summary
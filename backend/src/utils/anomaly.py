@@ -0,0 +1,185 @@
+"""
+Streaming anomaly detection
+Every expense is scored at write time against running statistics of its
+category (count, mean and M2 kept with Welford's algorithm in one
+STATS#ANOMALY item per user) and the merchants already seen (one small
+STATS#MERCHANT#{hash} item each), so a charge is checked with one batch read
+and one conditional write instead of re-reading the history. Deleting or
+recategorizing an expense takes it back out of the statistics. Flagged
+transactions carry gsi3 keys under ALERT#{user_id}, a sparse index holding
+only the alerts
+"""
+
+import hashlib
+import logging
+import math
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Any, Optional
+
+from utils.budgets import spend_amount
+from utils.subscriptions import normalize_description
+
+logger = logging.getLogger(__name__)
+
+# Expenses a category needs before its charges are scored
+ANOMALY_MIN_SAMPLES = int(os.environ.get('ANOMALY_MIN_SAMPLES', '5'))
+
+# Standard deviations above the category mean that make a charge unusually large
+ANOMALY_Z_THRESHOLD = float(os.environ.get('ANOMALY_Z_THRESHOLD', '3'))
+
+# Attempts to write the statistics while concurrent writes keep changing them
+ANOMALY_MAX_RETRIES = 3
+
+
+def stats_key(currency: str, category: str) -> str:
+    """Key of a category's statistics in the stats item"""
+    return f'{currency}#{category}'
+
+
+def merchant_key(currency: str, category: str, description: str) -> str:
+    """Short hash of a merchant (normalized description) within a category"""
+    raw = f'{currency}|{category}|{normalize_description(description)}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def welford_update(stats: Optional[Dict[str, Any]], amount: float) -> Dict[str, Decimal]:
+    """
+    Add an amount to running count/mean/M2
+
+    Returns:
+        New statistics as Decimals for DynamoDB
+    """
+    count = int(stats['count']) if stats else 0
+    mean = float(stats['mean']) if stats else 0.0
+    m2 = float(stats['m2']) if stats else 0.0
+    count += 1
+    delta = amount - mean
+    mean += delta / count
+    m2 += delta * (amount - mean)
+    return {'count': Decimal(count), 'mean': Decimal(str(round(mean, 6))), 'm2': Decimal(str(round(m2, 6)))}
+
+
+def welford_remove(stats: Dict[str, Any], amount: float) -> Dict[str, Decimal]:
+    """
+    Take an amount back out of running count/mean/M2 (inverse of welford_update)
+
+    Returns:
+        New statistics as Decimals for DynamoDB (all zero once the count is)
+    """
+    count = int(stats['count'])
+    if count <= 1:
+        return {'count': Decimal(0), 'mean': Decimal(0), 'm2': Decimal(0)}
+    mean = float(stats['mean'])
+    new_mean = (count * mean - amount) / (count - 1)
+    m2 = max(float(stats['m2']) - (amount - mean) * (amount - new_mean), 0.0)
+    return {'count': Decimal(count - 1), 'mean': Decimal(str(round(new_mean, 6))), 'm2': Decimal(str(round(m2, 6)))}
+
+
+def score_expense(stats_item: Optional[Dict[str, Any]], amount: float, key: str, merchant_seen: bool) -> Dict[str, Any]:
+    """
+    Flags of an expense given the statistics before it
+
+    - unusual_amount: more than ANOMALY_Z_THRESHOLD sample standard deviations above the mean
+    - unfamiliar_merchant: a merchant never seen in the category, charging at least the mean
+
+    Categories with fewer than ANOMALY_MIN_SAMPLES expenses are not scored.
+
+    Returns:
+        Dict with flags and z_score (None when not scored)
+    """
+    stats = (stats_item or {}).get('categories', {}).get(key)
+    if not stats or int(stats['count']) < ANOMALY_MIN_SAMPLES:
+        return {'flags': [], 'z_score': None}
+
+    count, mean = int(stats['count']), float(stats['mean'])
+    stddev = math.sqrt(float(stats['m2']) / (count - 1))
+    z_score = (amount - mean) / stddev if stddev > 0 else (math.inf if amount > mean else 0.0)
+
+    flags = []
+    if z_score >= ANOMALY_Z_THRESHOLD:
+        flags.append('unusual_amount')
+    if not merchant_seen and amount >= mean:
+        flags.append('unfamiliar_merchant')
+    return {'flags': flags, 'z_score': round(z_score, 2) if math.isfinite(z_score) else None}
+
+
+def check_transaction(db_client, user_id: str, transaction_data: Dict[str, Any], currency: str) -> Dict[str, Any]:
+    """
+    Score an expense before it is written
+
+    Failures are logged and the transaction is written unscored.
+
+    Args:
+        db_client: DynamoDBClient instance
+        user_id: Owner of the transaction
+        transaction_data: Transaction about to be created
+        currency: Currency of the transaction's account
+
+    Returns:
+        Dict with flags, z_score and the stats item read (None if not an expense)
+    """
+    amount = spend_amount(transaction_data)
+    if amount <= 0:
+        return {'flags': [], 'z_score': None, 'stats_item': None}
+    try:
+        state = db_client.get_anomaly_state(
+            user_id, merchant_key(currency, transaction_data['category'], transaction_data['description'])
+        )
+        stats_item = state['stats']
+        score = score_expense(stats_item, float(amount), stats_key(currency, transaction_data['category']),
+                              state['merchant_seen'])
+        if score['flags']:
+            logger.warning(f"Transaction flagged for user {user_id}: {score}")
+        return {**score, 'stats_item': stats_item}
+    except Exception as e:
+        logger.error(f"Error scoring transaction for user {user_id}: {e}")
+        return {'flags': [], 'z_score': None, 'stats_item': None}
+
+
+def anomaly_fields(check: Dict[str, Any]) -> Dict[str, Any]:
+    """Transaction attributes of a flagged check (empty when nothing was flagged)"""
+    if not check['flags']:
+        return {}
+    return {'anomaly_flags': check['flags'], 'anomaly_score': check['z_score']}
+
+
+def record_expense_stats(db_client, user_id: str, transaction: Dict[str, Any], currency: str,
+                         stats_item: Optional[Dict[str, Any]] = None, reverse: bool = False) -> bool:
+    """
+    Add an expense to its category statistics and merchants (or take it back out)
+
+    The write is conditioned on the stats version read; when another write
+    got in first the item is read again and the update reapplied. Reversing
+    (delete, or the old category of a recategorized expense) leaves the
+    merchant marked as seen.
+
+    Returns:
+        True if the statistics were updated
+    """
+    amount = spend_amount(transaction)
+    if amount <= 0:
+        return False
+    key = stats_key(currency, transaction['category'])
+    timestamp = datetime.now().isoformat()
+    try:
+        for _ in range(ANOMALY_MAX_RETRIES):
+            if stats_item is None:
+                stats_item = db_client.get_anomaly_stats(user_id)
+            current = (stats_item or {}).get('categories', {}).get(key)
+            if reverse and not (current and int(current['count'])):
+                return False
+            stats = welford_remove(current, float(amount)) if reverse else welford_update(current, float(amount))
+            version = int(stats_item['version']) if stats_item else 0
+            if db_client.save_anomaly_stats(user_id, key, stats, version, timestamp):
+                if not reverse:
+                    db_client.add_anomaly_merchant(
+                        user_id, merchant_key(currency, transaction['category'], transaction['description']), timestamp
+                    )
+                return True
+            stats_item = None
+        logger.error(f"Anomaly stats of user {user_id} still changing after {ANOMALY_MAX_RETRIES} attempts")
+    except Exception as e:
+        logger.error(f"Error recording anomaly stats for user {user_id}: {e}")
+    return False
@@ -0,0 +1,65 @@
+"""
+Card billing cycle helpers
+A cycle is labelled by the month of the cut-off date that closes it, so a
+purchase made after the cut-off day belongs to the next month's cycle
+"""
+
+import calendar
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+
+def clamp_day(year: int, month: int, day: int) -> date:
+    """Date for a day of month, moved to the last day in shorter months (cut-off 31 in February)"""
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def _shift_month(year: int, month: int, months: int) -> Tuple[int, int]:
+    """Year and month after adding (or subtracting) whole months"""
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def billing_cycle(on: date, cut_off_day: Optional[int]) -> str:
+    """
+    Billing cycle (yyyy-mm) a date belongs to
+
+    Args:
+        on: Transaction date
+        cut_off_day: Card cut_off_date (day of month); None uses calendar months
+
+    Returns:
+        Cycle label, e.g. '2025-10'
+    """
+    year, month = on.year, on.month
+    if cut_off_day and on > clamp_day(year, month, cut_off_day):
+        year, month = _shift_month(year, month, 1)
+    return f"{year:04d}-{month:02d}"
+
+
+def cycle_bounds(cycle: str, cut_off_day: Optional[int]) -> Tuple[date, date]:
+    """
+    First and last day (inclusive) of a billing cycle
+
+    Args:
+        cycle: Cycle label (yyyy-mm)
+        cut_off_day: Card cut_off_date; None uses calendar months
+
+    Returns:
+        Tuple of (start, cut-off date)
+    """
+    year, month = (int(part) for part in cycle.split('-'))
+    if not cut_off_day:
+        return date(year, month, 1), clamp_day(year, month, 31)
+
+    previous_year, previous_month = _shift_month(year, month, -1)
+    start = clamp_day(previous_year, previous_month, cut_off_day) + timedelta(days=1)
+    return start, clamp_day(year, month, cut_off_day)
+
+
+def parse_cycle(value: str) -> str:
+    """Validate a yyyy-mm cycle label, raising ValueError otherwise"""
+    year, month = value.split('-')
+    if len(year) != 4 or not 1 <= int(month) <= 12:
+        raise ValueError(f"Invalid billing cycle: {value}")
+    return f"{int(year):04d}-{int(month):02d}"
@@ -0,0 +1,188 @@
+"""
+Category budgets
+Each budget item keeps a `spent` counter for its current month that the
+transaction write paths increment atomically, so remaining amounts and alerts
+are single-item reads; rebuild_budgets recomputes the counters from history
+"""
+
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+from utils.cascade import iter_active_user_ids, iter_query_pages
+
+logger = logging.getLogger(__name__)
+
+# Transaction types counted as spending
+BUDGET_SPEND_TYPES = ('expense', 'fee')
+
+
+def budget_period(transaction_date: str) -> str:
+    """Budget period (YYYY-MM) of a transaction date"""
+    return transaction_date[:7]
+
+
+def spend_amount(transaction: Dict[str, Any]) -> Decimal:
+    """Amount a transaction adds to its category budget (0 for non-spending types)"""
+    if transaction.get('transaction_type') not in BUDGET_SPEND_TYPES:
+        return Decimal('0')
+    return -Decimal(str(transaction['amount']))
+
+
+def budget_status(budget: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Remaining amount and alert flags of a budget for the current month
+
+    A counter still on an earlier month means nothing was spent yet this month.
+    """
+    period = (today or date.today()).strftime('%Y-%m')
+    amount = float(budget['amount'])
+    spent = float(budget.get('spent', 0)) if budget.get('period', '') >= period else 0.0
+    threshold = float(budget['alert_threshold'])
+    return {
+        'period': max(budget.get('period', ''), period),
+        'spent': round(spent, 2),
+        'remaining': round(amount - spent, 2),
+        'percent_used': round(spent / amount * 100, 2) if amount else 0.0,
+        'is_over_threshold': spent >= amount * threshold,
+        'is_over_budget': spent > amount
+    }
+
+
+def record_budget_spend(db_client, user_id: str, transaction: Dict[str, Any], currency: str,
+                        reverse: bool = False, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    Count a transaction against its category budget (or take it back)
+
+    Only transactions dated in the current month touch the counter: a
+    future-dated expense would otherwise move the budget to its month and
+    every expense of this month would stop counting. The monthly
+    rebuild_budgets run counts future-dated expenses once their month starts.
+
+    Failures are logged but never fail the write that already happened;
+    rebuild_budgets repairs the counter.
+
+    Args:
+        db_client: DynamoDBClient instance
+        user_id: Owner of the transaction
+        transaction: Transaction with amount, transaction_type, category and transaction_date
+        currency: Currency of the transaction's account
+        reverse: Subtract instead (deleted or recategorized transactions)
+        today: Day that sets the current month (default: today)
+
+    Returns:
+        Updated budget, None if no budget counted it
+    """
+    amount = spend_amount(transaction)
+    period = budget_period(transaction.get('transaction_date') or '')
+    if not amount or period != (today or date.today()).strftime('%Y-%m'):
+        return None
+    if reverse:
+        amount = -amount
+
+    category = transaction['category']
+    try:
+        budget = db_client.add_budget_spend(
+            user_id, category, period, currency, amount, datetime.now().isoformat()
+        )
+        if budget is not None and amount > 0:
+            spent, limit = budget['spent'], budget['amount']
+            if spent > limit >= spent - amount:
+                logger.warning(f"Budget exceeded for user {user_id}: {category} {spent}/{limit}")
+            elif spent >= limit * budget['alert_threshold'] > spent - amount:
+                logger.warning(f"Budget alert threshold reached for user {user_id}: {category} {spent}/{limit}")
+        return budget
+    except Exception as e:
+        logger.error(f"Error recording budget spend for user {user_id}, category {category}: {e}")
+        return None
+
+
+def month_spending(db_client, user_id: str, accounts: List[Dict[str, Any]], period: str) -> Dict[tuple, Decimal]:
+    """
+    Spending of a month per (category, currency), read from the accounts' date-ordered GSI1 range
+
+    Returns:
+        Spent amount by (category, currency)
+    """
+    spending: Dict[tuple, Decimal] = {}
+    names = {'#amount': 'amount', '#type': 'transaction_type', '#category': 'category', '#user': 'user_id'}
+    for account in accounts:
+        currency = account.get('currency', 'MXN')
+        pages = iter_query_pages(
+            db_client.table,
+            IndexName='GSI1',
+            KeyConditionExpression='gsi1_pk = :account_pk AND gsi1_sk BETWEEN :start AND :end',
+            ExpressionAttributeValues={
+                ':account_pk': f"ACCOUNT#{account['account_id']}",
+                ':start': f'TRANSACTION#{period}',
+                ':end': f'TRANSACTION#{period}~'
+            },
+            ProjectionExpression=', '.join(names),
+            ExpressionAttributeNames=names
+        )
+        for page in pages:
+            for item in page:
+                amount = spend_amount(item)
+                if item.get('user_id') == user_id and amount:
+                    key = (item.get('category'), currency)
+                    spending[key] = spending.get(key, Decimal('0')) + amount
+    return spending
+
+
+def rebuild_budgets(db_client, user_id: str, period: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Recompute the spent counters of a user's budgets for a month
+
+    Args:
+        db_client: DynamoDBClient
+        user_id: User whose budgets are rebuilt
+        period: Month to count (YYYY-MM, default: current month)
+
+    Returns:
+        Summary with budgets rebuilt
+    """
+    period = period or date.today().strftime('%Y-%m')
+    budgets = db_client.list_budgets(user_id)
+    if not budgets:
+        return {'user_id': user_id, 'period': period, 'budgets': 0, 'changed': 0}
+
+    currencies = {budget.get('currency', 'MXN') for budget in budgets}
+    accounts = [account for account in db_client.list_user_accounts(user_id, include_inactive=True)
+                if account.get('currency', 'MXN') in currencies]
+    spending = month_spending(db_client, user_id, accounts, period)
+
+    now = datetime.now().isoformat()
+    changed = 0
+    for budget in budgets:
+        spent = spending.get((budget['category'], budget.get('currency', 'MXN')), Decimal('0'))
+        if budget.get('period') == period and Decimal(str(budget.get('spent', 0))) == spent:
+            continue
+        if db_client.set_budget_spent(user_id, budget['category'], period, spent, now):
+            changed += 1
+
+    summary = {'user_id': user_id, 'period': period, 'budgets': len(budgets), 'changed': changed}
+    logger.info(f"Budgets rebuilt: {summary}")
+    return summary
+
+
+def rebuild_all_budgets(db_client, period: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Rebuild the budgets of every active user
+
+    Returns:
+        Totals of users, budgets and counters changed
+    """
+    totals = {'users': 0, 'budgets': 0, 'changed': 0, 'failed': 0}
+    for user_id in iter_active_user_ids(db_client):
+        try:
+            summary = rebuild_budgets(db_client, user_id, period)
+        except Exception as e:
+            logger.error(f"Error rebuilding budgets for user {user_id}: {e}")
+            totals['failed'] += 1
+            continue
+        totals['users'] += 1
+        totals['budgets'] += summary['budgets']
+        totals['changed'] += summary['changed']
+    logger.info(f"Budget rebuild finished: {totals}")
+    return totals
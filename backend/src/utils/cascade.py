@@ -0,0 +1,341 @@
+"""
+Cascade delete and export of user data
+Enumerates a user's (or an account's or card's) items with paginated queries over the
+USER# partition and GSI1 ACCOUNT#/CARD# items, optionally streams them to a gzipped
+JSON Lines archive and removes them with parallel BatchWriteItem chunks
+"""
+
+import gzip
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Parallel BatchWriteItem requests in flight
+CASCADE_MAX_WORKERS = int(os.environ.get('CASCADE_MAX_WORKERS', '4'))
+
+# Attempts per chunk while DynamoDB keeps returning UnprocessedItems
+CASCADE_MAX_RETRIES = int(os.environ.get('CASCADE_MAX_RETRIES', '8'))
+
+# Async cascade target; empty keeps deletes soft-only
+CASCADE_FUNCTION_NAME = os.environ.get('CASCADE_FUNCTION_NAME', '')
+
+# Bucket receiving export archives; empty keeps them on local disk
+EXPORT_BUCKET = os.environ.get('EXPORT_BUCKET', '')
+
+# DynamoDB limit of put/delete requests per BatchWriteItem
+BATCH_WRITE_LIMIT = 25
+
+# Base delay between retries of unprocessed items (doubles per attempt, with jitter)
+RETRY_BASE_DELAY_SECONDS = 0.05
+
+CASCADE_SCOPES = ('user', 'account', 'card')
+
+# Secrets never written to export archives
+EXPORT_EXCLUDED_ATTRIBUTES = ('password_hash',)
+
+
+class CascadeError(Exception):
+    """Raised when items are still unprocessed after all retries"""
+
+
+def iter_query_pages(table, **query_kwargs) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield every page of a query, following LastEvaluatedKey
+
+    Args:
+        table: boto3 Table
+        **query_kwargs: Arguments for table.query
+
+    Yields:
+        List of items per page
+    """
+    while True:
+        response = table.query(**query_kwargs)
+        yield response.get('Items', [])
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        query_kwargs['ExclusiveStartKey'] = last_key
+
+
+def _key_projection(keys_only: bool, extra: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """ProjectionExpression kwargs for key-only reads (deletes skip item bodies)"""
+    if not keys_only:
+        return {}
+    attributes = ('pk', 'sk') + extra
+    names = {f'#k{i}': attribute for i, attribute in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+
+def _iter_gsi1_items(db_client, user_id: str, gsi1_pk: str, keys_only: bool) -> Iterator[Dict[str, Any]]:
+    """Yield the user's items under one GSI1 partition"""
+    pages = iter_query_pages(
+        db_client.table,
+        IndexName='GSI1',
+        KeyConditionExpression='gsi1_pk = :gsi1_pk',
+        ExpressionAttributeValues={':gsi1_pk': gsi1_pk},
+        **_key_projection(keys_only, extra=('user_id',))
+    )
+    for page in pages:
+        for item in page:
+            # Data isolation: GSI1 is shared by every user
+            if item.get('user_id') == user_id:
+                yield item
+
+
+def iter_active_user_ids(db_client) -> Iterator[str]:
+    """Yield the ids of active users from the sparse ENTITY#user index"""
+    pages = iter_query_pages(
+        db_client.table,
+        IndexName='GSI2',
+        KeyConditionExpression='gsi2_pk = :entity',
+        ExpressionAttributeValues={':entity': db_client.USER_INDEX_PK},
+        ProjectionExpression='user_id'
+    )
+    for page in pages:
+        for item in page:
+            yield item['user_id']
+
+
+def iter_account_items(db_client, user_id: str, account_id: str,
+                       keys_only: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the items indexed under GSI1 ACCOUNT#{account_id} that belong to the user
+
+    Covers the account item itself, every transaction posted to it and its
+    manual balance adjustments.
+    """
+    return _iter_gsi1_items(db_client, user_id, f'ACCOUNT#{account_id}', keys_only)
+
+
+def iter_card_items(db_client, user_id: str, card_id: str,
+                    keys_only: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the items indexed under GSI1 CARD#{card_id} that belong to the user
+
+    Covers the card item itself, its transactions in every
+    CARD#{card_id}#CYCLE#{yyyy-mm} partition and its statements.
+    """
+    return _iter_gsi1_items(db_client, user_id, f'CARD#{card_id}', keys_only)
+
+
+def iter_user_items(db_client, user_id: str, keys_only: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item owned by a user exactly once
+
+    Reads the USER#{user_id} partition page by page, then the GSI1 ACCOUNT#
+    and CARD# items of each account and card found there, so items stored
+    outside the partition (card billing cycles) are included.
+    """
+    seen = set()
+    indexed_keys = []
+
+    pages = iter_query_pages(
+        db_client.table,
+        KeyConditionExpression='pk = :pk',
+        ExpressionAttributeValues={':pk': f'USER#{user_id}'},
+        **_key_projection(keys_only)
+    )
+    for page in pages:
+        for item in page:
+            seen.add((item['pk'], item['sk']))
+            if item['sk'].startswith(('ACCOUNT#', 'CARD#')):
+                indexed_keys.append(item['sk'])
+            yield item
+
+    for gsi1_pk in indexed_keys:
+        for item in _iter_gsi1_items(db_client, user_id, gsi1_pk, keys_only):
+            key = (item['pk'], item['sk'])
+            if key not in seen:
+                seen.add(key)
+                yield item
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize DynamoDB types (Decimal, sets, binary) for the archive"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
+
+
+def export_items(items: Iterator[Dict[str, Any]], path: str) -> Tuple[int, List[Dict[str, str]]]:
+    """
+    Stream items to a gzipped JSON Lines file
+
+    Args:
+        items: Items to export (consumed lazily)
+        path: Destination file
+
+    Returns:
+        Tuple of (exported count, keys of the exported items)
+    """
+    count = 0
+    keys = []
+    with gzip.open(path, 'wt', encoding='utf-8') as archive:
+        for item in items:
+            keys.append({'pk': item['pk'], 'sk': item['sk']})
+            item = {k: v for k, v in item.items() if k not in EXPORT_EXCLUDED_ATTRIBUTES}
+            archive.write(json.dumps(item, default=_json_default, ensure_ascii=False))
+            archive.write('\n')
+            count += 1
+    return count, keys
+
+
+def _delete_chunk(client, table_name: str, keys: List[Dict[str, str]]) -> int:
+    """Delete up to 25 keys, retrying UnprocessedItems with jittered backoff"""
+    request_items = {table_name: [{'DeleteRequest': {'Key': key}} for key in keys]}
+
+    for attempt in range(CASCADE_MAX_RETRIES):
+        response = client.batch_write_item(RequestItems=request_items)
+        unprocessed = response.get('UnprocessedItems') or {}
+        if not unprocessed.get(table_name):
+            return len(keys)
+
+        request_items = unprocessed
+        delay = RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+        time.sleep(random.uniform(0, delay))
+
+    pending = len(request_items.get(table_name, []))
+    raise CascadeError(f"{pending} items still unprocessed after {CASCADE_MAX_RETRIES} attempts")
+
+
+def batch_delete(db_client, keys: List[Dict[str, str]], max_workers: Optional[int] = None) -> int:
+    """
+    Delete keys with parallel BatchWriteItem requests
+
+    Args:
+        db_client: DynamoDBClient
+        keys: pk/sk dicts to delete
+        max_workers: Requests in flight (default CASCADE_MAX_WORKERS)
+
+    Returns:
+        Number of deleted items
+    """
+    if not keys:
+        return 0
+
+    # Low-level clients are thread safe, Table resources are not
+    client = db_client.table.meta.client
+    table_name = db_client.table.name
+    chunks = [keys[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(keys), BATCH_WRITE_LIMIT)]
+
+    with ThreadPoolExecutor(max_workers=max_workers or CASCADE_MAX_WORKERS) as executor:
+        deleted = sum(executor.map(lambda chunk: _delete_chunk(client, table_name, chunk), chunks))
+
+    logger.info(f"Deleted {deleted} items in {len(chunks)} batches")
+    return deleted
+
+
+def upload_export(path: str, user_id: str) -> str:
+    """
+    Upload an archive to EXPORT_BUCKET when configured
+
+    Returns:
+        s3:// URI of the archive, or the local path when no bucket is set
+    """
+    if not EXPORT_BUCKET:
+        return path
+
+    import boto3
+
+    key = f"exports/{user_id}/{os.path.basename(path)}"
+    boto3.client('s3').upload_file(path, EXPORT_BUCKET, key)
+    os.remove(path)
+    return f"s3://{EXPORT_BUCKET}/{key}"
+
+
+def run_cascade(db_client, scope: str, user_id: str, account_id: Optional[str] = None,
+                export: bool = False, delete: bool = True, card_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Export and/or delete every item of a user or of one of their accounts or cards
+
+    With export the archive is fully written (and uploaded) before anything is
+    deleted, and only the exported keys are deleted.
+
+    Args:
+        db_client: DynamoDBClient
+        scope: 'user', 'account' or 'card'
+        user_id: Owner of the data
+        account_id: Required for the account scope
+        export: Write a gzipped JSON Lines archive first
+        delete: Delete the items (False for export only)
+        card_id: Required for the card scope
+
+    Returns:
+        Report with counts, archive location and duration
+    """
+    if scope not in CASCADE_SCOPES:
+        raise ValueError(f"Invalid cascade scope: {scope}")
+    if scope == 'account' and not account_id:
+        raise ValueError("account_id is required for the account scope")
+    if scope == 'card' and not card_id:
+        raise ValueError("card_id is required for the card scope")
+
+    started = time.perf_counter()
+    keys_only = not export
+
+    if scope == 'user':
+        items = iter_user_items(db_client, user_id, keys_only=keys_only)
+    elif scope == 'account':
+        items = iter_account_items(db_client, user_id, account_id, keys_only=keys_only)
+    else:
+        items = iter_card_items(db_client, user_id, card_id, keys_only=keys_only)
+
+    report = {'scope': scope, 'user_id': user_id, 'account_id': account_id, 'card_id': card_id}
+
+    if export:
+        timestamp = datetime.now().strftime('%Y%m%dT%H%M%S')
+        suffix = f"-{account_id or card_id}" if account_id or card_id else ''
+        path = os.path.join(tempfile.gettempdir(), f"{user_id}{suffix}-{timestamp}.jsonl.gz")
+        report['exported'], keys = export_items(items, path)
+        report['archive'] = upload_export(path, user_id)
+        logger.info(f"Exported {report['exported']} items for user {user_id} to {report['archive']}")
+    else:
+        keys = [{'pk': item['pk'], 'sk': item['sk']} for item in items]
+
+    report['deleted'] = batch_delete(db_client, keys) if delete else 0
+    report['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    logger.info(f"Cascade finished: {report}")
+    return report
+
+
+def schedule_cascade(scope: str, user_id: str, account_id: Optional[str] = None,
+                     export: bool = False, card_id: Optional[str] = None) -> bool:
+    """
+    Invoke the cascade job asynchronously when CASCADE_FUNCTION_NAME is set
+
+    Returns:
+        True when the job was queued
+    """
+    if not CASCADE_FUNCTION_NAME:
+        return False
+
+    import boto3
+
+    payload = {'action': 'cascade', 'scope': scope, 'user_id': user_id,
+               'account_id': account_id, 'card_id': card_id, 'export': export}
+    boto3.client('lambda').invoke(
+        FunctionName=CASCADE_FUNCTION_NAME,
+        InvocationType='Event',
+        Payload=json.dumps(payload).encode('utf-8')
+    )
+    logger.info(f"Cascade queued: {payload}")
+    return True
@@ -5,7 +5,12 @@ Implements Single Table Design pattern to optimize performance and costs
 
 import boto3
 import os
-from typing import Dict, Any, Optional, List
+import queue
+import random
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterator
 from botocore.exceptions import ClientError
 from decimal import Decimal
 import logging
@@ -14,14 +19,64 @@ logger = logging.getLogger(__name__)
 
 class DynamoDBClient:
     """Client to interact with DynamoDB using Single Table Design"""
+
+    # Sparse GSI2 partition holding only active users
+    USER_INDEX_PK = 'ENTITY#user'
+
+    # Sparse GSI2 partitions of active cards by cut-off day (CUTOFF#01 .. CUTOFF#31)
+    CUT_OFF_INDEX_PREFIX = 'CUTOFF#'
+
+    # Sparse GSI3 partitions of active cards by payment due day (DUE#01 .. DUE#31)
+    DUE_INDEX_PREFIX = 'DUE#'
+    CARD_INDEX_ATTRIBUTES = ('gsi2_pk', 'gsi2_sk', 'gsi3_pk', 'gsi3_sk')
+
+    # Sparse GSI2 partitions of recurring transaction templates by next run date
+    RECURRING_INDEX_PREFIX = 'RECUR#'
+
+    # Sparse GSI3 partitions of transactions flagged by the anomaly detector (ALERT#{user_id})
+    ALERT_INDEX_PREFIX = 'ALERT#'
+
+    # Partition of background job state (cursors of catch-up jobs)
+    JOB_STATE_PREFIX = 'JOB#'
+
+    # Attempts while BatchGetItem keeps returning UnprocessedKeys, and the base
+    # delay between them (doubles per attempt, with jitter)
+    BATCH_GET_MAX_ATTEMPTS = 5
+    BATCH_GET_BASE_DELAY_SECONDS = 0.05
     
     def __init__(self):
-        """Initialize DynamoDB client"""
-        self.dynamodb = boto3.resource('dynamodb')
+        """Initialize DynamoDB client (the boto3 resource is created on first use)"""
         self.table_name = os.environ.get('DYNAMODB_TABLE', 'finance-tracker-dev-main')
-        self.table = self.dynamodb.Table(self.table_name)
+        self._dynamodb = None
+        self._table = None
         logger.info(f"DynamoDBClient initialized with table: {self.table_name}")
     
+    @property
+    def dynamodb(self):
+        """boto3 DynamoDB resource, built lazily to keep it out of module import time"""
+        if self._dynamodb is None:
+            self._dynamodb = boto3.resource('dynamodb')
+        return self._dynamodb
+    
+    @property
+    def table(self):
+        """DynamoDB Table resource, built on first request that needs it"""
+        if self._table is None:
+            self._table = self.dynamodb.Table(self.table_name)
+        return self._table
+
+    def for_worker(self) -> 'DynamoDBClient':
+        """
+        Client on the same table with its own boto3 session, for one worker thread
+
+        Table resources (and the default session) are not thread safe, so
+        every thread of a pool needs its own instead of sharing this one.
+        """
+        client = DynamoDBClient()
+        client.table_name = self.table_name
+        client._dynamodb = boto3.session.Session().resource('dynamodb')
+        return client
+
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new user in DynamoDB
@@ -31,6 +86,8 @@ class DynamoDBClient:
         - sk: METADATA
         - gsi1pk: EMAIL#{email}
         - gsi1sk: USER#{user_id}
+        - gsi2_pk: ENTITY#user (sparse, removed on soft delete)
+        - gsi2_sk: USER#{created_at}#{user_id}
         """
         try:
             user_id = user_data['user_id']
@@ -41,6 +98,8 @@ class DynamoDBClient:
                 'sk': 'METADATA',
                 'gsi1_pk': f'EMAIL#{email}',
                 'gsi1_sk': f'USER#{user_id}',
+                'gsi2_pk': self.USER_INDEX_PK,
+                'gsi2_sk': f"USER#{user_data['created_at']}#{user_id}",
                 'entity_type': 'user',
                 'user_id': user_id,
                 'name': user_data['name'],
@@ -174,7 +233,7 @@ class DynamoDBClient:
     
     def delete_user(self, user_id: str, updated_at: str) -> bool:
         """
-        Delete user (soft delete - mark as inactive)
+        Delete user (soft delete - mark as inactive and drop it from the user index)
         """
         try:
             response = self.table.update_item(
@@ -182,7 +241,7 @@ class DynamoDBClient:
                     'pk': f'USER#{user_id}',
                     'sk': 'METADATA'
                 },
-                UpdateExpression='SET is_active = :inactive, updated_at = :timestamp',
+                UpdateExpression='SET is_active = :inactive, updated_at = :timestamp REMOVE gsi2_pk, gsi2_sk',
                 ExpressionAttributeValues={
                     ':inactive': False,
                     ':timestamp': updated_at
@@ -203,52 +262,265 @@ class DynamoDBClient:
     
     def list_users(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
-        List all active users
+        List active users from the sparse ENTITY#user index (oldest first)
+
+        Only user items carry gsi2_pk, so every page read is a user.
         """
         try:
-            response = self.table.scan(
-                FilterExpression='entity_type = :type AND is_active = :active',
-                ExpressionAttributeValues={
-                    ':type': 'user',
-                    ':active': True
-                },
-                Limit=limit
-            )
-            
-            users = response.get('Items', [])
+            users = []
+            query_kwargs = {
+                'IndexName': 'GSI2',
+                'KeyConditionExpression': 'gsi2_pk = :entity',
+                'ExpressionAttributeValues': {':entity': self.USER_INDEX_PK},
+                'Limit': limit
+            }
+            while len(users) < limit:
+                response = self.table.query(**query_kwargs)
+                users.extend(response.get('Items', []))
+
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_kwargs['ExclusiveStartKey'] = last_key
+
+            users = users[:limit]
             logger.info(f"Found {len(users)} active users")
             return users
-            
+
         except ClientError as e:
             logger.error(f"Error listing users: {e}")
             raise
 
-    def update_failed_login_attempts(self, user_id: str, attempts: int) -> bool:
+    def index_user(self, user_id: str, created_at: str) -> bool:
         """
-        Update number of failed login attempts
+        Add an active user created before the ENTITY#user index to it
+
+        Returns:
+            True if the user was indexed, False if it is missing or inactive
         """
         try:
-            from datetime import datetime
-            
-            response = self.table.update_item(
+            self.table.update_item(
                 Key={
                     'pk': f'USER#{user_id}',
                     'sk': 'METADATA'
                 },
-                UpdateExpression='SET failed_login_attempts = :attempts, updated_at = :timestamp',
+                UpdateExpression='SET gsi2_pk = :entity, gsi2_sk = :sort_key',
                 ExpressionAttributeValues={
-                    ':attempts': attempts,
-                    ':timestamp': datetime.now().isoformat()
+                    ':entity': self.USER_INDEX_PK,
+                    ':sort_key': f'USER#{created_at}#{user_id}',
+                    ':active': True
                 },
-                ConditionExpression='attribute_exists(pk)'
+                ConditionExpression='attribute_exists(pk) AND is_active = :active'
             )
-            
-            logger.info(f"Failed attempts updated for user {user_id}: {attempts}")
             return True
-            
+
         except ClientError as e:
-            logger.error(f"Error updating failed attempts for {user_id}: {e}")
-            return False
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"User not indexed (missing or inactive): {user_id}")
+                return False
+            logger.error(f"Error indexing user {user_id}: {e}")
+            raise
+
+    def get_job_state(self, job: str) -> Dict[str, Any]:
+        """State saved by a background job on its last run (empty if it never ran)"""
+        try:
+            response = self.table.get_item(
+                Key={'pk': f'{self.JOB_STATE_PREFIX}{job}', 'sk': 'STATE'}
+            )
+            return response.get('Item', {})
+
+        except ClientError as e:
+            logger.error(f"Error getting state of job {job}: {e}")
+            raise
+
+    def put_job_state(self, job: str, state: Dict[str, Any]) -> None:
+        """Replace a background job's saved state"""
+        try:
+            self.table.put_item(Item={
+                **state,
+                'pk': f'{self.JOB_STATE_PREFIX}{job}',
+                'sk': 'STATE',
+                'entity_type': 'job_state'
+            })
+
+        except ClientError as e:
+            logger.error(f"Error saving state of job {job}: {e}")
+            raise
+
+    def parallel_scan(self, segments: int = 4, filter_expression: Optional[str] = None,
+                      expression_values: Optional[Dict[str, Any]] = None,
+                      projection: Optional[List[str]] = None,
+                      max_workers: Optional[int] = None,
+                      expression_names: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every item of the table matching a filter with a segmented parallel scan
+
+        Each segment is paged by a worker thread on the (thread-safe) low-level
+        client; pages are handed over through a bounded queue, so items are
+        yielded as soon as any segment returns them and memory stays flat.
+        Closing the generator early stops the workers.
+
+        Args:
+            segments: TotalSegments of the scan
+            filter_expression: Optional FilterExpression
+            expression_values: ExpressionAttributeValues for the filter
+            projection: Attributes to return (default: whole items)
+            max_workers: Segments scanned at once (default: all of them)
+            expression_names: ExpressionAttributeNames for reserved words in the filter
+
+        Yields:
+            Items from every segment, in no particular order
+        """
+        if segments < 1:
+            raise ValueError("segments must be positive")
+
+        client = self.table.meta.client
+        base_kwargs = {'TableName': self.table_name}
+        if filter_expression:
+            base_kwargs['FilterExpression'] = filter_expression
+        if expression_values:
+            base_kwargs['ExpressionAttributeValues'] = expression_values
+        if projection:
+            base_kwargs.update(self._build_projection(projection))
+        if expression_names:
+            base_kwargs['ExpressionAttributeNames'] = {**base_kwargs.get('ExpressionAttributeNames', {}),
+                                                       **expression_names}
+
+        pages = queue.Queue(maxsize=segments * 2)
+        stop = threading.Event()
+        segment_done = object()
+
+        def hand_over(value) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment: int) -> None:
+            scan_kwargs = dict(base_kwargs, Segment=segment, TotalSegments=segments)
+            try:
+                while not stop.is_set():
+                    response = client.scan(**scan_kwargs)
+                    hand_over(response.get('Items', []))
+
+                    last_key = response.get('LastEvaluatedKey')
+                    if not last_key:
+                        break
+                    scan_kwargs['ExclusiveStartKey'] = last_key
+            except Exception as e:
+                hand_over(e)
+            finally:
+                hand_over(segment_done)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or segments)
+        for segment in range(segments):
+            executor.submit(scan_segment, segment)
+
+        finished = 0
+        try:
+            while finished < segments:
+                page = pages.get()
+                if page is segment_done:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    logger.error(f"Parallel scan failed: {page}")
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def record_failed_login(self, user_id: str, seen_attempts: int, max_attempts: int,
+                            lockout_until: str, seen_blocked_until: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically count a failed login and lock the account when it reaches max_attempts
+        
+        A single update_item does ADD failed_login_attempts :one. When this
+        attempt reaches the limit the same update also sets blocked_until. When
+        the stored lock has already expired the count restarts at one and the
+        lock is removed in that same update, so one wrong password after a
+        lockout does not lock the account again. The branch is picked from the
+        count and lock the caller already read and guarded by a condition; if a
+        concurrent attempt changed them, the current values come back with the
+        failed check and the right branch is used. If the item keeps changing
+        under it the attempt is given up and logged with locked unknown (None).
+        
+        Returns:
+            Dict with failed_login_attempts and locked, or None if the user does not exist
+        """
+        from datetime import datetime
+        
+        lock_at = max_attempts - 1
+        attempts = seen_attempts
+        blocked_until = seen_blocked_until
+        
+        for _ in range(3):
+            now = datetime.now().isoformat()
+            expired = blocked_until is not None and blocked_until <= now
+            if expired:
+                attempts = 0
+            lock = attempts >= lock_at
+            values = {
+                ':one': 1,
+                ':timestamp': now
+            }
+            if expired:
+                update_expression = 'SET failed_login_attempts = :one, updated_at = :timestamp'
+                values[':seen_block'] = blocked_until
+                condition = 'attribute_exists(pk) AND blocked_until = :seen_block'
+            else:
+                update_expression = 'ADD failed_login_attempts :one SET updated_at = :timestamp'
+                values[':lock_at'] = lock_at
+                values[':now'] = now
+                condition = 'attribute_exists(pk) AND (attribute_not_exists(blocked_until) OR blocked_until > :now) AND '
+                if lock:
+                    condition += 'failed_login_attempts >= :lock_at'
+                else:
+                    condition += '(attribute_not_exists(failed_login_attempts) OR failed_login_attempts < :lock_at)'
+            if lock:
+                update_expression += ', blocked_until = :blocked_until'
+                values[':blocked_until'] = lockout_until
+            elif expired:
+                update_expression += ' REMOVE blocked_until'
+            
+            try:
+                response = self.table.update_item(
+                    Key={
+                        'pk': f'USER#{user_id}',
+                        'sk': 'METADATA'
+                    },
+                    UpdateExpression=update_expression,
+                    ConditionExpression=condition,
+                    ExpressionAttributeValues=values,
+                    ReturnValues='UPDATED_NEW',
+                    ReturnValuesOnConditionCheckFailure='ALL_OLD'
+                )
+                new_attempts = int(response.get('Attributes', {}).get('failed_login_attempts', attempts + 1))
+                
+                if lock:
+                    logger.warning(f"User temporarily blocked after {new_attempts} failed attempts: {user_id}")
+                else:
+                    logger.info(f"Failed attempts for user {user_id}: {new_attempts}")
+                return {'failed_login_attempts': new_attempts, 'locked': lock}
+                
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    logger.error(f"Error recording failed login for {user_id}: {e}")
+                    raise
+                
+                current = e.response.get('Item')
+                if not current:
+                    logger.warning(f"Failed login recorded for missing user: {user_id}")
+                    return None
+                # Another attempt raced us (or the lock expired); retry with the stored values
+                attempts = int(current.get('failed_login_attempts', {}).get('N', 0))
+                blocked_until = current.get('blocked_until', {}).get('S')
+        
+        logger.error(f"Could not record failed login for user {user_id}: item kept changing")
+        return {'failed_login_attempts': attempts, 'locked': None}
 
     def successful_login(self, user_id: str) -> bool:
         """
@@ -263,7 +535,7 @@ class DynamoDBClient:
                     'pk': f'USER#{user_id}',
                     'sk': 'METADATA'
                 },
-                UpdateExpression='SET failed_login_attempts = :zero, last_login_at = :timestamp, updated_at = :timestamp',
+                UpdateExpression='SET failed_login_attempts = :zero, last_login_at = :timestamp, updated_at = :timestamp REMOVE blocked_until',
                 ExpressionAttributeValues={
                     ':zero': 0,
                     ':timestamp': now
@@ -278,36 +550,140 @@ class DynamoDBClient:
             logger.error(f"Error recording successful login for {user_id}: {e}")
             return False
 
-    def deactivate_user_temporarily(self, user_id: str) -> bool:
+    def rehash_password(self, user_id: str, old_hash: str, new_hash: str) -> bool:
         """
-        Temporarily deactivate user due to failed attempts
+        Replace a password hash created with an outdated bcrypt work factor
+        
+        Conditional on the stored hash being unchanged so a concurrent
+        password change is never overwritten.
         """
         try:
-            from datetime import datetime, timedelta
+            self.table.update_item(
+                Key={
+                    'pk': f'USER#{user_id}',
+                    'sk': 'METADATA'
+                },
+                UpdateExpression='SET password_hash = :new_hash',
+                ConditionExpression='password_hash = :old_hash',
+                ExpressionAttributeValues={
+                    ':new_hash': new_hash,
+                    ':old_hash': old_hash
+                }
+            )
             
-            # In a complete implementation, we could add a temporary block timestamp
-            # For now we just deactivate the account
-            now = datetime.now().isoformat()
+            logger.info(f"Password rehashed for user: {user_id}")
+            return True
+            
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"Password changed concurrently, skipping rehash for user: {user_id}")
+            else:
+                logger.error(f"Error rehashing password for {user_id}: {e}")
+            return False
+
+    def get_data_version(self, user_id: str) -> int:
+        """
+        Get the user's data version counter
+
+        Reads only the data_version attribute of USER#{user_id}/METADATA,
+        used to build ETags for conditional GET requests
+        """
+        try:
+            response = self.table.get_item(
+                Key={
+                    'pk': f'USER#{user_id}',
+                    'sk': 'METADATA'
+                },
+                ProjectionExpression='data_version'
+            )
+
+            item = response.get('Item') or {}
+            return int(item.get('data_version', 0))
+
+        except ClientError as e:
+            logger.error(f"Error getting data version for user {user_id}: {e}")
+            raise
+
+    def bump_data_version(self, user_id: str) -> Optional[int]:
+        """
+        Atomically increment the user's data version counter
+
+        Must be called after every write that changes data returned by
+        list endpoints (accounts, cards, transactions)
+        """
+        try:
             response = self.table.update_item(
                 Key={
                     'pk': f'USER#{user_id}',
                     'sk': 'METADATA'
                 },
-                UpdateExpression='SET is_active = :inactive, updated_at = :timestamp, blocked_until = :blocked_until',
+                UpdateExpression='ADD data_version :one',
                 ExpressionAttributeValues={
-                    ':inactive': False,
-                    ':timestamp': now,
-                    ':blocked_until': (datetime.now() + timedelta(hours=1)).isoformat()  # Block for 1 hour
+                    ':one': 1
                 },
-                ConditionExpression='attribute_exists(pk)'
+                ConditionExpression='attribute_exists(pk)',
+                ReturnValues='UPDATED_NEW'
             )
+
+            version = int(response['Attributes']['data_version'])
+            logger.info(f"Data version bumped for user {user_id}: {version}")
+            return version
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"User not found for data version bump: {user_id}")
+                return None
+            else:
+                logger.error(f"Error bumping data version for user {user_id}: {e}")
+                raise
+
+    def query_user_partition(self, user_id: str, exclude_attributes: Optional[List[str]] = None,
+                             sk_prefixes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Read every item in the USER#{user_id} partition (user metadata, accounts,
+        cards, transactions) following LastEvaluatedKey until the end
+        
+        Args:
+            user_id: User ID
+            exclude_attributes: Attributes dropped from each item (e.g. password_hash)
+            sk_prefixes: Only read these sort key ranges, one query each (skips the
+                snapshots, statements and statistics kept in the same partition)
+        
+        Returns:
+            List of raw items in sort key order
+        """
+        try:
+            items = []
+            pages = 0
+
+            for prefix in sk_prefixes or [None]:
+                query_kwargs = {
+                    'KeyConditionExpression': 'pk = :pk',
+                    'ExpressionAttributeValues': {':pk': f'USER#{user_id}'}
+                }
+                if prefix:
+                    query_kwargs['KeyConditionExpression'] += ' AND begins_with(sk, :prefix)'
+                    query_kwargs['ExpressionAttributeValues'][':prefix'] = prefix
+
+                while True:
+                    response = self.table.query(**query_kwargs)
+                    pages += 1
+                    for item in response.get('Items', []):
+                        for attribute in exclude_attributes or []:
+                            item.pop(attribute, None)
+                        items.append(item)
+
+                    last_key = response.get('LastEvaluatedKey')
+                    if not last_key:
+                        break
+                    query_kwargs['ExclusiveStartKey'] = last_key
             
-            logger.warning(f"User temporarily blocked: {user_id}")
-            return True
+            logger.info(f"Read {len(items)} items in {pages} page(s) for user {user_id}")
+            return items
             
         except ClientError as e:
-            logger.error(f"Error temporarily blocking user {user_id}: {e}")
-            return False
+            logger.error(f"Error querying partition for user {user_id}: {e}")
+            raise
 
     # -----------------------------------------------------------------------------
     # Account Operations
@@ -490,9 +866,15 @@ class DynamoDBClient:
                 logger.error(f"Error deleting account {account_id} for user {user_id}: {e}")
                 raise
     
-    def update_account_balance(self, user_id: str, account_id: str, amount: float, updated_at: str) -> Dict[str, Any]:
+    def update_account_balance(self, user_id: str, account_id: str, amount: float, updated_at: str,
+                               adjustment_id: Optional[str] = None,
+                               description: Optional[str] = None) -> Dict[str, Any]:
         """
         Update account balance by adding/subtracting amount
+
+        With an adjustment_id the change is also recorded as an ADJUSTMENT#
+        ledger row under GSI1 ACCOUNT#{account_id}, so reconciliation replays
+        it instead of reporting it as drift.
         """
         try:
             response = self.table.update_item(
@@ -511,7 +893,24 @@ class DynamoDBClient:
             )
             
             logger.info(f"Account balance updated: {account_id} for user {user_id}, amount: {amount}")
-            return response['Attributes']
+            account = response['Attributes']
+            if adjustment_id:
+                self.table.put_item(Item={
+                    'pk': f'USER#{user_id}',
+                    'sk': f'ADJUSTMENT#{adjustment_id}',
+                    'gsi1_pk': f'ACCOUNT#{account_id}',
+                    'gsi1_sk': f'ADJUSTMENT#{updated_at}#{adjustment_id}',
+                    'entity_type': 'balance_adjustment',
+                    'adjustment_id': adjustment_id,
+                    'user_id': user_id,
+                    'account_id': account_id,
+                    'amount': amount,
+                    'account_balance_after': account['current_balance'],
+                    'description': description,
+                    'transaction_date': updated_at,
+                    'created_at': updated_at
+                })
+            return account
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
@@ -521,10 +920,90 @@ class DynamoDBClient:
                 logger.error(f"Error updating balance for account {account_id}, user {user_id}: {e}")
                 raise
 
+    def set_account_balance(self, user_id: str, account_id: str, balance: Decimal, expected: Decimal,
+                            opening_balance: Decimal) -> bool:
+        """
+        Overwrite an account balance if it still holds the expected value
+
+        Used by ledger reconciliation, which also pins the opening balance it
+        derived so later runs do not depend on rewritten snapshots. A
+        concurrent transaction makes the condition fail and the account is
+        left for the next run.
+
+        Returns:
+            True if the balance was written
+        """
+        from datetime import datetime
+
+        try:
+            self.table.update_item(
+                Key={
+                    'pk': f'USER#{user_id}',
+                    'sk': f'ACCOUNT#{account_id}'
+                },
+                UpdateExpression=(
+                    'SET current_balance = :balance, '
+                    'opening_balance = if_not_exists(opening_balance, :opening), updated_at = :timestamp'
+                ),
+                ExpressionAttributeValues={
+                    ':balance': balance,
+                    ':expected': expected,
+                    ':opening': opening_balance,
+                    ':timestamp': datetime.now().isoformat()
+                },
+                ConditionExpression='attribute_exists(pk) AND current_balance = :expected'
+            )
+            logger.info(f"Account balance reconciled: {account_id} for user {user_id}, {expected} -> {balance}")
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"Account balance changed during reconciliation: {account_id} for user {user_id}")
+                return False
+            logger.error(f"Error reconciling balance for account {account_id}, user {user_id}: {e}")
+            raise
+
     # -------------------------------------------------------------------------
     # Card Methods
     # -------------------------------------------------------------------------
 
+    @classmethod
+    def card_index_keys(cls, card: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Sparse index keys a card should carry given its status and days
+
+        Active cards are indexed under CUTOFF#{dd} (GSI2) when they have a
+        cut-off day and under DUE#{dd} (GSI3) when they have a payment due day.
+        """
+        keys = {}
+        if card.get('status', 'active') != 'active':
+            return keys
+        if card.get('cut_off_date') is not None:
+            keys['gsi2_pk'] = f"{cls.CUT_OFF_INDEX_PREFIX}{int(card['cut_off_date']):02d}"
+            keys['gsi2_sk'] = f"CARD#{card['card_id']}"
+        if card.get('payment_due_date') is not None:
+            keys['gsi3_pk'] = f"{cls.DUE_INDEX_PREFIX}{int(card['payment_due_date']):02d}"
+            keys['gsi3_sk'] = f"CARD#{card['card_id']}"
+        return keys
+
+    def _sync_card_indexes(self, card: Dict[str, Any]) -> Dict[str, Any]:
+        """Set or remove a card's sparse index keys after its days or status changed"""
+        keys = self.card_index_keys(card)
+        stale = [name for name in self.CARD_INDEX_ATTRIBUTES if name not in keys and name in card]
+        if not stale and all(card.get(name) == value for name, value in keys.items()):
+            return card
+
+        clauses = []
+        update_kwargs = {'Key': {'pk': card['pk'], 'sk': card['sk']}, 'ReturnValues': 'ALL_NEW'}
+        if keys:
+            clauses.append('SET ' + ', '.join(f'{name} = :{name}' for name in keys))
+            update_kwargs['ExpressionAttributeValues'] = {f':{name}': value for name, value in keys.items()}
+        if stale:
+            clauses.append('REMOVE ' + ', '.join(stale))
+        update_kwargs['UpdateExpression'] = ' '.join(clauses)
+
+        return self.table.update_item(**update_kwargs)['Attributes']
+
     def create_card(self, card_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new card for a user
@@ -534,6 +1013,10 @@ class DynamoDBClient:
         - sk: CARD#{card_id}  
         - gsi1_pk: CARD#{card_id}
         - gsi1_sk: USER#{user_id}
+        - gsi2_pk: CUTOFF#{dd} (sparse: active cards with a cut-off day)
+        - gsi2_sk: CARD#{card_id}
+        - gsi3_pk: DUE#{dd} (sparse: active cards with a payment due day)
+        - gsi3_sk: CARD#{card_id}
         - entity_type: card
         """
         try:
@@ -567,6 +1050,7 @@ class DynamoDBClient:
                 'created_at': card_data['created_at'],
                 'updated_at': card_data['updated_at']
             }
+            item.update(self.card_index_keys(item))
             
             # Put item to DynamoDB
             self.table.put_item(Item=item)
@@ -602,6 +1086,17 @@ class DynamoDBClient:
             logger.error(f"Error getting card {card_id} for user {user_id}: {e}")
             raise
 
+    # Fields a card item must carry to be listed
+    CARD_REQUIRED_FIELDS = [
+        'card_id', 'user_id', 'name', 'card_type', 'card_network',
+        'bank_name', 'currency', 'status', 'created_at', 'updated_at'
+    ]
+
+    @classmethod
+    def is_valid_card(cls, item: Dict[str, Any]) -> bool:
+        """Check a card item has every required field present and non-empty"""
+        return all(item.get(field) for field in cls.CARD_REQUIRED_FIELDS)
+
     def list_user_cards(self, user_id: str, include_inactive: bool = False) -> List[Dict[str, Any]]:
         """
         List all cards for a user
@@ -627,18 +1122,13 @@ class DynamoDBClient:
             raw_cards = [item for item in response['Items'] if item.get('entity_type') == 'card']
             
             # Validate each item has required fields (defensive filtering)
-            required_fields = [
-                'card_id', 'user_id', 'name', 'card_type', 'card_network',
-                'bank_name', 'currency', 'status', 'created_at', 'updated_at'
-            ]
-            
             valid_cards = []
             for item in raw_cards:
                 # Check if all required fields are present and non-empty
-                if all(item.get(field) for field in required_fields):
+                if self.is_valid_card(item):
                     valid_cards.append(item)
                 else:
-                    missing = [f for f in required_fields if not item.get(f)]
+                    missing = [f for f in self.CARD_REQUIRED_FIELDS if not item.get(f)]
                     logger.warning(
                         f"Skipping malformed card for user {user_id}: "
                         f"card_id={item.get('card_id', 'UNKNOWN')}, "
@@ -663,7 +1153,7 @@ class DynamoDBClient:
             expression_names = {}
             
             for key, value in update_data.items():
-                if key not in ['user_id', 'card_id', 'pk', 'sk', 'entity_type']:
+                if key not in ['user_id', 'card_id', 'pk', 'sk', 'entity_type', *self.CARD_INDEX_ATTRIBUTES]:
                     attr_name = f"#{key}"
                     attr_value = f":{key}"
                     update_expression += f"{attr_name} = {attr_value}, "
@@ -689,7 +1179,10 @@ class DynamoDBClient:
             )
             
             logger.info(f"Card updated: {card_id} for user {user_id}")
-            return response['Attributes']
+            card = response['Attributes']
+            if {'cut_off_date', 'payment_due_date', 'status'} & update_data.keys():
+                card = self._sync_card_indexes(card)
+            return card
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
@@ -709,7 +1202,7 @@ class DynamoDBClient:
                     'pk': f'USER#{user_id}',
                     'sk': f'CARD#{card_id}'
                 },
-                UpdateExpression='SET #status = :status, updated_at = :updated_at',
+                UpdateExpression='SET #status = :status, updated_at = :updated_at REMOVE gsi2_pk, gsi2_sk, gsi3_pk, gsi3_sk',
                 ExpressionAttributeNames={'#status': 'status'},
                 ExpressionAttributeValues={
                     ':status': 'inactive',
@@ -731,94 +1224,322 @@ class DynamoDBClient:
                 logger.error(f"Error deleting card {card_id} for user {user_id}: {e}")
                 raise
 
-    # ===========================
-    # TRANSACTION OPERATIONS
-    # ===========================
+    @staticmethod
+    def card_transaction_item(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a card transaction item
 
-    def create_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        Single Table Design for Card Transaction:
+        - pk: CARD#{card_id}#CYCLE#{yyyy-mm}  (billing cycle closed by cut_off_date)
+        - sk: TRANSACTION#{transaction_date}#{card_transaction_id}
+        - gsi1_pk: CARD#{card_id}
+        - gsi1_sk: TRANSACTION#{transaction_date}#{card_transaction_id}
+        - entity_type: card_transaction
         """
-        Create a new transaction in DynamoDB
-        
-        Single Table Design:
-        - pk: USER#{user_id}
-        - sk: TRANSACTION#{transaction_id}
-        - gsi1_pk: ACCOUNT#{account_id}
-        - gsi1_sk: TRANSACTION#{transaction_date}#{transaction_id}
+        card_id = transaction_data['card_id']
+        transaction_id = transaction_data['card_transaction_id']
+        sort_key = f"TRANSACTION#{transaction_data['transaction_date']}#{transaction_id}"
+
+        return {
+            'pk': f"CARD#{card_id}#CYCLE#{transaction_data['cycle']}",
+            'sk': sort_key,
+            'gsi1_pk': f'CARD#{card_id}',
+            'gsi1_sk': sort_key,
+            'entity_type': 'card_transaction',
+            'card_transaction_id': transaction_id,
+            'card_id': card_id,
+            'user_id': transaction_data['user_id'],
+            'cycle': transaction_data['cycle'],
+            'transaction_type': transaction_data['transaction_type'],
+            'amount': transaction_data['amount'],
+            'balance_delta': transaction_data['balance_delta'],
+            'description': transaction_data['description'],
+            'transaction_date': transaction_data['transaction_date'],
+            'created_at': transaction_data['created_at']
+        }
+
+    def create_card_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """
+        Store a card transaction and apply it to the card balance atomically
+
+        The item put and the `ADD current_balance` on the card run in one
+        TransactWriteItems, so history and balance never diverge.
+        """
+        user_id = transaction_data['user_id']
+        card_id = transaction_data['card_id']
+        transaction_id = transaction_data['card_transaction_id']
+        item = self.card_transaction_item(transaction_data)
+
         try:
-            transaction_id = transaction_data['transaction_id']
-            user_id = transaction_data['user_id']
-            account_id = transaction_data['account_id']
-            transaction_date = transaction_data['transaction_date']
-            
-            item = {
-                'pk': f'USER#{user_id}',
-                'sk': f'TRANSACTION#{transaction_id}',
-                'gsi1_pk': f'ACCOUNT#{account_id}',
-                'gsi1_sk': f'TRANSACTION#{transaction_date}#{transaction_id}',
-                'entity_type': 'transaction',
-                'transaction_id': transaction_id,
-                'user_id': user_id,
-                'account_id': account_id,
-                'account_name': transaction_data['account_name'],
-                'amount': Decimal(str(transaction_data['amount'])),
-                'description': transaction_data['description'],
-                'transaction_type': transaction_data['transaction_type'],
-                'category': transaction_data['category'],
-                'status': transaction_data['status'],
-                'transaction_date': transaction_date,
-                'reference_number': transaction_data.get('reference_number'),
-                'notes': transaction_data.get('notes'),
-                'tags': transaction_data.get('tags', []),
-                'location': transaction_data.get('location'),
-                'destination_account_id': transaction_data.get('destination_account_id'),
-                'destination_account_name': transaction_data.get('destination_account_name'),
-                'account_balance_after': Decimal(str(transaction_data['account_balance_after'])),
-                'is_recurring': transaction_data.get('is_recurring', False),
-                'recurring_frequency': transaction_data.get('recurring_frequency'),
-                'created_at': transaction_data['created_at'],
-                'updated_at': transaction_data['updated_at']
-            }
-            
-            # Use ConditionExpression to avoid duplicates
-            response = self.table.put_item(
-                Item=item,
-                ConditionExpression='attribute_not_exists(pk) AND attribute_not_exists(sk)'
-            )
-            
-            logger.info(f"Transaction created successfully: {transaction_id}")
-            
-            # Convert Decimal back to float for response
-            item['amount'] = float(item['amount'])
-            item['account_balance_after'] = float(item['account_balance_after'])
-            
+            self.table.meta.client.transact_write_items(TransactItems=[
+                {
+                    'Put': {
+                        'TableName': self.table_name,
+                        'Item': item,
+                        'ConditionExpression': 'attribute_not_exists(pk)'
+                    }
+                },
+                {
+                    'Update': {
+                        'TableName': self.table_name,
+                        'Key': {
+                            'pk': f'USER#{user_id}',
+                            'sk': f'CARD#{card_id}'
+                        },
+                        'UpdateExpression': 'ADD current_balance :delta SET updated_at = :timestamp',
+                        'ExpressionAttributeValues': {
+                            ':delta': transaction_data['balance_delta'],
+                            ':timestamp': transaction_data['created_at'],
+                            ':entity_type': 'card'
+                        },
+                        'ConditionExpression': 'attribute_exists(pk) AND entity_type = :entity_type'
+                    }
+                }
+            ])
+
+            logger.info(f"Card transaction created: {transaction_id} on card {card_id} for user {user_id}")
             return item
-            
+
         except ClientError as e:
-            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
-                logger.error(f"Transaction already exists: {transaction_id}")
-                raise ValueError("Transaction already exists")
-            else:
-                logger.error(f"Error creating transaction: {e}")
-                raise
+            if e.response['Error']['Code'] == 'TransactionCanceledException':
+                logger.error(f"Card transaction rejected for card {card_id}, user {user_id}: {e}")
+                raise ValueError("Card not found")
+            logger.error(f"Error creating card transaction for card {card_id}, user {user_id}: {e}")
+            raise
 
-    def get_transaction_by_id(self, user_id: str, transaction_id: str) -> Optional[Dict[str, Any]]:
-        """Get transaction by ID"""
+    def list_card_cycle_transactions(self, user_id: str, card_id: str, cycle: str) -> List[Dict[str, Any]]:
+        """
+        List a card's transactions for one billing cycle (single partition, date order)
+        """
+        try:
+            transactions = []
+            query_kwargs = {
+                'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :prefix)',
+                'ExpressionAttributeValues': {
+                    ':pk': f'CARD#{card_id}#CYCLE#{cycle}',
+                    ':prefix': 'TRANSACTION#'
+                }
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                # Data isolation: only the card owner's items
+                transactions.extend(item for item in response.get('Items', []) if item.get('user_id') == user_id)
+
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_kwargs['ExclusiveStartKey'] = last_key
+
+            logger.info(f"Found {len(transactions)} transactions for card {card_id} cycle {cycle}")
+            return transactions
+
+        except ClientError as e:
+            logger.error(f"Error listing transactions for card {card_id}, cycle {cycle}: {e}")
+            raise
+
+    def get_statement(self, user_id: str, card_id: str, cycle: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the statement of a closed card cycle
+        """
         try:
             response = self.table.get_item(
                 Key={
                     'pk': f'USER#{user_id}',
-                    'sk': f'TRANSACTION#{transaction_id}'
+                    'sk': f'STATEMENT#{card_id}#{cycle}'
                 }
             )
-            
-            item = response.get('Item')
-            if item:
-                # Convert Decimal to float
-                item['amount'] = float(item['amount'])
-                item['account_balance_after'] = float(item['account_balance_after'])
-                logger.info(f"Transaction found: {transaction_id}")
-                return item
+            return response.get('Item')
+
+        except ClientError as e:
+            logger.error(f"Error getting statement {cycle} of card {card_id} for user {user_id}: {e}")
+            raise
+
+    def create_statement(self, statement: Dict[str, Any]) -> bool:
+        """
+        Persist an immutable card statement and copy its figures onto the card
+
+        Single Table Design for Statement:
+        - pk: USER#{user_id}
+        - sk: STATEMENT#{card_id}#{cycle}
+        - gsi1_pk: CARD#{card_id}
+        - gsi1_sk: STATEMENT#{cycle}
+        - entity_type: statement
+
+        The card only takes the figures of its newest statement, so closing
+        an older cycle late does not overwrite them.
+
+        Returns:
+            True if created, False if the cycle already had a statement
+        """
+        user_id = statement['user_id']
+        card_id = statement['card_id']
+        cycle = statement['cycle']
+
+        item = {
+            'pk': f'USER#{user_id}',
+            'sk': f'STATEMENT#{card_id}#{cycle}',
+            'gsi1_pk': f'CARD#{card_id}',
+            'gsi1_sk': f'STATEMENT#{cycle}',
+            'entity_type': 'statement',
+            **statement
+        }
+
+        try:
+            self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(pk)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"Statement {cycle} of card {card_id} already exists")
+                return False
+            logger.error(f"Error creating statement {cycle} of card {card_id} for user {user_id}: {e}")
+            raise
+
+        try:
+            self.table.update_item(
+                Key={
+                    'pk': f'USER#{user_id}',
+                    'sk': f'CARD#{card_id}'
+                },
+                UpdateExpression=(
+                    'SET statement_balance = :balance, minimum_payment = :minimum, '
+                    'revolving_balance = :revolving, next_payment_due = :due, last_statement_cycle = :cycle'
+                ),
+                ExpressionAttributeValues={
+                    ':balance': statement['statement_balance'],
+                    ':minimum': statement['minimum_payment'],
+                    ':revolving': statement['revolving_balance'],
+                    ':due': statement['payment_due_date'],
+                    ':cycle': cycle
+                },
+                ConditionExpression=(
+                    'attribute_exists(pk) AND '
+                    '(attribute_not_exists(last_statement_cycle) OR last_statement_cycle < :cycle)'
+                )
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.info(f"Card {card_id} already shows a newer statement than {cycle}")
+
+        logger.info(f"Statement created: {cycle} of card {card_id} for user {user_id}")
+        return True
+
+    # ===========================
+    # TRANSACTION OPERATIONS
+    # ===========================
+
+    @classmethod
+    def transaction_item(cls, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a transaction item
+
+        Single Table Design:
+        - pk: USER#{user_id}
+        - sk: TRANSACTION#{transaction_id}
+        - gsi1_pk: ACCOUNT#{account_id}
+        - gsi1_sk: TRANSACTION#{transaction_date}#{transaction_id}
+        - gsi2_pk: RECUR#{recurring_index_date or next_run_date} (sparse: recurring templates only)
+        - gsi2_sk: USER#{user_id}#TRANSACTION#{transaction_id}
+        - gsi3_pk: ALERT#{user_id} (sparse: flagged transactions only)
+        - gsi3_sk: {transaction_date}#{transaction_id}
+        """
+        transaction_id = transaction_data['transaction_id']
+        user_id = transaction_data['user_id']
+        account_id = transaction_data['account_id']
+        transaction_date = transaction_data['transaction_date']
+
+        item = {
+            'pk': f'USER#{user_id}',
+            'sk': f'TRANSACTION#{transaction_id}',
+            'gsi1_pk': f'ACCOUNT#{account_id}',
+            'gsi1_sk': f'TRANSACTION#{transaction_date}#{transaction_id}',
+            'entity_type': 'transaction',
+            'transaction_id': transaction_id,
+            'user_id': user_id,
+            'account_id': account_id,
+            'account_name': transaction_data['account_name'],
+            'amount': Decimal(str(transaction_data['amount'])),
+            'description': transaction_data['description'],
+            'transaction_type': transaction_data['transaction_type'],
+            'category': transaction_data['category'],
+            'status': transaction_data['status'],
+            'transaction_date': transaction_date,
+            'reference_number': transaction_data.get('reference_number'),
+            'notes': transaction_data.get('notes'),
+            'tags': transaction_data.get('tags', []),
+            'location': transaction_data.get('location'),
+            'destination_account_id': transaction_data.get('destination_account_id'),
+            'destination_account_name': transaction_data.get('destination_account_name'),
+            'account_balance_after': Decimal(str(transaction_data['account_balance_after'])),
+            'is_recurring': transaction_data.get('is_recurring', False),
+            'recurring_frequency': transaction_data.get('recurring_frequency'),
+            'created_at': transaction_data['created_at'],
+            'updated_at': transaction_data['updated_at']
+        }
+        if transaction_data.get('next_run_date'):
+            item['next_run_date'] = transaction_data['next_run_date']
+            index_date = transaction_data.get('recurring_index_date') or transaction_data['next_run_date']
+            item['gsi2_pk'] = f"{cls.RECURRING_INDEX_PREFIX}{index_date}"
+            item['gsi2_sk'] = f'USER#{user_id}#TRANSACTION#{transaction_id}'
+        if transaction_data.get('recurring_template_id'):
+            item['recurring_template_id'] = transaction_data['recurring_template_id']
+        if transaction_data.get('anomaly_flags'):
+            item['anomaly_flags'] = transaction_data['anomaly_flags']
+            if transaction_data.get('anomaly_score') is not None:
+                item['anomaly_score'] = Decimal(str(transaction_data['anomaly_score']))
+            item['gsi3_pk'] = f'{cls.ALERT_INDEX_PREFIX}{user_id}'
+            item['gsi3_sk'] = f'{transaction_date}#{transaction_id}'
+        return item
+
+    def create_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a new transaction in DynamoDB (see transaction_item for the keys)
+        """
+        try:
+            transaction_id = transaction_data['transaction_id']
+            item = self.transaction_item(transaction_data)
+            
+            # Use ConditionExpression to avoid duplicates
+            response = self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(pk) AND attribute_not_exists(sk)'
+            )
+            
+            logger.info(f"Transaction created successfully: {transaction_id}")
+            
+            # Convert Decimal back to float for response
+            item['amount'] = float(item['amount'])
+            item['account_balance_after'] = float(item['account_balance_after'])
+            
+            return item
+            
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.error(f"Transaction already exists: {transaction_id}")
+                raise ValueError("Transaction already exists")
+            else:
+                logger.error(f"Error creating transaction: {e}")
+                raise
+
+    def get_transaction_by_id(self, user_id: str, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Get transaction by ID"""
+        try:
+            response = self.table.get_item(
+                Key={
+                    'pk': f'USER#{user_id}',
+                    'sk': f'TRANSACTION#{transaction_id}'
+                }
+            )
+            
+            item = response.get('Item')
+            if item:
+                # Convert Decimal to float
+                item['amount'] = float(item['amount'])
+                item['account_balance_after'] = float(item['account_balance_after'])
+                logger.info(f"Transaction found: {transaction_id}")
+                return item
             else:
                 logger.info(f"Transaction not found: {transaction_id}")
                 return None
@@ -846,7 +1567,8 @@ class DynamoDBClient:
                         update_expression += f', {key} = :{key}'
                     expression_values[f':{key}'] = value
             
-            # Update item
+            # Update item (boto3 rejects ExpressionAttributeNames=None, so only pass it when used)
+            optional_params = {'ExpressionAttributeNames': expression_names} if expression_names else {}
             response = self.table.update_item(
                 Key={
                     'pk': f'USER#{user_id}',
@@ -854,9 +1576,9 @@ class DynamoDBClient:
                 },
                 UpdateExpression=update_expression,
                 ExpressionAttributeValues=expression_values,
-                ExpressionAttributeNames=expression_names if expression_names else None,
                 ConditionExpression='attribute_exists(pk)',
-                ReturnValues='ALL_NEW'
+                ReturnValues='ALL_NEW',
+                **optional_params
             )
             
             updated_item = response['Attributes']
@@ -898,16 +1620,51 @@ class DynamoDBClient:
                 logger.error(f"Error deleting transaction {transaction_id}: {e}")
                 raise
 
-    def list_user_transactions(self, user_id: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    # Attributes each filter reads, fetched even when not requested by the caller
+    TRANSACTION_FILTER_ATTRIBUTES = {
+        'transaction_type': ['transaction_type'],
+        'category': ['category'],
+        'status': ['status'],
+        'date_from': ['transaction_date'],
+        'date_to': ['transaction_date'],
+        'amount_min': ['amount'],
+        'amount_max': ['amount'],
+        'search_term': ['description', 'notes', 'reference_number'],
+        'tags': ['tags'],
+    }
+
+    def _build_projection(self, attributes: List[str]) -> Dict[str, Any]:
+        """Build ProjectionExpression kwargs using placeholders (avoids reserved words like status)"""
+        names = {f'#p{i}': attribute for i, attribute in enumerate(attributes)}
+        return {
+            'ProjectionExpression': ', '.join(names.keys()),
+            'ExpressionAttributeNames': names
+        }
+
+    def list_user_transactions(self, user_id: str, filters: Dict[str, Any] = None,
+                               projection: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         List user transactions with optional filtering
         
         Uses pk = USER#{user_id} and sk begins_with TRANSACTION#
         For account-specific queries, uses GSI1
+        
+        When projection is given only those attributes (plus the ones needed by
+        the filters) are read from DynamoDB.
         """
         try:
             transactions = []
             
+            query_kwargs = {}
+            if projection:
+                attributes = list(dict.fromkeys(projection))
+                for key, value in (filters or {}).items():
+                    if value is not None:
+                        attributes.extend(self.TRANSACTION_FILTER_ATTRIBUTES.get(key, []))
+                if filters and filters.get('account_id'):
+                    attributes.append('user_id')
+                query_kwargs = self._build_projection(list(dict.fromkeys(attributes)))
+            
             # If filtering by account_id, use GSI1 for better performance
             if filters and filters.get('account_id'):
                 account_id = filters['account_id']
@@ -919,16 +1676,14 @@ class DynamoDBClient:
                     ExpressionAttributeValues={
                         ':account_pk': f'ACCOUNT#{account_id}'
                     },
-                    ScanIndexForward=False  # Most recent first
+                    ScanIndexForward=False,  # Most recent first
+                    **query_kwargs
                 )
                 
                 # Filter by user_id to ensure data isolation
                 for item in response.get('Items', []):
                     if item.get('user_id') == user_id:
-                        # Convert Decimal to float
-                        item['amount'] = float(item['amount'])
-                        item['account_balance_after'] = float(item['account_balance_after'])
-                        transactions.append(item)
+                        transactions.append(self._convert_transaction_numbers(item))
             
             else:
                 # Query all user transactions
@@ -938,14 +1693,12 @@ class DynamoDBClient:
                         ':user_pk': f'USER#{user_id}',
                         ':transaction_prefix': 'TRANSACTION#'
                     },
-                    ScanIndexForward=False  # Most recent first
+                    ScanIndexForward=False,  # Most recent first
+                    **query_kwargs
                 )
                 
                 for item in response.get('Items', []):
-                    # Convert Decimal to float
-                    item['amount'] = float(item['amount'])
-                    item['account_balance_after'] = float(item['account_balance_after'])
-                    transactions.append(item)
+                    transactions.append(self._convert_transaction_numbers(item))
             
             # Apply additional filters
             if filters:
@@ -958,6 +1711,13 @@ class DynamoDBClient:
             logger.error(f"Error listing transactions for user {user_id}: {e}")
             raise
 
+    def _convert_transaction_numbers(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert Decimal amounts to float, tolerating projected-out attributes"""
+        for key in ('amount', 'account_balance_after', 'anomaly_score'):
+            if key in item:
+                item[key] = float(item[key])
+        return item
+
     def _filter_transactions(self, transactions: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Apply filters to transaction list"""
         filtered = transactions
@@ -1037,3 +1797,596 @@ class DynamoDBClient:
             filtered = filtered_by_tags
         
         return filtered
+
+    # ===========================
+    # SUBSCRIPTION OPERATIONS
+    # ===========================
+
+    def list_subscriptions(self, user_id: str) -> List[Dict[str, Any]]:
+        """
+        List the recurring payments detected for a user
+
+        Single Table Design:
+        - pk: USER#{user_id}
+        - sk: SUBSCRIPTION#{subscription_id}
+        """
+        try:
+            subscriptions = []
+            query_kwargs = {
+                'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk_prefix)',
+                'ExpressionAttributeValues': {
+                    ':pk': f'USER#{user_id}',
+                    ':sk_prefix': 'SUBSCRIPTION#'
+                }
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                subscriptions.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            logger.info(f"Found {len(subscriptions)} subscriptions for user {user_id}")
+            return subscriptions
+
+        except ClientError as e:
+            logger.error(f"Error listing subscriptions for user {user_id}: {e}")
+            raise
+
+    def replace_subscriptions(self, user_id: str, subscriptions: List[Dict[str, Any]]) -> int:
+        """
+        Store a user's detected subscriptions, deleting those no longer detected
+
+        Returns:
+            Number of stale subscriptions deleted
+        """
+        try:
+            existing = {item['sk'] for item in self.list_subscriptions(user_id)}
+            current = set()
+
+            with self.table.batch_writer() as writer:
+                for subscription in subscriptions:
+                    sk = f"SUBSCRIPTION#{subscription['subscription_id']}"
+                    current.add(sk)
+                    writer.put_item(Item={
+                        **subscription,
+                        'pk': f'USER#{user_id}',
+                        'sk': sk,
+                        'entity_type': 'subscription',
+                        'user_id': user_id
+                    })
+                for sk in existing - current:
+                    writer.delete_item(Key={'pk': f'USER#{user_id}', 'sk': sk})
+
+            logger.info(f"Stored {len(current)} subscriptions for user {user_id}")
+            return len(existing - current)
+
+        except ClientError as e:
+            logger.error(f"Error storing subscriptions for user {user_id}: {e}")
+            raise
+
+    # ===========================
+    # BUDGET OPERATIONS
+    # ===========================
+
+    def create_budget(self, budget_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a category budget
+
+        Single Table Design:
+        - pk: USER#{user_id}
+        - sk: BUDGET#{category}
+        - entity_type: budget
+        One item per category; `spent` counts the expenses of `period` (YYYY-MM)
+        """
+        user_id = budget_data['user_id']
+        category = budget_data['category']
+        item = {
+            'pk': f'USER#{user_id}',
+            'sk': f'BUDGET#{category}',
+            'entity_type': 'budget',
+            **budget_data,
+            'amount': Decimal(str(budget_data['amount'])),
+            'alert_threshold': Decimal(str(budget_data['alert_threshold'])),
+            'spent': Decimal(str(budget_data.get('spent', 0)))
+        }
+
+        try:
+            self.table.put_item(Item=item, ConditionExpression='attribute_not_exists(pk)')
+            logger.info(f"Budget created: {category} for user {user_id}")
+            return item
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.error(f"Budget already exists: {category} for user {user_id}")
+                raise ValueError("Budget already exists")
+            logger.error(f"Error creating budget {category} for user {user_id}: {e}")
+            raise
+
+    def get_budget(self, user_id: str, category: str) -> Optional[Dict[str, Any]]:
+        """Get a category budget"""
+        try:
+            response = self.table.get_item(Key={'pk': f'USER#{user_id}', 'sk': f'BUDGET#{category}'})
+            return response.get('Item')
+
+        except ClientError as e:
+            logger.error(f"Error getting budget {category} for user {user_id}: {e}")
+            raise
+
+    def list_budgets(self, user_id: str) -> List[Dict[str, Any]]:
+        """List a user's budgets"""
+        try:
+            budgets = []
+            query_kwargs = {
+                'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk_prefix)',
+                'ExpressionAttributeValues': {
+                    ':pk': f'USER#{user_id}',
+                    ':sk_prefix': 'BUDGET#'
+                }
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                budgets.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            logger.info(f"Found {len(budgets)} budgets for user {user_id}")
+            return budgets
+
+        except ClientError as e:
+            logger.error(f"Error listing budgets for user {user_id}: {e}")
+            raise
+
+    def update_budget(self, user_id: str, category: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update a budget's limit or alert threshold
+
+        Returns:
+            Updated item, None if the budget does not exist
+        """
+        update_expression = 'SET updated_at = :updated_at'
+        expression_values = {':updated_at': update_data['updated_at']}
+        for key in ('amount', 'alert_threshold'):
+            if update_data.get(key) is not None:
+                update_expression += f', {key} = :{key}'
+                expression_values[f':{key}'] = Decimal(str(update_data[key]))
+
+        try:
+            response = self.table.update_item(
+                Key={'pk': f'USER#{user_id}', 'sk': f'BUDGET#{category}'},
+                UpdateExpression=update_expression,
+                ExpressionAttributeValues=expression_values,
+                ConditionExpression='attribute_exists(pk)',
+                ReturnValues='ALL_NEW'
+            )
+            logger.info(f"Budget updated: {category} for user {user_id}")
+            return response['Attributes']
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.error(f"Budget not found for update: {category} for user {user_id}")
+                return None
+            logger.error(f"Error updating budget {category} for user {user_id}: {e}")
+            raise
+
+    def delete_budget(self, user_id: str, category: str) -> bool:
+        """Delete a budget"""
+        try:
+            self.table.delete_item(
+                Key={'pk': f'USER#{user_id}', 'sk': f'BUDGET#{category}'},
+                ConditionExpression='attribute_exists(pk)'
+            )
+            logger.info(f"Budget deleted: {category} for user {user_id}")
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.error(f"Budget not found for deletion: {category} for user {user_id}")
+                return False
+            logger.error(f"Error deleting budget {category} for user {user_id}: {e}")
+            raise
+
+    def add_budget_spend(self, user_id: str, category: str, period: str, currency: str,
+                         amount: Decimal, timestamp: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically add an expense to a budget's spent counter
+
+        The `ADD` only applies while the budget counts the same period and
+        currency. A budget still on an earlier period is moved to this one with
+        `spent` restarted at the amount (only for positive amounts); anything
+        else (no budget, an older period, another currency) is left untouched.
+
+        Returns:
+            Updated budget, None when no counter changed
+        """
+        key = {'pk': f'USER#{user_id}', 'sk': f'BUDGET#{category}'}
+        try:
+            response = self.table.update_item(
+                Key=key,
+                UpdateExpression='ADD spent :amount SET updated_at = :timestamp',
+                ConditionExpression='attribute_exists(pk) AND #period = :period AND currency = :currency',
+                ExpressionAttributeNames={'#period': 'period'},
+                ExpressionAttributeValues={':amount': amount, ':timestamp': timestamp,
+                                           ':period': period, ':currency': currency},
+                ReturnValues='ALL_NEW',
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+            return response['Attributes']
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                logger.error(f"Error adding spend to budget {category} for user {user_id}: {e}")
+                raise
+            # Item is in low-level format here; absent when there is no budget
+            current = e.response.get('Item')
+            if not current or amount <= 0 or current['period']['S'] >= period:
+                return None
+
+        try:
+            response = self.table.update_item(
+                Key=key,
+                UpdateExpression='SET spent = :amount, #period = :period, updated_at = :timestamp',
+                ConditionExpression='attribute_exists(pk) AND #period < :period AND currency = :currency',
+                ExpressionAttributeNames={'#period': 'period'},
+                ExpressionAttributeValues={':amount': amount, ':timestamp': timestamp,
+                                           ':period': period, ':currency': currency},
+                ReturnValues='ALL_NEW'
+            )
+            logger.info(f"Budget {category} for user {user_id} moved to period {period}")
+            return response['Attributes']
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            logger.error(f"Error starting budget {category} period {period} for user {user_id}: {e}")
+            raise
+
+    def set_budget_spent(self, user_id: str, category: str, period: str, spent: Decimal, timestamp: str) -> bool:
+        """
+        Overwrite a budget's spent counter (used by the rebuild job)
+
+        Returns:
+            False if the budget was deleted meanwhile
+        """
+        try:
+            self.table.update_item(
+                Key={'pk': f'USER#{user_id}', 'sk': f'BUDGET#{category}'},
+                UpdateExpression='SET spent = :spent, #period = :period, updated_at = :timestamp',
+                ConditionExpression='attribute_exists(pk)',
+                ExpressionAttributeNames={'#period': 'period'},
+                ExpressionAttributeValues={':spent': spent, ':period': period, ':timestamp': timestamp}
+            )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            logger.error(f"Error setting budget {category} spent for user {user_id}: {e}")
+            raise
+
+    # ===========================
+    # NET WORTH OPERATIONS
+    # ===========================
+
+    def put_net_worth_snapshots(self, snapshot_date: str, snapshots: Dict[str, Dict[str, Any]],
+                                timestamp: str) -> int:
+        """
+        Store one day's net-worth snapshot for several users in batched writes
+
+        Single Table Design:
+        - pk: USER#{user_id}
+        - sk: NETWORTH#{date}
+
+        Args:
+            snapshot_date: Day of the snapshots (YYYY-MM-DD)
+            snapshots: Totals by user_id (Decimal amounts)
+            timestamp: created_at of the items
+
+        Returns:
+            Number of snapshots written
+        """
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=['pk', 'sk']) as writer:
+                for user_id, totals in snapshots.items():
+                    writer.put_item(Item={
+                        **totals,
+                        'pk': f'USER#{user_id}',
+                        'sk': f'NETWORTH#{snapshot_date}',
+                        'entity_type': 'net_worth',
+                        'user_id': user_id,
+                        'snapshot_date': snapshot_date,
+                        'created_at': timestamp
+                    })
+            logger.info(f"Stored {len(snapshots)} net-worth snapshots for {snapshot_date}")
+            return len(snapshots)
+
+        except ClientError as e:
+            logger.error(f"Error storing net-worth snapshots for {snapshot_date}: {e}")
+            raise
+
+    def list_net_worth_snapshots(self, user_id: str, date_from: str, date_to: str) -> List[Dict[str, Any]]:
+        """
+        Net-worth snapshots of a user between two dates (inclusive), oldest first
+        """
+        try:
+            snapshots = []
+            query_kwargs = {
+                'KeyConditionExpression': 'pk = :pk AND sk BETWEEN :start AND :end',
+                'ExpressionAttributeValues': {
+                    ':pk': f'USER#{user_id}',
+                    ':start': f'NETWORTH#{date_from}',
+                    ':end': f'NETWORTH#{date_to}'
+                }
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                snapshots.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            logger.info(f"Found {len(snapshots)} net-worth snapshots for user {user_id}")
+            return snapshots
+
+        except ClientError as e:
+            logger.error(f"Error listing net-worth snapshots for user {user_id}: {e}")
+            raise
+
+    # ===========================
+    # SPEND DISTRIBUTION OPERATIONS
+    # ===========================
+
+    def add_spend_distribution(self, user_id: str, currency: str, category: str, period: str,
+                               deltas: Dict[str, Decimal], timestamp: str) -> None:
+        """
+        Add counters to a month's spending distribution with one atomic ADD
+
+        Single Table Design:
+        - pk: USER#{user_id}
+        - sk: SPENDDIST#{currency}#{category}#{period}
+        """
+        try:
+            names = {f'#c{index}': name for index, name in enumerate(deltas)}
+            values = {f':c{index}': delta for index, delta in enumerate(deltas.values())}
+            self.table.update_item(
+                Key={'pk': f'USER#{user_id}', 'sk': f'SPENDDIST#{currency}#{category}#{period}'},
+                UpdateExpression=(
+                    'SET entity_type = :entity, user_id = :user, currency = :currency, '
+                    'category = :category, #period = :period, updated_at = :timestamp '
+                    'ADD ' + ', '.join(f'{name} {value}' for name, value in zip(names, values))
+                ),
+                ExpressionAttributeNames={**names, '#period': 'period'},
+                ExpressionAttributeValues={
+                    **values, ':entity': 'spend_distribution', ':user': user_id, ':currency': currency,
+                    ':category': category, ':period': period, ':timestamp': timestamp
+                }
+            )
+
+        except ClientError as e:
+            logger.error(f"Error updating spend distribution {category} {period} for user {user_id}: {e}")
+            raise
+
+    def list_spend_distributions(self, user_id: str, currency: str, category: Optional[str] = None,
+                                 period_from: str = '', period_to: str = '~') -> List[Dict[str, Any]]:
+        """
+        Spending distribution items of a currency between two months (inclusive)
+
+        With a category this is one sort key range; without one every
+        category's items are read and filtered by period.
+        """
+        try:
+            prefix = f'SPENDDIST#{currency}#'
+            if category:
+                key_condition = 'pk = :pk AND sk BETWEEN :start AND :end'
+                values = {':start': f'{prefix}{category}#{period_from}', ':end': f'{prefix}{category}#{period_to}'}
+            else:
+                key_condition = 'pk = :pk AND begins_with(sk, :prefix)'
+                values = {':prefix': prefix}
+            items = []
+            query_kwargs = {
+                'KeyConditionExpression': key_condition,
+                'ExpressionAttributeValues': {':pk': f'USER#{user_id}', **values}
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                items.extend(item for item in response.get('Items', [])
+                             if period_from <= item.get('period', '') <= period_to)
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            return items
+
+        except ClientError as e:
+            logger.error(f"Error listing spend distributions for user {user_id}: {e}")
+            raise
+
+    def replace_spend_distributions(self, user_id: str, counters: Dict[tuple, Dict[str, Decimal]],
+                                    timestamp: str) -> int:
+        """
+        Replace all of a user's spending distribution items (used by the rebuild job)
+
+        Args:
+            counters: Counters by (currency, category, period)
+
+        Returns:
+            Number of items written
+        """
+        try:
+            existing = set()
+            query_kwargs = {
+                'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :prefix)',
+                'ExpressionAttributeValues': {':pk': f'USER#{user_id}', ':prefix': 'SPENDDIST#'},
+                'ProjectionExpression': 'sk'
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                existing.update(item['sk'] for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            with self.table.batch_writer() as writer:
+                for (currency, category, period), item_counters in counters.items():
+                    sk = f'SPENDDIST#{currency}#{category}#{period}'
+                    existing.discard(sk)
+                    writer.put_item(Item={
+                        **item_counters,
+                        'pk': f'USER#{user_id}',
+                        'sk': sk,
+                        'entity_type': 'spend_distribution',
+                        'user_id': user_id,
+                        'currency': currency,
+                        'category': category,
+                        'period': period,
+                        'updated_at': timestamp
+                    })
+                for sk in existing:
+                    writer.delete_item(Key={'pk': f'USER#{user_id}', 'sk': sk})
+            return len(counters)
+
+        except ClientError as e:
+            logger.error(f"Error replacing spend distributions for user {user_id}: {e}")
+            raise
+
+    # ===========================
+    # ANOMALY OPERATIONS
+    # ===========================
+
+    def get_anomaly_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Running expense statistics of a user (None before the first expense)
+
+        Single Table Design:
+        - pk: USER#{user_id}
+        - sk: STATS#ANOMALY
+        """
+        try:
+            response = self.table.get_item(Key={'pk': f'USER#{user_id}', 'sk': 'STATS#ANOMALY'})
+            return response.get('Item')
+
+        except ClientError as e:
+            logger.error(f"Error getting anomaly stats for user {user_id}: {e}")
+            raise
+
+    def get_anomaly_state(self, user_id: str, merchant: str) -> Dict[str, Any]:
+        """
+        Running expense statistics and whether a merchant was seen, in one BatchGetItem
+
+        Merchants are separate STATS#MERCHANT#{hash} items so the statistics
+        item stays the same size however many merchants a user has.
+
+        Returns:
+            Dict with stats (item or None) and merchant_seen
+        """
+        keys = [{'pk': f'USER#{user_id}', 'sk': 'STATS#ANOMALY'},
+                {'pk': f'USER#{user_id}', 'sk': f'STATS#MERCHANT#{merchant}'}]
+        try:
+            items = []
+            request = {self.table_name: {'Keys': keys}}
+            for attempt in range(self.BATCH_GET_MAX_ATTEMPTS):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                items.extend(response.get('Responses', {}).get(self.table_name, []))
+                request = response.get('UnprocessedKeys')
+                if not request:
+                    break
+                delay = self.BATCH_GET_BASE_DELAY_SECONDS * (2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+            else:
+                raise RuntimeError(f"Anomaly state of user {user_id} still unprocessed after "
+                                   f"{self.BATCH_GET_MAX_ATTEMPTS} attempts")
+            by_sk = {item['sk']: item for item in items}
+            return {'stats': by_sk.get('STATS#ANOMALY'), 'merchant_seen': keys[1]['sk'] in by_sk}
+
+        except ClientError as e:
+            logger.error(f"Error getting anomaly state for user {user_id}: {e}")
+            raise
+
+    def add_anomaly_merchant(self, user_id: str, merchant: str, timestamp: str) -> None:
+        """Mark a merchant hash as seen (idempotent)"""
+        try:
+            self.table.put_item(Item={
+                'pk': f'USER#{user_id}',
+                'sk': f'STATS#MERCHANT#{merchant}',
+                'entity_type': 'anomaly_merchant',
+                'user_id': user_id,
+                'seen_at': timestamp
+            })
+
+        except ClientError as e:
+            logger.error(f"Error saving anomaly merchant for user {user_id}: {e}")
+            raise
+
+    def save_anomaly_stats(self, user_id: str, key: str, stats: Dict[str, Decimal],
+                           version: int, timestamp: str) -> bool:
+        """
+        Store a category's new statistics, if the item is still at version
+
+        Args:
+            key: Category key ({currency}#{category})
+            stats: count, mean and m2
+            version: Version the statistics were computed from (0 when there was no item)
+
+        Returns:
+            True if written, False if another write changed the item first
+        """
+        item_key = {'pk': f'USER#{user_id}', 'sk': 'STATS#ANOMALY'}
+        try:
+            if version == 0:
+                self.table.put_item(
+                    Item={
+                        **item_key,
+                        'entity_type': 'anomaly_stats',
+                        'user_id': user_id,
+                        'categories': {key: stats},
+                        'version': 1,
+                        'updated_at': timestamp
+                    },
+                    ConditionExpression='attribute_not_exists(pk)'
+                )
+            else:
+                self.table.update_item(
+                    Key=item_key,
+                    UpdateExpression='SET categories.#key = :stats, version = :next, updated_at = :timestamp',
+                    ConditionExpression='version = :version',
+                    ExpressionAttributeNames={'#key': key},
+                    ExpressionAttributeValues={
+                        ':stats': stats, ':version': version, ':next': version + 1, ':timestamp': timestamp
+                    }
+                )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            logger.error(f"Error saving anomaly stats for user {user_id}: {e}")
+            raise
+
+    def list_alerts(self, user_id: str, date_from: str = '0000', date_to: str = '9999',
+                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Flagged transactions of a user from the sparse ALERT# index, most recent first
+        """
+        try:
+            alerts = []
+            query_kwargs = {
+                'IndexName': 'GSI3',
+                'KeyConditionExpression': 'gsi3_pk = :alert_pk AND gsi3_sk BETWEEN :start AND :end',
+                'ExpressionAttributeValues': {
+                    ':alert_pk': f'{self.ALERT_INDEX_PREFIX}{user_id}',
+                    ':start': date_from,
+                    ':end': f'{date_to}~'
+                },
+                'ScanIndexForward': False
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                alerts.extend(self._convert_transaction_numbers(item) for item in response.get('Items', []))
+                if 'LastEvaluatedKey' not in response or (limit and len(alerts) >= limit):
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            return alerts[:limit] if limit else alerts
+
+        except ClientError as e:
+            logger.error(f"Error listing alerts for user {user_id}: {e}")
+            raise
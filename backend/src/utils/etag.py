@@ -0,0 +1,134 @@
+"""
+ETag utilities for conditional GET requests
+Builds weak ETags from the per-user data version so unchanged lists can be
+answered with 304 Not Modified without re-reading or re-serializing data
+"""
+
+import hashlib
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from utils.responses import not_modified_response
+
+logger = logging.getLogger(__name__)
+
+# Seconds a data version can be served from the in-container cache.
+# 0 disables the cache: every conditional GET costs one projected get_item.
+DATA_VERSION_CACHE_TTL_SECONDS = float(os.environ.get('DATA_VERSION_CACHE_TTL_SECONDS', '0'))
+
+# user_id -> (data_version, expires_at)
+_version_cache: Dict[str, Tuple[int, float]] = {}
+
+
+def get_if_none_match(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the If-None-Match header from a Lambda event (case-insensitive)
+
+    Args:
+        event: API Gateway event
+
+    Returns:
+        Header value if present, None otherwise
+    """
+    headers = event.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == 'if-none-match':
+            return value
+    return None
+
+
+def compute_etag(user_id: str, data_version: int, event: Dict[str, Any]) -> str:
+    """
+    Compute a weak ETag for a user's resource representation
+
+    The current date is included because some representations (days until
+    payment due, current month summaries) change with the calendar.
+
+    Args:
+        user_id: Owner of the data
+        data_version: Current user data version
+        event: API Gateway event (path and query parameters)
+
+    Returns:
+        Weak ETag string
+    """
+    query_params = event.get('queryStringParameters') or {}
+    canonical_query = '&'.join(f"{k}={query_params[k]}" for k in sorted(query_params))
+    raw = '|'.join([
+        user_id,
+        str(data_version),
+        event.get('path', ''),
+        canonical_query,
+        datetime.now().date().isoformat()
+    ])
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def get_cached_data_version(db_client, user_id: str) -> int:
+    """
+    Get the user's data version, using the in-container cache when fresh
+
+    Args:
+        db_client: DynamoDBClient instance
+        user_id: User to look up
+
+    Returns:
+        Current data version
+    """
+    cached = _version_cache.get(user_id)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    version = db_client.get_data_version(user_id)
+    if DATA_VERSION_CACHE_TTL_SECONDS > 0:
+        _version_cache[user_id] = (version, time.monotonic() + DATA_VERSION_CACHE_TTL_SECONDS)
+    return version
+
+
+def check_not_modified(db_client, user_id: str, event: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Evaluate a conditional GET against the user's data version
+
+    Args:
+        db_client: DynamoDBClient instance
+        user_id: Authenticated user
+        event: API Gateway event
+
+    Returns:
+        Tuple of (etag, 304 response or None when the handler must run)
+    """
+    etag = compute_etag(user_id, get_cached_data_version(db_client, user_id), event)
+
+    if_none_match = get_if_none_match(event)
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        if etag in candidates or '*' in candidates:
+            logger.info(f"Conditional GET matched for user {user_id}: {event.get('path')}")
+            return etag, not_modified_response(etag)
+
+    return etag, None
+
+
+def record_write(db_client, user_id: str) -> None:
+    """
+    Bump the user's data version after a write
+
+    Failures are logged but never fail the request that already wrote data.
+
+    Args:
+        db_client: DynamoDBClient instance
+        user_id: User whose data changed
+    """
+    try:
+        version = db_client.bump_data_version(user_id)
+        if version is not None and DATA_VERSION_CACHE_TTL_SECONDS > 0:
+            _version_cache[user_id] = (version, time.monotonic() + DATA_VERSION_CACHE_TTL_SECONDS)
+        else:
+            _version_cache.pop(user_id, None)
+    except Exception as e:
+        _version_cache.pop(user_id, None)
+        logger.error(f"Error recording write for user {user_id}: {e}")
@@ -0,0 +1,204 @@
+"""
+Cash-flow forecast
+Projects each currency's balance day by day: recurring templates and card
+payments are added to a day-indexed delta array and a cumulative sum over it
+gives every day's balance and the minimum
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from utils.billing_cycle import clamp_day
+from utils.cascade import iter_query_pages
+from utils.recurring import next_run_date, template_account_ids
+
+logger = logging.getLogger(__name__)
+
+# Days projected by default and at most
+DEFAULT_FORECAST_DAYS = 90
+MAX_FORECAST_DAYS = 365
+
+# Forecasts kept per container, keyed by the ETag (user, data version, query and date)
+FORECAST_CACHE_SIZE = int(os.environ.get('FORECAST_CACHE_SIZE', '256'))
+
+_forecast_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+
+
+def iter_recurring_templates(db_client, user_id: str) -> Iterator[Dict[str, Any]]:
+    """Yield the user's recurring transaction templates, projected"""
+    names = {'#id': 'transaction_id', '#account': 'account_id', '#destination': 'destination_account_id',
+             '#amount': 'amount', '#description': 'description', '#date': 'transaction_date',
+             '#frequency': 'recurring_frequency', '#next': 'next_run_date', '#type': 'transaction_type'}
+    pages = iter_query_pages(
+        db_client.table,
+        KeyConditionExpression='pk = :pk AND begins_with(sk, :prefix)',
+        FilterExpression='is_recurring = :recurring',
+        ExpressionAttributeValues={':pk': f'USER#{user_id}', ':prefix': 'TRANSACTION#', ':recurring': True},
+        ProjectionExpression=', '.join(names),
+        ExpressionAttributeNames=names
+    )
+    for page in pages:
+        yield from page
+
+
+def template_runs(template: Dict[str, Any], today: date, end: date) -> Iterator[date]:
+    """
+    Run dates of a template up to end (inclusive), on its stored schedule
+
+    Overdue runs (before today) are still owed: the next job materializes
+    every one of them, so each is yielded as today and the runs after today
+    keep the template's original dates.
+    """
+    if not template.get('next_run_date') or not template.get('recurring_frequency'):
+        return
+    anchor_day = date.fromisoformat(template['transaction_date'][:10]).day
+    run = date.fromisoformat(template['next_run_date'])
+    while run <= end:
+        yield max(run, today)
+        run = next_run_date(run, template['recurring_frequency'], anchor_day)
+
+
+def card_payment(card: Dict[str, Any], today: date) -> Optional[Tuple[date, Decimal]]:
+    """
+    Next payment a card will need and its amount
+
+    The closed statement is used while it is pending (less what was already
+    paid); otherwise the whole balance is due on the next payment_due_date day.
+    Later payments depend on purchases not made yet and are not projected.
+    """
+    balance = Decimal(str(card.get('current_balance') or 0))
+    if balance <= 0:
+        return None
+
+    next_payment_due = card.get('next_payment_due')
+    if next_payment_due and date.fromisoformat(next_payment_due) >= today:
+        owed = min(Decimal(str(card.get('statement_balance') or 0)), balance)
+        return (date.fromisoformat(next_payment_due), owed) if owed > 0 else None
+
+    due_day = card.get('payment_due_date')
+    if not due_day:
+        return None
+    due_on = clamp_day(today.year, today.month, int(due_day))
+    if due_on < today:
+        year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+        due_on = clamp_day(year, month, int(due_day))
+    return due_on, balance
+
+
+def project_balances(starting_balance: Decimal, deltas: List[Decimal], today: date) -> Dict[str, Any]:
+    """
+    Daily balances of one currency and their minimum
+
+    Args:
+        starting_balance: Balance before today's movements
+        deltas: Net movement of each day, index 0 being today
+
+    Returns:
+        Balances, minimum and first negative date
+    """
+    balances = list(accumulate(deltas, initial=starting_balance))[1:]
+    min_index = min(range(len(balances)), key=balances.__getitem__)
+    first_negative = next((index for index, balance in enumerate(balances) if balance < 0), None)
+    return {
+        'starting_balance': float(starting_balance),
+        'ending_balance': float(balances[-1]),
+        'min_balance': float(balances[min_index]),
+        'min_balance_date': (today + timedelta(days=min_index)).isoformat(),
+        'first_negative_date': (today + timedelta(days=first_negative)).isoformat()
+        if first_negative is not None else None,
+        'daily_balances': [float(balance) for balance in balances]
+    }
+
+
+def build_forecast(db_client, user_id: str, days: int, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Project the user's balances per currency for the next days
+
+    Args:
+        db_client: DynamoDBClient
+        user_id: User to project
+        days: Days after today to project
+        today: First projected day (default: today)
+
+    Returns:
+        Forecast with one projection per currency
+    """
+    today = today or date.today()
+    end = today + timedelta(days=days)
+
+    accounts = {account['account_id']: account for account in db_client.list_user_accounts(user_id)}
+    starting: Dict[str, Decimal] = {}
+    for account in accounts.values():
+        currency = account.get('currency', 'MXN')
+        starting[currency] = starting.get(currency, Decimal('0')) + Decimal(str(account.get('current_balance', 0)))
+
+    deltas: Dict[str, List[Decimal]] = {currency: [Decimal('0')] * (days + 1) for currency in starting}
+    events: Dict[str, List[Dict[str, Any]]] = {currency: [] for currency in starting}
+
+    def add(currency: str, on: date, amount: Decimal, description: str, source: str) -> None:
+        if currency not in deltas:
+            starting[currency] = Decimal('0')
+            deltas[currency] = [Decimal('0')] * (days + 1)
+            events[currency] = []
+        deltas[currency][(on - today).days] += amount
+        events[currency].append({'date': on.isoformat(), 'amount': float(amount),
+                                 'description': description, 'source': source})
+
+    for template in iter_recurring_templates(db_client, user_id):
+        source = accounts.get(template['account_id'])
+        if source is None:
+            # Templates of closed accounts are skipped by the recurring job too
+            continue
+        amount = Decimal(str(template['amount']))
+        # Same legs the recurring job writes: the source, plus the destination of a transfer
+        legs = [(accounts.get(account_id), leg_amount)
+                for account_id, leg_amount in zip(template_account_ids(template), (amount, abs(amount)))]
+        for run in template_runs(template, today, end):
+            for account, leg_amount in legs:
+                if account is not None:
+                    add(account.get('currency', 'MXN'), run, leg_amount, template['description'], 'recurring')
+
+    for card in db_client.list_user_cards(user_id):
+        payment = card_payment(card, today)
+        if payment and payment[0] <= end:
+            add(card.get('currency', 'MXN'), payment[0], -payment[1], f"{card.get('name')} payment", 'card_payment')
+
+    currencies = []
+    for currency in sorted(deltas):
+        projection = project_balances(starting[currency], deltas[currency], today)
+        currencies.append({
+            'currency': currency,
+            **projection,
+            'events': sorted(events[currency], key=lambda event: event['date'])
+        })
+
+    return {
+        'start_date': today.isoformat(),
+        'end_date': end.isoformat(),
+        'days': days,
+        'currencies': currencies,
+        'generated_at': datetime.now().isoformat()
+    }
+
+
+def get_cached_forecast(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Forecast computed for the same ETag by this container, if any"""
+    forecast = _forecast_cache.get(cache_key)
+    if forecast is not None:
+        _forecast_cache.move_to_end(cache_key)
+    return forecast
+
+
+def cache_forecast(cache_key: str, forecast: Dict[str, Any]) -> None:
+    """Keep a forecast until a write changes the ETag (least recently used first out)"""
+    if FORECAST_CACHE_SIZE <= 0:
+        return
+    _forecast_cache[cache_key] = forecast
+    _forecast_cache.move_to_end(cache_key)
+    while len(_forecast_cache) > FORECAST_CACHE_SIZE:
+        _forecast_cache.popitem(last=False)
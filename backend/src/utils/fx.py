@@ -0,0 +1,142 @@
+"""
+Foreign exchange rates
+The rate table (units of the base currency per unit of each currency) is
+loaded from a rates service or the bundled file and kept in the container for
+a TTL; conversions build one factor per currency and apply it to totals that
+are already grouped by currency instead of converting row by row
+"""
+
+import json
+import logging
+import os
+import time
+import urllib.request
+from typing import Dict, Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rate table bundled with the code, used when no rates service is configured or it fails
+FX_RATES_FILE = os.environ.get('FX_RATES_FILE', os.path.join(os.path.dirname(__file__), 'fx_rates.json'))
+
+# Optional rates service returning the same JSON document as the bundled file
+FX_RATES_URL = os.environ.get('FX_RATES_URL', '')
+
+# Seconds a loaded rate table is reused by the container
+FX_RATES_TTL_SECONDS = int(os.environ.get('FX_RATES_TTL_SECONDS', '3600'))
+
+# Seconds to wait for the rates service
+FX_RATES_TIMEOUT_SECONDS = float(os.environ.get('FX_RATES_TIMEOUT_SECONDS', '2'))
+
+_rates_cache: Dict[str, Any] = {}
+
+
+def _parse_rate_table(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a rate table document and normalize its rates to floats"""
+    rates = {currency.upper(): float(rate) for currency, rate in document['rates'].items()}
+    if any(rate <= 0 for rate in rates.values()):
+        raise ValueError("FX rates must be positive")
+    base = document.get('base', 'MXN').upper()
+    rates.setdefault(base, 1.0)
+    return {'base': base, 'as_of': document.get('as_of'), 'rates': rates}
+
+
+def _fetch_rate_table() -> Dict[str, Any]:
+    """Read the rate table from the rates service, falling back to the bundled file"""
+    if FX_RATES_URL:
+        try:
+            with urllib.request.urlopen(FX_RATES_URL, timeout=FX_RATES_TIMEOUT_SECONDS) as response:
+                return _parse_rate_table(json.loads(response.read()))
+        except Exception as e:
+            logger.warning(f"FX rates service unavailable, using {FX_RATES_FILE}: {e}")
+    with open(FX_RATES_FILE, encoding='utf-8') as rates_file:
+        return _parse_rate_table(json.load(rates_file))
+
+
+def get_rate_table(now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Rate table cached in the container
+
+    A table older than the TTL is reloaded; if reloading fails the stale table
+    keeps being served rather than failing the request.
+
+    Returns:
+        Dict with base, as_of and rates
+    """
+    now = time.monotonic() if now is None else now
+    if _rates_cache and now - _rates_cache['loaded_at'] < FX_RATES_TTL_SECONDS:
+        return _rates_cache['table']
+    try:
+        table = _fetch_rate_table()
+    except Exception as e:
+        if not _rates_cache:
+            raise
+        logger.error(f"Error reloading FX rates, keeping table from {_rates_cache['table']['as_of']}: {e}")
+        return _rates_cache['table']
+    _rates_cache.update(table=table, loaded_at=now)
+    return table
+
+
+def parse_target_currency(value: Optional[str], table: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Validate a convert_to query parameter
+
+    Raises:
+        ValueError: If the currency has no rate
+    """
+    if not value:
+        return None
+    currency = value.strip().upper()
+    rates = (table or get_rate_table())['rates']
+    if currency not in rates:
+        raise ValueError(f'convert_to must be one of: {", ".join(sorted(rates))}')
+    return currency
+
+
+def conversion_factors(currencies: Iterable[str], target: str,
+                       table: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    Multiplier from each currency to the target, computed once per currency
+
+    Raises:
+        ValueError: If a currency has no rate
+    """
+    rates = (table or get_rate_table())['rates']
+    currencies = set(currencies)
+    missing = sorted(currencies - rates.keys())
+    if missing:
+        raise ValueError(f"No FX rate for: {', '.join(missing)}")
+    return {currency: rates[currency] / rates[target] for currency in currencies}
+
+
+def convert_totals(totals: Dict[str, float], target: str, table: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Sum of per-currency totals expressed in the target currency
+
+    Args:
+        totals: Amount by currency
+        target: Currency of the result
+
+    Returns:
+        Converted sum rounded to 2 decimals
+    """
+    factors = conversion_factors(totals, target, table)
+    return round(sum(float(amount) * factors[currency] for currency, amount in totals.items()), 2)
+
+
+def convert_breakdowns(breakdowns: Dict[str, Dict[str, float]], factors: Dict[str, float]) -> Dict[str, float]:
+    """
+    Merge per-currency breakdowns (e.g. amount by category) into one in the target currency
+
+    Args:
+        breakdowns: Breakdown dict by currency
+        factors: Output of conversion_factors for those currencies
+
+    Returns:
+        Merged breakdown rounded to 2 decimals
+    """
+    merged: Dict[str, float] = {}
+    for currency, breakdown in breakdowns.items():
+        factor = factors[currency]
+        for key, amount in breakdown.items():
+            merged[key] = merged.get(key, 0.0) + float(amount) * factor
+    return {key: round(amount, 2) for key, amount in merged.items()}
@@ -5,8 +5,11 @@ Handles token generation, validation, and middleware functionality
 
 import jwt
 import json
+import hashlib
 import logging
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, Union
 from functools import wraps
@@ -20,6 +23,16 @@ JWT_ALGORITHM = 'HS256'
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# Verified token cache (per container). 0 disables the cache.
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '1024'))
+
+# sha256(token) -> TokenPayload, in LRU order
+_token_cache: "OrderedDict[str, TokenPayload]" = OrderedDict()
+# sha256(token) -> exp of explicitly revoked tokens
+_revoked_tokens: Dict[str, int] = {}
+# user_id -> epoch seconds; tokens issued before it are rejected
+_revoked_users: Dict[str, int] = {}
+
 class JWTError(Exception):
     """Custom JWT exception"""
     pass
@@ -211,6 +224,100 @@ def extract_token_from_event(event: Dict[str, Any]) -> Optional[str]:
         logger.error(f"Error extracting token from event: {str(e)}")
         return None
 
+def _token_key(token: str) -> str:
+    """Cache key for a token (raw tokens are never kept in memory)"""
+    if token.startswith('Bearer '):
+        token = token[7:]
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _is_revoked(key: str, payload: TokenPayload) -> bool:
+    """Check the in-container revocation lists"""
+    if key in _revoked_tokens:
+        return True
+    revoked_before = _revoked_users.get(payload.user_id)
+    return revoked_before is not None and payload.iat < revoked_before
+
+def get_verified_token(token: str) -> TokenPayload:
+    """
+    Decode a token, reusing the verified payload cached for this container
+    
+    Payloads are cached by token hash until their exp claim, bounded by
+    TOKEN_CACHE_MAX_ENTRIES (least recently used entries are evicted).
+    
+    Args:
+        token: The JWT token string
+        
+    Returns:
+        TokenPayload object with decoded information
+        
+    Raises:
+        JWTError: If token is invalid, expired, malformed or revoked
+    """
+    key = _token_key(token)
+    now = int(time.time())
+    
+    payload = _token_cache.get(key)
+    if payload is not None:
+        if payload.exp > now and not _is_revoked(key, payload):
+            _token_cache.move_to_end(key)
+            return payload
+        del _token_cache[key]
+    
+    payload = decode_token(token)
+    if _is_revoked(key, payload):
+        logger.warning(f"Revoked token used for user: {payload.user_id}")
+        raise JWTError("Token has been revoked")
+    
+    if TOKEN_CACHE_MAX_ENTRIES > 0:
+        _token_cache[key] = payload
+        while len(_token_cache) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+    
+    return payload
+
+def revoke_token(token: str) -> None:
+    """
+    Revoke a single token in this container until it expires
+    
+    Args:
+        token: The JWT token string
+    """
+    key = _token_key(token)
+    _token_cache.pop(key, None)
+    try:
+        exp = jwt.decode(token[7:] if token.startswith('Bearer ') else token,
+                         options={"verify_signature": False}).get('exp', 0)
+    except jwt.InvalidTokenError:
+        exp = 0
+    _revoked_tokens[key] = int(exp)
+    
+    # Forget revocations of tokens that can no longer be used
+    now = int(time.time())
+    for revoked_key in [k for k, revoked_exp in _revoked_tokens.items() if revoked_exp <= now]:
+        del _revoked_tokens[revoked_key]
+
+def revoke_user_tokens(user_id: str) -> None:
+    """
+    Revoke every token issued to a user before now (password change, deletion)
+    
+    The revocation lives in this container's memory (_revoked_users), so it
+    only applies to requests served by this container; other warm containers
+    keep accepting those tokens until they expire.
+    
+    Args:
+        user_id: User whose tokens are revoked
+    """
+    _revoked_users[user_id] = int(time.time())
+    for key in [k for k, payload in _token_cache.items() if payload.user_id == user_id]:
+        del _token_cache[key]
+    logger.info(f"Tokens revoked for user: {user_id}")
+
+def clear_token_cache() -> None:
+    """Drop all cached payloads and revocations (tests, secret rotation)"""
+    _token_cache.clear()
+    _revoked_tokens.clear()
+    _revoked_users.clear()
+
 def validate_token_from_event(event: Dict[str, Any]) -> Optional[TokenPayload]:
     """
     Extract and validate token from Lambda event
@@ -226,7 +333,7 @@ def validate_token_from_event(event: Dict[str, Any]) -> Optional[TokenPayload]:
         if not token:
             return None
         
-        return decode_token(token)
+        return get_verified_token(token)
         
     except JWTError:
         return None
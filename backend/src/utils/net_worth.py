@@ -0,0 +1,172 @@
+"""
+Net-worth snapshots
+A daily job stores one small NETWORTH#{date} item per user with the totals of
+that day, so a net-worth chart is a single sort key range query instead of
+rebuilding past balances from the transaction history
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Optional
+
+from utils.cascade import BATCH_WRITE_LIMIT, iter_active_user_ids
+from utils.etag import record_write
+from utils.fx import conversion_factors
+
+logger = logging.getLogger(__name__)
+
+# Users whose balances are read concurrently
+NETWORTH_MAX_WORKERS = int(os.environ.get('NETWORTH_MAX_WORKERS', '4'))
+
+
+def _add(totals: Dict[str, Decimal], key: str, amount: Decimal) -> None:
+    totals[key] = totals.get(key, Decimal('0')) + amount
+
+
+def net_worth_totals(accounts: List[Dict[str, Any]], cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Totals of a user's active accounts and cards
+
+    Account balances are assets and card balances liabilities; the breakdown
+    by account type keeps each currency apart (cards appear as {card_type}_card
+    with negative amounts).
+
+    Returns:
+        Dict with assets, liabilities and net worth by currency and the
+        by_account_type breakdown
+    """
+    assets: Dict[str, Decimal] = {}
+    liabilities: Dict[str, Decimal] = {}
+    by_account_type: Dict[str, Dict[str, Decimal]] = {}
+
+    for account in accounts:
+        currency = account.get('currency', 'MXN')
+        balance = Decimal(str(account.get('current_balance', 0)))
+        _add(assets, currency, balance)
+        _add(by_account_type.setdefault(account.get('account_type', 'other'), {}), currency, balance)
+
+    for card in cards:
+        currency = card.get('currency', 'MXN')
+        balance = Decimal(str(card.get('current_balance', 0)))
+        _add(liabilities, currency, balance)
+        _add(by_account_type.setdefault(f"{card.get('card_type', 'other')}_card", {}), currency, -balance)
+
+    currencies = sorted(assets.keys() | liabilities.keys())
+    return {
+        'assets_by_currency': assets,
+        'liabilities_by_currency': liabilities,
+        'net_worth_by_currency': {
+            currency: assets.get(currency, Decimal('0')) - liabilities.get(currency, Decimal('0'))
+            for currency in currencies
+        },
+        'by_account_type': by_account_type,
+        'account_count': len(accounts),
+        'card_count': len(cards)
+    }
+
+
+def build_snapshot(db_client, user_id: str) -> Dict[str, Any]:
+    """Current totals of a user from list_user_accounts and list_user_cards (active only)"""
+    return net_worth_totals(db_client.list_user_accounts(user_id), db_client.list_user_cards(user_id))
+
+
+def _chunks(user_ids: Iterator[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for user_id in user_ids:
+        chunk.append(user_id)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def snapshot_net_worth(db_client, snapshot_date: Optional[date] = None,
+                       user_ids: Optional[List[str]] = None,
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Store the NETWORTH#{date} snapshot of every active user (or the given ones)
+
+    Users are processed in chunks of 25: their balances are read concurrently
+    and the chunk's snapshots go out in one BatchWriteItem. Each worker thread
+    reads through its own client. Re-running a date overwrites that day's
+    snapshots.
+
+    Args:
+        db_client: DynamoDBClient
+        snapshot_date: Day the snapshot is stored under (default: today)
+        user_ids: Users to snapshot (default: every active user)
+        max_workers: Users read concurrently (default NETWORTH_MAX_WORKERS)
+
+    Returns:
+        Summary with users snapshotted and failures
+    """
+    snapshot_date = (snapshot_date or date.today()).isoformat()
+    users = iter(user_ids) if user_ids is not None else iter_active_user_ids(db_client)
+    totals = {'date': snapshot_date, 'users': 0, 'failed': 0}
+    worker = threading.local()
+
+    def init_worker() -> None:
+        worker.db_client = db_client.for_worker()
+
+    def read(user_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return build_snapshot(worker.db_client, user_id)
+        except Exception as e:
+            logger.error(f"Error reading balances for net-worth snapshot of user {user_id}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers or NETWORTH_MAX_WORKERS,
+                            initializer=init_worker) as executor:
+        for chunk in _chunks(users, BATCH_WRITE_LIMIT):
+            snapshots = {}
+            for user_id, snapshot in zip(chunk, executor.map(read, chunk)):
+                if snapshot is None:
+                    totals['failed'] += 1
+                else:
+                    snapshots[user_id] = snapshot
+            if not snapshots:
+                continue
+            db_client.put_net_worth_snapshots(snapshot_date, snapshots, datetime.now().isoformat())
+            for user_id in snapshots:
+                record_write(db_client, user_id)
+            totals['users'] += len(snapshots)
+
+    logger.info(f"Net-worth snapshots stored: {totals}")
+    return totals
+
+
+def snapshot_series(snapshots: List[Dict[str, Any]], convert_to: Optional[str] = None,
+                    fx_table: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Snapshot items as API dicts, optionally totalled in one currency
+
+    With convert_to the factors are built once for every currency in the
+    range and applied to each day's per-currency totals (today's rates).
+    """
+    factors = {}
+    if convert_to:
+        currencies = {currency for snapshot in snapshots for currency in snapshot.get('net_worth_by_currency', {})}
+        factors = conversion_factors(currencies, convert_to, fx_table)
+
+    def floats(totals: Dict[str, Any]) -> Dict[str, float]:
+        return {key: float(value) for key, value in totals.items()}
+
+    series = []
+    for snapshot in snapshots:
+        net_worth = floats(snapshot.get('net_worth_by_currency', {}))
+        series.append({
+            'date': snapshot['snapshot_date'],
+            'net_worth_by_currency': net_worth,
+            'assets_by_currency': floats(snapshot.get('assets_by_currency', {})),
+            'liabilities_by_currency': floats(snapshot.get('liabilities_by_currency', {})),
+            'by_account_type': {account_type: floats(totals)
+                                for account_type, totals in snapshot.get('by_account_type', {}).items()},
+            'total': round(sum(amount * factors[currency] for currency, amount in net_worth.items()), 2)
+            if convert_to else None
+        })
+    return series
@@ -0,0 +1,61 @@
+"""
+In-container token bucket rate limiter
+Cheap pre-filter for expensive endpoints (login runs bcrypt): requests over the
+limit are rejected before touching DynamoDB or spending hashing CPU
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string (email, source IP, ...)
+
+    Each key starts with `capacity` tokens and regains `refill_per_second`
+    tokens per second. State is per Lambda container and bounded to
+    `max_keys` buckets (least recently used keys are dropped, which only
+    ever makes the limiter more permissive).
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        # key -> (tokens, last_refill_monotonic)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def allow(self, key: str, cost: float = 1.0) -> Tuple[bool, int]:
+        """
+        Try to take tokens from a key's bucket
+
+        Args:
+            key: Bucket key
+            cost: Tokens consumed by this request
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds)
+        """
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        if allowed:
+            return True, 0
+        if self.refill_per_second <= 0:
+            return False, 0
+        return False, max(1, math.ceil((cost - tokens) / self.refill_per_second))
+
+    def reset(self) -> None:
+        """Drop all buckets"""
+        self._buckets.clear()
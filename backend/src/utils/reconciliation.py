@@ -0,0 +1,301 @@
+"""
+Ledger reconciliation
+Recomputes each account's running balance from its GSI1 transaction history
+and manual balance adjustments, reports drift against current_balance / account_balance_after and optionally
+repairs it with batched conditional writes
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
+from itertools import accumulate
+from typing import Dict, Any, Iterator, List, Optional
+
+from utils.cascade import iter_query_pages
+
+logger = logging.getLogger(__name__)
+
+# Differences below half a cent are rounding noise, not drift
+RECONCILE_TOLERANCE = Decimal(os.environ.get('RECONCILE_TOLERANCE', '0.005'))
+
+# Segments of the parallel scan over all accounts
+RECONCILE_SCAN_SEGMENTS = int(os.environ.get('RECONCILE_SCAN_SEGMENTS', '4'))
+
+# Accounts reconciled concurrently
+RECONCILE_MAX_WORKERS = int(os.environ.get('RECONCILE_MAX_WORKERS', '4'))
+
+# DynamoDB limit of actions per TransactWriteItems
+TRANSACT_WRITE_LIMIT = 100
+
+
+def _decimal(value: Any) -> Decimal:
+    """Exact Decimal for DynamoDB numbers and floats alike"""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _iter_ledger_range(db_client, user_id: str, account_id: str, prefix: str) -> Iterator[Dict[str, Any]]:
+    """Yield the ledger rows of one GSI1 sort key range, in date order"""
+    names = {'#pk': 'pk', '#sk': 'sk', '#amount': 'amount', '#after': 'account_balance_after',
+             '#created': 'created_at', '#date': 'transaction_date', '#user': 'user_id'}
+    pages = iter_query_pages(
+        db_client.table,
+        IndexName='GSI1',
+        KeyConditionExpression='gsi1_pk = :account_pk AND begins_with(gsi1_sk, :prefix)',
+        ExpressionAttributeValues={':account_pk': f'ACCOUNT#{account_id}', ':prefix': prefix},
+        ProjectionExpression=', '.join(names),
+        ExpressionAttributeNames=names,
+        ScanIndexForward=True
+    )
+    for page in pages:
+        for item in page:
+            if item.get('user_id') != user_id:
+                continue
+            yield {
+                'pk': item['pk'],
+                'sk': item['sk'],
+                'amount': _decimal(item.get('amount', 0)),
+                'balance_after': _decimal(item['account_balance_after']) if 'account_balance_after' in item else None,
+                'created_at': item.get('created_at', ''),
+                'date': item.get('transaction_date', '')
+            }
+
+
+def load_ledger(db_client, user_id: str, account_id: str) -> List[Dict[str, Any]]:
+    """
+    Stream an account's transactions and balance adjustments from GSI1 in ledger order
+
+    Manual adjustments (PATCH /accounts/{id}/balance) are ADJUSTMENT# rows
+    merged by date with the transactions, so they are replayed rather than
+    reported as drift. Only the fields needed to recompute balances are kept
+    per row.
+
+    Returns:
+        Rows with pk, sk, amount, balance_after, created_at and date, ordered
+        by date (transaction_date, the GSI1 sort key)
+    """
+    return list(heapq.merge(
+        _iter_ledger_range(db_client, user_id, account_id, 'TRANSACTION#'),
+        _iter_ledger_range(db_client, user_id, account_id, 'ADJUSTMENT#'),
+        key=lambda row: row['date']
+    ))
+
+
+def opening_balance(account: Dict[str, Any], rows: List[Dict[str, Any]]) -> Decimal:
+    """
+    Balance of the account before its first transaction
+
+    Uses the opening_balance pinned by a previous repair. Otherwise it is
+    derived from the first transaction ever created (its balance_after minus
+    its amount), which is independent of backdated transaction dates, since
+    the initial balance is not stored on the account. Accounts without
+    transactions are anchored at their current balance.
+    """
+    if account.get('opening_balance') is not None:
+        return _decimal(account['opening_balance'])
+
+    anchored = [row for row in rows if row['balance_after'] is not None]
+    if not anchored:
+        return _decimal(account.get('current_balance', 0))
+    first = min(anchored, key=lambda row: row['created_at'])
+    return first['balance_after'] - first['amount']
+
+
+def recompute_ledger(account: Dict[str, Any], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Recompute running balances and compare them with stored values
+
+    Args:
+        account: Account item
+        rows: Ledger rows from load_ledger
+
+    Returns:
+        Result with expected_balance, balance drift and the transactions whose
+        account_balance_after differs from the recomputed running balance
+    """
+    opening = opening_balance(account, rows)
+    # Cumulative sum over the whole history in one pass (exact Decimal arithmetic)
+    running = list(accumulate((row['amount'] for row in rows), initial=opening))[1:]
+
+    transaction_fixes = [
+        {'pk': row['pk'], 'sk': row['sk'], 'old': row['balance_after'], 'new': balance}
+        for row, balance in zip(rows, running)
+        if row['balance_after'] is None or abs(row['balance_after'] - balance) > RECONCILE_TOLERANCE
+    ]
+
+    expected = running[-1] if running else opening
+    current = _decimal(account.get('current_balance', 0))
+    drift = current - expected
+
+    return {
+        'account_id': account['account_id'],
+        'user_id': account['user_id'],
+        'transactions': len(rows),
+        'opening_balance': opening,
+        'current_balance': current,
+        'expected_balance': expected,
+        'drift': drift,
+        'balance_drift': abs(drift) > RECONCILE_TOLERANCE,
+        'transaction_fixes': transaction_fixes
+    }
+
+
+def repair_ledger(db_client, result: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Write recomputed balances back in batched conditional transactions
+
+    The account is written first (balance plus pinned opening balance) and
+    only if its balance is still the one that was read; otherwise a
+    transaction was posted meanwhile and the account is left for the next
+    run. Each account_balance_after update is likewise conditioned on the
+    value that was read, so rows changed concurrently make their batch fail
+    instead of being overwritten.
+
+    Returns:
+        Counts of repaired transactions, failed batches and balance updates
+    """
+    updated = db_client.set_account_balance(
+        result['user_id'],
+        result['account_id'],
+        result['expected_balance'],
+        result['current_balance'],
+        result['opening_balance']
+    )
+    if not updated:
+        return {'repaired_transactions': 0, 'failed_batches': 0, 'balance_updated': 0}
+
+    client = db_client.table.meta.client
+    table_name = db_client.table.name
+    fixes = result['transaction_fixes']
+    repaired, failed_batches = 0, 0
+
+    for start in range(0, len(fixes), TRANSACT_WRITE_LIMIT):
+        chunk = fixes[start:start + TRANSACT_WRITE_LIMIT]
+        actions = []
+        for fix in chunk:
+            update = {
+                'TableName': table_name,
+                'Key': {'pk': fix['pk'], 'sk': fix['sk']},
+                'UpdateExpression': 'SET account_balance_after = :new',
+                'ExpressionAttributeValues': {':new': fix['new']}
+            }
+            if fix['old'] is None:
+                update['ConditionExpression'] = 'attribute_not_exists(account_balance_after)'
+            else:
+                update['ConditionExpression'] = 'account_balance_after = :old'
+                update['ExpressionAttributeValues'][':old'] = fix['old']
+            actions.append({'Update': update})
+
+        try:
+            client.transact_write_items(TransactItems=actions)
+            repaired += len(chunk)
+        except client.exceptions.TransactionCanceledException as e:
+            failed_batches += 1
+            logger.warning(f"Ledger repair batch skipped for account {result['account_id']}: {e}")
+
+    return {'repaired_transactions': repaired, 'failed_batches': failed_batches,
+            'balance_updated': 1 if result['balance_drift'] else 0}
+
+
+def reconcile_account(db_client, account: Dict[str, Any], repair: bool = False) -> Dict[str, Any]:
+    """
+    Reconcile one account and optionally repair it
+
+    Returns:
+        Drift report for the account (Decimal values converted to float)
+    """
+    rows = load_ledger(db_client, account['user_id'], account['account_id'])
+    result = recompute_ledger(account, rows)
+
+    report = {
+        'account_id': result['account_id'],
+        'user_id': result['user_id'],
+        'transactions': result['transactions'],
+        'current_balance': float(result['current_balance']),
+        'expected_balance': float(result['expected_balance']),
+        'drift': float(result['drift']),
+        'balance_drift': result['balance_drift'],
+        'transactions_out_of_sync': len(result['transaction_fixes'])
+    }
+
+    if repair and (result['balance_drift'] or result['transaction_fixes']):
+        report.update(repair_ledger(db_client, result))
+
+    if report['balance_drift'] or report['transactions_out_of_sync']:
+        logger.warning(f"Ledger drift: {report}")
+    return report
+
+
+def scan_accounts(db_client, segments: int) -> Iterator[Dict[str, Any]]:
+    """Yield every account item with a segmented parallel scan"""
+    return db_client.parallel_scan(
+        segments=segments,
+        filter_expression='entity_type = :type',
+        expression_values={':type': 'account'}
+    )
+
+
+def reconcile_accounts(db_client, accounts: Iterator[Dict[str, Any]], repair: bool = False,
+                       max_workers: Optional[int] = None,
+                       deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Reconcile accounts concurrently until done or the deadline passes
+
+    Each worker thread reads and repairs through its own client, and an
+    account that fails is logged and counted without losing the others.
+
+    Args:
+        db_client: DynamoDBClient
+        accounts: Account items to reconcile
+        repair: Write recomputed balances back
+        max_workers: Accounts reconciled concurrently (default RECONCILE_MAX_WORKERS)
+        deadline: time.monotonic() value after which no new account is started
+
+    Returns:
+        Summary with totals, drifting accounts, failed accounts and whether
+        the run completed
+    """
+    started = time.perf_counter()
+    reports = []
+    failed = 0
+    complete = True
+    worker = threading.local()
+
+    def init_worker() -> None:
+        worker.db_client = db_client.for_worker()
+
+    def reconcile(account: Dict[str, Any]) -> Dict[str, Any]:
+        return reconcile_account(worker.db_client, account, repair)
+
+    with ThreadPoolExecutor(max_workers=max_workers or RECONCILE_MAX_WORKERS,
+                            initializer=init_worker) as executor:
+        futures = {}
+        for account in accounts:
+            if deadline is not None and time.monotonic() >= deadline:
+                complete = False
+                break
+            futures[executor.submit(reconcile, account)] = account
+        for future in as_completed(futures):
+            try:
+                reports.append(future.result())
+            except Exception as e:
+                failed += 1
+                logger.error(f"Error reconciling account {futures[future].get('account_id')}: {e}")
+
+    drifting = [r for r in reports if r['balance_drift'] or r['transactions_out_of_sync']]
+    summary = {
+        'accounts': len(reports),
+        'accounts_with_drift': len(drifting),
+        'failed': failed,
+        'total_drift': round(sum(r['drift'] for r in reports), 2),
+        'repair': repair,
+        'complete': complete,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        'drift': drifting
+    }
+    logger.info(f"Reconciliation finished: {len(reports)} accounts, {len(drifting)} with drift, "
+                f"{failed} failed")
+    return summary
@@ -0,0 +1,423 @@
+"""
+Recurring transaction materializer
+Recurring transactions are templates indexed under RECUR#{next_run_date}
+(sparse GSI2); each run reads only the dates since the previous run, writes
+the due occurrences with batched TransactWriteItems and moves every
+account's balance once per batch with the aggregated delta
+"""
+
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from utils.anomaly import record_expense_stats
+from utils.billing_cycle import clamp_day
+from utils.budgets import record_budget_spend
+from utils.cascade import iter_query_pages
+from utils.etag import record_write
+from utils.spend_distribution import record_spend_distribution
+
+logger = logging.getLogger(__name__)
+
+# Days read back on the first run, when there is no cursor yet
+RECURRING_CATCH_UP_DAYS = int(os.environ.get('RECURRING_CATCH_UP_DAYS', '31'))
+
+# Runs of one template written per pass, the rest follow in later batches
+# (at most 48: a transfer run writes two items and a batch holds 100 actions)
+RECURRING_MAX_OCCURRENCES = min(int(os.environ.get('RECURRING_MAX_OCCURRENCES', '40')), 48)
+
+# Actions per TransactWriteItems (DynamoDB limit)
+TRANSACT_WRITE_LIMIT = 100
+
+RECURRING_JOB = 'recurring'
+
+
+def next_run_date(current: date, frequency: str, anchor_day: int) -> date:
+    """
+    Occurrence following a run date
+
+    Monthly and yearly templates keep their original day of month, moved to
+    the last day in shorter months (a template on the 31st runs on Feb 28).
+    """
+    if frequency == 'daily':
+        return current + timedelta(days=1)
+    if frequency == 'weekly':
+        return current + timedelta(days=7)
+    if frequency == 'monthly':
+        year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+        return clamp_day(year, month, anchor_day)
+    if frequency == 'yearly':
+        return clamp_day(current.year + 1, current.month, anchor_day)
+    raise ValueError(f"Invalid recurring frequency: {frequency}")
+
+
+def first_run_date(transaction_date: str, frequency: str) -> str:
+    """Next run date (ISO) of a recurring transaction created on transaction_date"""
+    start = date.fromisoformat(transaction_date[:10])
+    return next_run_date(start, frequency, start.day).isoformat()
+
+
+def template_index_date(next_run: str, today: Optional[date] = None) -> str:
+    """
+    Date a new template is indexed under (RECUR#{date})
+
+    The job only reads the dates after its cursor, so a backdated template
+    whose next run already passed is indexed under tomorrow instead; its
+    next_run_date is kept and the missed runs are caught up from there.
+    """
+    return max(next_run, ((today or date.today()) + timedelta(days=1)).isoformat())
+
+
+def iter_due_templates(db_client, start: date, end: date) -> Iterator[Dict[str, Any]]:
+    """Yield the templates whose next run date is between start and end (inclusive)"""
+    day = start
+    while day <= end:
+        pages = iter_query_pages(
+            db_client.table,
+            IndexName='GSI2',
+            KeyConditionExpression='gsi2_pk = :run',
+            ExpressionAttributeValues={':run': f'{db_client.RECURRING_INDEX_PREFIX}{day.isoformat()}'}
+        )
+        for page in pages:
+            yield from page
+        day += timedelta(days=1)
+
+
+def plan_occurrences(template: Dict[str, Any], today: date,
+                     limit: Optional[int] = None) -> Tuple[List[date], date]:
+    """
+    Run dates of a template due up to today
+
+    Returns:
+        Tuple of (run dates, next run date after them)
+    """
+    limit = limit or RECURRING_MAX_OCCURRENCES
+    anchor_day = date.fromisoformat(template['transaction_date'][:10]).day
+    run = date.fromisoformat(template['next_run_date'])
+
+    runs = []
+    while run <= today and len(runs) < limit:
+        runs.append(run)
+        run = next_run_date(run, template['recurring_frequency'], anchor_day)
+    return runs, run
+
+
+def occurrence_data(template: Dict[str, Any], run: date, now: str) -> List[Dict[str, Any]]:
+    """
+    Transactions created by one run of a template
+
+    Transfers also create the incoming transaction on the destination account,
+    like the transactions endpoint does. Ids are derived from the template and
+    the run date so a run can never be written twice.
+    """
+    transaction_date = run.isoformat() + template['transaction_date'][10:]
+    suffix = run.strftime('%Y%m%d')
+    amount = Decimal(str(template['amount']))
+
+    occurrence = {
+        'transaction_id': f"{template['transaction_id']}_{suffix}",
+        'user_id': template['user_id'],
+        'account_id': template['account_id'],
+        'account_name': template['account_name'],
+        'amount': amount,
+        'description': template['description'],
+        'transaction_type': template['transaction_type'],
+        'category': template['category'],
+        'status': 'completed',
+        'transaction_date': transaction_date,
+        'notes': template.get('notes'),
+        'tags': template.get('tags') or [],
+        'location': template.get('location'),
+        'destination_account_id': template.get('destination_account_id'),
+        'destination_account_name': template.get('destination_account_name'),
+        'is_recurring': False,
+        'recurring_template_id': template['transaction_id'],
+        'created_at': now,
+        'updated_at': now
+    }
+    occurrences = [occurrence]
+
+    if len(template_account_ids(template)) == 2:
+        occurrences.append({
+            **occurrence,
+            'transaction_id': f"{template['transaction_id']}_{suffix}_in",
+            'account_id': template['destination_account_id'],
+            'account_name': template.get('destination_account_name'),
+            'amount': abs(amount),
+            'description': f"Transfer from {template['account_name']}: {template['description']}",
+            'transaction_type': 'income',
+            'category': 'account_transfer',
+            'notes': f"Transfer from transaction {occurrence['transaction_id']}",
+            'destination_account_id': template['account_id'],
+            'destination_account_name': template['account_name']
+        })
+    return occurrences
+
+
+class AccountCache:
+    """Accounts touched by the run, with the balances this run last wrote"""
+
+    def __init__(self, db_client):
+        self.db_client = db_client
+        self.accounts: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+
+    def get(self, user_id: str, account_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        key = (user_id, account_id)
+        if refresh or key not in self.accounts:
+            self.accounts[key] = self.db_client.get_account_by_id(user_id, account_id)
+        return self.accounts[key]
+
+    def set_balance(self, user_id: str, account_id: str, balance: Decimal) -> None:
+        self.accounts[(user_id, account_id)]['current_balance'] = balance
+
+
+def batch_actions(db_client, plans: List[Dict[str, Any]], accounts: AccountCache,
+                  now: str) -> Tuple[List[Dict[str, Any]], List[Optional[int]], Dict[Tuple[str, str], Decimal]]:
+    """
+    TransactWriteItems actions for a batch of template plans
+
+    Occurrences are applied in date order to running balances, so each one
+    carries its account_balance_after, and each account gets a single update
+    with the batch's aggregated delta (conditioned on the balance read).
+
+    Returns:
+        Tuple of (actions, owning plan index per action or None for accounts,
+        new balance per account)
+    """
+    occurrences = []
+    for index, plan in enumerate(plans):
+        for run in plan['runs']:
+            occurrences.extend((run, index, data) for data in occurrence_data(plan['template'], run, now))
+    occurrences.sort(key=lambda entry: (entry[0], entry[1]))
+
+    opening = {}
+    balances = {}
+    actions, owners = [], []
+    for _, index, data in occurrences:
+        key = (data['user_id'], data['account_id'])
+        if key not in balances:
+            opening[key] = balances[key] = Decimal(str(accounts.get(*key)['current_balance']))
+        balances[key] += data['amount']
+        data['account_balance_after'] = balances[key]
+        actions.append({'Put': {
+            'TableName': db_client.table_name,
+            'Item': db_client.transaction_item(data),
+            'ConditionExpression': 'attribute_not_exists(pk)'
+        }})
+        owners.append(index)
+
+    for index, plan in enumerate(plans):
+        template = plan['template']
+        actions.append({'Update': {
+            'TableName': db_client.table_name,
+            'Key': {'pk': template['pk'], 'sk': template['sk']},
+            'UpdateExpression': (
+                'SET next_run_date = :next, gsi2_pk = :index, last_run_date = :last, updated_at = :timestamp'
+            ),
+            'ExpressionAttributeValues': {
+                ':next': plan['next_run'].isoformat(),
+                ':index': f"{db_client.RECURRING_INDEX_PREFIX}{plan['next_run'].isoformat()}",
+                ':last': plan['runs'][-1].isoformat(),
+                ':timestamp': now,
+                ':expected': template['next_run_date']
+            },
+            'ConditionExpression': 'next_run_date = :expected'
+        }})
+        owners.append(index)
+
+    for (user_id, account_id), balance in balances.items():
+        actions.append({'Update': {
+            'TableName': db_client.table_name,
+            'Key': {'pk': f'USER#{user_id}', 'sk': f'ACCOUNT#{account_id}'},
+            'UpdateExpression': 'SET current_balance = :balance, updated_at = :timestamp',
+            'ExpressionAttributeValues': {
+                ':balance': balance,
+                ':expected': opening[(user_id, account_id)],
+                ':timestamp': now,
+                ':active': True
+            },
+            'ConditionExpression': 'current_balance = :expected AND is_active = :active'
+        }})
+        owners.append(None)
+
+    return actions, owners, balances
+
+
+def park_template(db_client, template: Dict[str, Any], today: date) -> None:
+    """
+    Index a skipped template under tomorrow so the next run reads it again
+
+    Its next_run_date is left as is, so once the account is active again the
+    runs owed since then are caught up.
+    """
+    day = (today + timedelta(days=1)).isoformat()
+    if template.get('gsi2_pk', '') >= f'{db_client.RECURRING_INDEX_PREFIX}{day}':
+        return
+    try:
+        db_client.table.update_item(
+            Key={'pk': template['pk'], 'sk': template['sk']},
+            UpdateExpression='SET gsi2_pk = :index',
+            ConditionExpression='next_run_date = :expected',
+            ExpressionAttributeValues={':index': f'{db_client.RECURRING_INDEX_PREFIX}{day}',
+                                       ':expected': template['next_run_date']}
+        )
+    except Exception as e:
+        logger.error(f"Error re-indexing skipped recurring template {template['transaction_id']}: {e}")
+
+
+def template_account_ids(template: Dict[str, Any]) -> List[str]:
+    """Accounts a template's runs write to (both sides of a transfer)"""
+    if template['transaction_type'] == 'transfer' and template.get('destination_account_id'):
+        return [template['account_id'], template['destination_account_id']]
+    return [template['account_id']]
+
+
+def batch_size(plan: Dict[str, Any]) -> int:
+    """Actions a plan adds to a batch (occurrences, template update and its accounts)"""
+    accounts = len(template_account_ids(plan['template']))
+    return len(plan['runs']) * accounts + 1 + accounts
+
+
+def write_batch(db_client, plans: List[Dict[str, Any]], accounts: AccountCache) -> List[Dict[str, Any]]:
+    """
+    Write a batch of plans in one TransactWriteItems
+
+    Plans whose template was advanced by another run are dropped; when an
+    account balance moved underneath, its accounts are re-read. Either way
+    the rest is retried once.
+
+    Returns:
+        The plans written
+    """
+    client = db_client.table.meta.client
+    pending = list(plans)
+
+    for _ in range(2):
+        if not pending:
+            return []
+        now = datetime.now().isoformat()
+        actions, owners, balances = batch_actions(db_client, pending, accounts, now)
+        try:
+            client.transact_write_items(TransactItems=actions)
+            for key, balance in balances.items():
+                accounts.set_balance(*key, balance)
+            return pending
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get('CancellationReasons') or []
+            failed = [i for i, reason in enumerate(reasons) if reason.get('Code') == 'ConditionalCheckFailed']
+            if not failed:
+                raise
+            stale_plans = {owners[i] for i in failed if owners[i] is not None}
+            for i in failed:
+                if owners[i] is None:
+                    key = actions[i]['Update']['Key']
+                    accounts.get(key['pk'][len('USER#'):], key['sk'][len('ACCOUNT#'):], refresh=True)
+            logger.warning(f"Recurring batch conflict: {len(stale_plans)} templates already advanced")
+            pending = [plan for index, plan in enumerate(pending) if index not in stale_plans]
+
+    raise RuntimeError("Recurring batch kept conflicting")
+
+
+def materialize_templates(db_client, templates: List[Dict[str, Any]], today: date) -> Dict[str, Any]:
+    """
+    Write every occurrence due up to today for a list of templates
+
+    Templates with more due runs than RECURRING_MAX_OCCURRENCES are written
+    in several passes within the same call.
+
+    Returns:
+        Counts of templates, occurrences, skipped templates and failed batches
+    """
+    accounts = AccountCache(db_client)
+    counts = {'templates': 0, 'occurrences': 0, 'skipped': 0, 'failed_batches': 0}
+    users = set()
+    queue = list(templates)
+
+    while queue:
+        batch, size = [], 0
+        deferred = []
+        while queue:
+            template = queue.pop(0)
+            runs, next_run = plan_occurrences(template, today)
+            if not runs:
+                continue
+            if not all((accounts.get(template['user_id'], account_id) or {}).get('is_active')
+                       for account_id in template_account_ids(template)):
+                logger.warning(f"Recurring template {template['transaction_id']} skipped: account inactive")
+                park_template(db_client, template, today)
+                counts['skipped'] += 1
+                continue
+
+            plan = {'template': template, 'runs': runs, 'next_run': next_run}
+            if size + batch_size(plan) > TRANSACT_WRITE_LIMIT and batch:
+                deferred.append(template)
+                break
+            batch.append(plan)
+            size += batch_size(plan)
+
+        if not batch:
+            break
+        try:
+            written = write_batch(db_client, batch, accounts)
+        except Exception as e:
+            counts['failed_batches'] += 1
+            logger.error(f"Recurring batch of {len(batch)} templates failed: {e}")
+            written = []
+
+        for plan in written:
+            template = plan['template']
+            users.add(template['user_id'])
+            currency = accounts.get(template['user_id'], template['account_id']).get('currency', 'MXN')
+            for run in plan['runs']:
+                occurrence = {**template, 'transaction_date': run.isoformat()}
+                record_budget_spend(db_client, template['user_id'], occurrence, currency)
+                record_spend_distribution(db_client, template['user_id'], occurrence, currency)
+                record_expense_stats(db_client, template['user_id'], occurrence, currency)
+            counts['occurrences'] += len(plan['runs']) * len(template_account_ids(plan['template']))
+            if plan['next_run'] <= today:
+                # Catch-up longer than one pass: continue from the new run date
+                queue.append({**plan['template'], 'next_run_date': plan['next_run'].isoformat()})
+            else:
+                counts['templates'] += 1
+        queue = deferred + queue
+
+    for user_id in users:
+        record_write(db_client, user_id)
+    return counts
+
+
+def run_recurring(db_client, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Materialize the recurring transactions due since the previous run
+
+    Only the RECUR#{date} partitions after the saved cursor are read, so
+    missed days are caught up without reading the transaction history.
+
+    Returns:
+        Summary with the dates read and materializer counts
+    """
+    started = time.perf_counter()
+    today = today or date.today()
+    state = db_client.get_job_state(RECURRING_JOB)
+    if state.get('last_run_date'):
+        start = date.fromisoformat(state['last_run_date']) + timedelta(days=1)
+    else:
+        start = today - timedelta(days=RECURRING_CATCH_UP_DAYS)
+
+    # Templates advanced during the run land on later dates and are not re-read
+    templates = list(iter_due_templates(db_client, start, today))
+    counts = materialize_templates(db_client, templates, today)
+    if not counts['failed_batches']:
+        db_client.put_job_state(RECURRING_JOB, {'last_run_date': today.isoformat()})
+
+    summary = {
+        'from': start.isoformat(),
+        'to': today.isoformat(),
+        **counts,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    logger.info(f"Recurring transactions materialized: {summary}")
+    return summary
@@ -0,0 +1,147 @@
+"""
+Payment due reminders for credit cards
+Reads only the cards indexed under the DUE#{dd} days of the reminder dates
+(sparse GSI3) and publishes one EventBridge event per card, in PutEvents batches
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+
+from utils.cascade import iter_query_pages
+from utils.statements import cut_off_days
+
+logger = logging.getLogger(__name__)
+
+# Days before the due date a reminder is sent (comma separated; 0 = on the due date)
+REMINDER_DAYS_AHEAD = [int(day) for day in os.environ.get('REMINDER_DAYS_AHEAD', '3,1').split(',') if day.strip()]
+
+# EventBridge bus reminders are published to (empty: reminders are only counted and logged)
+REMINDER_EVENT_BUS = os.environ.get('REMINDER_EVENT_BUS', '')
+
+REMINDER_EVENT_SOURCE = 'finance-tracker.cards'
+REMINDER_DETAIL_TYPE = 'PaymentDueReminder'
+
+# Entries per PutEvents request (EventBridge limit)
+EVENTS_BATCH_SIZE = 10
+
+
+def iter_due_cards(db_client, due_on: date) -> Iterator[Dict[str, Any]]:
+    """Yield the active cards whose payment due day falls on a date, from the sparse index only"""
+    # Same month-end rule as cut-offs: a due day 31 is due on the last day of shorter months
+    for day in cut_off_days(due_on):
+        pages = iter_query_pages(
+            db_client.table,
+            IndexName='GSI3',
+            KeyConditionExpression='gsi3_pk = :due',
+            ExpressionAttributeValues={':due': f'{db_client.DUE_INDEX_PREFIX}{day:02d}'}
+        )
+        for page in pages:
+            yield from page
+
+
+def build_reminder(card: Dict[str, Any], due_on: date, today: date) -> Optional[Dict[str, Any]]:
+    """
+    Reminder payload for a card due on a date
+
+    Cards without debt get no reminder. When the last statement is due on that
+    date its balance and minimum payment are included.
+
+    Returns:
+        Event detail, or None when nothing is owed
+    """
+    balance = float(card.get('current_balance') or 0)
+    if balance <= 0:
+        return None
+
+    reminder = {
+        'user_id': card['user_id'],
+        'card_id': card['card_id'],
+        'card_name': card.get('name'),
+        'payment_due_date': due_on.isoformat(),
+        'days_until_due': (due_on - today).days,
+        'current_balance': balance,
+        'currency': card.get('currency', 'MXN')
+    }
+    if card.get('next_payment_due') == due_on.isoformat():
+        reminder['statement_balance'] = float(card.get('statement_balance') or 0)
+        reminder['minimum_payment'] = float(card.get('minimum_payment') or 0)
+    return reminder
+
+
+def publish_reminders(reminders: List[Dict[str, Any]], event_bus: Optional[str] = None) -> Dict[str, int]:
+    """
+    Publish reminders to EventBridge, EVENTS_BATCH_SIZE entries per request
+
+    Returns:
+        Counts of sent and failed entries (nothing is sent without an event bus)
+    """
+    event_bus = REMINDER_EVENT_BUS if event_bus is None else event_bus
+    if not event_bus or not reminders:
+        return {'sent': 0, 'failed': 0}
+
+    import boto3
+
+    client = boto3.client('events')
+    sent = failed = 0
+    for start in range(0, len(reminders), EVENTS_BATCH_SIZE):
+        batch = reminders[start:start + EVENTS_BATCH_SIZE]
+        response = client.put_events(Entries=[
+            {
+                'Source': REMINDER_EVENT_SOURCE,
+                'DetailType': REMINDER_DETAIL_TYPE,
+                'Detail': json.dumps(reminder),
+                'EventBusName': event_bus
+            }
+            for reminder in batch
+        ])
+        failed += response.get('FailedEntryCount', 0)
+        sent += len(batch) - response.get('FailedEntryCount', 0)
+
+    return {'sent': sent, 'failed': failed}
+
+
+def send_payment_reminders(db_client, today: Optional[date] = None,
+                           days_ahead: Optional[Sequence[int]] = None,
+                           event_bus: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Send reminders for the cards due a number of days from today
+
+    Only the DUE#{dd} partitions of the reminder dates are queried, so the
+    cost grows with the cards due, not with every card in the table.
+
+    Args:
+        db_client: DynamoDBClient
+        today: Reference date (default: today)
+        days_ahead: Days before the due date to remind (default REMINDER_DAYS_AHEAD)
+        event_bus: EventBridge bus (default REMINDER_EVENT_BUS)
+
+    Returns:
+        Summary with cards read, reminders built, sent and failed
+    """
+    started = time.perf_counter()
+    today = today or date.today()
+    due_dates = sorted({today + timedelta(days=days) for days in (days_ahead or REMINDER_DAYS_AHEAD)})
+
+    cards = 0
+    reminders = []
+    for due_on in due_dates:
+        for card in iter_due_cards(db_client, due_on):
+            cards += 1
+            reminder = build_reminder(card, due_on, today)
+            if reminder:
+                reminders.append(reminder)
+
+    summary = {
+        'date': today.isoformat(),
+        'due_dates': [due_on.isoformat() for due_on in due_dates],
+        'cards': cards,
+        'reminders': len(reminders),
+        **publish_reminders(reminders, event_bus),
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    logger.info(f"Payment reminders: {summary}")
+    return summary
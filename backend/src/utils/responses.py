@@ -3,26 +3,160 @@ HTTP response utilities for Lambda handlers.
 Common functions to generate standardized responses.
 """
 
+import base64
 import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import time
+import zlib
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
+try:
+    import brotli  # Optional: only used when present in the Lambda layer
+except ImportError:
+    brotli = None
+
 logger = logging.getLogger(__name__)
 
+# Response compression configuration
+# API Gateway must declare binary media types (e.g. "*/*") so that base64
+# bodies are decoded before reaching the client, hence disabled by default.
+COMPRESSION_ENABLED = os.environ.get('RESPONSE_COMPRESSION_ENABLED', 'false').lower() == 'true'
+COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', '5'))
+
+# Pristine gzip compressor kept across invocations; each response works on a
+# copy() so the header/window setup is paid once per container.
+_gzip_template = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+# Compression metrics accumulated during the container lifetime
+_compression_metrics: Dict[str, float] = {
+    "responses_compressed": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "cpu_ms": 0.0
+}
+
+
+def get_accept_encoding(event: Optional[Dict[str, Any]]) -> str:
+    """
+    Get the Accept-Encoding header from a Lambda event (case-insensitive).
+    
+    Args:
+        event: API Gateway event
+        
+    Returns:
+        Lowercased header value or empty string
+    """
+    if not event:
+        return ""
+    headers = event.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == 'accept-encoding' and value:
+            return value.lower()
+    return ""
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding value.
+    
+    The coding with the highest q-value wins; brotli is only preferred over
+    gzip when both are accepted with the same q-value.
+    
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        
+    Returns:
+        "br", "gzip" or None if the client accepts neither
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip()] = quality
+
+    wildcard = accepted.get('*', 0.0)
+    candidates = [('gzip', accepted.get('gzip', wildcard))]
+    if brotli is not None:
+        candidates.insert(0, ('br', accepted.get('br', wildcard)))
+    # max() keeps the first of equal q-values, so brotli wins ties
+    coding, quality = max(candidates, key=lambda candidate: candidate[1])
+    return coding if quality > 0 else None
+
+
+def compress_body(payload: bytes, encoding: str) -> Tuple[bytes, float]:
+    """
+    Compress a response payload and record compression metrics.
+    
+    Args:
+        payload: Serialized response body
+        encoding: "br" or "gzip"
+        
+    Returns:
+        Tuple of (compressed bytes, CPU milliseconds spent)
+    """
+    cpu_start = time.process_time()
+    if encoding == 'br':
+        compressed = brotli.compress(payload, quality=BROTLI_QUALITY)
+    else:
+        compressor = _gzip_template.copy()
+        compressed = compressor.compress(payload) + compressor.flush()
+    cpu_ms = (time.process_time() - cpu_start) * 1000
+
+    _compression_metrics["responses_compressed"] += 1
+    _compression_metrics["bytes_in"] += len(payload)
+    _compression_metrics["bytes_out"] += len(compressed)
+    _compression_metrics["cpu_ms"] += cpu_ms
+
+    logger.info(
+        f"Response compressed with {encoding}: {len(payload)} -> {len(compressed)} bytes "
+        f"(ratio {len(payload) / max(len(compressed), 1):.2f}, cpu {cpu_ms:.2f} ms)"
+    )
+    return compressed, cpu_ms
+
+
+def get_compression_metrics() -> Dict[str, float]:
+    """
+    Get compression metrics accumulated in this container.
+    
+    Returns:
+        Counters plus the overall compression ratio
+    """
+    metrics = dict(_compression_metrics)
+    metrics["compression_ratio"] = (
+        round(metrics["bytes_in"] / metrics["bytes_out"], 2) if metrics["bytes_out"] else 0.0
+    )
+    return metrics
+
 
 def create_response(
     status_code: int,
     body: Dict[str, Any],
-    headers: Optional[Dict[str, str]] = None
+    headers: Optional[Dict[str, str]] = None,
+    event: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Create a standardized HTTP response for Lambda.
     
+    When the originating event is provided and compression is enabled, bodies
+    above RESPONSE_COMPRESSION_MIN_BYTES are compressed with the best encoding
+    the client accepts and returned base64-encoded.
+    
     Args:
         status_code: HTTP status code
         body: Response body
         headers: Additional headers
+        event: Originating API Gateway event (used for Accept-Encoding)
         
     Returns:
         Response formatted for API Gateway
@@ -31,7 +165,8 @@ def create_response(
         "Content-Type": "application/json",
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With"
+        "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, If-None-Match",
+        "Access-Control-Expose-Headers": "ETag"
     }
     
     if headers:
@@ -41,10 +176,26 @@ def create_response(
     if isinstance(body, dict):
         body["timestamp"] = datetime.now(timezone.utc).isoformat()
     
+    serialized = json.dumps(body, ensure_ascii=False, default=str)
+    
+    if COMPRESSION_ENABLED and event is not None:
+        payload = serialized.encode('utf-8')
+        encoding = negotiate_encoding(get_accept_encoding(event))
+        default_headers["Vary"] = "Accept-Encoding"
+        if encoding and len(payload) >= COMPRESSION_MIN_BYTES:
+            compressed, _ = compress_body(payload, encoding)
+            default_headers["Content-Encoding"] = encoding
+            return {
+                "statusCode": status_code,
+                "headers": default_headers,
+                "body": base64.b64encode(compressed).decode('ascii'),
+                "isBase64Encoded": True
+            }
+    
     return {
         "statusCode": status_code,
         "headers": default_headers,
-        "body": json.dumps(body, ensure_ascii=False, default=str)
+        "body": serialized
     }
 
 
@@ -84,6 +235,27 @@ def created_response(data: Any, message: str = "Resource created") -> Dict[str,
     })
 
 
+def not_modified_response(etag: str) -> Dict[str, Any]:
+    """
+    Create not modified response (304) for conditional GET requests.
+    
+    Args:
+        etag: ETag of the unchanged representation
+        
+    Returns:
+        HTTP 304 response without body
+    """
+    return {
+        "statusCode": 304,
+        "headers": {
+            "ETag": etag,
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Expose-Headers": "ETag"
+        },
+        "body": ""
+    }
+
+
 def bad_request_response(message: str, errors: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Create bad request response (400).
@@ -0,0 +1,210 @@
+"""
+Shared request router for Lambda handlers
+Compiles route templates like /transactions/{transaction_id} once into a
+dispatch trie so each request is matched in a single walk over its segments
+"""
+
+import logging
+from typing import Dict, Any, Optional, Callable, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# API Gateway stage prefix stripped before matching
+API_PREFIX = '/api'
+
+# Method key matching any HTTP method (used to mount whole modules)
+ANY_METHOD = 'ANY'
+
+HandlerTarget = Union[Callable, str]
+
+
+class _Node:
+    """Trie node: literal children, one parameter child and one greedy child"""
+
+    __slots__ = ('literals', 'param_name', 'param_child', 'greedy_name', 'greedy_methods', 'methods')
+
+    def __init__(self):
+        self.literals: Dict[str, '_Node'] = {}
+        self.param_name: Optional[str] = None
+        self.param_child: Optional['_Node'] = None
+        self.greedy_name: Optional[str] = None
+        self.greedy_methods: Dict[str, Tuple[Dict[str, Any], HandlerTarget]] = {}
+        self.methods: Dict[str, Tuple[Dict[str, Any], HandlerTarget]] = {}
+
+
+def normalize_path(path: str) -> str:
+    """
+    Remove the API Gateway stage prefix and trailing slashes from a path
+
+    Args:
+        path: Raw request path
+
+    Returns:
+        Normalized path (at least '/')
+    """
+    if path.startswith(API_PREFIX):
+        path = path[len(API_PREFIX):]
+    return path.rstrip('/') or '/'
+
+
+def split_path(path: str) -> list:
+    """Split a path into non-empty segments"""
+    return [segment for segment in path.split('/') if segment]
+
+
+class Router:
+    """
+    Method + path router backed by a precompiled segment trie
+
+    Templates support literal segments, {param} segments and a trailing
+    greedy {param+} segment. Literal segments take precedence over
+    parameters, so /transactions/summary wins over /transactions/{id}.
+
+    Handlers may be registered by name; names are resolved against the
+    namespace given to the router (usually the module globals()) at
+    dispatch time so module-level patching keeps working.
+    """
+
+    def __init__(self, namespace: Optional[Dict[str, Any]] = None):
+        self.namespace = namespace if namespace is not None else {}
+        self.root = _Node()
+        self.routes: list = []
+
+    def add(self, method: str, template: str, handler: HandlerTarget) -> None:
+        """
+        Compile a route template into the trie
+
+        Args:
+            method: HTTP method or ANY
+            template: Path template, e.g. /cards/{card_id}/payment
+            handler: Callable or name of a callable in the router namespace
+        """
+        self._insert(method.upper(), template, self.namespace, handler)
+        self.routes.append((method.upper(), template))
+
+    def include(self, other: 'Router') -> None:
+        """Merge another router's routes, keeping their namespaces"""
+        self._merge(self.root, other.root, '')
+        self.routes.extend(other.routes)
+
+    def _insert(self, method: str, template: str, namespace: Dict[str, Any], handler: HandlerTarget) -> None:
+        node = self.root
+        segments = split_path(normalize_path(template))
+
+        for index, segment in enumerate(segments):
+            if segment.startswith('{') and segment.endswith('+}'):
+                if index != len(segments) - 1:
+                    raise ValueError(f"Greedy parameter must be the last segment: {template}")
+                name = segment[1:-2]
+                if node.greedy_name not in (None, name):
+                    raise ValueError(f"Conflicting greedy parameter in route: {template}")
+                node.greedy_name = name
+                self._register(node.greedy_methods, method, template, namespace, handler)
+                return
+            if segment.startswith('{') and segment.endswith('}'):
+                name = segment[1:-1]
+                if node.param_name not in (None, name):
+                    raise ValueError(f"Conflicting parameter name '{name}' in route: {template}")
+                node.param_name = name
+                if node.param_child is None:
+                    node.param_child = _Node()
+                node = node.param_child
+            else:
+                node = node.literals.setdefault(segment, _Node())
+
+        self._register(node.methods, method, template, namespace, handler)
+
+    def _register(self, methods: Dict[str, Any], method: str, template: str,
+                  namespace: Dict[str, Any], handler: HandlerTarget) -> None:
+        if method in methods:
+            raise ValueError(f"Duplicate route: {method} {template}")
+        methods[method] = (namespace, handler)
+
+    def _merge(self, target: _Node, source: _Node, prefix: str) -> None:
+        for method, entry in source.methods.items():
+            self._register(target.methods, method, prefix or '/', *entry)
+        if source.greedy_name:
+            if target.greedy_name not in (None, source.greedy_name):
+                raise ValueError(f"Conflicting greedy parameter under {prefix or '/'}")
+            target.greedy_name = source.greedy_name
+            for method, entry in source.greedy_methods.items():
+                self._register(target.greedy_methods, method, f"{prefix}/{{{source.greedy_name}+}}", *entry)
+        for segment, child in source.literals.items():
+            self._merge(target.literals.setdefault(segment, _Node()), child, f"{prefix}/{segment}")
+        if source.param_child is not None:
+            if target.param_name not in (None, source.param_name):
+                raise ValueError(f"Conflicting parameter name '{source.param_name}' under {prefix or '/'}")
+            target.param_name = source.param_name
+            if target.param_child is None:
+                target.param_child = _Node()
+            self._merge(target.param_child, source.param_child, f"{prefix}/{{{source.param_name}}}")
+
+    def resolve(self, method: str, path: str) -> Optional[Tuple[Callable, Dict[str, str]]]:
+        """
+        Find the handler for a request
+
+        Args:
+            method: HTTP method
+            path: Request path (stage prefix allowed)
+
+        Returns:
+            Tuple of (handler, path parameters) or None when no route matches
+        """
+        segments = split_path(normalize_path(path))
+        match = self._walk(self.root, segments, 0, method.upper(), {})
+        if match is None:
+            return None
+
+        (namespace, handler), params = match
+        if isinstance(handler, str):
+            handler = namespace[handler]
+        return handler, params
+
+    def _walk(self, node: _Node, segments: list, index: int, method: str,
+              params: Dict[str, str]) -> Optional[Tuple[Tuple[Dict[str, Any], HandlerTarget], Dict[str, str]]]:
+        if index == len(segments):
+            entry = node.methods.get(method) or node.methods.get(ANY_METHOD)
+            if entry:
+                return entry, params
+        else:
+            segment = segments[index]
+            child = node.literals.get(segment)
+            if child is not None:
+                match = self._walk(child, segments, index + 1, method, params)
+                if match:
+                    return match
+            if node.param_child is not None:
+                match = self._walk(node.param_child, segments, index + 1, method,
+                                   {**params, node.param_name: segment})
+                if match:
+                    return match
+
+        if node.greedy_name and index < len(segments):
+            entry = node.greedy_methods.get(method) or node.greedy_methods.get(ANY_METHOD)
+            if entry:
+                return entry, {**params, node.greedy_name: '/'.join(segments[index:])}
+
+        return None
+
+    def dispatch(self, event: Dict[str, Any], context: Any) -> Optional[Dict[str, Any]]:
+        """
+        Route an API Gateway event to its handler
+
+        Path parameters extracted from the template are added to the event
+        when API Gateway did not provide them (e.g. proxy integrations).
+
+        Args:
+            event: API Gateway event
+            context: Lambda context
+
+        Returns:
+            Handler response, or None when no route matches
+        """
+        match = self.resolve(event['httpMethod'], event['path'])
+        if match is None:
+            return None
+
+        handler, params = match
+        if params and not event.get('pathParameters'):
+            event['pathParameters'] = params
+        return handler(event, context)
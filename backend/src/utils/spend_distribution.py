@@ -0,0 +1,223 @@
+"""
+Spending distributions
+Each user/currency/category/month keeps a small SPENDDIST# item with two
+mergeable summaries of its expense amounts: a log-bucketed quantile sketch
+(DDSketch: every quantile within SKETCH_RELATIVE_ACCURACY of the true value)
+and a fixed-bucket histogram. Both are plain counters, so the transaction
+write paths update them with one atomic ADD and reads over any range of
+months merge the items by adding their counters
+"""
+
+import logging
+import math
+import os
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Any, Iterable, List, Tuple
+
+from utils.budgets import budget_period, spend_amount
+from utils.cascade import iter_query_pages
+
+logger = logging.getLogger(__name__)
+
+# Relative error of the quantiles read from the sketch
+SKETCH_RELATIVE_ACCURACY = float(os.environ.get('SKETCH_RELATIVE_ACCURACY', '0.02'))
+
+SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(SKETCH_GAMMA)
+
+# Lower edges of the histogram buckets (the last bucket is open ended)
+HISTOGRAM_EDGES = (0, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Quantiles reported by default
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75, 0.9, 0.95, 0.99)
+
+# Attribute prefixes of the sketch and histogram counters
+SKETCH_PREFIX = 'dd_'
+HISTOGRAM_PREFIX = 'h_'
+
+
+def sketch_bucket(amount: float) -> int:
+    """Sketch bucket of an amount; amounts below 1 share bucket 0"""
+    if amount <= 1:
+        return 0
+    return math.ceil(math.log(amount) / _LOG_GAMMA)
+
+
+def bucket_value(bucket: int) -> float:
+    """Value reported for a sketch bucket (within the relative accuracy of all its amounts)"""
+    if bucket == 0:
+        return 1.0
+    return 2 * SKETCH_GAMMA ** bucket / (SKETCH_GAMMA + 1)
+
+
+def histogram_bucket(amount: float) -> int:
+    """Index of the fixed histogram bucket holding an amount"""
+    index = 0
+    for position, edge in enumerate(HISTOGRAM_EDGES):
+        if amount >= edge:
+            index = position
+    return index
+
+
+def counter_deltas(amount: Decimal) -> Dict[str, Decimal]:
+    """
+    Counters one expense adds to its SPENDDIST# item (negative amounts take it back)
+
+    Args:
+        amount: Spent amount, positive to add and negative to remove
+
+    Returns:
+        Delta by attribute name
+    """
+    sign = Decimal('1') if amount > 0 else Decimal('-1')
+    value = float(abs(amount))
+    return {
+        'spend_count': sign,
+        'spend_total': amount,
+        f'{SKETCH_PREFIX}{sketch_bucket(value)}': sign,
+        f'{HISTOGRAM_PREFIX}{histogram_bucket(value)}': sign
+    }
+
+
+def record_spend_distribution(db_client, user_id: str, transaction: Dict[str, Any], currency: str,
+                              reverse: bool = False) -> None:
+    """
+    Add an expense to its category's distribution for the month (or take it back)
+
+    Failures are logged but never fail the write that already happened;
+    rebuild_spend_distributions repairs the counters.
+
+    Args:
+        db_client: DynamoDBClient instance
+        user_id: Owner of the transaction
+        transaction: Transaction with amount, transaction_type, category and transaction_date
+        currency: Currency of the transaction's account
+        reverse: Remove instead (deleted or recategorized transactions)
+    """
+    amount = spend_amount(transaction)
+    if not amount:
+        return
+    try:
+        db_client.add_spend_distribution(
+            user_id, currency, transaction['category'], budget_period(transaction['transaction_date']),
+            counter_deltas(-amount if reverse else amount), datetime.now().isoformat()
+        )
+    except Exception as e:
+        logger.error(f"Error recording spend distribution for user {user_id}: {e}")
+
+
+def merge_distributions(items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge SPENDDIST# items by adding their counters
+
+    Returns:
+        Dict with count, total, sketch buckets and histogram counts
+    """
+    count, total = 0, Decimal('0')
+    sketch: Dict[int, int] = {}
+    histogram = [0] * len(HISTOGRAM_EDGES)
+    for item in items:
+        count += int(item.get('spend_count', 0))
+        total += Decimal(str(item.get('spend_total', 0)))
+        for name, value in item.items():
+            if name.startswith(SKETCH_PREFIX):
+                bucket = int(name[len(SKETCH_PREFIX):])
+                sketch[bucket] = sketch.get(bucket, 0) + int(value)
+            elif name.startswith(HISTOGRAM_PREFIX):
+                histogram[int(name[len(HISTOGRAM_PREFIX):])] += int(value)
+    return {'count': count, 'total': total, 'sketch': sketch, 'histogram': histogram}
+
+
+def sketch_quantiles(sketch: Dict[int, int], count: int, quantiles: Iterable[float]) -> Dict[float, float]:
+    """
+    Quantiles of a merged sketch in one pass over its sorted buckets
+
+    Args:
+        sketch: Count by bucket
+        count: Total count
+        quantiles: Quantiles to read (0..1)
+
+    Returns:
+        Value by quantile (empty when count is 0)
+    """
+    if count <= 0:
+        return {}
+    targets = sorted((q * (count - 1), q) for q in quantiles)
+    results = {}
+    cumulative = 0
+    position = 0
+    for bucket in sorted(sketch):
+        cumulative += sketch[bucket]
+        while position < len(targets) and targets[position][0] < cumulative:
+            results[targets[position][1]] = round(bucket_value(bucket), 2)
+            position += 1
+    for _, q in targets[position:]:
+        results[q] = round(bucket_value(max(sketch)), 2)
+    return results
+
+
+def describe_distribution(items: List[Dict[str, Any]],
+                          quantiles: Tuple[float, ...] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+    """
+    Count, mean, quantiles, histogram and outlier threshold of merged items
+
+    The outlier threshold is the upper Tukey fence (p75 + 1.5 * IQR).
+    """
+    merged = merge_distributions(items)
+    count = merged['count']
+    values = sketch_quantiles(merged['sketch'], count, set(quantiles) | {0.25, 0.75})
+    upper = len(HISTOGRAM_EDGES) - 1
+    return {
+        'count': count,
+        'total': round(float(merged['total']), 2),
+        'mean': round(float(merged['total']) / count, 2) if count else None,
+        'quantiles': {f'p{round(q * 100):g}': values[q] for q in quantiles if q in values},
+        'outlier_threshold': round(values[0.75] + 1.5 * (values[0.75] - values[0.25]), 2) if count else None,
+        'histogram': [
+            {'min': HISTOGRAM_EDGES[index], 'max': HISTOGRAM_EDGES[index + 1] if index < upper else None,
+             'count': merged['histogram'][index]}
+            for index in range(len(HISTOGRAM_EDGES))
+        ]
+    }
+
+
+def rebuild_spend_distributions(db_client, user_id: str) -> Dict[str, Any]:
+    """
+    Recompute every SPENDDIST# item of a user from the transaction history
+
+    Reads each account's GSI1 history once and replaces the stored items.
+
+    Returns:
+        Summary with transactions counted and items written
+    """
+    counters: Dict[Tuple[str, str, str], Dict[str, Decimal]] = {}
+    counted = 0
+    names = {'#amount': 'amount', '#type': 'transaction_type', '#category': 'category',
+             '#date': 'transaction_date', '#user': 'user_id'}
+    for account in db_client.list_user_accounts(user_id, include_inactive=True):
+        currency = account.get('currency', 'MXN')
+        pages = iter_query_pages(
+            db_client.table,
+            IndexName='GSI1',
+            KeyConditionExpression='gsi1_pk = :account_pk AND begins_with(gsi1_sk, :prefix)',
+            ExpressionAttributeValues={':account_pk': f"ACCOUNT#{account['account_id']}",
+                                       ':prefix': 'TRANSACTION#'},
+            ProjectionExpression=', '.join(names),
+            ExpressionAttributeNames=names
+        )
+        for page in pages:
+            for item in page:
+                amount = spend_amount(item)
+                if item.get('user_id') != user_id or not amount:
+                    continue
+                key = (currency, item.get('category'), budget_period(item['transaction_date']))
+                item_counters = counters.setdefault(key, {})
+                for name, delta in counter_deltas(amount).items():
+                    item_counters[name] = item_counters.get(name, Decimal('0')) + delta
+                counted += 1
+
+    written = db_client.replace_spend_distributions(user_id, counters, datetime.now().isoformat())
+    summary = {'user_id': user_id, 'transactions': counted, 'items': written}
+    logger.info(f"Spend distributions rebuilt: {summary}")
+    return summary
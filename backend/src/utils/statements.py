@@ -0,0 +1,226 @@
+"""
+Credit card statement engine
+Closes a billing cycle once its cut-off has passed: totals the cycle's card
+transactions, computes minimum payment and interest, persists an immutable
+STATEMENT# item and denormalizes the figures onto the card
+"""
+
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from utils.billing_cycle import billing_cycle, clamp_day, cycle_bounds
+from utils.cascade import iter_query_pages
+from utils.etag import record_write
+
+logger = logging.getLogger(__name__)
+
+# Share of the statement balance due as minimum payment (interest and fees are added on top)
+STATEMENT_MIN_PAYMENT_RATE = Decimal(os.environ.get('STATEMENT_MIN_PAYMENT_RATE', '0.015'))
+
+CENT = Decimal('0.01')
+
+# Statement total each transaction type is added to
+STATEMENT_TOTALS = {
+    'purchase': 'purchases',
+    'payment': 'payments',
+    'fee': 'fees',
+    'interest': 'interest_charged',
+    'cashback': 'credits',
+    'refund': 'credits',
+}
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _card_day(card: Dict[str, Any], attribute: str) -> Optional[int]:
+    value = card.get(attribute)
+    return int(value) if value is not None else None
+
+
+def next_cycle(cycle: str) -> str:
+    """Cycle label following a yyyy-mm cycle"""
+    year, month = (int(part) for part in cycle.split('-'))
+    return f"{year + month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def payment_due_after(cut_off: date, due_day: Optional[int]) -> Optional[date]:
+    """First payment_due_date day strictly after the cut-off date"""
+    if not due_day:
+        return None
+    due = clamp_day(cut_off.year, cut_off.month, due_day)
+    if due <= cut_off:
+        following = cut_off.replace(day=1) + timedelta(days=32)
+        due = clamp_day(following.year, following.month, due_day)
+    return due
+
+
+def compute_statement(card: Dict[str, Any], cycle: str, transactions: List[Dict[str, Any]],
+                      statement_balance: Decimal) -> Dict[str, Any]:
+    """
+    Compute the figures of a closed cycle
+
+    Args:
+        card: Card item
+        cycle: Cycle being closed (yyyy-mm)
+        transactions: Card transactions of the cycle
+        statement_balance: Card balance at the cut-off
+
+    Returns:
+        Statement figures (Decimal amounts, ISO dates)
+    """
+    totals = {name: Decimal('0') for name in set(STATEMENT_TOTALS.values())}
+    net_change = Decimal('0')
+    for transaction in transactions:
+        total = STATEMENT_TOTALS.get(transaction['transaction_type'])
+        if total:
+            totals[total] += Decimal(str(transaction['amount']))
+        net_change += Decimal(str(transaction['balance_delta']))
+
+    statement_balance = _money(statement_balance)
+    apr = Decimal(str(card.get('apr') or 0))
+
+    if statement_balance > 0:
+        minimum = statement_balance * STATEMENT_MIN_PAYMENT_RATE + totals['interest_charged'] + totals['fees']
+        minimum_payment = min(statement_balance, _money(minimum))
+        # Interest accrued next cycle if only the minimum is paid
+        projected_interest = _money((statement_balance - minimum_payment) * apr / Decimal('1200'))
+    else:
+        minimum_payment = projected_interest = Decimal('0')
+
+    previous_balance = _money(statement_balance - net_change)
+    cut_off_day = _card_day(card, 'cut_off_date')
+    cycle_start, cycle_end = cycle_bounds(cycle, cut_off_day)
+    payment_due = payment_due_after(cycle_end, _card_day(card, 'payment_due_date'))
+
+    return {
+        'card_id': card['card_id'],
+        'user_id': card['user_id'],
+        'cycle': cycle,
+        'cycle_start': cycle_start.isoformat(),
+        'cycle_end': cycle_end.isoformat(),
+        'previous_balance': previous_balance,
+        **{name: _money(value) for name, value in totals.items()},
+        # Part of the previous statement not paid off during the cycle (accrues interest)
+        'revolving_balance': max(previous_balance - _money(totals['payments'] + totals['credits']), Decimal('0.00')),
+        'statement_balance': statement_balance,
+        'minimum_payment': minimum_payment,
+        'projected_interest': projected_interest,
+        'apr': apr,
+        'payment_due_date': payment_due.isoformat() if payment_due else None,
+        'transaction_count': len(transactions),
+        'currency': card.get('currency', 'MXN')
+    }
+
+
+def balance_at_cut_off(db_client, card: Dict[str, Any], cycle: str, today: date) -> Decimal:
+    """
+    Card balance when the cycle closed
+
+    The current balance minus everything posted to later cycles (normally
+    only the open one).
+    """
+    balance = Decimal(str(card.get('current_balance', 0)))
+    open_cycle = billing_cycle(today, _card_day(card, 'cut_off_date'))
+
+    later = next_cycle(cycle)
+    while later <= open_cycle:
+        for transaction in db_client.list_card_cycle_transactions(card['user_id'], card['card_id'], later):
+            balance -= Decimal(str(transaction['balance_delta']))
+        later = next_cycle(later)
+    return balance
+
+
+def close_statement(db_client, card: Dict[str, Any], cycle: str,
+                    today: Optional[date] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Close one card cycle and persist its statement
+
+    Statements are immutable: closing an already closed cycle returns the
+    stored statement unchanged. A new statement changes the card's figures,
+    so the user's data version is bumped (cached GET /cards ETags go stale).
+
+    Returns:
+        Tuple of (statement, created)
+    """
+    today = today or date.today()
+    _, cycle_end = cycle_bounds(cycle, _card_day(card, 'cut_off_date'))
+    if cycle_end >= today:
+        raise ValueError(f"Cycle {cycle} of card {card['card_id']} is still open")
+
+    existing = db_client.get_statement(card['user_id'], card['card_id'], cycle)
+    if existing:
+        return existing, False
+
+    transactions = db_client.list_card_cycle_transactions(card['user_id'], card['card_id'], cycle)
+    statement = compute_statement(card, cycle, transactions, balance_at_cut_off(db_client, card, cycle, today))
+    statement['created_at'] = datetime.now().isoformat()
+
+    created = db_client.create_statement(statement)
+    if not created:
+        # Closed concurrently by another run
+        return db_client.get_statement(card['user_id'], card['card_id'], cycle), False
+    record_write(db_client, card['user_id'])
+    return statement, True
+
+
+def cut_off_days(on: date) -> List[int]:
+    """Cut-off days that fall on a date (days past the month end close on its last day)"""
+    last_day = clamp_day(on.year, on.month, 31).day
+    return list(range(on.day, 32)) if on.day == last_day else [on.day]
+
+
+def iter_cut_off_cards(db_client, on: date) -> Iterator[Dict[str, Any]]:
+    """Yield the active cards whose cut-off falls on a date, from the sparse index only"""
+    for day in cut_off_days(on):
+        pages = iter_query_pages(
+            db_client.table,
+            IndexName='GSI2',
+            KeyConditionExpression='gsi2_pk = :cut_off',
+            ExpressionAttributeValues={':cut_off': f'{db_client.CUT_OFF_INDEX_PREFIX}{day:02d}'}
+        )
+        for page in pages:
+            yield from page
+
+
+def close_due_statements(db_client, on: date) -> Dict[str, Any]:
+    """
+    Close the cycles of every active card whose cut-off was on a date
+
+    Cards are read from the sparse CUTOFF#{dd} index, so the sweep costs the
+    cards due that day rather than a scan of the table.
+
+    Args:
+        db_client: DynamoDBClient
+        on: Cut-off date (normally yesterday, so that day's purchases are in)
+
+    Returns:
+        Summary with created/existing/failed statement counts
+    """
+    started = time.perf_counter()
+
+    created = existing = failed = 0
+    for card in iter_cut_off_cards(db_client, on):
+        cycle = billing_cycle(on, _card_day(card, 'cut_off_date'))
+        try:
+            _, was_created = close_statement(db_client, card, cycle)
+            created += was_created
+            existing += not was_created
+        except Exception as e:
+            failed += 1
+            logger.error(f"Statement for card {card.get('card_id')} cycle {cycle} failed: {e}")
+
+    summary = {
+        'cut_off': on.isoformat(),
+        'created': created,
+        'existing': existing,
+        'failed': failed,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    logger.info(f"Statements closed: {summary}")
+    return summary
@@ -0,0 +1,242 @@
+"""
+Recurring payment detection
+Streams each account's ledger once in date order, grouping charges by a hash
+of their normalized description and amount band, keeps running interval
+statistics per group and stores the periodic ones as SUBSCRIPTION# items
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Optional
+
+from utils.cascade import iter_active_user_ids, iter_query_pages
+from utils.etag import record_write
+
+logger = logging.getLogger(__name__)
+
+# Relative width of an amount band (0.1: charges within ~10% group together)
+SUBSCRIPTION_AMOUNT_TOLERANCE = float(os.environ.get('SUBSCRIPTION_AMOUNT_TOLERANCE', '0.1'))
+
+# Charges needed before a series is reported
+SUBSCRIPTION_MIN_OCCURRENCES = int(os.environ.get('SUBSCRIPTION_MIN_OCCURRENCES', '3'))
+
+# Period in days and accepted deviation of the mean interval / its standard deviation
+PERIODS = {
+    'weekly': (7, 1.5),
+    'monthly': (30.44, 3.5),
+    'yearly': (365.25, 10),
+}
+
+# Transaction types that can be a recurring payment
+CHARGE_TYPES = ('expense', 'fee')
+
+_NOISE = re.compile(r'[^a-z ]+')
+
+
+def normalize_description(description: str) -> str:
+    """Lowercase words of a description without digits or punctuation ('NETFLIX.COM 8734' -> 'netflix com')"""
+    words = _NOISE.sub(' ', (description or '').lower()).split()
+    return ' '.join(words[:4])
+
+
+def amount_band(amount: float) -> int:
+    """Logarithmic band of an amount, SUBSCRIPTION_AMOUNT_TOLERANCE wide"""
+    return int(math.floor(math.log(max(abs(amount), 0.01)) / math.log1p(SUBSCRIPTION_AMOUNT_TOLERANCE)))
+
+
+def series_key(account_id: str, description: str, amount: float) -> str:
+    """Hash grouping the charges of one series on an account"""
+    raw = f"{account_id}|{normalize_description(description)}|{amount_band(amount)}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class SeriesStats:
+    """Running statistics of one series, updated one charge at a time in date order"""
+
+    __slots__ = ('description', 'account_id', 'count', 'first_date', 'last_date',
+                 'amount_total', 'last_amount', 'interval_mean', 'interval_m2')
+
+    def __init__(self, description: str, account_id: str):
+        self.description = description
+        self.account_id = account_id
+        self.count = 0
+        self.first_date: Optional[date] = None
+        self.last_date: Optional[date] = None
+        self.amount_total = 0.0
+        self.last_amount = 0.0
+        self.interval_mean = 0.0
+        self.interval_m2 = 0.0
+
+    def add(self, on: date, amount: float, description: str) -> None:
+        """Add a charge (Welford update of the interval mean and variance)"""
+        if self.last_date is not None:
+            if on == self.last_date:
+                # Same-day duplicates (split charges) are not a new period
+                self.amount_total += amount
+                self.last_amount += amount
+                return
+            interval = (on - self.last_date).days
+            intervals = self.count  # intervals seen after this one
+            delta = interval - self.interval_mean
+            self.interval_mean += delta / intervals
+            self.interval_m2 += delta * (interval - self.interval_mean)
+        else:
+            self.first_date = on
+
+        self.count += 1
+        self.last_date = on
+        self.amount_total += amount
+        self.last_amount = amount
+        self.description = description
+
+    @property
+    def interval_stddev(self) -> float:
+        intervals = self.count - 1
+        return math.sqrt(self.interval_m2 / intervals) if intervals > 1 else 0.0
+
+    def frequency(self) -> Optional[str]:
+        """Period the intervals match, if regular enough"""
+        if self.count < SUBSCRIPTION_MIN_OCCURRENCES:
+            return None
+        for frequency, (days, deviation) in PERIODS.items():
+            if abs(self.interval_mean - days) <= deviation and self.interval_stddev <= deviation:
+                return frequency
+        return None
+
+
+def iter_account_charges(db_client, user_id: str, account_id: str) -> Iterator[Dict[str, Any]]:
+    """Yield an account's charges in transaction date order (GSI1), projected"""
+    names = {'#date': 'transaction_date', '#amount': 'amount', '#description': 'description',
+             '#type': 'transaction_type', '#user': 'user_id', '#template': 'recurring_template_id',
+             '#recurring': 'is_recurring'}
+    pages = iter_query_pages(
+        db_client.table,
+        IndexName='GSI1',
+        KeyConditionExpression='gsi1_pk = :account_pk AND begins_with(gsi1_sk, :prefix)',
+        ExpressionAttributeValues={':account_pk': f'ACCOUNT#{account_id}', ':prefix': 'TRANSACTION#'},
+        ProjectionExpression=', '.join(names),
+        ExpressionAttributeNames=names,
+        ScanIndexForward=True
+    )
+    for page in pages:
+        for item in page:
+            # Recurring templates and their occurrences are already known
+            if (item.get('user_id') == user_id and item.get('transaction_type') in CHARGE_TYPES
+                    and not item.get('is_recurring') and not item.get('recurring_template_id')):
+                yield item
+
+
+def detect_series(db_client, user_id: str, accounts: List[Dict[str, Any]]) -> Dict[str, SeriesStats]:
+    """
+    Group every charge of a user's accounts into series in one pass
+
+    Returns:
+        SeriesStats by series key
+    """
+    series: Dict[str, SeriesStats] = {}
+    for account in accounts:
+        account_id = account['account_id']
+        for charge in iter_account_charges(db_client, user_id, account_id):
+            amount = abs(float(charge['amount']))
+            key = series_key(account_id, charge['description'], amount)
+            stats = series.get(key)
+            if stats is None:
+                stats = series[key] = SeriesStats(charge['description'], account_id)
+            stats.add(date.fromisoformat(charge['transaction_date'][:10]), amount, charge['description'])
+    return series
+
+
+def build_subscription(key: str, stats: SeriesStats, frequency: str, account: Dict[str, Any],
+                       today: date, now: str) -> Dict[str, Any]:
+    """Subscription item fields for a periodic series"""
+    period = PERIODS[frequency][0]
+    next_expected = stats.last_date + timedelta(days=round(period))
+    return {
+        'subscription_id': key,
+        'description': stats.description,
+        'normalized_description': normalize_description(stats.description),
+        'account_id': stats.account_id,
+        'account_name': account.get('name'),
+        'currency': account.get('currency', 'MXN'),
+        'frequency': frequency,
+        'average_amount': Decimal(str(round(stats.amount_total / stats.count, 2))),
+        'last_amount': Decimal(str(round(stats.last_amount, 2))),
+        'occurrences': stats.count,
+        'first_date': stats.first_date.isoformat(),
+        'last_date': stats.last_date.isoformat(),
+        'next_expected_date': next_expected.isoformat(),
+        'interval_mean_days': Decimal(str(round(stats.interval_mean, 2))),
+        'interval_stddev_days': Decimal(str(round(stats.interval_stddev, 2))),
+        # A missed period (plus tolerance) means the subscription was probably cancelled
+        'is_active': (today - stats.last_date).days <= period + PERIODS[frequency][1] * 2,
+        'detected_at': now
+    }
+
+
+def detect_subscriptions(db_client, user_id: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Detect a user's recurring payments and replace the stored SUBSCRIPTION# items
+
+    Args:
+        db_client: DynamoDBClient
+        user_id: User to analyze
+        today: Reference date for is_active (default: today)
+
+    Returns:
+        Summary with series and subscriptions found
+    """
+    started = time.perf_counter()
+    today = today or date.today()
+    now = datetime.now().isoformat()
+
+    accounts = {account['account_id']: account
+                for account in db_client.list_user_accounts(user_id, include_inactive=True)}
+    series = detect_series(db_client, user_id, list(accounts.values()))
+
+    subscriptions = []
+    for key, stats in series.items():
+        frequency = stats.frequency()
+        if frequency:
+            subscriptions.append(build_subscription(key, stats, frequency, accounts[stats.account_id], today, now))
+
+    removed = db_client.replace_subscriptions(user_id, subscriptions)
+    if subscriptions or removed:
+        record_write(db_client, user_id)
+    summary = {
+        'user_id': user_id,
+        'series': len(series),
+        'subscriptions': len(subscriptions),
+        'removed': removed,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    logger.info(f"Subscriptions detected: {summary}")
+    return summary
+
+
+def detect_all_subscriptions(db_client, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Detect the recurring payments of every active user
+
+    Returns:
+        Totals of users analyzed, subscriptions found and failures
+    """
+    totals = {'users': 0, 'subscriptions': 0, 'removed': 0, 'failed': 0}
+    for user_id in iter_active_user_ids(db_client):
+        try:
+            summary = detect_subscriptions(db_client, user_id, today=today)
+        except Exception as e:
+            # One user's failure should not stop the weekly pass
+            logger.error(f"Error detecting subscriptions for user {user_id}: {e}")
+            totals['failed'] += 1
+            continue
+        totals['users'] += 1
+        totals['subscriptions'] += summary['subscriptions']
+        totals['removed'] += summary['removed']
+    logger.info(f"Subscription detection finished: {totals}")
+    return totals
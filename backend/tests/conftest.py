@@ -0,0 +1,79 @@
+"""
+Shared fixtures and item builders for the tests that run against a moto DynamoDB table
+"""
+
+import os
+import sys
+from decimal import Decimal
+from unittest.mock import patch
+
+import boto3
+import pytest
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.dynamodb_client import DynamoDBClient
+
+TABLE_NAME = 'finance-tracker-test'
+
+
+def create_table():
+    """Table with the production key schema: pk/sk plus GSI1, GSI2 and GSI3, all projected"""
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+    return dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[
+            {'AttributeName': 'pk', 'KeyType': 'HASH'},
+            {'AttributeName': 'sk', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': name, 'AttributeType': 'S'}
+            for name in ('pk', 'sk', 'gsi1_pk', 'gsi1_sk', 'gsi2_pk', 'gsi2_sk', 'gsi3_pk', 'gsi3_sk')
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': index,
+                'KeySchema': [
+                    {'AttributeName': f'{prefix}_pk', 'KeyType': 'HASH'},
+                    {'AttributeName': f'{prefix}_sk', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }
+            for index, prefix in (('GSI1', 'gsi1'), ('GSI2', 'gsi2'), ('GSI3', 'gsi3'))
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+@pytest.fixture
+def table():
+    """Empty moto table, with DYNAMODB_TABLE pointing at it for the test"""
+    with mock_aws():
+        with patch.dict(os.environ, {'DYNAMODB_TABLE': TABLE_NAME, 'AWS_DEFAULT_REGION': 'us-east-1'}):
+            yield create_table()
+
+
+def account_item(account_id, balance='0', user_id='user_123', **extra):
+    """Active MXN checking account item, indexed under GSI1 ACCOUNT#{account_id}"""
+    return {
+        'pk': f'USER#{user_id}', 'sk': f'ACCOUNT#{account_id}', 'entity_type': 'account',
+        'gsi1_pk': f'ACCOUNT#{account_id}', 'gsi1_sk': f'USER#{user_id}',
+        'account_id': account_id, 'user_id': user_id, 'name': account_id, 'account_type': 'checking',
+        'currency': 'MXN', 'current_balance': Decimal(str(balance)), 'is_active': True,
+        **extra
+    }
+
+
+def card_item(card_id, balance='0', user_id='user_123', **extra):
+    """Active MXN credit card item with its GSI1 keys and the sparse CUTOFF#/DUE# keys of its days"""
+    card = {
+        'pk': f'USER#{user_id}', 'sk': f'CARD#{card_id}', 'entity_type': 'card',
+        'gsi1_pk': f'CARD#{card_id}', 'gsi1_sk': f'USER#{user_id}',
+        'card_id': card_id, 'user_id': user_id, 'name': card_id, 'card_type': 'credit',
+        'card_network': 'visa', 'bank_name': 'Bank', 'currency': 'MXN', 'status': 'active',
+        'current_balance': Decimal(str(balance)),
+        'created_at': '2025-01-01T00:00:00', 'updated_at': '2025-01-01T00:00:00',
+        **extra
+    }
+    return {**card, **DynamoDBClient.card_index_keys(card)}
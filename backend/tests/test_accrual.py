@@ -0,0 +1,221 @@
+"""
+Tests for the batch interest and fee accrual
+"""
+
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import card_item
+from utils.accrual import apply_batch, compute_accruals, iter_cut_off_cards, run_accrual
+from utils.dynamodb_client import DynamoDBClient
+
+CUT_OFF = date(2025, 9, 15)
+
+
+def _card(client, card_id, cut_off_date, apr='36', annual_fee=None, created_at='2024-03-01T00:00:00',
+          revolving=None, statement_cycle=None, status='active'):
+    client.create_card(card_item(
+        card_id, '1000', cut_off_date=cut_off_date, payment_due_date=5, apr=Decimal(apr),
+        annual_fee=Decimal(annual_fee) if annual_fee else None,
+        status=status, created_at=created_at, updated_at=created_at
+    ))
+    if statement_cycle:
+        client.table.update_item(
+            Key={'pk': 'USER#user_123', 'sk': f'CARD#{card_id}'},
+            UpdateExpression='SET revolving_balance = :revolving, last_statement_cycle = :cycle',
+            ExpressionAttributeValues={':revolving': Decimal(revolving or '0'), ':cycle': statement_cycle}
+        )
+
+
+@pytest.fixture
+def db_client(table):
+    client = DynamoDBClient()
+    _card(client, 'card_interest', 15, revolving='1000', statement_cycle='2025-09')
+    _card(client, 'card_fee', 15, annual_fee='600', created_at='2024-09-02T00:00:00',
+          statement_cycle='2025-09')
+    _card(client, 'card_zero', 15, statement_cycle='2025-09')
+    _card(client, 'card_pending', 15, revolving='500')
+    _card(client, 'card_other_day', 20, revolving='1000', statement_cycle='2025-09')
+    _card(client, 'card_off', 15, revolving='1000', statement_cycle='2025-09', status='inactive')
+    return client
+
+
+def _balance(db_client, card_id):
+    return db_client.get_card_by_id('user_123', card_id)['current_balance']
+
+
+class TestCutOffIndex:
+    """Tests for the sparse CUTOFF#{dd} index maintained on the card"""
+
+    def test_only_active_cards_of_the_day(self, db_client):
+        """Test: The sweep reads the cards indexed under the cut-off day only"""
+        card_ids = {card['card_id'] for card in iter_cut_off_cards(db_client, CUT_OFF)}
+
+        assert card_ids == {'card_interest', 'card_fee', 'card_zero', 'card_pending'}
+
+    def test_index_follows_updates(self, db_client):
+        """Test: Changing the cut-off day or deactivating the card moves or drops its key"""
+        db_client.update_card('user_123', 'card_zero', {'cut_off_date': 20, 'updated_at': '2025-09-01'})
+        db_client.delete_card('user_123', 'card_fee', '2025-09-01')
+
+        card = db_client.get_card_by_id('user_123', 'card_zero')
+        assert card['gsi2_pk'] == 'CUTOFF#20'
+        assert 'gsi2_pk' not in db_client.get_card_by_id('user_123', 'card_fee')
+        assert {card['card_id'] for card in iter_cut_off_cards(db_client, CUT_OFF)} == {
+            'card_interest', 'card_pending'
+        }
+
+    def test_month_end_sweeps_later_days(self, db_client):
+        """Test: On the last day of a short month cut-offs up to the 31st are included"""
+        _card(db_client, 'card_eom', 31)
+
+        card_ids = {card['card_id'] for card in iter_cut_off_cards(db_client, date(2025, 9, 30))}
+
+        assert card_ids == {'card_eom'}
+
+
+class TestComputeAccruals:
+    """Tests for the batch interest and fee computation"""
+
+    def test_interest_and_anniversary_fee(self):
+        """Test: Interest is revolving x APR / 12; the fee is due in the anniversary month only"""
+        cards = [
+            {'card_id': 'a', 'cut_off_date': Decimal('15'), 'apr': Decimal('36'),
+             'revolving_balance': Decimal('1234.56'), 'last_statement_cycle': '2025-09',
+             'created_at': '2024-01-10T00:00:00'},
+            {'card_id': 'b', 'cut_off_date': Decimal('15'), 'apr': Decimal('24'), 'annual_fee': Decimal('600'),
+             'last_statement_cycle': '2025-09', 'created_at': '2024-09-01T00:00:00'},
+            {'card_id': 'c', 'cut_off_date': Decimal('15'), 'annual_fee': Decimal('600'),
+             'last_statement_cycle': '2025-09', 'created_at': '2025-09-01T00:00:00'},
+            {'card_id': 'd', 'cut_off_date': Decimal('15'), 'last_statement_cycle': '2025-09',
+             'last_accrual_cycle': '2025-09', 'revolving_balance': Decimal('10')},
+        ]
+
+        accruals = compute_accruals(cards, CUT_OFF)
+
+        assert [a['interest'] for a in accruals] == [Decimal('37.04'), Decimal('0'), Decimal('0'), Decimal('0.00')]
+        assert [a['fee'] for a in accruals] == [Decimal('0'), Decimal('600'), Decimal('0'), Decimal('0')]
+        assert [a['status'] for a in accruals] == ['due', 'due', 'nothing_due', 'already_accrued']
+
+
+class TestRunAccrual:
+    """Tests for applying the accrual"""
+
+    def test_charges_posted_once_per_cycle(self, db_client):
+        """Test: Interest and fees are posted to the next cycle and the balance grows once"""
+        summary = run_accrual(db_client, CUT_OFF, batch_size=2)
+
+        assert summary['cards'] == 4
+        assert summary['applied'] == 2
+        assert summary['nothing_due'] == 1
+        assert summary['pending_statement'] == 1
+        assert summary['interest'] == 30.0 and summary['fees'] == 600.0
+        assert summary['cards_per_second'] > 0
+        assert _balance(db_client, 'card_interest') == Decimal('1030')
+        assert _balance(db_client, 'card_fee') == Decimal('1600')
+        assert _balance(db_client, 'card_pending') == Decimal('1000')
+
+        posted = db_client.list_card_cycle_transactions('user_123', 'card_interest', '2025-10')
+        assert [(t['card_transaction_id'], t['transaction_type']) for t in posted] == [
+            ('ctxn_interest_2025-09', 'interest')
+        ]
+        assert posted[0]['transaction_date'] == '2025-09-16T00:00:00'
+
+    def test_rerun_is_idempotent(self, db_client):
+        """Test: Running the same cut-off again charges nothing"""
+        run_accrual(db_client, CUT_OFF)
+        summary = run_accrual(db_client, CUT_OFF)
+
+        assert summary['applied'] == 0
+        assert summary['already_accrued'] == 2
+        assert _balance(db_client, 'card_interest') == Decimal('1030')
+
+    def test_concurrent_accrual_dropped_from_batch(self, db_client):
+        """Test: Cards accrued by another run are dropped and the rest of the batch is applied"""
+        cards = list(iter_cut_off_cards(db_client, CUT_OFF))
+        due = [a for a in compute_accruals(cards, CUT_OFF) if a['status'] == 'due']
+        apply_batch(db_client, [a for a in due if a['card']['card_id'] == 'card_interest'], CUT_OFF)
+
+        result = apply_batch(db_client, due, CUT_OFF)
+
+        assert [a['card']['card_id'] for a in result['applied']] == ['card_fee']
+        assert result['already_accrued'] == 1 and result['failed'] == 0
+        assert _balance(db_client, 'card_interest') == Decimal('1030')
+        assert _balance(db_client, 'card_fee') == Decimal('1600')
+
+    def test_batch_still_conflicting_counted_as_failed(self, db_client):
+        """Test: Cards not applied after the retry are reported as failed, not as already accrued"""
+        _card(db_client, 'card_extra', 15, revolving='200', statement_cycle='2025-09')
+        client = db_client.table.meta.client
+
+        def conflict_on_first_card(TransactItems):
+            reasons = [{'Code': 'ConditionalCheckFailed'}] + [{'Code': 'None'}] * (len(TransactItems) - 1)
+            raise client.exceptions.TransactionCanceledException(
+                {'Error': {'Code': 'TransactionCanceledException'}, 'CancellationReasons': reasons},
+                'TransactWriteItems'
+            )
+
+        with patch.object(client, 'transact_write_items', side_effect=conflict_on_first_card):
+            summary = run_accrual(db_client, CUT_OFF)
+
+        assert summary['applied'] == 0
+        assert summary['already_accrued'] == 2
+        assert summary['failed'] == 1
+        assert summary['interest'] == 0.0 and summary['fees'] == 0.0
+
+    def test_data_version_bumped_per_user(self, db_client):
+        """Test: Users with applied accruals get their data version bumped once"""
+        with patch('utils.accrual.record_write') as mock_record_write:
+            run_accrual(db_client, CUT_OFF, batch_size=1)
+            run_accrual(db_client, CUT_OFF)
+
+        mock_record_write.assert_called_once_with(db_client, 'user_123')
+
+    def test_pending_statement_retried(self, db_client):
+        """Test: A card waiting for its statement is accrued by a later run with its own cut-off"""
+        run_accrual(db_client, CUT_OFF)
+        assert db_client.get_job_state('accrual')['pending'] == [
+            {'user_id': 'user_123', 'card_id': 'card_pending', 'cut_off': '2025-09-15'}
+        ]
+        db_client.table.update_item(
+            Key={'pk': 'USER#user_123', 'sk': 'CARD#card_pending'},
+            UpdateExpression='SET revolving_balance = :revolving, last_statement_cycle = :cycle',
+            ExpressionAttributeValues={':revolving': Decimal('500'), ':cycle': '2025-09'}
+        )
+
+        summary = run_accrual(db_client, date(2025, 9, 16))
+
+        assert summary['retried'] == 1 and summary['applied'] == 1
+        assert _balance(db_client, 'card_pending') == Decimal('1015')
+        assert db_client.get_job_state('accrual')['pending'] == []
+
+    def test_stale_pending_dropped(self, db_client):
+        """Test: Cards still without a statement after ACCRUAL_PENDING_DAYS stop being retried"""
+        run_accrual(db_client, CUT_OFF)
+
+        summary = run_accrual(db_client, date(2025, 11, 1))
+
+        assert summary['retried'] == 0
+        assert db_client.get_job_state('accrual')['pending'] == []
+
+    def test_jobs_handler(self, db_client):
+        """Test: The accrue job runs for a date and index_cards backfills legacy cards"""
+        from handlers.jobs import lambda_handler
+
+        db_client.table.update_item(
+            Key={'pk': 'USER#user_123', 'sk': 'CARD#card_zero'},
+            UpdateExpression='REMOVE gsi2_pk, gsi2_sk'
+        )
+        backfill = lambda_handler({'action': 'index_cards', 'segments': 2}, None)
+        result = lambda_handler({'action': 'accrue', 'date': '2025-09-15'}, None)
+
+        assert backfill['result'] == {'indexed': 1}
+        assert result['status'] == 'ok'
+        assert result['result']['cards'] == 4 and result['result']['applied'] == 2
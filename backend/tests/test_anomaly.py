@@ -0,0 +1,185 @@
+"""
+Tests for the streaming anomaly detector and GET /alerts
+"""
+
+import json
+import os
+import statistics
+import sys
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item
+from utils.anomaly import record_expense_stats, welford_remove, welford_update
+from utils.dynamodb_client import DynamoDBClient
+
+AUTH_HEADERS = {'Authorization': 'Bearer valid_token'}
+
+
+def _create(amount, description, category='groceries', day='2025-10-01'):
+    from handlers.transactions import create_transaction_handler
+
+    response = create_transaction_handler({'headers': AUTH_HEADERS, 'body': json.dumps({
+        'account_id': 'acc_main', 'amount': amount, 'description': description,
+        'transaction_type': 'expense', 'category': category, 'transaction_date': f'{day}T12:00:00'
+    })}, Mock())
+    assert response['statusCode'] == 201
+    return json.loads(response['body'])['transaction']
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item=account_item('acc_main', '100000', name='Main'))
+    return DynamoDBClient()
+
+
+class TestWelford:
+    """Tests for the running statistics"""
+
+    def test_matches_batch_statistics(self):
+        """Test: Count, mean and sample variance match the batch computation"""
+        amounts = [120.5, 80, 300.25, 95, 150, 60.75]
+        stats = None
+        for amount in amounts:
+            stats = welford_update(stats, amount)
+
+        assert stats['count'] == 6
+        assert abs(float(stats['mean']) - statistics.mean(amounts)) < 1e-6
+        assert abs(float(stats['m2']) / 5 - statistics.variance(amounts)) < 1e-4
+
+    def test_remove_is_inverse(self):
+        """Test: Removing an amount gives the statistics of the remaining amounts"""
+        amounts = [120.5, 80, 300.25, 95, 150, 60.75]
+        stats = None
+        for amount in amounts:
+            stats = welford_update(stats, amount)
+
+        stats = welford_remove(stats, 300.25)
+
+        remaining = [120.5, 80, 95, 150, 60.75]
+        assert stats['count'] == 5
+        assert abs(float(stats['mean']) - statistics.mean(remaining)) < 1e-6
+        assert abs(float(stats['m2']) / 4 - statistics.variance(remaining)) < 1e-4
+        assert welford_remove(welford_update(None, 42), 42)['count'] == 0
+
+
+class TestGetAnomalyState:
+    """Tests for the batch read of the anomaly statistics"""
+
+    @patch('utils.dynamodb_client.time.sleep')
+    def test_unprocessed_keys_are_retried_then_given_up(self, mock_sleep):
+        """Test: UnprocessedKeys are re-requested with backoff, and a bounded number of times"""
+        client = DynamoDBClient()
+        client.table_name = 'finance-tracker-test'
+        client._dynamodb = MagicMock()
+        unprocessed = {'finance-tracker-test': {'Keys': [{'pk': 'USER#user_123', 'sk': 'STATS#ANOMALY'}]}}
+        client._dynamodb.batch_get_item.side_effect = [
+            {'Responses': {'finance-tracker-test': [{'sk': 'STATS#MERCHANT#abc'}]}, 'UnprocessedKeys': unprocessed},
+            {'Responses': {'finance-tracker-test': [{'sk': 'STATS#ANOMALY', 'count': 3}]}, 'UnprocessedKeys': {}}
+        ]
+
+        state = client.get_anomaly_state('user_123', 'abc')
+        assert state == {'stats': {'sk': 'STATS#ANOMALY', 'count': 3}, 'merchant_seen': True}
+        assert mock_sleep.call_count == 1
+
+        client._dynamodb.batch_get_item.side_effect = None
+        client._dynamodb.batch_get_item.return_value = {'Responses': {}, 'UnprocessedKeys': unprocessed}
+        with pytest.raises(RuntimeError):
+            client.get_anomaly_state('user_123', 'abc')
+        assert client._dynamodb.batch_get_item.call_count == 2 + DynamoDBClient.BATCH_GET_MAX_ATTEMPTS
+
+
+class TestCreateFlags:
+    """Tests for the flags set by create_transaction_handler"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_unusual_and_unfamiliar_flagged(self, mock_validate_token, db_client):
+        """Test: Only large or unfamiliar charges are flagged once the category has history"""
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        for day, amount in enumerate((100, 110, 90, 105, 95), start=1):
+            assert _create(amount, 'Supermarket Centro', day=f'2025-09-{day:02d}')['anomaly_flags'] is None
+
+        assert _create(102, 'Supermarket Centro', day='2025-10-01')['anomaly_flags'] is None
+        assert _create(104, 'Corner Deli', day='2025-10-02')['anomaly_flags'] == ['unfamiliar_merchant']
+        large = _create(900, 'Supermarket Centro', day='2025-10-03')
+        assert large['anomaly_flags'] == ['unusual_amount']
+        assert large['anomaly_score'] > 3
+        assert _create(20, 'Farmers Market', day='2025-10-04')['anomaly_flags'] is None
+        assert _create(5000, 'Steakhouse', category='restaurants', day='2025-10-05')['anomaly_flags'] is None
+
+        stats = db_client.get_anomaly_stats('user_123')
+        assert stats['categories']['MXN#groceries']['count'] == 9
+        assert stats['version'] == 10
+        assert 'merchants' not in stats
+        merchants = db_client.table.query(
+            KeyConditionExpression='pk = :pk AND begins_with(sk, :prefix)',
+            ExpressionAttributeValues={':pk': 'USER#user_123', ':prefix': 'STATS#MERCHANT#'}
+        )['Items']
+        assert len(merchants) == 4
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_delete_and_recategorize_reverse_stats(self, mock_validate_token, db_client):
+        """Test: Deleted or recategorized expenses leave their category statistics"""
+        from handlers.transactions import delete_transaction_handler, update_transaction_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        created = [_create(amount, 'Supermarket Centro', day=f'2025-09-{day:02d}')
+                   for day, amount in enumerate((100, 110, 90, 105, 95), start=1)]
+
+        response = delete_transaction_handler({'headers': AUTH_HEADERS, 'pathParameters': {
+            'transaction_id': created[0]['transaction_id']}}, Mock())
+        assert response['statusCode'] == 200
+        response = update_transaction_handler({'headers': AUTH_HEADERS, 'pathParameters': {
+            'transaction_id': created[1]['transaction_id']}, 'body': json.dumps({'category': 'restaurants'})}, Mock())
+        assert response['statusCode'] == 200
+
+        categories = db_client.get_anomaly_stats('user_123')['categories']
+        assert categories['MXN#groceries']['count'] == 3
+        assert categories['MXN#groceries']['mean'] == Decimal('96.666667')
+        assert categories['MXN#restaurants']['count'] == 1
+
+    def test_version_conflict_reread(self, db_client):
+        """Test: A write that lost the version race is recomputed from the current item"""
+        transaction = {'amount': -50, 'transaction_type': 'expense', 'category': 'groceries', 'description': 'Shop'}
+        record_expense_stats(db_client, 'user_123', transaction, 'MXN')
+        stale = db_client.get_anomaly_stats('user_123')
+        record_expense_stats(db_client, 'user_123', {**transaction, 'amount': -150}, 'MXN')
+
+        assert record_expense_stats(db_client, 'user_123', {**transaction, 'amount': -100}, 'MXN', stale)
+        stats = db_client.get_anomaly_stats('user_123')['categories']['MXN#groceries']
+        assert stats['count'] == 3
+        assert stats['mean'] == Decimal('100')
+
+
+class TestGetAlerts:
+    """Tests for GET /alerts"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_sparse_index_newest_first(self, mock_validate_token, db_client):
+        """Test: Only flagged transactions are listed, most recent first and within the range"""
+        from handlers.dashboard import get_alerts_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        for day, amount in enumerate((100, 110, 90, 105, 95), start=1):
+            _create(amount, 'Supermarket Centro', day=f'2025-09-{day:02d}')
+        _create(800, 'Supermarket Centro', day='2025-09-20')
+        _create(5000, 'Supermarket Centro', day='2025-10-02')
+
+        response = get_alerts_handler({'headers': AUTH_HEADERS, 'queryStringParameters': None}, Mock())
+        body = json.loads(response['body'])
+        assert response['statusCode'] == 200
+        assert body['count'] == 2
+        assert [alert['amount'] for alert in body['alerts']] == [-5000.0, -800.0]
+
+        response = get_alerts_handler({'headers': AUTH_HEADERS,
+                                       'queryStringParameters': {'date_to': '2025-09-30'}}, Mock())
+        assert [alert['amount'] for alert in json.loads(response['body'])['alerts']] == [-800.0]
+
+        for params in ({'limit': '0'}, {'date_from': 'yesterday'},
+                       {'date_from': '2025-10-02', 'date_to': '2025-10-01'}):
+            response = get_alerts_handler({'headers': AUTH_HEADERS, 'queryStringParameters': params}, Mock())
+            assert response['statusCode'] == 400
@@ -6,15 +6,29 @@ Validates login, register, and refresh token operations
 import pytest
 import json
 import os
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
 from moto import mock_aws
 
 # Import system modules
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from handlers import auth as auth_module
 from handlers.auth import lambda_handler
 from models.user import UserCreate, UserLogin, hash_password, verify_password
+from utils.dynamodb_client import DynamoDBClient
+
+
+@pytest.fixture(autouse=True)
+def reset_login_limiters():
+    """Login rate limiters are per container; isolate them between tests"""
+    auth_module.email_limiter.reset()
+    auth_module.ip_limiter.reset()
+    yield
+    auth_module.email_limiter.reset()
+    auth_module.ip_limiter.reset()
 
 
 class TestAuthRegistration:
@@ -256,6 +270,252 @@ class TestAuthLogin:
                     body = json.loads(response['body'])
                     assert body['error'] == 'User account not found or disabled'
 
+    def _login_with_stored_hash(self, mock_db, stored_hash):
+        mock_db.get_user_by_email.return_value = {
+            'user_id': 'usr_test123',
+            'email': 'bryan@example.com',
+            'password_hash': stored_hash,
+            'is_active': True
+        }
+        event = {
+            'httpMethod': 'POST',
+            'path': '/auth/login',
+            'body': json.dumps({
+                'email': 'bryan@example.com',
+                'password': 'MyPassword123!'
+            })
+        }
+        return lambda_handler(event, None)
+
+    def test_login_rehashes_outdated_cost(self):
+        """Test: Successful login rehashes a hash created with another cost"""
+        stored_hash = hash_password('MyPassword123!', rounds=4)
+
+        with patch('models.user.BCRYPT_ROUNDS', 5):
+            with patch('handlers.auth.db_client') as mock_db:
+                response = self._login_with_stored_hash(mock_db, stored_hash)
+
+        assert response['statusCode'] == 200
+        user_id, old_hash, new_hash = mock_db.rehash_password.call_args[0]
+        assert user_id == 'usr_test123'
+        assert old_hash == stored_hash
+        assert new_hash.startswith('$2b$05$')
+        assert verify_password('MyPassword123!', new_hash)
+
+    def test_login_keeps_current_cost(self):
+        """Test: No rehash when the stored cost matches the configuration"""
+        stored_hash = hash_password('MyPassword123!', rounds=4)
+
+        with patch('models.user.BCRYPT_ROUNDS', 4):
+            with patch('handlers.auth.db_client') as mock_db:
+                response = self._login_with_stored_hash(mock_db, stored_hash)
+
+        assert response['statusCode'] == 200
+        mock_db.rehash_password.assert_not_called()
+
+    def test_login_succeeds_when_rehash_fails(self):
+        """Test: Rehash errors never fail the login"""
+        stored_hash = hash_password('MyPassword123!', rounds=4)
+
+        with patch('models.user.BCRYPT_ROUNDS', 5):
+            with patch('handlers.auth.db_client') as mock_db:
+                mock_db.rehash_password.side_effect = Exception("DynamoDB unavailable")
+                response = self._login_with_stored_hash(mock_db, stored_hash)
+
+        assert response['statusCode'] == 200
+
+
+class TestLoginLockout:
+    """Tests for failed-login counting, lockout and rate limiting"""
+
+    def _event(self, password='WrongPassword!', email='bryan@example.com', source_ip=None):
+        event = {
+            'httpMethod': 'POST',
+            'path': '/auth/login',
+            'body': json.dumps({'email': email, 'password': password})
+        }
+        if source_ip:
+            event['requestContext'] = {'identity': {'sourceIp': source_ip}}
+        return event
+
+    def _user(self, **extra):
+        return {
+            'user_id': 'usr_test123',
+            'email': 'bryan@example.com',
+            'password_hash': hash_password('MyPassword123!', rounds=4),
+            'is_active': True,
+            **extra
+        }
+
+    def test_wrong_password_records_failed_login(self):
+        """Test: A wrong password is counted atomically with the stored count"""
+        with patch('handlers.auth.db_client') as mock_db:
+            mock_db.get_user_by_email.return_value = self._user(failed_login_attempts=2)
+            response = lambda_handler(self._event(), None)
+
+        assert response['statusCode'] == 401
+        user_id, seen, max_attempts, lockout_until = mock_db.record_failed_login.call_args[0]
+        assert (user_id, seen, max_attempts) == ('usr_test123', 2, auth_module.MAX_FAILED_LOGIN_ATTEMPTS)
+        assert datetime.fromisoformat(lockout_until) > datetime.now()
+
+    def test_failed_login_not_recorded_still_401(self):
+        """Test: An error while counting the attempt still answers 401"""
+        with patch('handlers.auth.db_client') as mock_db:
+            mock_db.get_user_by_email.return_value = self._user()
+            mock_db.record_failed_login.side_effect = RuntimeError('throttled')
+            response = lambda_handler(self._event(), None)
+
+        assert response['statusCode'] == 401
+
+    def test_locked_account_rejected_before_password_check(self):
+        """Test: Locked accounts get 429 with Retry-After and no bcrypt work"""
+        blocked_until = (datetime.now() + timedelta(minutes=10)).isoformat()
+
+        with patch('handlers.auth.db_client') as mock_db, \
+             patch('models.user.verify_password') as mock_verify:
+            mock_db.get_user_by_email.return_value = self._user(blocked_until=blocked_until)
+            response = lambda_handler(self._event(password='MyPassword123!'), None)
+
+        assert response['statusCode'] == 429
+        assert 500 < int(response['headers']['Retry-After']) <= 601
+        mock_verify.assert_not_called()
+        mock_db.record_failed_login.assert_not_called()
+
+    def test_expired_lock_allows_login(self):
+        """Test: A lock in the past does not block a correct password"""
+        blocked_until = (datetime.now() - timedelta(minutes=1)).isoformat()
+
+        with patch('handlers.auth.db_client') as mock_db:
+            mock_db.get_user_by_email.return_value = self._user(blocked_until=blocked_until)
+            response = lambda_handler(self._event(password='MyPassword123!'), None)
+
+        assert response['statusCode'] == 200
+        mock_db.successful_login.assert_called_once_with('usr_test123')
+
+    def test_email_rate_limit_rejects_before_database(self):
+        """Test: Bursts against one email are rejected without reading the user"""
+        with patch('handlers.auth.db_client') as mock_db:
+            mock_db.get_user_by_email.return_value = None
+            statuses = [
+                lambda_handler(self._event(), None)['statusCode']
+                for _ in range(int(auth_module.LOGIN_EMAIL_BURST) + 1)
+            ]
+
+        assert statuses[:-1] == [401] * int(auth_module.LOGIN_EMAIL_BURST)
+        assert statuses[-1] == 429
+        assert mock_db.get_user_by_email.call_count == auth_module.LOGIN_EMAIL_BURST
+
+    def test_ip_rate_limit_spans_emails(self):
+        """Test: One source IP cycling through emails is limited"""
+        with patch('handlers.auth.db_client') as mock_db:
+            mock_db.get_user_by_email.return_value = None
+            statuses = [
+                lambda_handler(self._event(email=f'user{i}@example.com', source_ip='203.0.113.7'), None)['statusCode']
+                for i in range(int(auth_module.LOGIN_IP_BURST) + 1)
+            ]
+
+        assert statuses[-1] == 429
+        assert 429 not in statuses[:-1]
+
+
+class TestRecordFailedLogin:
+    """Tests for the atomic failed-login counter in DynamoDB"""
+
+    def _client(self):
+        client = DynamoDBClient()
+        client._table = MagicMock()
+        return client
+
+    def _conditional_failure(self, item):
+        error = {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'failed'}}
+        if item is not None:
+            error['Item'] = item
+        return ClientError(error, 'UpdateItem')
+
+    def test_increment_below_limit(self):
+        """Test: Below the limit only the counter is added"""
+        client = self._client()
+        client.table.update_item.return_value = {'Attributes': {'failed_login_attempts': 2}}
+
+        result = client.record_failed_login('usr_1', 1, 5, '2030-01-01T00:00:00')
+
+        assert result == {'failed_login_attempts': 2, 'locked': False}
+        kwargs = client.table.update_item.call_args.kwargs
+        assert kwargs['UpdateExpression'].startswith('ADD failed_login_attempts :one')
+        assert 'blocked_until' not in kwargs['UpdateExpression']
+        assert 'failed_login_attempts < :lock_at' in kwargs['ConditionExpression']
+
+    def test_reaching_limit_locks_in_same_update(self):
+        """Test: The attempt that reaches the limit sets blocked_until atomically"""
+        client = self._client()
+        client.table.update_item.return_value = {'Attributes': {'failed_login_attempts': 5}}
+
+        result = client.record_failed_login('usr_1', 4, 5, '2030-01-01T00:00:00')
+
+        assert result == {'failed_login_attempts': 5, 'locked': True}
+        kwargs = client.table.update_item.call_args.kwargs
+        assert 'blocked_until = :blocked_until' in kwargs['UpdateExpression']
+        assert kwargs['ExpressionAttributeValues'][':blocked_until'] == '2030-01-01T00:00:00'
+        assert client.table.update_item.call_count == 1
+
+    def test_concurrent_attempt_switches_branch(self):
+        """Test: A stale count is corrected from the failed condition check"""
+        client = self._client()
+        client.table.update_item.side_effect = [
+            self._conditional_failure({'failed_login_attempts': {'N': '4'}}),
+            {'Attributes': {'failed_login_attempts': 5}}
+        ]
+
+        result = client.record_failed_login('usr_1', 2, 5, '2030-01-01T00:00:00')
+
+        assert result == {'failed_login_attempts': 5, 'locked': True}
+        assert client.table.update_item.call_count == 2
+
+    def test_expired_lock_restarts_count(self):
+        """Test: A wrong password after the lockout counts as the first attempt and lifts the old lock"""
+        client = self._client()
+        client.table.update_item.return_value = {'Attributes': {'failed_login_attempts': 1}}
+
+        result = client.record_failed_login('usr_1', 5, 5, '2030-01-01T00:00:00',
+                                            seen_blocked_until='2020-01-01T00:00:00')
+
+        assert result == {'failed_login_attempts': 1, 'locked': False}
+        kwargs = client.table.update_item.call_args.kwargs
+        assert kwargs['UpdateExpression'].startswith('SET failed_login_attempts = :one')
+        assert kwargs['UpdateExpression'].endswith('REMOVE blocked_until')
+        assert kwargs['ConditionExpression'] == 'attribute_exists(pk) AND blocked_until = :seen_block'
+
+    def test_expired_lock_found_by_condition(self):
+        """Test: A lock that expired after the read is reset on the retry"""
+        client = self._client()
+        client.table.update_item.side_effect = [
+            self._conditional_failure({'failed_login_attempts': {'N': '5'},
+                                       'blocked_until': {'S': '2020-01-01T00:00:00'}}),
+            {'Attributes': {'failed_login_attempts': 1}}
+        ]
+
+        result = client.record_failed_login('usr_1', 4, 5, '2030-01-01T00:00:00')
+
+        assert result == {'failed_login_attempts': 1, 'locked': False}
+        assert ':seen_block' in client.table.update_item.call_args.kwargs['ExpressionAttributeValues']
+
+    def test_missing_user(self):
+        """Test: A missing user is not created by the counter"""
+        client = self._client()
+        client.table.update_item.side_effect = self._conditional_failure(None)
+
+        assert client.record_failed_login('usr_missing', 0, 5, '2030-01-01T00:00:00') is None
+
+    def test_repeated_conflicts_leave_lock_unknown(self):
+        """Test: After repeated conflicts the attempt is given up without raising"""
+        client = self._client()
+        client.table.update_item.side_effect = self._conditional_failure({'failed_login_attempts': {'N': '3'}})
+
+        result = client.record_failed_login('usr_1', 2, 5, '2030-01-01T00:00:00')
+
+        assert result == {'failed_login_attempts': 3, 'locked': None}
+        assert client.table.update_item.call_count == 3
+
 
 class TestAuthRefreshToken:
     """Tests for token refresh"""
@@ -372,3 +632,28 @@ class TestAuthRouting:
         assert response['statusCode'] == 400
         body = json.loads(response['body'])
         assert body['error'] == 'Invalid JSON in request body'
+
+
+class TestPasswordHashCost:
+    """Tests for configurable bcrypt work factor"""
+
+    def test_hash_uses_configured_rounds(self):
+        """Test: New hashes use BCRYPT_ROUNDS"""
+        from models.user import get_hash_rounds
+
+        with patch('models.user.BCRYPT_ROUNDS', 4):
+            hashed = hash_password('MyPassword123!')
+
+        assert get_hash_rounds(hashed) == 4
+
+    def test_password_needs_rehash(self):
+        """Test: Only bcrypt hashes with a different cost need rehash"""
+        from models.user import password_needs_rehash
+
+        hashed = hash_password('MyPassword123!', rounds=4)
+        with patch('models.user.BCRYPT_ROUNDS', 4):
+            assert password_needs_rehash(hashed) is False
+        with patch('models.user.BCRYPT_ROUNDS', 6):
+            assert password_needs_rehash(hashed) is True
+        assert password_needs_rehash('') is False
+        assert password_needs_rehash('not-a-bcrypt-hash') is False
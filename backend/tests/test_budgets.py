@@ -0,0 +1,212 @@
+"""
+Tests for category budgets and their spent counters
+"""
+
+import json
+import os
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item
+from utils.dynamodb_client import DynamoDBClient
+from utils.budgets import budget_status, rebuild_budgets
+
+PERIOD = date.today().strftime('%Y-%m')
+
+AUTH_HEADERS = {'Authorization': 'Bearer valid_token'}
+
+
+def _budget(client, category='groceries', amount=1000, period=PERIOD, spent=0, currency='MXN'):
+    return client.create_budget({
+        'user_id': 'user_123', 'category': category, 'amount': amount, 'currency': currency,
+        'alert_threshold': 0.8, 'period': period, 'spent': spent,
+        'created_at': '2025-01-01T00:00:00', 'updated_at': '2025-01-01T00:00:00'
+    })
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item={
+        'pk': 'USER#user_123', 'sk': 'METADATA', 'entity_type': 'user', 'user_id': 'user_123',
+        'gsi2_pk': 'ENTITY#user', 'gsi2_sk': '2025-01-01T00:00:00#user_123'
+    })
+    table.put_item(Item=account_item('acc_main', '10000'))
+    table.put_item(Item=account_item('acc_usd', '10000', currency='USD'))
+    return DynamoDBClient()
+
+
+def _call(handler, method, path, body=None, path_parameters=None):
+    event = {'httpMethod': method, 'path': path, 'headers': AUTH_HEADERS,
+             'pathParameters': path_parameters, 'body': json.dumps(body) if body is not None else None}
+    response = handler(event, Mock())
+    return response['statusCode'], json.loads(response['body'])
+
+
+class TestSpendCounter:
+    """Tests for the conditional ADD on the budget item"""
+
+    def test_add_same_period(self, db_client):
+        """Test: Spending in the budget's period and currency is added"""
+        _budget(db_client, period='2025-10', spent=100)
+
+        budget = db_client.add_budget_spend('user_123', 'groceries', '2025-10', 'MXN', Decimal('50'), 'now')
+
+        assert budget['spent'] == Decimal('150')
+
+    def test_new_period_restarts_counter(self, db_client):
+        """Test: The first expense of a later month restarts the counter; older months are ignored"""
+        _budget(db_client, period='2025-09', spent=900)
+
+        assert db_client.add_budget_spend('user_123', 'groceries', '2025-08', 'MXN', Decimal('10'), 'now') is None
+        assert db_client.add_budget_spend('user_123', 'groceries', '2025-10', 'MXN', Decimal('-10'), 'now') is None
+        budget = db_client.add_budget_spend('user_123', 'groceries', '2025-10', 'MXN', Decimal('40'), 'now')
+
+        assert budget['period'] == '2025-10'
+        assert budget['spent'] == Decimal('40')
+
+    def test_other_currency_or_category_untouched(self, db_client):
+        """Test: No budget item is created or changed for other categories or currencies"""
+        _budget(db_client, period='2025-10')
+
+        assert db_client.add_budget_spend('user_123', 'groceries', '2025-10', 'USD', Decimal('5'), 'now') is None
+        assert db_client.add_budget_spend('user_123', 'restaurants', '2025-10', 'MXN', Decimal('5'), 'now') is None
+        assert db_client.get_budget('user_123', 'restaurants') is None
+        assert db_client.get_budget('user_123', 'groceries')['spent'] == Decimal('0')
+
+    def test_status_of_past_period(self):
+        """Test: A counter from an earlier month reads as nothing spent this month"""
+        budget = {'amount': Decimal('100'), 'alert_threshold': Decimal('0.8'), 'spent': Decimal('90'),
+                  'period': '2025-09'}
+
+        assert budget_status(budget, date(2025, 9, 30))['is_over_threshold'] is True
+        status = budget_status(budget, date(2025, 10, 1))
+        assert status == {'period': '2025-10', 'spent': 0.0, 'remaining': 100.0, 'percent_used': 0.0,
+                          'is_over_threshold': False, 'is_over_budget': False}
+
+
+class TestBudgetWritePaths:
+    """Tests for the transaction endpoints keeping the counters"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_create_recategorize_delete(self, mock_validate_token, db_client):
+        """Test: Creating, recategorizing and deleting an expense move the counters"""
+        from handlers.budgets import create_budget_handler, get_budgets_handler
+        from handlers.transactions import (
+            create_transaction_handler,
+            delete_transaction_handler,
+            update_transaction_handler
+        )
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        assert _call(create_budget_handler, 'POST', '/budgets', {'category': 'groceries', 'amount': 1000})[0] == 201
+        assert _call(create_budget_handler, 'POST', '/budgets', {'category': 'restaurants', 'amount': 100})[0] == 201
+
+        status, body = _call(create_transaction_handler, 'POST', '/transactions', {
+            'account_id': 'acc_main', 'amount': 850, 'description': 'Market',
+            'transaction_type': 'expense', 'category': 'groceries'
+        })
+        assert status == 201
+        transaction_id = body['transaction']['transaction_id']
+        # Income and other currencies do not count
+        _call(create_transaction_handler, 'POST', '/transactions', {
+            'account_id': 'acc_main', 'amount': 500, 'description': 'Refund',
+            'transaction_type': 'income', 'category': 'groceries'
+        })
+        _call(create_transaction_handler, 'POST', '/transactions', {
+            'account_id': 'acc_usd', 'amount': 20, 'description': 'Store',
+            'transaction_type': 'expense', 'category': 'groceries'
+        })
+
+        _, body = _call(get_budgets_handler, 'GET', '/budgets')
+        groceries = next(budget for budget in body['budgets'] if budget['category'] == 'groceries')
+        assert groceries['spent'] == 850.0
+        assert groceries['remaining'] == 150.0
+        assert body['alerts'] == ['groceries']
+
+        _call(update_transaction_handler, 'PUT', f'/transactions/{transaction_id}', {'category': 'restaurants'},
+              {'transaction_id': transaction_id})
+        assert db_client.get_budget('user_123', 'groceries')['spent'] == Decimal('0')
+        assert db_client.get_budget('user_123', 'restaurants')['spent'] == Decimal('850')
+
+        _call(delete_transaction_handler, 'DELETE', f'/transactions/{transaction_id}', None,
+              {'transaction_id': transaction_id})
+        assert db_client.get_budget('user_123', 'restaurants')['spent'] == Decimal('0')
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_create_counts_month_so_far(self, mock_validate_token, db_client):
+        """Test: A new budget starts with the month's spending; duplicates are rejected"""
+        from handlers.budgets import create_budget_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        db_client.create_transaction({
+            'transaction_id': 'txn_1', 'user_id': 'user_123', 'account_id': 'acc_main', 'account_name': 'Main',
+            'amount': -120, 'description': 'Market', 'transaction_type': 'expense', 'category': 'groceries',
+            'status': 'completed', 'transaction_date': datetime.now().isoformat(), 'account_balance_after': 0,
+            'created_at': 'now', 'updated_at': 'now'
+        })
+
+        status, body = _call(create_budget_handler, 'POST', '/budgets', {'category': 'groceries', 'amount': 100})
+        assert status == 201
+        assert body['budget']['spent'] == 120.0
+        assert body['budget']['is_over_budget'] is True
+        assert _call(create_budget_handler, 'POST', '/budgets', {'category': 'groceries', 'amount': 100})[0] == 409
+
+    def test_future_dated_expense_ignored(self, db_client):
+        """Test: An expense dated next month neither moves the counter nor hides this month's"""
+        from utils.budgets import record_budget_spend
+
+        _budget(db_client, period='2025-10', spent=100)
+        expense = {'amount': -60, 'transaction_type': 'expense', 'category': 'groceries'}
+
+        assert record_budget_spend(db_client, 'user_123', {**expense, 'transaction_date': '2025-11-03T10:00:00'},
+                                   'MXN', today=date(2025, 10, 20)) is None
+        budget = record_budget_spend(db_client, 'user_123', {**expense, 'transaction_date': '2025-10-20T10:00:00'},
+                                     'MXN', today=date(2025, 10, 20))
+        assert budget['period'] == '2025-10'
+        assert budget['spent'] == Decimal('160')
+
+
+class TestRebuild:
+    """Tests for recomputing counters from history"""
+
+    def test_rebuild_from_history(self, db_client):
+        """Test: Counters are recomputed from the month's expenses per currency"""
+        _budget(db_client, spent=999)
+        _budget(db_client, category='restaurants', currency='USD')
+        for transaction_id, account_id, category, amount, day in (
+                ('txn_1', 'acc_main', 'groceries', -100, '2025-10-02'),
+                ('txn_2', 'acc_main', 'groceries', -50, '2025-10-30'),
+                ('txn_3', 'acc_main', 'groceries', -70, '2025-09-30'),
+                ('txn_4', 'acc_usd', 'restaurants', -15, '2025-10-10'),
+                ('txn_5', 'acc_main', 'restaurants', -40, '2025-10-10')):
+            db_client.create_transaction({
+                'transaction_id': transaction_id, 'user_id': 'user_123', 'account_id': account_id,
+                'account_name': account_id, 'amount': amount, 'description': transaction_id,
+                'transaction_type': 'expense', 'category': category, 'status': 'completed',
+                'transaction_date': f'{day}T12:00:00', 'account_balance_after': 0,
+                'created_at': 'now', 'updated_at': 'now'
+            })
+
+        summary = rebuild_budgets(db_client, 'user_123', '2025-10')
+
+        assert summary == {'user_id': 'user_123', 'period': '2025-10', 'budgets': 2, 'changed': 2}
+        assert db_client.get_budget('user_123', 'groceries')['spent'] == Decimal('150')
+        assert db_client.get_budget('user_123', 'restaurants')['spent'] == Decimal('15')
+        assert rebuild_budgets(db_client, 'user_123', '2025-10')['changed'] == 0
+
+    def test_jobs_handler(self, db_client):
+        """Test: Without user_id every indexed user is rebuilt"""
+        from handlers.jobs import lambda_handler
+
+        _budget(db_client, spent=5)
+
+        result = lambda_handler({'action': 'rebuild_budgets'}, None)
+
+        assert result['status'] == 'ok'
+        assert result['result'] == {'users': 1, 'budgets': 1, 'changed': 1, 'failed': 0}
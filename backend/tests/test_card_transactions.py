@@ -0,0 +1,220 @@
+"""
+Tests for persisted card transactions
+Covers billing cycle assignment, the atomic balance ADD (moto) and the handlers
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.billing_cycle import billing_cycle, cycle_bounds, parse_cycle
+from utils.cascade import iter_user_items
+from utils.dynamodb_client import DynamoDBClient
+from handlers.cards import (
+    add_card_transaction_handler, get_card_transactions_handler,
+    make_card_payment_handler, record_card_transaction
+)
+
+
+class TestBillingCycle:
+    """Tests for cycle labels and bounds"""
+
+    def test_cycle_closed_by_cut_off(self):
+        """Test: Dates after the cut-off day roll into next month's cycle"""
+        assert billing_cycle(date(2025, 10, 15), 15) == '2025-10'
+        assert billing_cycle(date(2025, 10, 16), 15) == '2025-11'
+        assert billing_cycle(date(2025, 12, 20), 15) == '2026-01'
+        assert billing_cycle(date(2025, 10, 31), None) == '2025-10'
+
+    def test_cut_off_clamped_in_short_months(self):
+        """Test: A cut-off on the 31st closes February on its last day"""
+        assert billing_cycle(date(2025, 2, 28), 31) == '2025-02'
+        assert cycle_bounds('2025-03', 31) == (date(2025, 3, 1), date(2025, 3, 31))
+        assert cycle_bounds('2025-02', 31) == (date(2025, 2, 1), date(2025, 2, 28))
+
+    def test_cycle_bounds(self):
+        """Test: A cycle runs from the day after the previous cut-off to its own"""
+        assert cycle_bounds('2025-01', 15) == (date(2024, 12, 16), date(2025, 1, 15))
+        assert cycle_bounds('2025-02', None) == (date(2025, 2, 1), date(2025, 2, 28))
+
+    def test_parse_cycle(self):
+        """Test: Only yyyy-mm labels are accepted"""
+        assert parse_cycle('2025-9') == '2025-09'
+        for value in ('2025', '2025-13', 'abcd-01', '25-01'):
+            with pytest.raises(ValueError):
+                parse_cycle(value)
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item={
+        'pk': 'USER#user_123', 'sk': 'CARD#card_1', 'entity_type': 'card',
+        'gsi1_pk': 'CARD#card_1', 'gsi1_sk': 'USER#user_123',
+        'card_id': 'card_1', 'user_id': 'user_123', 'current_balance': Decimal('100'),
+        'cut_off_date': Decimal('15')
+    })
+    return DynamoDBClient()
+
+
+class TestCardTransactionStorage:
+    """Tests for the cycle partition and atomic balance update"""
+
+    def test_purchases_and_payment(self, db_client):
+        """Test: Items land in their cycle partition and the balance is ADDed"""
+        card = db_client.get_card_by_id('user_123', 'card_1')
+        record_card_transaction(db_client, 'user_123', card, 'purchase', 50, 'Store', '2025-10-10T12:00:00')
+        record_card_transaction(db_client, 'user_123', card, 'purchase', 20.5, 'Cafe', '2025-10-16T09:00:00')
+        record_card_transaction(db_client, 'user_123', card, 'payment', 30, 'Pago', '2025-10-01')
+
+        october = db_client.list_card_cycle_transactions('user_123', 'card_1', '2025-10')
+        november = db_client.list_card_cycle_transactions('user_123', 'card_1', '2025-11')
+
+        assert [t['description'] for t in october] == ['Pago', 'Store']
+        assert october[0]['balance_delta'] == Decimal('-30')
+        assert [t['description'] for t in november] == ['Cafe']
+        assert db_client.get_card_by_id('user_123', 'card_1')['current_balance'] == Decimal('140.5')
+
+    def test_missing_card_rejected(self, db_client):
+        """Test: The transaction is not stored when the card update fails"""
+        card = {'card_id': 'card_missing', 'cut_off_date': None}
+        with pytest.raises(ValueError):
+            record_card_transaction(db_client, 'user_123', card, 'purchase', 10, 'Store', '2025-10-10')
+
+        assert db_client.list_card_cycle_transactions('user_123', 'card_missing', '2025-10') == []
+
+    def test_other_users_items_hidden(self, db_client):
+        """Test: Cycle queries only return the owner's items"""
+        card = db_client.get_card_by_id('user_123', 'card_1')
+        record_card_transaction(db_client, 'user_123', card, 'purchase', 10, 'Store', '2025-10-10')
+
+        assert db_client.list_card_cycle_transactions('user_999', 'card_1', '2025-10') == []
+
+    def test_cascade_includes_card_cycles(self, db_client):
+        """Test: User enumeration follows GSI1 CARD# into the cycle partitions"""
+        card = db_client.get_card_by_id('user_123', 'card_1')
+        record_card_transaction(db_client, 'user_123', card, 'purchase', 10, 'Store', '2025-10-10')
+
+        keys = {(item['pk'], item['sk']) for item in iter_user_items(db_client, 'user_123', keys_only=True)}
+
+        assert len(keys) == 2
+        assert any(pk == 'CARD#card_1#CYCLE#2025-10' for pk, _ in keys)
+
+
+class TestCardTransactionHandlers:
+    """Tests for the card transaction endpoints"""
+
+    def setup_method(self):
+        self.mock_context = Mock()
+        self.mock_user_data = MagicMock()
+        self.mock_user_data.user_id = 'user_123'
+        self.card = {'card_id': 'card_1', 'user_id': 'user_123', 'current_balance': Decimal('100'),
+                     'cut_off_date': Decimal('15')}
+
+    def _event(self, body=None, query=None):
+        return {
+            'headers': {'Authorization': 'Bearer valid_token'},
+            'pathParameters': {'card_id': 'card_1'},
+            'queryStringParameters': query,
+            'body': json.dumps(body) if body is not None else None
+        }
+
+    def _stored(self, data):
+        return dict(data)
+
+    @patch('handlers.cards.DynamoDBClient')
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_add_purchase(self, mock_validate_token, mock_db_class):
+        """Test: A purchase is stored in the cycle of its date and increases the debt"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db = mock_db_class.return_value
+        mock_db.get_card_by_id.return_value = self.card
+        mock_db.create_card_transaction.side_effect = self._stored
+
+        response = add_card_transaction_handler(self._event({
+            'amount': 150.0, 'description': 'Store', 'transaction_type': 'purchase',
+            'transaction_date': '2025-10-20T10:00:00'
+        }), self.mock_context)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['new_balance'] == 250.0
+        assert body['transaction']['cycle'] == '2025-11'
+        stored = mock_db.create_card_transaction.call_args.args[0]
+        assert stored['balance_delta'] == Decimal('150')
+        mock_db.update_card.assert_not_called()
+
+    @patch('handlers.cards.DynamoDBClient')
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_payment_reduces_balance(self, mock_validate_token, mock_db_class):
+        """Test: Payments are stored as negative balance deltas"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db = mock_db_class.return_value
+        mock_db.get_card_by_id.return_value = self.card
+        mock_db.create_card_transaction.side_effect = self._stored
+
+        response = make_card_payment_handler(self._event({'amount': 40.0}), self.mock_context)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['new_balance'] == 60.0
+        assert body['transaction']['transaction_type'] == 'payment'
+        assert body['transaction']['balance_delta'] == -40.0
+
+    @patch('handlers.cards.DynamoDBClient')
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_invalid_date_rejected(self, mock_validate_token, mock_db_class):
+        """Test: Malformed transaction dates return 400"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db_class.return_value.get_card_by_id.return_value = self.card
+
+        response = add_card_transaction_handler(self._event({
+            'amount': 10.0, 'description': 'Store', 'transaction_type': 'purchase',
+            'transaction_date': 'yesterday'
+        }), self.mock_context)
+
+        assert response['statusCode'] == 400
+        mock_db_class.return_value.create_card_transaction.assert_not_called()
+
+    @patch('handlers.cards.DynamoDBClient')
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_list_cycle(self, mock_validate_token, mock_db_class):
+        """Test: One cycle partition is read and totals are computed"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db = mock_db_class.return_value
+        mock_db.get_card_by_id.return_value = self.card
+        mock_db.list_card_cycle_transactions.return_value = [
+            {'card_transaction_id': f'ctxn_{i}', 'card_id': 'card_1', 'cycle': '2025-10',
+             'transaction_type': kind, 'amount': Decimal(str(abs(delta))), 'balance_delta': Decimal(str(delta)),
+             'description': kind, 'transaction_date': f'2025-10-0{i + 1}T00:00:00',
+             'created_at': '2025-10-01T00:00:00'}
+            for i, (kind, delta) in enumerate([('purchase', 120.5), ('payment', -50), ('fee', 10)])
+        ]
+
+        response = get_card_transactions_handler(self._event(query={'cycle': '2025-10'}), self.mock_context)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['cycle_start'] == '2025-09-16'
+        assert body['cycle_end'] == '2025-10-15'
+        assert body['total_charges'] == 130.5
+        assert body['total_credits'] == 50.0
+        assert body['net_change'] == 80.5
+        mock_db.list_card_cycle_transactions.assert_called_once_with('user_123', 'card_1', '2025-10')
+
+    @patch('handlers.cards.DynamoDBClient')
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_list_invalid_cycle(self, mock_validate_token, mock_db_class):
+        """Test: Malformed cycles return 400"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db_class.return_value.get_card_by_id.return_value = self.card
+
+        response = get_card_transactions_handler(self._event(query={'cycle': 'october'}), self.mock_context)
+
+        assert response['statusCode'] == 400
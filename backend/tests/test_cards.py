@@ -408,6 +408,25 @@ class TestDeleteCardHandler(TestCardHandlers):
         assert call_args[0] == self.test_user_id
         assert call_args[1] == self.test_card_id
     
+    @patch('handlers.cards.schedule_cascade')
+    @patch('handlers.cards.DynamoDBClient')
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_delete_card_schedules_cascade(self, mock_validate_token, mock_db_class, mock_schedule):
+        """Test deleting a card queues the card cascade; failures do not fail the request"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db_class.return_value.delete_card.return_value = True
+        mock_schedule.side_effect = Exception("Lambda unavailable")
+        
+        event = {
+            'headers': {'Authorization': 'Bearer valid_token'},
+            'pathParameters': {'card_id': self.test_card_id}
+        }
+        
+        response = delete_card_handler(event, self.mock_context)
+        
+        assert response['statusCode'] == 200
+        mock_schedule.assert_called_once_with('card', self.test_user_id, card_id=self.test_card_id)
+    
     @patch('handlers.cards.DynamoDBClient')
     @patch('utils.jwt_auth.validate_token_from_event')
     def test_delete_card_not_found(self, mock_validate_token, mock_db_class):
@@ -0,0 +1,234 @@
+"""
+Tests for cascade delete / export and the jobs handler
+"""
+
+import gzip
+import json
+import os
+import sys
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import cascade
+from utils.cascade import (
+    CascadeError,
+    batch_delete,
+    iter_user_items,
+    run_cascade,
+    schedule_cascade
+)
+from utils.dynamodb_client import DynamoDBClient
+
+
+def _seed(table, user_id, accounts=2, transactions_per_account=30):
+    with table.batch_writer() as writer:
+        writer.put_item(Item={
+            'pk': f'USER#{user_id}', 'sk': 'METADATA', 'entity_type': 'user',
+            'gsi1_pk': f'EMAIL#{user_id}@example.com', 'gsi1_sk': f'USER#{user_id}',
+            'user_id': user_id, 'password_hash': '$2b$12$secret'
+        })
+        for a in range(accounts):
+            account_id = f'acc_{user_id}_{a}'
+            writer.put_item(Item={
+                'pk': f'USER#{user_id}', 'sk': f'ACCOUNT#{account_id}', 'entity_type': 'account',
+                'gsi1_pk': f'ACCOUNT#{account_id}', 'gsi1_sk': f'USER#{user_id}',
+                'user_id': user_id, 'account_id': account_id, 'current_balance': Decimal('10.50')
+            })
+            for t in range(transactions_per_account):
+                transaction_id = f'txn_{a}_{t}'
+                writer.put_item(Item={
+                    'pk': f'USER#{user_id}', 'sk': f'TRANSACTION#{account_id}_{transaction_id}',
+                    'entity_type': 'transaction',
+                    'gsi1_pk': f'ACCOUNT#{account_id}', 'gsi1_sk': f'TRANSACTION#2025-10-01#{transaction_id}',
+                    'user_id': user_id, 'account_id': account_id, 'amount': Decimal('-1')
+                })
+
+
+def _count(table, user_id):
+    response = table.query(
+        KeyConditionExpression='pk = :pk',
+        ExpressionAttributeValues={':pk': f'USER#{user_id}'},
+        Select='COUNT'
+    )
+    return response['Count']
+
+
+@pytest.fixture
+def db_client(table):
+    _seed(table, 'usr_a')
+    _seed(table, 'usr_b', accounts=1, transactions_per_account=3)
+    return DynamoDBClient()
+
+
+class TestCascadeDelete:
+    """Tests for enumeration and parallel batch deletes"""
+
+    def test_iter_user_items_unique(self, db_client):
+        """Test: Partition and GSI1 ACCOUNT# items are yielded once"""
+        items = list(iter_user_items(db_client, 'usr_a', keys_only=True))
+        keys = {(item['pk'], item['sk']) for item in items}
+
+        assert len(items) == len(keys) == 1 + 2 + 60
+        assert all(set(item) <= {'pk', 'sk'} for item in items)
+
+    def test_user_cascade_deletes_only_that_user(self, db_client):
+        """Test: Every item of the user is deleted; other users are untouched"""
+        report = run_cascade(db_client, 'user', 'usr_a')
+
+        assert report['deleted'] == 63
+        assert _count(db_client.table, 'usr_a') == 0
+        assert _count(db_client.table, 'usr_b') == 5
+
+    def test_account_cascade(self, db_client):
+        """Test: Account scope removes the account and its transactions only"""
+        report = run_cascade(db_client, 'account', 'usr_a', account_id='acc_usr_a_0')
+
+        assert report['deleted'] == 31
+        assert _count(db_client.table, 'usr_a') == 32
+
+    def test_card_cascade(self, db_client):
+        """Test: Card scope removes the card, its cycle partitions and statements only"""
+        table = db_client.table
+        with table.batch_writer() as writer:
+            for user_id in ('usr_a', 'usr_b'):
+                card_id = f'card_{user_id}'
+                writer.put_item(Item={
+                    'pk': f'USER#{user_id}', 'sk': f'CARD#{card_id}', 'entity_type': 'card',
+                    'gsi1_pk': f'CARD#{card_id}', 'gsi1_sk': f'USER#{user_id}',
+                    'user_id': user_id, 'card_id': card_id
+                })
+                writer.put_item(Item={
+                    'pk': f'USER#{user_id}', 'sk': f'STATEMENT#{card_id}#2025-09', 'entity_type': 'statement',
+                    'gsi1_pk': f'CARD#{card_id}', 'gsi1_sk': 'STATEMENT#2025-09',
+                    'user_id': user_id, 'card_id': card_id
+                })
+                for cycle in ('2025-09', '2025-10'):
+                    writer.put_item(Item={
+                        'pk': f'CARD#{card_id}#CYCLE#{cycle}', 'sk': f'TRANSACTION#{cycle}-01#ctx_{cycle}',
+                        'entity_type': 'card_transaction',
+                        'gsi1_pk': f'CARD#{card_id}', 'gsi1_sk': f'TRANSACTION#{cycle}-01#ctx_{cycle}',
+                        'user_id': user_id, 'card_id': card_id
+                    })
+
+        report = run_cascade(db_client, 'card', 'usr_a', card_id='card_usr_a')
+
+        assert report['deleted'] == 4
+        assert _count(table, 'usr_a') == 63
+        assert table.query(KeyConditionExpression='pk = :pk',
+                           ExpressionAttributeValues={':pk': 'CARD#card_usr_a#CYCLE#2025-10'})['Count'] == 0
+        assert table.query(KeyConditionExpression='pk = :pk',
+                           ExpressionAttributeValues={':pk': 'CARD#card_usr_b#CYCLE#2025-10'})['Count'] == 1
+
+    def test_account_scope_requires_account_id(self, db_client):
+        """Test: Invalid scopes are rejected before touching the table"""
+        with pytest.raises(ValueError):
+            run_cascade(db_client, 'account', 'usr_a')
+        with pytest.raises(ValueError):
+            run_cascade(db_client, 'card', 'usr_a')
+        with pytest.raises(ValueError):
+            run_cascade(db_client, 'nope', 'usr_a', account_id='acc_usr_a_0')
+
+    def test_export_then_delete(self, db_client, tmp_path):
+        """Test: The archive holds every item (without secrets) before deletion"""
+        with patch('utils.cascade.tempfile.gettempdir', return_value=str(tmp_path)):
+            report = run_cascade(db_client, 'user', 'usr_a', export=True)
+
+        assert report['exported'] == report['deleted'] == 63
+        with gzip.open(report['archive'], 'rt', encoding='utf-8') as archive:
+            lines = [json.loads(line) for line in archive]
+        assert len(lines) == 63
+        assert all('password_hash' not in line for line in lines)
+        account = next(line for line in lines if line['sk'].startswith('ACCOUNT#'))
+        assert account['current_balance'] == 10.5
+        assert _count(db_client.table, 'usr_a') == 0
+
+    def test_export_only_keeps_items(self, db_client, tmp_path):
+        """Test: Export without delete leaves the partition intact"""
+        with patch('utils.cascade.tempfile.gettempdir', return_value=str(tmp_path)):
+            report = run_cascade(db_client, 'user', 'usr_b', export=True, delete=False)
+
+        assert report['exported'] == 5
+        assert report['deleted'] == 0
+        assert _count(db_client.table, 'usr_b') == 5
+
+
+class TestUnprocessedRetries:
+    """Tests for UnprocessedItems handling"""
+
+    def _db_client(self, responses):
+        db_client = MagicMock()
+        db_client.table.name = 'table'
+        db_client.table.meta.client.batch_write_item.side_effect = responses
+        return db_client
+
+    @patch('utils.cascade.time.sleep')
+    def test_unprocessed_items_retried(self, mock_sleep):
+        """Test: Unprocessed items are resent until DynamoDB accepts them"""
+        keys = [{'pk': 'USER#u', 'sk': f'TRANSACTION#{i}'} for i in range(3)]
+        leftover = {'table': [{'DeleteRequest': {'Key': keys[2]}}]}
+        db_client = self._db_client([{'UnprocessedItems': leftover}, {'UnprocessedItems': {}}])
+
+        assert batch_delete(db_client, keys, max_workers=1) == 3
+        second = db_client.table.meta.client.batch_write_item.call_args_list[1].kwargs
+        assert second['RequestItems'] == leftover
+        mock_sleep.assert_called_once()
+
+    @patch('utils.cascade.time.sleep')
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        """Test: Persistent throttling raises CascadeError"""
+        keys = [{'pk': 'USER#u', 'sk': 'TRANSACTION#1'}]
+        leftover = {'table': [{'DeleteRequest': {'Key': keys[0]}}]}
+        db_client = self._db_client([{'UnprocessedItems': leftover}] * cascade.CASCADE_MAX_RETRIES)
+
+        with pytest.raises(CascadeError):
+            batch_delete(db_client, keys, max_workers=1)
+
+    def test_chunks_of_25(self):
+        """Test: Keys are split into BatchWriteItem-sized chunks"""
+        keys = [{'pk': 'USER#u', 'sk': f'TRANSACTION#{i}'} for i in range(60)]
+        db_client = self._db_client(lambda RequestItems: {'UnprocessedItems': {}})
+
+        assert batch_delete(db_client, keys) == 60
+        sizes = sorted(len(call.kwargs['RequestItems']['table'])
+                       for call in db_client.table.meta.client.batch_write_item.call_args_list)
+        assert sizes == [10, 25, 25]
+
+
+class TestScheduleAndJobs:
+    """Tests for async scheduling and the jobs handler"""
+
+    def test_schedule_disabled_without_function(self):
+        """Test: Nothing is invoked when CASCADE_FUNCTION_NAME is empty"""
+        with patch('utils.cascade.CASCADE_FUNCTION_NAME', ''):
+            assert schedule_cascade('user', 'usr_a') is False
+
+    def test_schedule_invokes_async(self):
+        """Test: The job is invoked with InvocationType Event"""
+        with patch('utils.cascade.CASCADE_FUNCTION_NAME', 'finance-tracker-jobs'), \
+             patch('boto3.client') as mock_client:
+            assert schedule_cascade('account', 'usr_a', 'acc_1') is True
+
+        kwargs = mock_client.return_value.invoke.call_args.kwargs
+        assert kwargs['InvocationType'] == 'Event'
+        assert json.loads(kwargs['Payload'])['account_id'] == 'acc_1'
+
+    @patch('handlers.jobs.run_cascade')
+    @patch('handlers.jobs.DynamoDBClient')
+    def test_jobs_handler_dispatch(self, mock_db_client, mock_run_cascade):
+        """Test: Export action never deletes; unknown actions are reported"""
+        from handlers.jobs import lambda_handler
+
+        mock_run_cascade.return_value = {'exported': 1}
+        result = lambda_handler({'action': 'export', 'user_id': 'usr_a'}, None)
+
+        assert result['status'] == 'ok'
+        kwargs = mock_run_cascade.call_args.kwargs
+        assert kwargs['export'] is True and kwargs['delete'] is False
+
+        assert lambda_handler({'action': 'nope'}, None)['status'] == 'error'
+        assert lambda_handler({'action': 'cascade'}, None)['status'] == 'error'
@@ -0,0 +1,194 @@
+"""
+Tests for the dashboard handler
+Covers the single partition query, the entity split and the combined response
+"""
+
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.jwt_auth import TokenPayload
+from utils.dynamodb_client import DynamoDBClient
+from handlers.dashboard import get_dashboard_handler, split_partition, lambda_handler
+
+
+def _account(account_id, balance, is_active=True):
+    return {
+        'pk': 'USER#user_123', 'sk': f'ACCOUNT#{account_id}', 'entity_type': 'account',
+        'account_id': account_id, 'user_id': 'user_123', 'name': f'Account {account_id}',
+        'account_type': 'checking', 'bank_name': 'BBVA', 'currency': 'MXN',
+        'current_balance': Decimal(str(balance)), 'is_active': is_active,
+        'created_at': '2025-01-01T00:00:00', 'updated_at': '2025-01-01T00:00:00'
+    }
+
+
+def _card(card_id, balance, status='active', **overrides):
+    card = {
+        'pk': 'USER#user_123', 'sk': f'CARD#{card_id}', 'entity_type': 'card',
+        'card_id': card_id, 'user_id': 'user_123', 'name': f'Card {card_id}',
+        'card_type': 'credit', 'card_network': 'visa', 'bank_name': 'BBVA',
+        'credit_limit': Decimal('10000'), 'current_balance': Decimal(str(balance)),
+        'currency': 'MXN', 'status': status,
+        'created_at': '2025-01-01T00:00:00', 'updated_at': '2025-01-01T00:00:00'
+    }
+    card.update(overrides)
+    return card
+
+
+def _transaction(transaction_id, amount, transaction_date, category='food_drinks'):
+    return {
+        'pk': 'USER#user_123', 'sk': f'TRANSACTION#{transaction_id}', 'entity_type': 'transaction',
+        'transaction_id': transaction_id, 'user_id': 'user_123', 'account_id': 'acc_1',
+        'account_name': 'Account acc_1', 'amount': Decimal(str(amount)),
+        'description': f'Transaction {transaction_id}',
+        'transaction_type': 'income' if amount > 0 else 'expense', 'category': category,
+        'status': 'completed', 'transaction_date': transaction_date,
+        'account_balance_after': Decimal('1000'),
+        'created_at': transaction_date, 'updated_at': transaction_date
+    }
+
+
+class TestSplitPartition:
+    """Tests for the single-pass entity split"""
+
+    def test_split_by_entity_type(self):
+        """Test: Items are routed by entity_type and inactive/malformed ones dropped"""
+        items = [
+            {'pk': 'USER#user_123', 'sk': 'METADATA', 'entity_type': 'user'},
+            _account('acc_1', 1000),
+            _account('acc_2', 50, is_active=False),
+            _card('card_1', 200),
+            _card('card_2', 0, status='inactive'),
+            _card('card_3', 0, bank_name=''),
+            _transaction('txn_1', -100, '2025-10-05T10:00:00'),
+            _transaction('txn_2', 500, '2025-09-30T10:00:00'),
+        ]
+
+        parts = split_partition(items, '2025-10-01T00:00:00', '2025-10-18T12:00:00')
+
+        assert [a['account_id'] for a in parts['accounts']] == ['acc_1']
+        assert [c['card_id'] for c in parts['cards']] == ['card_1']
+        assert [t['transaction_id'] for t in parts['transactions']] == ['txn_1', 'txn_2']
+        assert [t['transaction_id'] for t in parts['month_transactions']] == ['txn_1']
+        assert parts['transactions'][0]['amount'] == -100.0
+
+
+class TestDashboardHandler:
+    """Tests for GET /dashboard"""
+
+    def setup_method(self):
+        current_time = int(time.time())
+        self.mock_user_data = TokenPayload(
+            user_id='user_123',
+            email='test@example.com',
+            exp=current_time + 1800,
+            iat=current_time,
+            token_type='access'
+        )
+        self.mock_context = Mock()
+
+    def _event(self, query=None):
+        return {
+            'httpMethod': 'GET',
+            'path': '/dashboard',
+            'queryStringParameters': query,
+            'headers': {'Authorization': 'Bearer valid-token'}
+        }
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.dashboard.DynamoDBClient')
+    def test_dashboard_success(self, mock_db_client, mock_validate_token):
+        """Test: One partition query feeds accounts, cards, recent transactions and summary"""
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db_client.is_valid_card.side_effect = DynamoDBClient.is_valid_card
+        mock_db = mock_db_client.return_value
+        mock_db.get_data_version.return_value = 3
+
+        month = time.strftime('%Y-%m')
+        mock_db.query_user_partition.return_value = [
+            _account('acc_1', 1000),
+            _card('card_1', 200),
+            _transaction('txn_old', 900, '2020-01-01T10:00:00', category='salary'),
+            _transaction('txn_1', -100, f'{month}-01T00:00:01'),
+            _transaction('txn_2', -50, f'{month}-01T00:00:02'),
+        ]
+
+        result = get_dashboard_handler(self._event({'recent': '2'}), self.mock_context)
+
+        assert result['statusCode'] == 200
+        assert 'ETag' in result['headers']
+        body = json.loads(result['body'])
+        assert body['accounts']['total_count'] == 1
+        assert body['accounts']['total_balance_by_currency'] == {'MXN': 1000.0}
+        assert body['cards']['total_count'] == 1
+        assert [t['transaction_id'] for t in body['recent_transactions']] == ['txn_2', 'txn_1']
+        assert body['summary']['period'] == month
+        assert body['summary']['transaction_count'] == 2
+        assert body['summary']['total_expenses'] == 150.0
+
+        mock_db.query_user_partition.assert_called_once_with(
+            'user_123', sk_prefixes=['ACCOUNT#', 'CARD#', 'TRANSACTION#']
+        )
+        mock_db.list_user_accounts.assert_not_called()
+        mock_db.list_user_cards.assert_not_called()
+        mock_db.list_user_transactions.assert_not_called()
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.dashboard.DynamoDBClient')
+    def test_dashboard_invalid_recent(self, mock_db_client, mock_validate_token):
+        """Test: recent outside the allowed range is rejected"""
+        mock_validate_token.return_value = self.mock_user_data
+
+        result = get_dashboard_handler(self._event({'recent': '500'}), self.mock_context)
+        assert result['statusCode'] == 400
+
+        result = get_dashboard_handler(self._event({'recent': 'many'}), self.mock_context)
+        assert result['statusCode'] == 400
+        mock_db_client.return_value.query_user_partition.assert_not_called()
+
+    def test_unknown_route(self):
+        """Test: Unknown dashboard routes return 404"""
+        result = lambda_handler({'httpMethod': 'POST', 'path': '/dashboard'}, self.mock_context)
+        assert result['statusCode'] == 404
+
+
+class TestQueryUserPartition:
+    """Tests for the paginated partition read"""
+
+    def test_follows_last_evaluated_key(self):
+        """Test: Pages are read until LastEvaluatedKey is absent"""
+        client = DynamoDBClient()
+        client._table = MagicMock()
+        client.table.query.side_effect = [
+            {'Items': [{'sk': 'ACCOUNT#1', 'password_hash': 'x'}], 'LastEvaluatedKey': {'pk': 'p', 'sk': 'ACCOUNT#1'}},
+            {'Items': [{'sk': 'METADATA', 'password_hash': 'secret'}]},
+        ]
+
+        items = client.query_user_partition('user_123', exclude_attributes=['password_hash'])
+
+        assert items == [{'sk': 'ACCOUNT#1'}, {'sk': 'METADATA'}]
+        assert client.table.query.call_count == 2
+        second_call = client.table.query.call_args_list[1].kwargs
+        assert second_call['ExclusiveStartKey'] == {'pk': 'p', 'sk': 'ACCOUNT#1'}
+        assert second_call['ExpressionAttributeValues'] == {':pk': 'USER#user_123'}
+
+    def test_sk_prefixes_one_range_each(self):
+        """Test: Each sort key prefix is read as its own begins_with range"""
+        client = DynamoDBClient()
+        client._table = MagicMock()
+        client.table.query.side_effect = [
+            {'Items': [{'sk': 'ACCOUNT#1'}]},
+            {'Items': [{'sk': 'TRANSACTION#1'}]},
+        ]
+
+        items = client.query_user_partition('user_123', sk_prefixes=['ACCOUNT#', 'TRANSACTION#'])
+
+        assert items == [{'sk': 'ACCOUNT#1'}, {'sk': 'TRANSACTION#1'}]
+        calls = [call.kwargs for call in client.table.query.call_args_list]
+        assert all(c['KeyConditionExpression'] == 'pk = :pk AND begins_with(sk, :prefix)' for c in calls)
+        assert [c['ExpressionAttributeValues'][':prefix'] for c in calls] == ['ACCOUNT#', 'TRANSACTION#']
@@ -0,0 +1,188 @@
+"""
+Tests for ETag / conditional GET utilities
+Covers data-version based ETags and 304 handling in list handlers
+"""
+
+import json
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import etag as etag_module
+from utils.etag import (
+    compute_etag,
+    check_not_modified,
+    get_cached_data_version,
+    get_if_none_match,
+    record_write
+)
+from utils.jwt_auth import TokenPayload
+
+
+def _event(path='/accounts', query=None, if_none_match=None):
+    headers = {'Authorization': 'Bearer valid-token'}
+    if if_none_match:
+        headers['If-None-Match'] = if_none_match
+    return {
+        'httpMethod': 'GET',
+        'path': path,
+        'queryStringParameters': query,
+        'headers': headers
+    }
+
+
+class TestETagComputation:
+    """Tests for ETag computation and comparison"""
+
+    def setup_method(self):
+        etag_module._version_cache.clear()
+
+    def test_get_if_none_match_case_insensitive(self):
+        """Test: Header lookup ignores case"""
+        assert get_if_none_match({'headers': {'if-none-match': 'W/"abc"'}}) == 'W/"abc"'
+        assert get_if_none_match({'headers': None}) is None
+
+    def test_etag_is_weak_and_stable(self):
+        """Test: Same version and request produce the same weak ETag"""
+        first = compute_etag('user_1', 3, _event(query={'a': '1', 'b': '2'}))
+        second = compute_etag('user_1', 3, _event(query={'b': '2', 'a': '1'}))
+        assert first == second
+        assert first.startswith('W/"')
+
+    def test_etag_changes_with_version_path_and_query(self):
+        """Test: Version, path and query all participate in the ETag"""
+        base = compute_etag('user_1', 3, _event())
+        assert compute_etag('user_1', 4, _event()) != base
+        assert compute_etag('user_1', 3, _event(path='/cards')) != base
+        assert compute_etag('user_1', 3, _event(query={'include_inactive': 'true'})) != base
+        assert compute_etag('user_2', 3, _event()) != base
+
+    def test_check_not_modified_match(self):
+        """Test: Matching If-None-Match returns a 304 response"""
+        db_client = Mock()
+        db_client.get_data_version.return_value = 7
+        current = compute_etag('user_1', 7, _event())
+
+        etag, response = check_not_modified(db_client, 'user_1', _event(if_none_match=f'W/"other", {current}'))
+
+        assert etag == current
+        assert response['statusCode'] == 304
+        assert response['headers']['ETag'] == current
+        assert response['body'] == ''
+
+    def test_check_not_modified_stale(self):
+        """Test: A stale ETag lets the handler run"""
+        db_client = Mock()
+        db_client.get_data_version.return_value = 8
+        stale = compute_etag('user_1', 7, _event())
+
+        etag, response = check_not_modified(db_client, 'user_1', _event(if_none_match=stale))
+
+        assert response is None
+        assert etag != stale
+
+    def test_version_cache_disabled_by_default(self):
+        """Test: Without a TTL every lookup reads the version"""
+        db_client = Mock()
+        db_client.get_data_version.return_value = 1
+        get_cached_data_version(db_client, 'user_1')
+        get_cached_data_version(db_client, 'user_1')
+        assert db_client.get_data_version.call_count == 2
+
+    def test_version_cache_with_ttl(self):
+        """Test: Cached versions are reused and refreshed on write"""
+        db_client = Mock()
+        db_client.get_data_version.return_value = 1
+        db_client.bump_data_version.return_value = 2
+
+        with patch.object(etag_module, 'DATA_VERSION_CACHE_TTL_SECONDS', 60):
+            assert get_cached_data_version(db_client, 'user_1') == 1
+            assert get_cached_data_version(db_client, 'user_1') == 1
+            record_write(db_client, 'user_1')
+            assert get_cached_data_version(db_client, 'user_1') == 2
+
+        assert db_client.get_data_version.call_count == 1
+
+    def test_record_write_never_raises(self):
+        """Test: Version bump failures do not fail the write"""
+        db_client = Mock()
+        db_client.bump_data_version.side_effect = Exception("boom")
+        etag_module._version_cache['user_1'] = (1, time.monotonic() + 60)
+
+        record_write(db_client, 'user_1')
+
+        assert 'user_1' not in etag_module._version_cache
+
+
+class TestConditionalListHandlers:
+    """Tests for 304 handling in list handlers"""
+
+    def setup_method(self):
+        etag_module._version_cache.clear()
+        now = int(time.time())
+        self.mock_user_data = TokenPayload(
+            user_id='user_123',
+            email='test@example.com',
+            exp=now + 1800,
+            iat=now,
+            token_type='access'
+        )
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.accounts.DynamoDBClient')
+    def test_list_accounts_returns_etag_then_304(self, mock_db_client, mock_validate_token):
+        """Test: Second request with the returned ETag is answered with 304"""
+        from handlers.accounts import list_accounts_handler
+
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db = mock_db_client.return_value
+        mock_db.get_data_version.return_value = 5
+        mock_db.list_user_accounts.return_value = []
+
+        first = list_accounts_handler(_event(), Mock())
+        assert first['statusCode'] == 200
+        current = first['headers']['ETag']
+
+        second = list_accounts_handler(_event(if_none_match=current), Mock())
+        assert second['statusCode'] == 304
+        assert mock_db.list_user_accounts.call_count == 1
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.accounts.DynamoDBClient')
+    def test_create_account_bumps_version(self, mock_db_client, mock_validate_token):
+        """Test: Writes bump the user's data version"""
+        from handlers.accounts import create_account_handler
+
+        mock_validate_token.return_value = self.mock_user_data
+        mock_db = mock_db_client.return_value
+        mock_db.create_account.return_value = {
+            'account_id': 'acc_1',
+            'user_id': 'user_123',
+            'name': 'Savings',
+            'account_type': 'savings',
+            'bank_name': 'BBVA México',
+            'bank_code': 'bbva',
+            'currency': 'MXN',
+            'current_balance': 100.0,
+            'is_active': True,
+            'created_at': '2024-01-01T00:00:00',
+            'updated_at': '2024-01-01T00:00:00'
+        }
+        event = _event()
+        event['httpMethod'] = 'POST'
+        event['body'] = json.dumps({
+            'name': 'Savings',
+            'account_type': 'savings',
+            'bank_name': 'BBVA México',
+            'bank_code': 'bbva',
+            'currency': 'MXN',
+            'initial_balance': 100.0
+        })
+
+        result = create_account_handler(event, Mock())
+
+        assert result['statusCode'] == 201
+        mock_db.bump_data_version.assert_called_once_with('user_123')
@@ -0,0 +1,160 @@
+"""
+Tests for the cash-flow forecast
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item, card_item
+import utils.forecast as forecast
+from utils.dynamodb_client import DynamoDBClient
+from utils.forecast import build_forecast, card_payment, project_balances, template_runs
+
+TODAY = date(2025, 10, 5)
+
+
+def _template(client, transaction_id, amount, transaction_type, frequency, transaction_date, next_run,
+              destination_account_id=None):
+    client.create_transaction({
+        'transaction_id': transaction_id, 'user_id': 'user_123', 'account_id': 'acc_main',
+        'account_name': 'acc_main', 'amount': amount, 'description': transaction_id,
+        'transaction_type': transaction_type, 'category': 'other', 'status': 'completed',
+        'transaction_date': transaction_date, 'account_balance_after': 0,
+        'destination_account_id': destination_account_id, 'destination_account_name': destination_account_id,
+        'is_recurring': True, 'recurring_frequency': frequency, 'next_run_date': next_run,
+        'created_at': transaction_date, 'updated_at': transaction_date
+    })
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item=account_item('acc_main', '1000'))
+    table.put_item(Item=account_item('acc_savings', '0'))
+    table.put_item(Item=account_item('acc_usd', '100', currency='USD'))
+    table.put_item(Item=card_item('card_1', '800', name='Oro', statement_balance=Decimal('500'),
+                                  next_payment_due='2025-10-08', payment_due_date=8))
+    client = DynamoDBClient()
+    _template(client, 'txn_salary', 3000, 'salary', 'monthly', '2025-09-15T09:00:00', '2025-10-15')
+    _template(client, 'txn_rent', -2500, 'expense', 'monthly', '2025-09-10T09:00:00', '2025-10-10')
+    _template(client, 'txn_saving', -100, 'transfer', 'weekly', '2025-09-28T09:00:00', '2025-10-05',
+              destination_account_id='acc_savings')
+    # A destination on a non-transfer template is not credited by the recurring job
+    _template(client, 'txn_gym', -50, 'expense', 'monthly', '2025-09-20T09:00:00', '2025-10-20',
+              destination_account_id='acc_savings')
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    forecast._forecast_cache.clear()
+    yield
+    forecast._forecast_cache.clear()
+
+
+class TestProjection:
+    """Tests for the day-indexed projection"""
+
+    def test_cumulative_minimum(self):
+        """Test: The minimum and the first negative day come from the running sum"""
+        deltas = [Decimal(delta) for delta in ('0', '-50', '-80', '100', '-200')]
+
+        result = project_balances(Decimal('100'), deltas, TODAY)
+
+        assert result['daily_balances'] == [100.0, 50.0, -30.0, 70.0, -130.0]
+        assert result['min_balance'] == -130.0
+        assert result['min_balance_date'] == '2025-10-09'
+        assert result['first_negative_date'] == '2025-10-07'
+
+    def test_card_payment_without_statement(self):
+        """Test: Without a pending statement the balance is due on the next due day"""
+        card = {'current_balance': Decimal('300'), 'payment_due_date': 3}
+
+        assert card_payment(card, TODAY) == (date(2025, 11, 3), Decimal('300'))
+        assert card_payment({**card, 'current_balance': Decimal('0')}, TODAY) is None
+
+    def test_overdue_runs_land_on_today(self):
+        """Test: Every overdue run is owed today and later runs keep the stored schedule"""
+        weekly = {'transaction_date': '2025-09-30T09:00:00', 'recurring_frequency': 'weekly',
+                  'next_run_date': '2025-10-07'}
+        daily = {'transaction_date': '2025-10-01T09:00:00', 'recurring_frequency': 'daily',
+                 'next_run_date': '2025-10-07'}
+        today = date(2025, 10, 10)
+
+        assert list(template_runs(weekly, today, date(2025, 10, 21))) == [
+            date(2025, 10, 10), date(2025, 10, 14), date(2025, 10, 21)]
+        assert list(template_runs(daily, today, date(2025, 10, 11))) == [today] * 4 + [date(2025, 10, 11)]
+
+
+class TestBuildForecast:
+    """Tests for projecting a user's balances"""
+
+    def test_projects_templates_and_cards(self, db_client):
+        """Test: Recurring runs and the card statement move each currency's balance"""
+        result = build_forecast(db_client, 'user_123', 30, today=TODAY)
+
+        assert result['end_date'] == '2025-11-04'
+        mxn, usd = result['currencies']
+        assert mxn['currency'] == 'MXN'
+        assert len(mxn['daily_balances']) == 31
+        # card -500 on 10-08, rent -2500 on 10-10, salary +3000 on 10-15, gym -50 on 10-20;
+        # transfers net to zero
+        assert mxn['min_balance'] == -2000.0
+        assert mxn['min_balance_date'] == '2025-10-10'
+        assert mxn['first_negative_date'] == '2025-10-10'
+        assert mxn['ending_balance'] == 950.0
+        assert len(mxn['events']) == 4 + 2 * 5
+        assert mxn['events'][0]['date'] == '2025-10-05'
+        assert {'date': '2025-10-08', 'amount': -500.0, 'description': 'Oro payment',
+                'source': 'card_payment'} in mxn['events']
+        assert usd['min_balance'] == usd['ending_balance'] == 100.0
+        assert usd['first_negative_date'] is None
+
+
+class TestGetForecast:
+    """Tests for GET /forecast"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.dashboard.build_forecast')
+    @patch('handlers.dashboard.DynamoDBClient')
+    def test_cached_per_data_version(self, mock_db_class, mock_build, mock_validate_token):
+        """Test: Repeated views reuse the forecast until the data version changes"""
+        from handlers.dashboard import get_forecast_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        mock_db = mock_db_class.return_value
+        mock_db.get_data_version.return_value = 1
+        mock_build.return_value = {'start_date': '2025-10-05', 'end_date': '2025-10-12', 'days': 7,
+                                   'currencies': [], 'generated_at': '2025-10-05T08:00:00'}
+        event = {'headers': {'Authorization': 'Bearer valid_token'}, 'path': '/forecast',
+                 'queryStringParameters': {'days': '7'}}
+
+        first = get_forecast_handler(event, Mock())
+        second = get_forecast_handler(event, Mock())
+        mock_db.get_data_version.return_value = 2
+        third = get_forecast_handler(event, Mock())
+
+        assert first['statusCode'] == second['statusCode'] == third['statusCode'] == 200
+        assert json.loads(first['body'])['days'] == 7
+        assert mock_build.call_count == 2
+        assert mock_build.call_args.args[2] == 7
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.dashboard.DynamoDBClient')
+    def test_days_validated(self, mock_db_class, mock_validate_token):
+        """Test: days outside 1..365 is rejected"""
+        from handlers.dashboard import get_forecast_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+
+        response = get_forecast_handler({'headers': {'Authorization': 'Bearer valid_token'},
+                                         'queryStringParameters': {'days': '400'}}, Mock())
+
+        assert response['statusCode'] == 400
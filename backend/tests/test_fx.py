@@ -0,0 +1,148 @@
+"""
+Tests for the FX rate table and currency conversion of totals
+"""
+
+import json
+import os
+import sys
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import utils.fx as fx
+from utils.fx import conversion_factors, convert_totals, get_rate_table, parse_target_currency
+
+TABLE = {'base': 'MXN', 'as_of': '2025-10-01', 'rates': {'MXN': 1.0, 'USD': 20.0, 'EUR': 22.0}}
+
+AUTH_EVENT = {'headers': {'Authorization': 'Bearer valid_token'}}
+
+
+def _account(account_id, currency, balance, is_active=True):
+    return {
+        'account_id': account_id, 'user_id': 'user_123', 'name': account_id, 'account_type': 'checking',
+        'bank_name': 'Bank', 'currency': currency, 'current_balance': balance, 'is_active': is_active,
+        'created_at': '2025-01-01T00:00:00', 'updated_at': '2025-01-01T00:00:00'
+    }
+
+
+def _transaction(transaction_id, account_id, amount, category):
+    return {'transaction_id': transaction_id, 'account_id': account_id, 'account_name': account_id,
+            'amount': amount, 'category': category}
+
+
+@pytest.fixture(autouse=True)
+def rate_file(tmp_path):
+    path = tmp_path / 'fx_rates.json'
+    path.write_text(json.dumps(TABLE))
+    fx._rates_cache.clear()
+    with patch.object(fx, 'FX_RATES_FILE', str(path)), patch.object(fx, 'FX_RATES_URL', ''):
+        yield path
+    fx._rates_cache.clear()
+
+
+class TestRateTable:
+    """Tests for loading and caching the rate table"""
+
+    def test_cached_until_ttl(self, rate_file):
+        """Test: The table is reused within the TTL and reloaded after it"""
+        assert get_rate_table(now=0)['rates']['USD'] == 20.0
+        rate_file.write_text(json.dumps({**TABLE, 'rates': {'MXN': 1, 'USD': 19}}))
+
+        assert get_rate_table(now=fx.FX_RATES_TTL_SECONDS - 1)['rates']['USD'] == 20.0
+        assert get_rate_table(now=fx.FX_RATES_TTL_SECONDS)['rates']['USD'] == 19.0
+
+    def test_stale_table_kept_on_failure(self, rate_file):
+        """Test: A failed reload keeps serving the last table"""
+        get_rate_table(now=0)
+        rate_file.write_text('not json')
+
+        assert get_rate_table(now=fx.FX_RATES_TTL_SECONDS)['as_of'] == '2025-10-01'
+
+    def test_service_falls_back_to_file(self):
+        """Test: The bundled file is used when the rates service fails"""
+        with patch.object(fx, 'FX_RATES_URL', 'http://rates.invalid/latest'), \
+                patch('utils.fx.urllib.request.urlopen', side_effect=OSError('unreachable')):
+            assert get_rate_table(now=0)['rates']['EUR'] == 22.0
+
+
+class TestConversion:
+    """Tests for per-currency conversion factors"""
+
+    def test_convert_totals(self):
+        """Test: One factor per currency converts grouped totals to any target"""
+        assert convert_totals({'MXN': 1000.0, 'USD': 50.0}, 'MXN', TABLE) == 2000.0
+        assert convert_totals({'MXN': 1000.0, 'USD': 50.0}, 'USD', TABLE) == 100.0
+        assert conversion_factors(['EUR', 'EUR', 'USD'], 'USD', TABLE) == {'EUR': 1.1, 'USD': 1.0}
+
+    def test_unknown_currency(self):
+        """Test: Targets and sources without a rate are rejected"""
+        assert parse_target_currency(None, TABLE) is None
+        assert parse_target_currency(' usd ', TABLE) == 'USD'
+        with pytest.raises(ValueError):
+            parse_target_currency('CAD', TABLE)
+        with pytest.raises(ValueError):
+            convert_totals({'CAD': 1.0}, 'MXN', TABLE)
+
+
+class TestConvertTo:
+    """Tests for convert_to on the accounts, summary and dashboard endpoints"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.accounts.DynamoDBClient')
+    def test_accounts_converted_total(self, mock_db_class, mock_validate_token):
+        """Test: GET /accounts?convert_to adds the converted total of active accounts"""
+        from handlers.accounts import list_accounts_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        mock_db = mock_db_class.return_value
+        mock_db.get_data_version.return_value = 1
+        mock_db.list_user_accounts.return_value = [
+            _account('acc_mxn', 'MXN', 1000.0), _account('acc_usd', 'USD', 50.0),
+            _account('acc_old', 'EUR', 10.0, is_active=False)
+        ]
+
+        response = list_accounts_handler({**AUTH_EVENT, 'queryStringParameters': {'convert_to': 'mxn'}}, Mock())
+        body = json.loads(response['body'])
+
+        assert response['statusCode'] == 200
+        assert body['total_balance_by_currency'] == {'MXN': 1000.0, 'USD': 50.0}
+        assert body['converted_currency'] == 'MXN'
+        assert body['converted_total_balance'] == 2000.0
+        assert body['fx_rates_as_of'] == '2025-10-01'
+
+        response = list_accounts_handler({**AUTH_EVENT, 'queryStringParameters': {'convert_to': 'XYZ'}}, Mock())
+        assert response['statusCode'] == 400
+
+    def test_summary_converts_per_currency(self):
+        """Test: Each currency is summarized on its own and the aggregates converted"""
+        from handlers.transactions import summarize_in_currency
+
+        transactions = [
+            _transaction('txn_1', 'acc_mxn', -300.0, 'groceries'),
+            _transaction('txn_2', 'acc_usd', -10.0, 'groceries'),
+            _transaction('txn_3', 'acc_usd', 100.0, 'salary'),
+        ]
+
+        summary = summarize_in_currency(transactions, '2025-10', {'acc_mxn': 'MXN', 'acc_usd': 'USD'}, 'MXN')
+        data = summary.model_dump()
+
+        assert data['currency'] == 'MXN'
+        assert data['total_income'] == 2000.0
+        assert data['total_expenses'] == 500.0
+        assert data['net_amount'] == 1500.0
+        assert data['expenses_by_category'] == {'groceries': 500.0}
+        assert data['activity_by_account']['acc_usd']['net_amount'] == 1800.0
+        assert data['totals_by_currency']['USD'] == {'total_income': 100.0, 'total_expenses': 10.0,
+                                                     'net_amount': 90.0}
+
+    def test_net_worth(self):
+        """Test: Net worth subtracts card debt per currency and totals it when converting"""
+        from handlers.dashboard import build_net_worth
+
+        net_worth = build_net_worth({'MXN': 5000.0, 'USD': 100.0}, {'MXN': 1000.0, 'EUR': 10.0}, 'MXN')
+
+        assert net_worth['by_currency'] == {'EUR': -10.0, 'MXN': 4000.0, 'USD': 100.0}
+        assert net_worth['total'] == 5780.0
+        assert build_net_worth({'MXN': 1.0}, {})['total'] is None
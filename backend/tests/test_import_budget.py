@@ -0,0 +1,55 @@
+"""
+Tests for handler import-time budgets
+Each handler is imported in a fresh interpreter with -X importtime
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from import_budget import HANDLER_BUDGETS_MS, parse_importtime, profile_module, check_budget
+
+
+class TestImportTimeParser:
+    """Tests for -X importtime parsing"""
+
+    def test_parse_importtime(self):
+        """Test: Self, cumulative and nesting depth are parsed"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     jwt.api_jwt\n"
+            "import time:       300 |        420 |   jwt\n"
+            "import time:        80 |        500 | utils.jwt_auth\n"
+        )
+
+        entries = parse_importtime(stderr)
+
+        assert [e['module'] for e in entries] == ['jwt.api_jwt', 'jwt', 'utils.jwt_auth']
+        assert [e['depth'] for e in entries] == [2, 1, 0]
+        assert entries[-1]['cumulative_us'] == 500
+
+    def test_check_budget_violations(self):
+        """Test: Over-budget and eager heavy imports are reported"""
+        report = {'module': 'handlers.x', 'total_ms': 250.0, 'loaded': {'email_validator'}, 'entries': []}
+
+        violations = check_budget(report, budget_ms=100)
+
+        assert len(violations) == 2
+
+
+class TestHandlerImportBudget:
+    """Per-handler import-time budget"""
+
+    @pytest.mark.parametrize('module', sorted(HANDLER_BUDGETS_MS))
+    def test_handler_within_budget(self, module):
+        """Test: Handler imports stay within budget and keep heavy deps lazy"""
+        report = profile_module(module)
+        assert check_budget(report) == []
+
+    def test_health_skips_heavy_dependencies(self):
+        """Test: Health check does not load boto3, pydantic or bcrypt"""
+        loaded = profile_module('handlers.health')['loaded']
+        assert not {'boto3', 'pydantic', 'bcrypt'} & loaded
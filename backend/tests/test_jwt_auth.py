@@ -25,6 +25,10 @@ from utils.jwt_auth import (
     create_token_response,
     refresh_access_token,
     get_token_info,
+    get_verified_token,
+    revoke_token,
+    revoke_user_tokens,
+    clear_token_cache,
     JWTError,
     TokenPayload,
     JWT_SECRET_KEY,
@@ -412,6 +416,77 @@ class TestErrorHandling:
         with pytest.raises(JWTError, match="Failed to create token response"):
             create_token_response("user123", "test@example.com")
 
+class TestTokenCache:
+    """Test the in-container verified token cache"""
+    
+    def setup_method(self):
+        clear_token_cache()
+    
+    def teardown_method(self):
+        clear_token_cache()
+    
+    def test_cache_hit_skips_decode(self):
+        """Test repeated validation reuses the verified payload"""
+        token = create_access_token("user123", "cache@example.com")
+        event = {'headers': {'Authorization': f'Bearer {token}'}}
+        
+        with patch('utils.jwt_auth.decode_token', wraps=decode_token) as mock_decode:
+            first = validate_token_from_event(event)
+            second = validate_token_from_event(event)
+        
+        assert first is second
+        assert mock_decode.call_count == 1
+    
+    def test_expired_cached_token_rejected(self):
+        """Test cached payloads are only served until exp"""
+        token = create_access_token("user123", "cache@example.com")
+        payload = get_verified_token(token)
+        
+        with patch('utils.jwt_auth.time.time', return_value=payload.exp + 1):
+            with patch('utils.jwt_auth.decode_token', side_effect=JWTError("Token has expired")):
+                with pytest.raises(JWTError):
+                    get_verified_token(token)
+    
+    def test_invalid_token_not_cached(self):
+        """Test invalid tokens are never cached"""
+        assert validate_token_from_event({'headers': {'Authorization': 'Bearer invalid'}}) is None
+        assert validate_token_from_event({'headers': {'Authorization': 'Bearer invalid'}}) is None
+    
+    def test_revoke_token(self):
+        """Test revoked tokens are rejected even when cached"""
+        token = create_access_token("user123", "cache@example.com")
+        get_verified_token(token)
+        
+        revoke_token(token)
+        
+        with pytest.raises(JWTError, match="revoked"):
+            get_verified_token(token)
+    
+    def test_revoke_user_tokens(self):
+        """Test user revocation rejects tokens issued before it"""
+        old_payload = TokenPayload("user123", "cache@example.com", int(time.time()) + 600, int(time.time()) - 10)
+        token = jwt.encode(old_payload.to_dict(), JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+        other = create_access_token("user456", "other@example.com")
+        get_verified_token(token)
+        get_verified_token(other)
+        
+        revoke_user_tokens("user123")
+        
+        with pytest.raises(JWTError, match="revoked"):
+            get_verified_token(token)
+        assert get_verified_token(other).user_id == "user456"
+    
+    def test_cache_is_bounded(self):
+        """Test least recently used entries are evicted"""
+        from utils import jwt_auth
+        
+        tokens = [create_access_token(f"user{i}", "cache@example.com") for i in range(3)]
+        with patch.object(jwt_auth, 'TOKEN_CACHE_MAX_ENTRIES', 2):
+            for token in tokens:
+                get_verified_token(token)
+        
+        assert len(jwt_auth._token_cache) == 2
+
 class TestIntegration:
     """Integration tests for JWT functionality"""
     
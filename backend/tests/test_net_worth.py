@@ -0,0 +1,135 @@
+"""
+Tests for the daily net-worth snapshots and GET /net-worth
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item, card_item
+import utils.fx as fx
+from utils.dynamodb_client import DynamoDBClient
+from utils.net_worth import net_worth_totals
+
+FX_TABLE = {'base': 'MXN', 'as_of': '2025-10-01', 'rates': {'MXN': 1.0, 'USD': 20.0}}
+
+
+def _user(table, user_id):
+    table.put_item(Item={
+        'pk': f'USER#{user_id}', 'sk': 'METADATA', 'entity_type': 'user', 'user_id': user_id,
+        'gsi2_pk': 'ENTITY#user', 'gsi2_sk': f'2025-01-01T00:00:00#{user_id}'
+    })
+
+
+@pytest.fixture
+def db_client(table):
+    _user(table, 'user_123')
+    table.put_item(Item=account_item('acc_main', '1000'))
+    table.put_item(Item=account_item('acc_savings', '500', account_type='savings'))
+    table.put_item(Item=account_item('acc_usd', '100', currency='USD'))
+    table.put_item(Item=account_item('acc_closed', '999', is_active=False))
+    table.put_item(Item=card_item('card_1', '300'))
+    _user(table, 'user_456')
+    table.put_item(Item=account_item('acc_other', '42', user_id='user_456'))
+    return DynamoDBClient()
+
+
+class TestNetWorthTotals:
+    """Tests for the per-currency and per-type totals"""
+
+    def test_assets_less_card_debt(self):
+        """Test: Cards are liabilities and appear negative under their card type"""
+        totals = net_worth_totals(
+            [{'currency': 'MXN', 'current_balance': 1000, 'account_type': 'checking'},
+             {'currency': 'USD', 'current_balance': 50, 'account_type': 'checking'}],
+            [{'currency': 'MXN', 'current_balance': 250, 'card_type': 'credit'}]
+        )
+
+        assert totals['net_worth_by_currency'] == {'MXN': Decimal('750'), 'USD': Decimal('50')}
+        assert totals['liabilities_by_currency'] == {'MXN': Decimal('250')}
+        assert totals['by_account_type'] == {'checking': {'MXN': Decimal('1000'), 'USD': Decimal('50')},
+                                             'credit_card': {'MXN': Decimal('-250')}}
+
+
+class TestSnapshotJob:
+    """Tests for the net_worth_snapshot job"""
+
+    def test_snapshots_every_active_user(self, db_client):
+        """Test: One NETWORTH#{date} item per user; re-running a date overwrites it"""
+        from handlers.jobs import lambda_handler
+
+        result = lambda_handler({'action': 'net_worth_snapshot', 'date': '2025-10-01'}, None)
+        assert result['status'] == 'ok'
+        assert result['result'] == {'date': '2025-10-01', 'users': 2, 'failed': 0}
+
+        db_client.table.put_item(Item=account_item('acc_main', '2000'))
+        lambda_handler({'action': 'net_worth_snapshot', 'date': '2025-10-01', 'user_id': 'user_123'}, None)
+        lambda_handler({'action': 'net_worth_snapshot', 'date': '2025-10-02', 'user_id': 'user_123'}, None)
+
+        snapshots = db_client.list_net_worth_snapshots('user_123', '2025-09-01', '2025-10-01')
+        assert len(snapshots) == 1
+        assert snapshots[0]['net_worth_by_currency'] == {'MXN': Decimal('2200'), 'USD': Decimal('100')}
+        assert snapshots[0]['by_account_type']['savings'] == {'MXN': Decimal('500')}
+        assert snapshots[0]['account_count'] == 3
+        assert len(db_client.list_net_worth_snapshots('user_123', '2025-10-01', '2025-10-31')) == 2
+        assert db_client.list_net_worth_snapshots('user_456', '2025-10-01', '2025-10-01')[0][
+            'net_worth_by_currency'] == {'MXN': Decimal('42')}
+
+
+    def test_workers_read_through_their_own_client(self, db_client):
+        """Test: Balances are read by per-thread clients, never the shared Table resource"""
+        from utils.net_worth import snapshot_net_worth
+
+        with patch.object(db_client, 'list_user_accounts', side_effect=AssertionError('shared client')):
+            result = snapshot_net_worth(db_client, date(2025, 10, 1), user_ids=['user_123', 'user_456'])
+
+        assert result == {'date': '2025-10-01', 'users': 2, 'failed': 0}
+
+class TestGetNetWorth:
+    """Tests for GET /net-worth"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_range_converted(self, mock_validate_token, db_client):
+        """Test: The range is read oldest first and totalled with convert_to"""
+        from handlers.dashboard import get_net_worth_handler
+        from utils.net_worth import snapshot_net_worth
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        snapshot_net_worth(db_client, date(2025, 9, 30), user_ids=['user_123'])
+        snapshot_net_worth(db_client, date(2025, 10, 1), user_ids=['user_123'])
+
+        with patch.object(fx, 'get_rate_table', return_value=FX_TABLE), \
+                patch('handlers.dashboard.get_rate_table', return_value=FX_TABLE):
+            response = get_net_worth_handler({
+                'headers': {'Authorization': 'Bearer valid_token'}, 'path': '/net-worth',
+                'queryStringParameters': {'date_from': '2025-09-01', 'date_to': '2025-10-31', 'convert_to': 'MXN'}
+            }, Mock())
+        body = json.loads(response['body'])
+
+        assert response['statusCode'] == 200
+        assert body['count'] == 2
+        assert [snapshot['date'] for snapshot in body['snapshots']] == ['2025-09-30', '2025-10-01']
+        assert body['snapshots'][0]['net_worth_by_currency'] == {'MXN': 1200.0, 'USD': 100.0}
+        assert body['snapshots'][0]['total'] == 3200.0
+        assert body['currency'] == 'MXN'
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_range_validated(self, mock_validate_token):
+        """Test: Inverted, malformed or too long ranges are rejected"""
+        from handlers.dashboard import get_net_worth_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+
+        for params in ({'date_from': '2025-10-02', 'date_to': '2025-10-01'},
+                       {'date_from': 'yesterday'},
+                       {'date_from': '2010-01-01', 'date_to': '2025-10-01'}):
+            response = get_net_worth_handler({'headers': {'Authorization': 'Bearer valid_token'},
+                                              'queryStringParameters': params}, Mock())
+            assert response['statusCode'] == 400
@@ -0,0 +1,118 @@
+"""
+Tests for the segmented parallel scan and the sparse ENTITY#user index
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.dynamodb_client import DynamoDBClient
+
+
+def _user(user_id, created_at):
+    return {
+        'user_id': user_id, 'name': f'User {user_id}', 'email': f'{user_id}@example.com',
+        'password_hash': '$2b$12$secret', 'created_at': created_at, 'updated_at': created_at
+    }
+
+
+@pytest.fixture
+def db_client(table):
+    client = DynamoDBClient()
+    for i in range(5):
+        client.create_user(_user(f'usr_{i}', f'2025-10-0{i + 1}T00:00:00'))
+    with table.batch_writer() as writer:
+        for i in range(120):
+            writer.put_item(Item={
+                'pk': 'USER#usr_0', 'sk': f'TRANSACTION#txn_{i}',
+                'entity_type': 'transaction', 'user_id': 'usr_0', 'amount': i
+            })
+        # Legacy user written before the index existed
+        writer.put_item(Item={
+            'pk': 'USER#usr_legacy', 'sk': 'METADATA', 'entity_type': 'user',
+            'user_id': 'usr_legacy', 'is_active': True, 'created_at': '2024-01-01T00:00:00'
+        })
+    return client
+
+
+class TestParallelScan:
+    """Tests for DynamoDBClient.parallel_scan"""
+
+    def test_every_item_once(self, db_client):
+        """Test: Segments together yield each matching item exactly once"""
+        items = list(db_client.parallel_scan(
+            segments=4,
+            filter_expression='entity_type = :type',
+            expression_values={':type': 'transaction'},
+            projection=['sk', 'amount']
+        ))
+
+        assert sorted(int(item['amount']) for item in items) == list(range(120))
+        assert all(set(item) == {'sk', 'amount'} for item in items)
+
+    def test_fewer_workers_than_segments(self, db_client):
+        """Test: Segments queue up when max_workers is smaller"""
+        items = list(db_client.parallel_scan(segments=6, max_workers=2))
+        assert len(items) == 126
+
+    def test_follows_last_evaluated_key(self):
+        """Test: Each segment pages until LastEvaluatedKey is absent"""
+        client = DynamoDBClient()
+        client._table = MagicMock()
+        client.table.meta.client.scan.side_effect = [
+            {'Items': [{'sk': 'a'}], 'LastEvaluatedKey': {'pk': 'p', 'sk': 'a'}},
+            {'Items': [{'sk': 'b'}]},
+        ]
+
+        items = list(client.parallel_scan(segments=1))
+
+        assert items == [{'sk': 'a'}, {'sk': 'b'}]
+        second_call = client.table.meta.client.scan.call_args_list[1].kwargs
+        assert second_call['ExclusiveStartKey'] == {'pk': 'p', 'sk': 'a'}
+        assert second_call['Segment'] == 0 and second_call['TotalSegments'] == 1
+
+    def test_segment_error_raised(self):
+        """Test: A failing segment surfaces its error to the consumer"""
+        client = DynamoDBClient()
+        client._table = MagicMock()
+        client.table.meta.client.scan.side_effect = RuntimeError('throttled')
+
+        with pytest.raises(RuntimeError):
+            list(client.parallel_scan(segments=2))
+
+    def test_invalid_segments(self, db_client):
+        """Test: Non-positive segment counts are rejected"""
+        with pytest.raises(ValueError):
+            list(db_client.parallel_scan(segments=0))
+
+
+class TestUserIndex:
+    """Tests for the sparse ENTITY#user index"""
+
+    def test_list_users_reads_only_users(self, db_client):
+        """Test: Listing pages through the index and honours the limit"""
+        users = db_client.list_users(limit=3)
+
+        assert [u['user_id'] for u in users] == ['usr_0', 'usr_1', 'usr_2']
+        assert len(db_client.list_users()) == 5
+
+    def test_soft_delete_removes_from_index(self, db_client):
+        """Test: Inactive users drop out of the listing"""
+        db_client.delete_user('usr_1', '2025-10-10T00:00:00')
+
+        assert [u['user_id'] for u in db_client.list_users()] == ['usr_0', 'usr_2', 'usr_3', 'usr_4']
+        assert db_client.index_user('usr_1', '2025-10-02T00:00:00') is False
+
+    def test_index_users_job_backfills(self, db_client):
+        """Test: The backfill job indexes legacy users only once"""
+        from handlers.jobs import lambda_handler
+
+        result = lambda_handler({'action': 'index_users', 'segments': 2}, None)
+
+        assert result['result'] == {'indexed': 1}
+        assert db_client.list_users()[0]['user_id'] == 'usr_legacy'
+        assert lambda_handler({'action': 'index_users'}, None)['result'] == {'indexed': 0}
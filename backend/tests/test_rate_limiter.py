@@ -0,0 +1,71 @@
+"""
+Tests for the in-container token bucket rate limiter
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.rate_limiter import TokenBucketLimiter
+
+
+class TestTokenBucketLimiter:
+    """Tests for burst, refill and key eviction"""
+
+    def setup_method(self):
+        self.now = 1000.0
+        self.clock = patch('utils.rate_limiter.time.monotonic', side_effect=lambda: self.now)
+        self.clock.start()
+
+    def teardown_method(self):
+        self.clock.stop()
+
+    def test_burst_then_reject(self):
+        """Test: Capacity requests pass, the next one is rejected with a retry hint"""
+        limiter = TokenBucketLimiter(capacity=3, refill_per_second=0.5)
+
+        assert [limiter.allow('a@example.com')[0] for _ in range(3)] == [True, True, True]
+        allowed, retry_after = limiter.allow('a@example.com')
+
+        assert allowed is False
+        assert retry_after == 2
+
+    def test_refill_over_time(self):
+        """Test: Tokens come back at the refill rate up to capacity"""
+        limiter = TokenBucketLimiter(capacity=2, refill_per_second=1)
+        limiter.allow('k')
+        limiter.allow('k')
+        assert limiter.allow('k')[0] is False
+
+        self.now += 1
+        assert limiter.allow('k')[0] is True
+        assert limiter.allow('k')[0] is False
+
+        self.now += 100
+        assert [limiter.allow('k')[0] for _ in range(3)] == [True, True, False]
+
+    def test_keys_are_independent(self):
+        """Test: Exhausting one key does not affect another"""
+        limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.1)
+        assert limiter.allow('10.0.0.1')[0] is True
+        assert limiter.allow('10.0.0.1')[0] is False
+        assert limiter.allow('10.0.0.2')[0] is True
+
+    def test_max_keys_evicts_least_recent(self):
+        """Test: Bucket count is bounded and eviction resets the oldest key"""
+        limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.1, max_keys=2)
+        limiter.allow('a')
+        limiter.allow('b')
+        limiter.allow('c')
+
+        assert len(limiter._buckets) == 2
+        assert limiter.allow('a')[0] is True
+
+    def test_reset(self):
+        """Test: Reset drops all buckets"""
+        limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.1)
+        limiter.allow('a')
+        limiter.reset()
+        assert limiter.allow('a')[0] is True
@@ -0,0 +1,229 @@
+"""
+Tests for ledger reconciliation and the reconcile job
+"""
+
+import os
+import sys
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item
+from utils.dynamodb_client import DynamoDBClient
+from utils.reconciliation import (
+    load_ledger,
+    recompute_ledger,
+    reconcile_account,
+    reconcile_accounts,
+    repair_ledger,
+    scan_accounts
+)
+
+
+def _transaction(table, user_id, account_id, transaction_id, amount, balance_after,
+                 transaction_date, created_at):
+    table.put_item(Item={
+        'pk': f'USER#{user_id}', 'sk': f'TRANSACTION#{transaction_id}', 'entity_type': 'transaction',
+        'gsi1_pk': f'ACCOUNT#{account_id}', 'gsi1_sk': f'TRANSACTION#{transaction_date}#{transaction_id}',
+        'user_id': user_id, 'account_id': account_id, 'transaction_id': transaction_id,
+        'amount': Decimal(amount), 'account_balance_after': Decimal(balance_after),
+        'transaction_date': transaction_date, 'created_at': created_at
+    })
+
+
+def _seed(table):
+    # Consistent ledger: opening 100, +50, -30.25
+    table.put_item(Item=account_item('acc_ok', '119.75', user_id='usr_a'))
+    _transaction(table, 'usr_a', 'acc_ok', 'txn_1', '50', '150', '2025-10-01T10:00:00', '2025-10-01T10:00:00')
+    _transaction(table, 'usr_a', 'acc_ok', 'txn_2', '-30.25', '119.75', '2025-10-02T10:00:00', '2025-10-02T10:00:00')
+
+    # Backdated expense: created last but dated first, so later snapshots are stale
+    table.put_item(Item=account_item('acc_backdated', '130', user_id='usr_a'))
+    _transaction(table, 'usr_a', 'acc_backdated', 'txn_3', '50', '150', '2025-10-05T10:00:00', '2025-10-05T10:00:00')
+    _transaction(table, 'usr_a', 'acc_backdated', 'txn_4', '-20', '130', '2025-10-01T10:00:00', '2025-10-06T10:00:00')
+
+    # Transfer destination whose source transaction was deleted: balance drifts by 25
+    table.put_item(Item=account_item('acc_drift', '225', user_id='usr_b'))
+    _transaction(table, 'usr_b', 'acc_drift', 'txn_5', '100', '200', '2025-10-01T10:00:00', '2025-10-01T10:00:00')
+
+    # Another user's transaction indexed under the same account id is ignored
+    _transaction(table, 'usr_other', 'acc_ok', 'txn_6', '999', '999', '2025-10-03T10:00:00', '2025-10-03T10:00:00')
+
+    table.put_item(Item=account_item('acc_empty', '42', user_id='usr_c'))
+
+
+@pytest.fixture
+def db_client(table):
+    _seed(table)
+    return DynamoDBClient()
+
+
+def _get_account(db_client, user_id, account_id):
+    return db_client.get_account_by_id(user_id, account_id)
+
+
+class TestRecompute:
+    """Tests for running balance recomputation"""
+
+    def test_consistent_ledger(self, db_client):
+        """Test: A consistent ledger has no drift and ignores other users' items"""
+        report = reconcile_account(db_client, _get_account(db_client, 'usr_a', 'acc_ok'))
+
+        assert report['transactions'] == 2
+        assert report['expected_balance'] == 119.75
+        assert report['balance_drift'] is False
+        assert report['transactions_out_of_sync'] == 0
+
+    def test_backdated_transaction(self, db_client):
+        """Test: Snapshots are recomputed in transaction_date order from the first created one"""
+        account = _get_account(db_client, 'usr_a', 'acc_backdated')
+        rows = load_ledger(db_client, 'usr_a', 'acc_backdated')
+        result = recompute_ledger(account, rows)
+
+        assert [row['sk'] for row in rows] == ['TRANSACTION#txn_4', 'TRANSACTION#txn_3']
+        assert result['opening_balance'] == Decimal('100')
+        assert result['balance_drift'] is False
+        assert [(fix['sk'], fix['new']) for fix in result['transaction_fixes']] == [
+            ('TRANSACTION#txn_4', Decimal('80')),
+            ('TRANSACTION#txn_3', Decimal('130'))
+        ]
+
+    def test_balance_drift(self, db_client):
+        """Test: current_balance differing from the ledger is reported"""
+        report = reconcile_account(db_client, _get_account(db_client, 'usr_b', 'acc_drift'))
+
+        assert report['balance_drift'] is True
+        assert report['expected_balance'] == 200.0
+        assert report['drift'] == 25.0
+
+    def test_manual_adjustment_replayed(self, db_client):
+        """Test: A PATCH balance adjustment is a ledger row, not drift, and later snapshots include it"""
+        db_client.update_account_balance('usr_a', 'acc_ok', Decimal('20'), '2025-10-03T09:00:00',
+                                         adjustment_id='adj_1', description='Cash count')
+        _transaction(db_client.table, 'usr_a', 'acc_ok', 'txn_7', '-10', '129.75',
+                     '2025-10-04T10:00:00', '2025-10-04T10:00:00')
+        db_client.table.update_item(
+            Key={'pk': 'USER#usr_a', 'sk': 'ACCOUNT#acc_ok'},
+            UpdateExpression='SET current_balance = :balance',
+            ExpressionAttributeValues={':balance': Decimal('129.75')}
+        )
+
+        rows = load_ledger(db_client, 'usr_a', 'acc_ok')
+        report = reconcile_account(db_client, _get_account(db_client, 'usr_a', 'acc_ok'))
+
+        assert [row['sk'] for row in rows] == [
+            'TRANSACTION#txn_1', 'TRANSACTION#txn_2', 'ADJUSTMENT#adj_1', 'TRANSACTION#txn_7'
+        ]
+        assert not report['balance_drift'] and not report['transactions_out_of_sync']
+
+    def test_account_without_transactions(self, db_client):
+        """Test: Accounts with no history are anchored at their balance"""
+        report = reconcile_account(db_client, _get_account(db_client, 'usr_c', 'acc_empty'))
+
+        assert report['transactions'] == 0
+        assert report['balance_drift'] is False
+
+
+class TestRepair:
+    """Tests for batched conditional repairs"""
+
+    def test_repair_then_clean(self, db_client):
+        """Test: Repaired accounts reconcile cleanly on the next run"""
+        backdated = reconcile_account(db_client, _get_account(db_client, 'usr_a', 'acc_backdated'), repair=True)
+        drifted = reconcile_account(db_client, _get_account(db_client, 'usr_b', 'acc_drift'), repair=True)
+
+        assert backdated['repaired_transactions'] == 2
+        assert drifted['balance_updated'] == 1
+        assert _get_account(db_client, 'usr_b', 'acc_drift')['current_balance'] == Decimal('200')
+        assert _get_account(db_client, 'usr_a', 'acc_backdated')['opening_balance'] == Decimal('100')
+
+        for user_id, account_id in (('usr_a', 'acc_backdated'), ('usr_b', 'acc_drift')):
+            report = reconcile_account(db_client, _get_account(db_client, user_id, account_id))
+            assert not report['balance_drift'] and not report['transactions_out_of_sync']
+
+    def test_concurrent_change_not_overwritten(self, db_client):
+        """Test: Values changed after the read are left alone"""
+        account = _get_account(db_client, 'usr_b', 'acc_drift')
+        result = recompute_ledger(account, load_ledger(db_client, 'usr_b', 'acc_drift'))
+        db_client.update_account_balance('usr_b', 'acc_drift', Decimal('10'), '2025-10-07T10:00:00')
+
+        counts = repair_ledger(db_client, result)
+
+        assert counts['balance_updated'] == 0
+        account = _get_account(db_client, 'usr_b', 'acc_drift')
+        assert account['current_balance'] == Decimal('235')
+        assert 'opening_balance' not in account
+
+    def test_failed_batch_counted(self):
+        """Test: A cancelled transaction batch is counted, not raised"""
+        db_client = MagicMock()
+        db_client.set_account_balance.return_value = True
+        client = db_client.table.meta.client
+        client.exceptions.TransactionCanceledException = type('TransactionCanceledException', (Exception,), {})
+        client.transact_write_items.side_effect = [None, client.exceptions.TransactionCanceledException()]
+        fixes = [{'pk': 'USER#u', 'sk': f'TRANSACTION#{i}', 'old': Decimal('1'), 'new': Decimal('2')}
+                 for i in range(150)]
+        result = {'account_id': 'acc', 'user_id': 'u', 'transaction_fixes': fixes, 'balance_drift': False,
+                  'opening_balance': Decimal('0'), 'current_balance': Decimal('2'), 'expected_balance': Decimal('2')}
+
+        counts = repair_ledger(db_client, result)
+
+        assert counts == {'repaired_transactions': 100, 'failed_batches': 1, 'balance_updated': 0}
+        sizes = [len(call.kwargs['TransactItems']) for call in client.transact_write_items.call_args_list]
+        assert sizes == [100, 50]
+
+
+class TestReconcileAll:
+    """Tests for the parallel scan and the reconcile job"""
+
+    def test_scan_covers_every_account_once(self, db_client):
+        """Test: Segments together yield each account exactly once"""
+        accounts = list(scan_accounts(db_client, segments=3))
+
+        assert sorted(a['account_id'] for a in accounts) == ['acc_backdated', 'acc_drift', 'acc_empty', 'acc_ok']
+
+    def test_reconcile_accounts_summary(self, db_client):
+        """Test: The summary lists only drifting accounts"""
+        summary = reconcile_accounts(db_client, scan_accounts(db_client, segments=2), max_workers=2)
+
+        assert summary['accounts'] == 4
+        assert summary['failed'] == 0
+        assert summary['complete'] is True
+        assert sorted(r['account_id'] for r in summary['drift']) == ['acc_backdated', 'acc_drift']
+
+    def test_failed_account_counted(self, db_client):
+        """Test: An account that raises is counted as failed and the others are still reported"""
+        accounts = list(scan_accounts(db_client, segments=2))
+        broken = next(a for a in accounts if a['account_id'] == 'acc_ok')
+        del broken['user_id']
+
+        summary = reconcile_accounts(db_client, accounts, max_workers=2)
+
+        assert summary['accounts'] == 3
+        assert summary['failed'] == 1
+        assert sorted(r['account_id'] for r in summary['drift']) == ['acc_backdated', 'acc_drift']
+
+    def test_deadline_stops_dispatch(self, db_client):
+        """Test: No account is started once the deadline has passed"""
+        summary = reconcile_accounts(db_client, scan_accounts(db_client, segments=2), deadline=0)
+
+        assert summary['accounts'] == 0
+        assert summary['complete'] is False
+
+    def test_reconcile_job(self, db_client):
+        """Test: The jobs handler reconciles one user's accounts with repair"""
+        from handlers.jobs import lambda_handler
+
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 900000
+        result = lambda_handler({'action': 'reconcile', 'user_id': 'usr_b', 'repair': True}, context)
+
+        assert result['status'] == 'ok'
+        assert result['result']['accounts'] == 1
+        assert result['result']['drift'][0]['balance_updated'] == 1
+
+        result = lambda_handler({'action': 'reconcile', 'user_id': 'usr_b', 'account_id': 'missing'}, None)
+        assert result['status'] == 'error'
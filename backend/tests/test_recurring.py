@@ -0,0 +1,217 @@
+"""
+Tests for the recurring transaction materializer
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item
+from utils.dynamodb_client import DynamoDBClient
+from utils.recurring import (
+    AccountCache,
+    first_run_date,
+    next_run_date,
+    plan_occurrences,
+    run_recurring,
+    template_index_date,
+    write_batch
+)
+
+TODAY = date(2025, 10, 5)
+
+
+def _template(client, transaction_id, account_id, amount, transaction_type, frequency, transaction_date,
+              destination_account_id=None, created_on=None):
+    next_run = first_run_date(transaction_date, frequency)
+    client.create_transaction({
+        'transaction_id': transaction_id, 'user_id': 'user_123', 'account_id': account_id,
+        'account_name': account_id, 'amount': amount, 'description': transaction_id,
+        'transaction_type': transaction_type, 'category': 'other', 'status': 'completed',
+        'transaction_date': transaction_date, 'account_balance_after': 0,
+        'destination_account_id': destination_account_id, 'destination_account_name': destination_account_id,
+        'is_recurring': True, 'recurring_frequency': frequency,
+        'next_run_date': next_run,
+        'recurring_index_date': template_index_date(next_run, created_on) if created_on else None,
+        'created_at': transaction_date, 'updated_at': transaction_date
+    })
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item={'pk': 'USER#user_123', 'sk': 'METADATA', 'entity_type': 'user'})
+    table.put_item(Item=account_item('acc_main', '1000'))
+    table.put_item(Item=account_item('acc_savings', '0'))
+    table.put_item(Item=account_item('acc_closed', '0', is_active=False))
+    client = DynamoDBClient()
+    _template(client, 'txn_coffee', 'acc_main', -10, 'expense', 'daily', '2025-10-01T08:00:00')
+    _template(client, 'txn_salary', 'acc_main', 1000, 'salary', 'monthly', '2025-09-05T09:00:00')
+    _template(client, 'txn_saving', 'acc_main', -50, 'transfer', 'weekly', '2025-09-20T10:00:00',
+              destination_account_id='acc_savings')
+    _template(client, 'txn_old', 'acc_closed', -5, 'expense', 'daily', '2025-10-01T08:00:00')
+    return client
+
+
+def _balance(db_client, account_id):
+    return db_client.get_account_by_id('user_123', account_id)['current_balance']
+
+
+def _transaction(db_client, transaction_id):
+    return db_client.get_transaction_by_id('user_123', transaction_id)
+
+
+class TestSchedule:
+    """Tests for run date arithmetic"""
+
+    def test_monthly_keeps_anchor_day(self):
+        """Test: A template on the 31st runs on the last day of shorter months and back on the 31st"""
+        assert next_run_date(date(2025, 1, 31), 'monthly', 31) == date(2025, 2, 28)
+        assert next_run_date(date(2025, 2, 28), 'monthly', 31) == date(2025, 3, 31)
+        assert next_run_date(date(2025, 12, 15), 'monthly', 15) == date(2026, 1, 15)
+        assert next_run_date(date(2024, 2, 29), 'yearly', 29) == date(2025, 2, 28)
+        assert first_run_date('2025-10-01T08:00:00', 'weekly') == '2025-10-08'
+
+    def test_plan_limited_per_pass(self):
+        """Test: Long catch-ups are split and continue from the next pending run"""
+        template = {'transaction_date': '2025-10-01T00:00:00', 'next_run_date': '2025-10-02',
+                    'recurring_frequency': 'daily'}
+
+        runs, next_run = plan_occurrences(template, TODAY, limit=3)
+
+        assert runs == [date(2025, 10, 2), date(2025, 10, 3), date(2025, 10, 4)]
+        assert next_run == date(2025, 10, 5)
+
+
+class TestRunRecurring:
+    """Tests for materializing due templates"""
+
+    def test_materializes_due_runs(self, db_client):
+        """Test: Every due run is written and balances move by the aggregated deltas"""
+        summary = run_recurring(db_client, today=TODAY)
+
+        # coffee 10-02..10-05, salary 10-05, saving 09-27 and 10-04 (two items each)
+        assert summary['occurrences'] == 4 + 1 + 4
+        assert summary['templates'] == 3
+        assert summary['skipped'] == 1
+        assert _balance(db_client, 'acc_main') == Decimal('1860')
+        assert _balance(db_client, 'acc_savings') == Decimal('100')
+
+        transfer = _transaction(db_client, 'txn_saving_20250927')
+        assert transfer['transaction_date'] == '2025-09-27T10:00:00'
+        assert transfer['account_balance_after'] == 950.0
+        assert transfer['recurring_template_id'] == 'txn_saving'
+        assert _transaction(db_client, 'txn_saving_20250927_in')['account_balance_after'] == 50.0
+
+        template = _transaction(db_client, 'txn_coffee')
+        assert template['next_run_date'] == '2025-10-06'
+        assert template['gsi2_pk'] == 'RECUR#2025-10-06'
+
+    def test_rerun_reads_nothing(self, db_client):
+        """Test: A second run the same day finds no new dates to read"""
+        run_recurring(db_client, today=TODAY)
+        summary = run_recurring(db_client, today=TODAY)
+
+        assert summary['from'] == '2025-10-06'
+        assert summary['occurrences'] == 0
+        assert _balance(db_client, 'acc_main') == Decimal('1860')
+
+    def test_catches_up_missed_days(self, db_client):
+        """Test: Days missed since the last run are read once, in a few batches"""
+        run_recurring(db_client, today=TODAY)
+
+        with patch('utils.recurring.RECURRING_MAX_OCCURRENCES', 2):
+            summary = run_recurring(db_client, today=date(2025, 10, 9))
+
+        assert summary['from'] == '2025-10-06'
+        assert summary['occurrences'] == 4
+        assert _balance(db_client, 'acc_main') == Decimal('1820')
+        assert _transaction(db_client, 'txn_coffee')['next_run_date'] == '2025-10-10'
+
+    def test_backdated_template_caught_up(self, db_client):
+        """Test: A template created with its next run behind the cursor is read the next day"""
+        run_recurring(db_client, today=TODAY)
+        _template(db_client, 'txn_gym', 'acc_main', -20, 'expense', 'weekly', '2025-09-26T07:00:00',
+                  created_on=TODAY)
+
+        assert _transaction(db_client, 'txn_gym')['gsi2_pk'] == 'RECUR#2025-10-06'
+        run_recurring(db_client, today=date(2025, 10, 6))
+
+        assert _transaction(db_client, 'txn_gym_20251003')['amount'] == -20.0
+        assert _transaction(db_client, 'txn_gym')['next_run_date'] == '2025-10-10'
+
+    def test_skipped_template_read_again(self, db_client):
+        """Test: A template skipped for an inactive account stays readable and catches up later"""
+        run_recurring(db_client, today=TODAY)
+
+        template = _transaction(db_client, 'txn_old')
+        assert template['gsi2_pk'] == 'RECUR#2025-10-06'
+        assert template['next_run_date'] == '2025-10-02'
+
+        db_client.table.put_item(Item=account_item('acc_closed', '0'))
+        summary = run_recurring(db_client, today=date(2025, 10, 6))
+
+        assert summary['skipped'] == 0
+        assert _balance(db_client, 'acc_closed') == Decimal('-25')
+        assert _transaction(db_client, 'txn_old')['next_run_date'] == '2025-10-07'
+
+    def test_balance_moved_underneath(self, db_client):
+        """Test: A concurrent balance change is re-read and the batch retried"""
+        accounts = AccountCache(db_client)
+        accounts.get('user_123', 'acc_main')
+        db_client.table.update_item(
+            Key={'pk': 'USER#user_123', 'sk': 'ACCOUNT#acc_main'},
+            UpdateExpression='SET current_balance = :balance',
+            ExpressionAttributeValues={':balance': Decimal('500')}
+        )
+        template = db_client.table.get_item(Key={'pk': 'USER#user_123', 'sk': 'TRANSACTION#txn_salary'})['Item']
+        plan = {'template': template, 'runs': [date(2025, 10, 5)], 'next_run': date(2025, 11, 5)}
+
+        written = write_batch(db_client, [plan], accounts)
+
+        assert len(written) == 1
+        assert _balance(db_client, 'acc_main') == Decimal('1500')
+
+    def test_jobs_handler(self, db_client):
+        """Test: The recurring job runs for a date"""
+        from handlers.jobs import lambda_handler
+
+        result = lambda_handler({'action': 'recurring', 'date': '2025-10-05'}, None)
+
+        assert result['status'] == 'ok'
+        assert result['result']['occurrences'] == 9
+
+
+class TestCreateRecurringTransaction:
+    """Tests for scheduling templates from the transactions endpoint"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.transactions.DynamoDBClient')
+    def test_template_scheduled(self, mock_db_class, mock_validate_token):
+        """Test: Recurring transactions are stored with their first run date"""
+        from handlers.transactions import create_transaction_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        mock_db = mock_db_class.return_value
+        mock_db.get_account_by_id.return_value = {'account_id': 'acc_main', 'name': 'Main',
+                                                  'current_balance': 1000.0, 'is_active': True}
+        mock_db.create_transaction.side_effect = lambda data: {**data, 'amount': float(data['amount']),
+                                                               'account_balance_after': 900.0}
+
+        response = create_transaction_handler({
+            'headers': {'Authorization': 'Bearer valid_token'},
+            'body': json.dumps({'account_id': 'acc_main', 'amount': 100, 'description': 'Rent',
+                                'transaction_type': 'expense', 'category': 'rent_mortgage',
+                                'transaction_date': '2025-01-31T09:00:00',
+                                'is_recurring': True, 'recurring_frequency': 'monthly'})
+        }, Mock())
+
+        assert response['statusCode'] == 201
+        assert mock_db.create_transaction.call_args.args[0]['next_run_date'] == '2025-02-28'
+        assert mock_db.create_transaction.call_args.args[0]['recurring_index_date'] > date.today().isoformat()
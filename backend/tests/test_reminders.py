@@ -0,0 +1,123 @@
+"""
+Tests for the payment due reminder scheduler
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import boto3
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import card_item
+from utils.dynamodb_client import DynamoDBClient
+from utils.reminders import build_reminder, iter_due_cards, publish_reminders, send_payment_reminders
+
+TODAY = date(2025, 10, 2)
+
+
+def _card(client, card_id, payment_due_date, balance='1000', status='active'):
+    client.create_card(card_item(card_id, balance, cut_off_date=15, payment_due_date=payment_due_date,
+                                 status=status))
+
+
+@pytest.fixture
+def db_client(table):
+    client = DynamoDBClient()
+    _card(client, 'card_in_3', 5)
+    _card(client, 'card_in_1', 3)
+    _card(client, 'card_paid', 5, balance='0')
+    _card(client, 'card_in_2', 4)
+    _card(client, 'card_off', 5, status='inactive')
+    return client
+
+
+class TestDueIndex:
+    """Tests for the sparse DUE#{dd} index maintained on the card"""
+
+    def test_only_active_cards_of_the_day(self, db_client):
+        """Test: A due date reads only the active cards indexed under its day"""
+        card_ids = {card['card_id'] for card in iter_due_cards(db_client, date(2025, 10, 5))}
+
+        assert card_ids == {'card_in_3', 'card_paid'}
+
+    def test_index_follows_updates(self, db_client):
+        """Test: Changing the due day moves the key; deactivating the card drops it"""
+        db_client.update_card('user_123', 'card_in_2', {'payment_due_date': 5, 'updated_at': '2025-10-01'})
+        db_client.delete_card('user_123', 'card_in_3', '2025-10-01')
+
+        assert db_client.get_card_by_id('user_123', 'card_in_2')['gsi3_pk'] == 'DUE#05'
+        assert 'gsi3_pk' not in db_client.get_card_by_id('user_123', 'card_in_3')
+        assert {card['card_id'] for card in iter_due_cards(db_client, date(2025, 10, 5))} == {
+            'card_in_2', 'card_paid'
+        }
+
+    def test_due_day_beyond_month_end(self, db_client):
+        """Test: A due day 31 is read on the last day of shorter months"""
+        _card(db_client, 'card_eom', 31)
+
+        assert [card['card_id'] for card in iter_due_cards(db_client, date(2025, 9, 30))] == ['card_eom']
+
+
+class TestBuildReminder:
+    """Tests for the reminder payload"""
+
+    def test_statement_figures_included(self):
+        """Test: A statement due that day adds its balance and minimum payment"""
+        card = {'user_id': 'u', 'card_id': 'c', 'current_balance': Decimal('900'),
+                'next_payment_due': '2025-10-05', 'statement_balance': Decimal('800'),
+                'minimum_payment': Decimal('40.5')}
+
+        reminder = build_reminder(card, date(2025, 10, 5), TODAY)
+
+        assert reminder['days_until_due'] == 3
+        assert reminder['statement_balance'] == 800.0
+        assert reminder['minimum_payment'] == 40.5
+
+    def test_no_debt_no_reminder(self):
+        """Test: Cards without balance are skipped"""
+        assert build_reminder({'user_id': 'u', 'card_id': 'c', 'current_balance': 0},
+                              date(2025, 10, 5), TODAY) is None
+
+
+class TestSendPaymentReminders:
+    """Tests for the scheduler entry point"""
+
+    def test_reads_only_reminder_days(self, db_client):
+        """Test: Only the due dates days_ahead from today are queried"""
+        summary = send_payment_reminders(db_client, today=TODAY, days_ahead=[3, 1], event_bus='')
+
+        assert summary['due_dates'] == ['2025-10-03', '2025-10-05']
+        assert summary['cards'] == 3
+        assert summary['reminders'] == 2
+        assert summary['sent'] == 0
+
+    def test_published_in_batches(self, db_client):
+        """Test: Reminders are sent ten entries per PutEvents request"""
+        reminders = [{'card_id': f'card_{i}'} for i in range(23)]
+
+        with patch('boto3.client') as mock_client:
+            mock_client.return_value.put_events.return_value = {'FailedEntryCount': 1}
+            result = publish_reminders(reminders, event_bus='default')
+
+        calls = mock_client.return_value.put_events.call_args_list
+        assert [len(call.kwargs['Entries']) for call in calls] == [10, 10, 3]
+        assert json.loads(calls[0].kwargs['Entries'][0]['Detail']) == {'card_id': 'card_0'}
+        assert result == {'sent': 20, 'failed': 3}
+
+    def test_jobs_handler(self, db_client):
+        """Test: The payment_reminders job publishes to the default event bus"""
+        from handlers.jobs import lambda_handler
+
+        with patch('utils.reminders.REMINDER_EVENT_BUS', 'default'):
+            result = lambda_handler({'action': 'payment_reminders', 'date': '2025-10-02',
+                                     'days_ahead': [1, 2, 3]}, None)
+
+        assert result['status'] == 'ok'
+        assert result['result']['reminders'] == 3
+        assert result['result']['sent'] == 3
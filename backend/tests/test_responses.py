@@ -0,0 +1,142 @@
+"""
+Tests for HTTP response utilities
+Covers Accept-Encoding negotiation and response compression
+"""
+
+import base64
+import gzip
+import json
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import responses
+from utils.responses import (
+    create_response,
+    negotiate_encoding,
+    get_accept_encoding,
+    get_compression_metrics
+)
+
+
+def _large_body():
+    """Body big enough to cross the compression threshold"""
+    return {
+        "transactions": [
+            {"transaction_id": f"txn_{i:012d}", "description": "Grocery shopping", "amount": 250.75}
+            for i in range(200)
+        ]
+    }
+
+
+class TestEncodingNegotiation:
+    """Tests for Accept-Encoding parsing"""
+
+    def test_get_accept_encoding_case_insensitive(self):
+        """Test: Header lookup ignores case"""
+        event = {'headers': {'accept-encoding': 'GZIP, deflate'}}
+        assert get_accept_encoding(event) == 'gzip, deflate'
+
+    def test_get_accept_encoding_missing(self):
+        """Test: Missing headers yield empty string"""
+        assert get_accept_encoding({'headers': None}) == ''
+        assert get_accept_encoding(None) == ''
+
+    def test_negotiate_gzip(self):
+        """Test: gzip is selected when brotli is not accepted"""
+        assert negotiate_encoding('gzip, deflate') == 'gzip'
+
+    def test_negotiate_rejects_zero_quality(self):
+        """Test: q=0 disables an encoding"""
+        assert negotiate_encoding('gzip;q=0, identity') is None
+
+    def test_negotiate_no_supported_encoding(self):
+        """Test: identity-only clients get no compression"""
+        assert negotiate_encoding('identity') is None
+        assert negotiate_encoding('') is None
+
+    def test_negotiate_prefers_brotli_when_available(self):
+        """Test: br is preferred when the brotli module is installed"""
+        with patch.object(responses, 'brotli', object()):
+            assert negotiate_encoding('gzip, br') == 'br'
+        with patch.object(responses, 'brotli', None):
+            assert negotiate_encoding('gzip, br') == 'gzip'
+
+    def test_negotiate_highest_quality_wins(self):
+        """Test: A lower q-value for br loses to gzip; br only wins ties"""
+        with patch.object(responses, 'brotli', object()):
+            assert negotiate_encoding('br;q=0.1, gzip') == 'gzip'
+            assert negotiate_encoding('br;q=0.5, gzip;q=0.5') == 'br'
+            assert negotiate_encoding('gzip;q=0.2, *;q=0.8') == 'br'
+            assert negotiate_encoding('br;q=0, gzip;q=0') is None
+
+
+class TestResponseCompression:
+    """Tests for compressed create_response output"""
+
+    def test_compression_disabled_by_default(self):
+        """Test: Without the feature flag bodies stay plain JSON"""
+        event = {'headers': {'Accept-Encoding': 'gzip'}}
+        with patch.object(responses, 'COMPRESSION_ENABLED', False):
+            response = create_response(200, _large_body(), event=event)
+
+        assert 'isBase64Encoded' not in response
+        assert 'Content-Encoding' not in response['headers']
+        assert json.loads(response['body'])['transactions']
+
+    def test_gzip_compression_above_threshold(self):
+        """Test: Large bodies are gzip-compressed and base64-encoded"""
+        event = {'headers': {'Accept-Encoding': 'gzip, deflate'}}
+        with patch.object(responses, 'COMPRESSION_ENABLED', True):
+            response = create_response(200, _large_body(), event=event)
+
+        assert response['isBase64Encoded'] is True
+        assert response['headers']['Content-Encoding'] == 'gzip'
+        assert response['headers']['Vary'] == 'Accept-Encoding'
+
+        body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+        assert len(body['transactions']) == 200
+        assert 'timestamp' in body
+
+    def test_small_body_not_compressed(self):
+        """Test: Bodies below the threshold are sent as-is"""
+        event = {'headers': {'Accept-Encoding': 'gzip'}}
+        with patch.object(responses, 'COMPRESSION_ENABLED', True):
+            response = create_response(200, {"message": "ok"}, event=event)
+
+        assert 'isBase64Encoded' not in response
+        assert json.loads(response['body'])['message'] == 'ok'
+
+    def test_no_event_not_compressed(self):
+        """Test: Callers that do not pass the event keep plain responses"""
+        with patch.object(responses, 'COMPRESSION_ENABLED', True):
+            response = create_response(200, _large_body())
+
+        assert 'isBase64Encoded' not in response
+
+    def test_compressor_template_reused(self):
+        """Test: Consecutive responses compress independently from the cached template"""
+        event = {'headers': {'Accept-Encoding': 'gzip'}}
+        with patch.object(responses, 'COMPRESSION_ENABLED', True):
+            first = create_response(200, _large_body(), event=event)
+            second = create_response(200, _large_body(), event=event)
+
+        for response in (first, second):
+            body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+            assert len(body['transactions']) == 200
+
+    def test_compression_metrics(self):
+        """Test: Metrics track ratio and CPU cost"""
+        event = {'headers': {'Accept-Encoding': 'gzip'}}
+        before = get_compression_metrics()
+        with patch.object(responses, 'COMPRESSION_ENABLED', True):
+            create_response(200, _large_body(), event=event)
+        after = get_compression_metrics()
+
+        assert after['responses_compressed'] == before['responses_compressed'] + 1
+        assert after['bytes_in'] > before['bytes_in']
+        assert after['bytes_out'] > before['bytes_out']
+        assert after['compression_ratio'] > 1
+        assert after['cpu_ms'] >= before['cpu_ms']
@@ -0,0 +1,135 @@
+"""
+Tests for the shared router and the single-function entry point
+"""
+
+import json
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.router import Router, ANY_METHOD, normalize_path
+
+
+def _handler(name):
+    def handler(event, context):
+        return {'statusCode': 200, 'handler': name, 'params': event.get('pathParameters')}
+    return handler
+
+
+class TestRouter:
+    """Tests for template compilation and matching"""
+
+    def setup_method(self):
+        self.router = Router()
+        self.router.add('GET', '/transactions', _handler('list'))
+        self.router.add('GET', '/transactions/summary', _handler('summary'))
+        self.router.add('GET', '/transactions/{transaction_id}', _handler('get'))
+        self.router.add('DELETE', '/transactions/{transaction_id}', _handler('delete'))
+        self.router.add('POST', '/cards/{card_id}/payment', _handler('payment'))
+        self.router.add(ANY_METHOD, '/auth/{proxy+}', _handler('auth'))
+
+    def test_normalize_path(self):
+        """Test: Stage prefix and trailing slashes are removed"""
+        assert normalize_path('/api/accounts/') == '/accounts'
+        assert normalize_path('/api') == '/'
+
+    def test_literal_beats_parameter(self):
+        """Test: /transactions/summary is not captured by {transaction_id}"""
+        handler, params = self.router.resolve('GET', '/transactions/summary')
+        assert handler({}, None)['handler'] == 'summary'
+        assert params == {}
+
+    def test_parameter_extraction(self):
+        """Test: Path parameters are extracted from the template"""
+        handler, params = self.router.resolve('DELETE', '/api/transactions/txn_123')
+        assert handler({}, None)['handler'] == 'delete'
+        assert params == {'transaction_id': 'txn_123'}
+
+        _, params = self.router.resolve('POST', '/cards/card_1/payment')
+        assert params == {'card_id': 'card_1'}
+
+    def test_greedy_any_method(self):
+        """Test: Greedy ANY routes capture the remaining path"""
+        _, params = self.router.resolve('POST', '/auth/login')
+        assert params == {'proxy': 'login'}
+        assert self.router.resolve('GET', '/auth') is None
+
+    def test_no_match(self):
+        """Test: Unknown paths and methods do not match"""
+        assert self.router.resolve('PUT', '/transactions') is None
+        assert self.router.resolve('GET', '/transactions/txn_1/extra') is None
+        assert self.router.resolve('GET', '/unknown') is None
+
+    def test_dispatch_fills_path_parameters(self):
+        """Test: Dispatch sets pathParameters only when missing"""
+        event = {'httpMethod': 'GET', 'path': '/transactions/txn_9', 'pathParameters': None}
+        assert self.router.dispatch(event, None)['params'] == {'transaction_id': 'txn_9'}
+
+        event = {'httpMethod': 'GET', 'path': '/transactions/txn_9', 'pathParameters': {'transaction_id': 'gw'}}
+        assert self.router.dispatch(event, None)['params'] == {'transaction_id': 'gw'}
+
+    def test_named_handlers_resolved_at_dispatch(self):
+        """Test: Handlers registered by name follow the namespace"""
+        namespace = {'handler': _handler('first')}
+        router = Router(namespace)
+        router.add('GET', '/items', 'handler')
+        namespace['handler'] = _handler('second')
+
+        assert router.dispatch({'httpMethod': 'GET', 'path': '/items'}, None)['handler'] == 'second'
+
+    def test_duplicate_and_conflicting_routes(self):
+        """Test: Ambiguous templates are rejected at compile time"""
+        with pytest.raises(ValueError):
+            self.router.add('GET', '/transactions', _handler('again'))
+        with pytest.raises(ValueError):
+            self.router.add('GET', '/transactions/{id}/items', _handler('conflict'))
+
+    def test_include_merges_routes(self):
+        """Test: Included routers keep their handlers and parameters"""
+        other = Router()
+        other.add('PATCH', '/accounts/{account_id}/balance', _handler('balance'))
+
+        app = Router()
+        app.include(self.router)
+        app.include(other)
+
+        _, params = app.resolve('PATCH', '/accounts/acc_1/balance')
+        assert params == {'account_id': 'acc_1'}
+        handler, _ = app.resolve('GET', '/transactions/summary')
+        assert handler({}, None)['handler'] == 'summary'
+
+
+class TestSingleFunctionApp:
+    """Tests for the single-function entry point"""
+
+    @patch('handlers.transactions.get_transaction_summary_handler')
+    def test_routes_to_module_handler(self, mock_summary):
+        """Test: Module routes are reachable through the app router"""
+        from handlers.app import lambda_handler
+
+        mock_summary.return_value = {'statusCode': 200, 'body': '{}'}
+        event = {'httpMethod': 'GET', 'path': '/api/transactions/summary'}
+
+        result = lambda_handler(event, Mock())
+
+        assert result['statusCode'] == 200
+        mock_summary.assert_called_once()
+
+    def test_health_mounted(self):
+        """Test: Health endpoint is served by the app"""
+        from handlers.app import lambda_handler
+
+        result = lambda_handler({'httpMethod': 'GET', 'path': '/health'}, None)
+        assert result['statusCode'] == 200
+
+    def test_unknown_route(self):
+        """Test: Unknown routes return 404"""
+        from handlers.app import lambda_handler
+
+        result = lambda_handler({'httpMethod': 'GET', 'path': '/nope'}, None)
+        assert result['statusCode'] == 404
+        assert json.loads(result['body'])['error'] == 'Endpoint not found'
@@ -0,0 +1,165 @@
+"""
+Tests for the per-category spending distributions (quantile sketch and histogram)
+"""
+
+import json
+import os
+import random
+import sys
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import account_item
+from utils.dynamodb_client import DynamoDBClient
+from utils.spend_distribution import (
+    SKETCH_RELATIVE_ACCURACY,
+    counter_deltas,
+    describe_distribution,
+    merge_distributions,
+    sketch_quantiles
+)
+
+AUTH_HEADERS = {'Authorization': 'Bearer valid_token'}
+
+
+def _item(amounts):
+    """A SPENDDIST# item holding the given expense amounts"""
+    counters = {}
+    for amount in amounts:
+        for name, delta in counter_deltas(Decimal(str(amount))).items():
+            counters[name] = counters.get(name, Decimal('0')) + delta
+    return counters
+
+
+def _transaction(client, transaction_id, amount, category, day):
+    client.create_transaction({
+        'transaction_id': transaction_id, 'user_id': 'user_123', 'account_id': 'acc_main',
+        'account_name': 'Main', 'amount': amount, 'description': transaction_id,
+        'transaction_type': 'expense', 'category': category, 'status': 'completed',
+        'transaction_date': f'{day}T12:00:00', 'account_balance_after': 0,
+        'created_at': 'now', 'updated_at': 'now'
+    })
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item=account_item('acc_main', '100000', name='Main'))
+    return DynamoDBClient()
+
+
+class TestSketch:
+    """Tests for the log-bucketed quantile sketch"""
+
+    def test_quantiles_within_accuracy(self):
+        """Test: Every quantile is within the relative accuracy of the exact one"""
+        rng = random.Random(7)
+        amounts = sorted(round(rng.lognormvariate(6, 1), 2) for _ in range(2000))
+
+        merged = merge_distributions([_item(amounts)])
+        values = sketch_quantiles(merged['sketch'], merged['count'], (0.5, 0.9, 0.99))
+
+        for q, value in values.items():
+            exact = amounts[int(q * (len(amounts) - 1))]
+            assert abs(value - exact) <= exact * SKETCH_RELATIVE_ACCURACY + 0.01
+
+    def test_merge_equals_single_item(self):
+        """Test: Merging monthly items gives the same distribution as one item"""
+        september, october = [120, 80, 300.5], [95, 1500, 60]
+
+        merged = describe_distribution([_item(september), _item(october)])
+
+        assert merged == describe_distribution([_item(september + october)])
+        assert merged['count'] == 6
+        assert merged['mean'] == 359.25
+        assert [bucket['count'] for bucket in merged['histogram']][:6] == [0, 3, 1, 1, 0, 1]
+
+    def test_reverse_removes_expense(self):
+        """Test: Taking an expense back leaves the counters as if never added"""
+        item = _item([100, 250])
+        for name, delta in counter_deltas(Decimal('-250')).items():
+            item[name] += delta
+
+        assert describe_distribution([item]) == describe_distribution([_item([100])])
+
+
+class TestWritePaths:
+    """Tests for the transaction endpoints keeping the distributions"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_create_and_delete(self, mock_validate_token, db_client):
+        """Test: Expenses are added on create, removed on delete and income is ignored"""
+        from handlers.transactions import create_transaction_handler, delete_transaction_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        transaction_ids = []
+        for amount, transaction_type in ((450, 'expense'), (120, 'expense'), (5000, 'income')):
+            response = create_transaction_handler({'headers': AUTH_HEADERS, 'body': json.dumps({
+                'account_id': 'acc_main', 'amount': amount, 'description': 'Market',
+                'transaction_type': transaction_type, 'category': 'groceries'
+            })}, Mock())
+            assert response['statusCode'] == 201
+            transaction_ids.append(json.loads(response['body'])['transaction']['transaction_id'])
+
+        items = db_client.list_spend_distributions('user_123', 'MXN', 'groceries')
+        assert len(items) == 1
+        assert items[0]['spend_count'] == 2
+        assert items[0]['spend_total'] == Decimal('570')
+
+        delete_transaction_handler({'headers': AUTH_HEADERS, 'pathParameters': {'transaction_id': transaction_ids[0]}},
+                                   Mock())
+        items = db_client.list_spend_distributions('user_123', 'MXN', 'groceries')
+        assert describe_distribution(items) == describe_distribution([_item([120])])
+
+
+class TestGetSpending:
+    """Tests for GET /spending and the rebuild job"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_range_merged_from_rebuilt_items(self, mock_validate_token, db_client):
+        """Test: The rebuild job backfills the months and the range merges them"""
+        from handlers.dashboard import get_spending_distribution_handler
+        from handlers.jobs import lambda_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        for transaction_id, amount, category, day in (
+                ('txn_1', -100, 'groceries', '2025-08-03'),
+                ('txn_2', -200, 'groceries', '2025-09-03'),
+                ('txn_3', -300, 'groceries', '2025-10-03'),
+                ('txn_4', -900, 'restaurants', '2025-10-04')):
+            _transaction(db_client, transaction_id, amount, category, day)
+
+        result = lambda_handler({'action': 'rebuild_spend_distributions', 'user_id': 'user_123'}, None)
+        assert result['result'] == {'user_id': 'user_123', 'transactions': 4, 'items': 4}
+
+        response = get_spending_distribution_handler({'headers': AUTH_HEADERS, 'queryStringParameters': {
+            'category': 'groceries', 'period_from': '2025-09', 'period_to': '2025-10'
+        }}, Mock())
+        body = json.loads(response['body'])
+
+        assert response['statusCode'] == 200
+        assert body['months'] == 2
+        assert body['count'] == 2
+        assert body['total'] == 500.0
+        assert abs(body['quantiles']['p50'] - 200) <= 200 * SKETCH_RELATIVE_ACCURACY
+
+        response = get_spending_distribution_handler({'headers': AUTH_HEADERS, 'queryStringParameters': {
+            'period_from': '2025-10', 'period_to': '2025-10'
+        }}, Mock())
+        assert json.loads(response['body'])['total'] == 1200.0
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    def test_parameters_validated(self, mock_validate_token):
+        """Test: Unknown categories and malformed or inverted months are rejected"""
+        from handlers.dashboard import get_spending_distribution_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+
+        for params in ({'category': 'dining'}, {'period_from': '2025-13'},
+                       {'period_from': '2025-10', 'period_to': '2025-09'}):
+            response = get_spending_distribution_handler({'headers': AUTH_HEADERS,
+                                                          'queryStringParameters': params}, Mock())
+            assert response['statusCode'] == 400
@@ -0,0 +1,168 @@
+"""
+Tests for the credit card statement engine
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from conftest import card_item
+from utils.dynamodb_client import DynamoDBClient
+from utils.statements import (
+    close_due_statements,
+    close_statement,
+    cut_off_days,
+    next_cycle,
+    payment_due_after
+)
+from handlers.cards import record_card_transaction, statement_fields
+
+
+@pytest.fixture
+def db_client(table):
+    for card_id, cut_off_date, balance, status in [('card_1', 15, '1000', 'active'),
+                                                   ('card_eom', 31, '0', 'active'),
+                                                   ('card_off', 15, '1000', 'inactive')]:
+        table.put_item(Item=card_item(card_id, balance, cut_off_date=cut_off_date, payment_due_date=5,
+                                      apr=Decimal('36'), status=status))
+    client = DynamoDBClient()
+
+    card = client.get_card_by_id('user_123', 'card_1')
+    for kind, amount, when in [
+        ('purchase', 500, '2025-08-20'),   # cycle 2025-09
+        ('payment', 200, '2025-09-01'),
+        ('fee', 50, '2025-09-10'),
+        ('purchase', 100, '2025-09-20'),   # cycle 2025-10
+    ]:
+        record_card_transaction(client, 'user_123', card, kind, amount, kind, when)
+    return client
+
+
+def _card_1(db_client):
+    return db_client.get_card_by_id('user_123', 'card_1')
+
+
+class TestStatementHelpers:
+    """Tests for cycle and date helpers"""
+
+    def test_payment_due_after_cut_off(self):
+        """Test: The due date is the first due day after the cut-off"""
+        assert payment_due_after(date(2025, 9, 15), 5) == date(2025, 10, 5)
+        assert payment_due_after(date(2025, 9, 15), 25) == date(2025, 9, 25)
+        assert payment_due_after(date(2025, 1, 31), 30) == date(2025, 2, 28)
+        assert payment_due_after(date(2025, 9, 15), None) is None
+
+    def test_cut_off_days_at_month_end(self):
+        """Test: Cut-off days beyond the month end close on its last day"""
+        assert cut_off_days(date(2025, 2, 28)) == [28, 29, 30, 31]
+        assert cut_off_days(date(2025, 2, 15)) == [15]
+        assert next_cycle('2025-12') == '2026-01'
+
+
+class TestCloseStatement:
+    """Tests for closing a cycle"""
+
+    def test_statement_figures(self, db_client):
+        """Test: Totals, minimum payment, interest and due date of a closed cycle"""
+        statement, created = close_statement(db_client, _card_1(db_client), '2025-09')
+
+        assert created is True
+        assert statement['cycle_start'] == '2025-08-16'
+        assert statement['cycle_end'] == '2025-09-15'
+        assert statement['purchases'] == Decimal('500.00')
+        assert statement['payments'] == Decimal('200.00')
+        assert statement['fees'] == Decimal('50.00')
+        assert statement['statement_balance'] == Decimal('1350.00')
+        assert statement['previous_balance'] == Decimal('1000.00')
+        assert statement['minimum_payment'] == Decimal('70.25')
+        assert statement['projected_interest'] == Decimal('38.39')
+        assert statement['payment_due_date'] == '2025-10-05'
+        assert statement['transaction_count'] == 3
+
+    def test_data_version_bumped(self, db_client):
+        """Test: A new statement invalidates the user's ETags; reclosing does not"""
+        db_client.table.put_item(Item={'pk': 'USER#user_123', 'sk': 'METADATA', 'entity_type': 'user'})
+
+        close_statement(db_client, _card_1(db_client), '2025-09')
+        close_statement(db_client, _card_1(db_client), '2025-09')
+
+        assert db_client.get_data_version('user_123') == 1
+
+    def test_card_shows_precomputed_figures(self, db_client):
+        """Test: The card carries the newest statement's figures only"""
+        close_statement(db_client, _card_1(db_client), '2025-09')
+        close_statement(db_client, _card_1(db_client), '2025-08')
+
+        card = _card_1(db_client)
+        assert card['last_statement_cycle'] == '2025-09'
+        assert card['statement_balance'] == Decimal('1350')
+        assert card['minimum_payment'] == Decimal('70.25')
+        assert card['next_payment_due'] == '2025-10-05'
+
+    def test_statement_is_immutable(self, db_client):
+        """Test: Closing a cycle twice returns the stored statement"""
+        close_statement(db_client, _card_1(db_client), '2025-09')
+        card = _card_1(db_client)
+        record_card_transaction(db_client, 'user_123', card, 'purchase', 999, 'late', '2025-09-14')
+
+        statement, created = close_statement(db_client, _card_1(db_client), '2025-09')
+
+        assert created is False
+        assert statement['purchases'] == Decimal('500')
+
+    def test_open_cycle_rejected(self, db_client):
+        """Test: A cycle is only closed after its cut-off day"""
+        with pytest.raises(ValueError):
+            close_statement(db_client, _card_1(db_client), '2025-09', today=date(2025, 9, 15))
+
+
+class TestCloseDueStatements:
+    """Tests for the daily sweep and the jobs handler"""
+
+    def test_sweeps_active_cards_with_cut_off(self, db_client):
+        """Test: Only active cards whose cut-off matches are closed, once"""
+        summary = close_due_statements(db_client, date(2025, 9, 15))
+
+        assert summary['created'] == 1 and summary['failed'] == 0
+        assert close_due_statements(db_client, date(2025, 9, 15))['existing'] == 1
+
+    def test_month_end_cut_off(self, db_client):
+        """Test: A cut-off on the 31st closes on the last day of shorter months"""
+        summary = close_due_statements(db_client, date(2025, 9, 30))
+
+        assert summary['created'] == 1
+        assert db_client.get_statement('user_123', 'card_eom', '2025-09')['cycle_end'] == '2025-09-30'
+
+    def test_jobs_handler(self, db_client):
+        """Test: The close_statements job closes one card cycle on demand"""
+        from handlers.jobs import lambda_handler
+
+        result = lambda_handler({'action': 'close_statements', 'user_id': 'user_123',
+                                 'card_id': 'card_1', 'cycle': '2025-09'}, None)
+
+        assert result['status'] == 'ok'
+        assert result['result'] == {'created': True, 'statement_balance': 1350.0, 'minimum_payment': 70.25}
+
+
+class TestStatementFields:
+    """Tests for the card response fields"""
+
+    def test_days_until_due_from_statement(self):
+        """Test: A pending statement due date drives days_until_due"""
+        due = (date.today() + timedelta(days=3)).isoformat()
+        fields = statement_fields({'next_payment_due': due, 'statement_balance': Decimal('10.5')}, 1)
+
+        assert fields['days_until_due'] == 3
+        assert fields['statement_balance'] == 10.5
+
+    def test_falls_back_to_due_day(self):
+        """Test: Without a pending statement the due day of month is used"""
+        fields = statement_fields({'next_payment_due': '2020-01-05'}, 31)
+
+        assert 0 <= fields['days_until_due'] <= 31
+        assert fields['statement_balance'] is None
@@ -0,0 +1,193 @@
+"""
+Tests for recurring payment detection
+"""
+
+import json
+import os
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import Mock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.dynamodb_client import DynamoDBClient
+from utils.subscriptions import (
+    SeriesStats,
+    detect_all_subscriptions,
+    detect_subscriptions,
+    normalize_description,
+    series_key
+)
+
+TODAY = date(2025, 10, 20)
+
+
+def _charge(client, transaction_id, on, amount, description, transaction_type='expense', account_id='acc_main'):
+    client.create_transaction({
+        'transaction_id': transaction_id, 'user_id': 'user_123', 'account_id': account_id,
+        'account_name': account_id, 'amount': -amount, 'description': description,
+        'transaction_type': transaction_type, 'category': 'other', 'status': 'completed',
+        'transaction_date': f'{on.isoformat()}T10:00:00', 'account_balance_after': 0,
+        'created_at': on.isoformat(), 'updated_at': on.isoformat()
+    })
+
+
+@pytest.fixture
+def db_client(table):
+    table.put_item(Item={
+        'pk': 'USER#user_123', 'sk': 'METADATA', 'entity_type': 'user', 'user_id': 'user_123',
+        'gsi2_pk': 'ENTITY#user', 'gsi2_sk': '2025-01-01T00:00:00#user_123'
+    })
+    table.put_item(Item={
+        'pk': 'USER#user_123', 'sk': 'ACCOUNT#acc_main', 'entity_type': 'account',
+        'gsi1_pk': 'ACCOUNT#acc_main', 'gsi1_sk': 'USER#user_123',
+        'account_id': 'acc_main', 'user_id': 'user_123', 'name': 'Main', 'currency': 'MXN',
+        'current_balance': Decimal('1000'), 'is_active': True
+    })
+    client = DynamoDBClient()
+
+    # Monthly streaming with a card suffix that changes
+    for i, on in enumerate([date(2025, 5, 3), date(2025, 6, 3), date(2025, 7, 4),
+                            date(2025, 8, 3), date(2025, 9, 2), date(2025, 10, 3)]):
+        _charge(client, f'txn_netflix_{i}', on, 219.0, f'NETFLIX.COM {1000 + i}')
+    # Weekly gym, then cancelled in August
+    for i in range(6):
+        _charge(client, f'txn_gym_{i}', date(2025, 7, 1) + timedelta(days=7 * i), 150.0, 'Gym Pass')
+    # Yearly fee
+    for i, year in enumerate((2023, 2024, 2025)):
+        _charge(client, f'txn_domain_{i}', date(year, 3, 15), 300.0, 'Domain renewal', 'fee')
+    # Same merchant, irregular dates and amounts
+    for i, (on, amount) in enumerate([(date(2025, 6, 1), 80.0), (date(2025, 6, 9), 420.0),
+                                      (date(2025, 8, 30), 95.0), (date(2025, 9, 2), 300.0)]):
+        _charge(client, f'txn_market_{i}', on, amount, 'Supermarket')
+    return client
+
+
+class TestGrouping:
+    """Tests for series keys and interval statistics"""
+
+    def test_normalized_description_and_band(self):
+        """Test: Digits and punctuation are ignored and close amounts share a band"""
+        assert normalize_description('NETFLIX.COM 8734 MX') == 'netflix com mx'
+        assert series_key('acc', 'NETFLIX.COM 1', 219.0) == series_key('acc', 'netflix com 2', 225.0)
+        assert series_key('acc', 'Netflix', 219.0) != series_key('acc', 'Netflix', 399.0)
+        assert series_key('acc', 'Netflix', 219.0) != series_key('other', 'Netflix', 219.0)
+
+    def test_interval_statistics(self):
+        """Test: Same-day charges merge and the interval mean and deviation are exact"""
+        stats = SeriesStats('x', 'acc')
+        for day, amount in ((1, 10.0), (8, 10.0), (8, 5.0), (16, 10.0)):
+            stats.add(date(2025, 1, day), amount, 'x')
+
+        assert stats.count == 3
+        assert stats.interval_mean == 7.5
+        assert stats.interval_stddev == 0.5
+        assert stats.amount_total == 35.0
+        assert stats.frequency() == 'weekly'
+
+
+class TestDetectSubscriptions:
+    """Tests for detecting and storing subscriptions"""
+
+    def test_detects_periodic_series(self, db_client):
+        """Test: Monthly, weekly and yearly charges are stored; irregular ones are not"""
+        summary = detect_subscriptions(db_client, 'user_123', today=TODAY)
+
+        assert summary['series'] == 3 + 4
+        assert summary['subscriptions'] == 3
+        subscriptions = {item['frequency']: item for item in db_client.list_subscriptions('user_123')}
+        assert set(subscriptions) == {'monthly', 'weekly', 'yearly'}
+
+        netflix = subscriptions['monthly']
+        assert netflix['description'] == 'NETFLIX.COM 1005'
+        assert netflix['occurrences'] == 6
+        assert netflix['average_amount'] == Decimal('219.0')
+        assert netflix['next_expected_date'] == '2025-11-02'
+        assert netflix['is_active'] is True
+        assert subscriptions['weekly']['is_active'] is False
+        assert subscriptions['yearly']['is_active'] is True
+
+    def test_stale_subscriptions_removed(self, db_client):
+        """Test: A series no longer detected is deleted on the next run"""
+        detect_subscriptions(db_client, 'user_123', today=TODAY)
+        db_client.table.put_item(Item={'pk': 'USER#user_123', 'sk': 'SUBSCRIPTION#gone',
+                                       'entity_type': 'subscription'})
+
+        summary = detect_subscriptions(db_client, 'user_123', today=TODAY)
+
+        assert summary['removed'] == 1
+        assert len(db_client.list_subscriptions('user_123')) == 3
+
+    def test_recurring_templates_skipped(self, db_client):
+        """Test: Occurrences of a recurring template are not reported again"""
+        for i in range(4):
+            db_client.create_transaction({
+                'transaction_id': f'txn_rent_{i}', 'user_id': 'user_123', 'account_id': 'acc_main',
+                'account_name': 'Main', 'amount': -5000, 'description': 'Rent',
+                'transaction_type': 'expense', 'category': 'other', 'status': 'completed',
+                'transaction_date': f'2025-0{5 + i}-01T09:00:00', 'account_balance_after': 0,
+                'recurring_template_id': 'txn_rent', 'created_at': '2025-05-01', 'updated_at': '2025-05-01'
+            })
+
+        assert detect_subscriptions(db_client, 'user_123', today=TODAY)['subscriptions'] == 3
+
+    def test_jobs_handler(self, db_client):
+        """Test: Without user_id every indexed user is analyzed"""
+        from handlers.jobs import lambda_handler
+
+        result = lambda_handler({'action': 'detect_subscriptions', 'date': '2025-10-20'}, None)
+
+        assert result['status'] == 'ok'
+        assert result['result'] == {'users': 1, 'subscriptions': 3, 'removed': 0, 'failed': 0}
+
+    def test_all_users_continue_after_failure(self, db_client):
+        """Test: A failing user is counted and the pass continues"""
+        with patch('utils.subscriptions.detect_subscriptions', side_effect=RuntimeError('boom')):
+            totals = detect_all_subscriptions(db_client, today=TODAY)
+
+        assert totals['failed'] == 1
+        assert totals['users'] == 0
+
+
+class TestGetSubscriptions:
+    """Tests for GET /subscriptions"""
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.dashboard.DynamoDBClient')
+    def test_list_response(self, mock_db_class, mock_validate_token):
+        """Test: Active subscriptions come first and monthly totals are per currency"""
+        from handlers.dashboard import get_subscriptions_handler
+
+        mock_validate_token.return_value = MagicMock(user_id='user_123')
+        mock_db = mock_db_class.return_value
+        mock_db.get_data_version.return_value = 1
+
+        def item(subscription_id, frequency, amount, currency='MXN', is_active=True):
+            return {
+                'subscription_id': subscription_id, 'description': subscription_id, 'account_id': 'acc_main',
+                'account_name': 'Main', 'currency': currency, 'frequency': frequency,
+                'average_amount': Decimal(str(amount)), 'last_amount': Decimal(str(amount)),
+                'occurrences': Decimal('4'), 'first_date': '2025-01-01', 'last_date': '2025-10-01',
+                'next_expected_date': '2025-11-01', 'interval_mean_days': Decimal('30.5'),
+                'interval_stddev_days': Decimal('0.5'), 'is_active': is_active,
+                'detected_at': f'2025-10-19T08:00:0{len(subscription_id) % 10}'
+            }
+
+        mock_db.list_subscriptions.return_value = [
+            item('gym', 'weekly', 150, is_active=False),
+            item('domain', 'yearly', 1200),
+            item('netflix', 'monthly', 219),
+            item('spotify', 'monthly', 10, currency='USD')
+        ]
+
+        response = get_subscriptions_handler({'headers': {'Authorization': 'Bearer valid_token'}}, Mock())
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert [sub['subscription_id'] for sub in body['subscriptions']] == ['netflix', 'domain', 'spotify', 'gym']
+        assert body['monthly_totals'] == {'MXN': 319.0, 'USD': 10.0}
+        assert body['total_count'] == 4
+        assert body['analyzed_at'] == '2025-10-19T08:00:07'
@@ -370,6 +370,30 @@ class TestDynamoDBTransactionOperations:
         
         assert len(result) == 1
     
+    @patch('utils.dynamodb_client.boto3.resource')
+    def test_list_user_transactions_with_projection(self, mock_boto_resource):
+        """Test projection pushdown includes attributes needed by filters"""
+        mock_table = Mock()
+        mock_boto_resource.return_value.Table.return_value = mock_table
+        mock_table.query.return_value = {
+            'Items': [{'user_id': self.test_user_id, 'amount': Decimal('250.75'), 'status': 'completed'}]
+        }
+        
+        client = DynamoDBClient()
+        result = client.list_user_transactions(
+            self.test_user_id,
+            {'account_id': self.test_account_id, 'status': 'completed'},
+            projection=['amount']
+        )
+        
+        call_args = mock_table.query.call_args[1]
+        names = call_args['ExpressionAttributeNames']
+        assert call_args['ProjectionExpression'] == ', '.join(names.keys())
+        assert set(names.values()) == {'amount', 'status', 'user_id'}
+        
+        # Missing account_balance_after is tolerated
+        assert result == [{'user_id': self.test_user_id, 'amount': 250.75, 'status': 'completed'}]
+    
     def test_filter_transactions_by_type(self):
         """Test transaction filtering by type"""
         transactions = [
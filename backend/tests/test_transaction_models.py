@@ -366,6 +366,18 @@ class TestTransactionFilter:
         error = exc_info.value.errors()[0]
         assert 'date_from' in str(error)
         assert 'ISO format' in str(error)
+    
+    def test_fields_from_query_string(self):
+        """Test sparse fieldset parsed from comma separated value"""
+        filter_obj = TransactionFilter(fields='transaction_date, description,amount,amount')
+        assert filter_obj.fields == ['transaction_date', 'description', 'amount']
+    
+    def test_invalid_fields(self):
+        """Test sparse fieldset rejects unknown fields"""
+        with pytest.raises(ValidationError) as exc_info:
+            TransactionFilter(fields='amount,password_hash')
+        
+        assert 'Invalid fields: password_hash' in str(exc_info.value)
 
 
 class TestTransactionResponse:
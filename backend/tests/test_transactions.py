@@ -17,7 +17,9 @@ from handlers.transactions import (
     delete_transaction_handler,
     get_transaction_summary_handler,
     lambda_handler,
-    generate_transaction_id
+    generate_transaction_id,
+    bucket_by_period,
+    summary_period_bounds
 )
 from utils.jwt_auth import TokenPayload
 
@@ -349,6 +351,85 @@ class TestTransactionHandlers:
         assert filters['amount_min'] == 10.0
         assert filters['search_term'] == 'grocery'
     
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.transactions.DynamoDBClient')
+    def test_list_transactions_sparse_fields(self, mock_db_client, mock_validate_token):
+        """Test transaction listing with a sparse fieldset"""
+        mock_validate_token.return_value = self.mock_user_data
+        
+        mock_db = mock_db_client.return_value
+        mock_db.list_user_transactions.return_value = [{
+            'transaction_date': '2024-01-15T10:30:00',
+            'description': 'Grocery shopping',
+            'amount': 250.75,
+            'transaction_type': 'expense'
+        }]
+        
+        base_event = {
+            'httpMethod': 'GET',
+            'path': '/transactions',
+            'queryStringParameters': {'fields': 'transaction_date,description,amount'}
+        }
+        event = self._create_event_with_auth(base_event)
+        
+        response = list_transactions_handler(event, self.mock_context)
+        
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['transactions'] == [{
+            'transaction_date': '2024-01-15T10:30:00',
+            'description': 'Grocery shopping',
+            'amount': 250.75
+        }]
+        assert body['total_expenses'] == 250.75
+        
+        projection = mock_db.list_user_transactions.call_args[1]['projection']
+        assert set(projection) == {'transaction_date', 'description', 'amount', 'transaction_type'}
+    
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.transactions.DynamoDBClient')
+    def test_list_transactions_sparse_fields_missing_key(self, mock_db_client, mock_validate_token):
+        """Test sparse fieldsets return null for keys missing from the item, required ones included"""
+        mock_validate_token.return_value = self.mock_user_data
+        
+        mock_db = mock_db_client.return_value
+        mock_db.list_user_transactions.return_value = [{
+            'transaction_date': '2024-01-15T10:30:00',
+            'amount': -80.0,
+            'transaction_type': 'expense'
+        }]
+        
+        base_event = {
+            'httpMethod': 'GET',
+            'path': '/transactions',
+            'queryStringParameters': {'fields': 'amount,category,notes'}
+        }
+        event = self._create_event_with_auth(base_event)
+        
+        response = list_transactions_handler(event, self.mock_context)
+        
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['transactions'] == [{'amount': -80.0, 'category': None, 'notes': None}]
+    
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.transactions.DynamoDBClient')
+    def test_list_transactions_invalid_fields(self, mock_db_client, mock_validate_token):
+        """Test transaction listing rejects unknown fields"""
+        mock_validate_token.return_value = self.mock_user_data
+        
+        base_event = {
+            'httpMethod': 'GET',
+            'path': '/transactions',
+            'queryStringParameters': {'fields': 'amount,pk'}
+        }
+        event = self._create_event_with_auth(base_event)
+        
+        response = list_transactions_handler(event, self.mock_context)
+        
+        assert response['statusCode'] == 400
+        mock_db_client.return_value.list_user_transactions.assert_not_called()
+    
     @patch('utils.jwt_auth.validate_token_from_event')
     @patch('handlers.transactions.DynamoDBClient')
     def test_get_transaction_success(self, mock_db_client, mock_validate_token):
@@ -583,6 +664,72 @@ class TestTransactionHandlers:
         assert filters['date_from'] == '2024-01-01T00:00:00'
         assert filters['date_to'] == '2024-01-31T23:59:59'
 
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.transactions.DynamoDBClient')
+    def test_get_transaction_summary_multiple_periods(self, mock_db_client, mock_validate_token):
+        """Test summary of several periods bucketed from a single read"""
+        mock_validate_token.return_value = self.mock_user_data
+
+        transactions = []
+        for transaction_date, amount in (('2023-10-05T09:00:00', -100.0), ('2023-11-02T09:00:00', -40.0),
+                                         ('2024-09-30T23:59:59', -30.0), ('2024-10-01', 500.0),
+                                         ('2024-10-31T18:00:00', -60.0)):
+            transaction = self.sample_db_transaction.copy()
+            transaction.update({'transaction_date': transaction_date, 'amount': amount})
+            transactions.append(transaction)
+
+        mock_db = mock_db_client.return_value
+        mock_db.list_user_transactions.return_value = transactions
+
+        base_event = {
+            'httpMethod': 'GET',
+            'path': '/transactions/summary',
+            'queryStringParameters': {'periods': '2024-10,2024-09,2023-10,2024,2024-10'}
+        }
+        event = self._create_event_with_auth(base_event)
+
+        response = get_transaction_summary_handler(event, self.mock_context)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['periods'] == ['2024-10', '2024-09', '2023-10', '2024']
+        assert [s['transaction_count'] for s in body['summaries']] == [2, 1, 1, 3]
+        assert body['summaries'][0]['total_income'] == 500.0
+        assert body['summaries'][0]['total_expenses'] == 60.0
+        assert body['summaries'][3]['net_amount'] == 410.0
+
+        # One read covering every period
+        mock_db.list_user_transactions.assert_called_once()
+        filters = mock_db.list_user_transactions.call_args[0][1]
+        assert filters == {'date_from': '2023-10-01', 'date_to': '2025-01-01'}
+
+    def test_rolling_window_includes_first_day(self):
+        """Test rolling windows run from midnight N days ago through today"""
+        bounds = {'last_7_days': summary_period_bounds('last_7_days', datetime(2025, 10, 15, 18, 30))}
+        transactions = [{'transaction_date': day} for day in
+                        ('2025-10-07T23:00:00', '2025-10-08T08:00:00', '2025-10-15', '2025-10-16T00:00:00')]
+
+        assert bounds['last_7_days'] == ('2025-10-08', '2025-10-16')
+        assert bucket_by_period(transactions, bounds)['last_7_days'] == transactions[1:3]
+
+    @patch('utils.jwt_auth.validate_token_from_event')
+    @patch('handlers.transactions.DynamoDBClient')
+    def test_get_transaction_summary_invalid_periods(self, mock_db_client, mock_validate_token):
+        """Test malformed or too many periods are rejected"""
+        mock_validate_token.return_value = self.mock_user_data
+
+        too_many = ','.join(f'2024-{m:02d}' for m in range(1, 13)) + ',2023'
+        for periods in ('2024-13', 'last_0_days', 'last_999999999_days', 'yesterday', too_many):
+            base_event = {
+                'httpMethod': 'GET',
+                'path': '/transactions/summary',
+                'queryStringParameters': {'periods': periods}
+            }
+            response = get_transaction_summary_handler(self._create_event_with_auth(base_event), self.mock_context)
+
+            assert response['statusCode'] == 400
+        mock_db_client.return_value.list_user_transactions.assert_not_called()
+
 
 class TestLambdaHandler:
     
@@ -164,6 +164,32 @@ class TestAuthenticatedEndpoints:
         mock_db.get_user_by_id.assert_called_with(self.user_id)
         mock_db.update_user.assert_called_once()
     
+    @patch('handlers.users.revoke_user_tokens')
+    @patch('handlers.users.db_client')
+    def test_password_change_revokes_tokens(self, mock_db, mock_revoke):
+        """Test changing the password revokes the user's earlier tokens; other updates do not"""
+        from models.user import hash_password
+        
+        mock_db.get_user_by_id.return_value = {**self.user_data,
+                                               'password_hash': hash_password('OldPassword123!', rounds=4)}
+        mock_db.update_user.return_value = self.user_data
+        
+        for body, revoked in (({'name': 'Updated Name'}, False),
+                              ({'current_password': 'OldPassword123!', 'new_password': 'NewPassword456!',
+                               'confirm_new_password': 'NewPassword456!'}, True)):
+            event = self.create_authenticated_event(
+                method='PUT',
+                path=f'/users/{self.user_id}',
+                path_params={'user_id': self.user_id},
+                body=body
+            )
+            
+            response = lambda_handler(event, None)
+            
+            assert response['statusCode'] == 200
+            assert mock_revoke.called is revoked
+        mock_revoke.assert_called_once_with(self.user_id)
+    
     @patch('handlers.users.db_client')
     def test_update_user_wrong_user_returns_403(self, mock_db):
         """Test updating another user's data returns 403"""
@@ -203,6 +229,24 @@ class TestAuthenticatedEndpoints:
         mock_db.get_user_by_id.assert_called_with(self.user_id)
         mock_db.delete_user.assert_called_once()
     
+    @patch('handlers.users.schedule_cascade')
+    @patch('handlers.users.db_client')
+    def test_delete_user_schedules_cascade(self, mock_db, mock_schedule):
+        """Test deleting a user queues the partition cascade; failures do not fail the request"""
+        mock_db.get_user_by_id.return_value = self.user_data
+        mock_schedule.side_effect = Exception("Lambda unavailable")
+        
+        event = self.create_authenticated_event(
+            method='DELETE',
+            path=f'/users/{self.user_id}',
+            path_params={'user_id': self.user_id}
+        )
+        
+        response = lambda_handler(event, None)
+        
+        assert response['statusCode'] == 200
+        mock_schedule.assert_called_once_with('user', self.user_id)
+    
     @patch('handlers.users.db_client')
     def test_delete_user_wrong_user_returns_403(self, mock_db):
         """Test deleting another user's account returns 403"""
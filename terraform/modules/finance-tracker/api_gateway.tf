@@ -150,10 +150,89 @@ resource "aws_api_gateway_resource" "cards_card_id_payment" {
   path_part   = "payment"
 }
 
+# Recurso /dashboard
+resource "aws_api_gateway_resource" "dashboard" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "dashboard"
+}
+
+# Recurso /subscriptions
+resource "aws_api_gateway_resource" "subscriptions" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "subscriptions"
+}
+
+# Recurso /forecast
+resource "aws_api_gateway_resource" "forecast" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "forecast"
+}
+
+# Recurso /budgets
+resource "aws_api_gateway_resource" "budgets" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "budgets"
+}
+
+# Recurso /budgets/{category} para operaciones por categoría
+resource "aws_api_gateway_resource" "budgets_category" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_resource.budgets.id
+  path_part   = "{category}"
+}
+
+# Recurso /net-worth
+resource "aws_api_gateway_resource" "net_worth" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "net-worth"
+}
+
+# Recurso /spending
+resource "aws_api_gateway_resource" "spending" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "spending"
+}
+
+# Recurso /alerts
+resource "aws_api_gateway_resource" "alerts" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  parent_id   = aws_api_gateway_rest_api.finance_tracker_api.root_resource_id
+  path_part   = "alerts"
+}
+
 # -----------------------------------------------------------------------------
 # API Gateway Methods y Integraciones
 # -----------------------------------------------------------------------------
 
+# Lambda destino de cada recurso: una por módulo o la función única (handlers.app)
+locals {
+  api_invoke_arns = var.single_function_mode ? {
+    health       = aws_lambda_function.api[0].invoke_arn
+    users        = aws_lambda_function.api[0].invoke_arn
+    transactions = aws_lambda_function.api[0].invoke_arn
+    auth         = aws_lambda_function.api[0].invoke_arn
+    accounts     = aws_lambda_function.api[0].invoke_arn
+    cards        = aws_lambda_function.api[0].invoke_arn
+    dashboard    = aws_lambda_function.api[0].invoke_arn
+    budgets      = aws_lambda_function.api[0].invoke_arn
+  } : {
+    health       = aws_lambda_function.health.invoke_arn
+    users        = aws_lambda_function.users.invoke_arn
+    transactions = aws_lambda_function.transactions.invoke_arn
+    auth         = aws_lambda_function.auth.invoke_arn
+    accounts     = aws_lambda_function.accounts.invoke_arn
+    cards        = aws_lambda_function.cards.invoke_arn
+    dashboard    = aws_lambda_function.dashboard.invoke_arn
+    budgets      = aws_lambda_function.budgets.invoke_arn
+  }
+}
+
 # Health Check - GET /health
 resource "aws_api_gateway_method" "health_get" {
   rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
@@ -169,7 +248,7 @@ resource "aws_api_gateway_integration" "health_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.health.invoke_arn
+  uri                     = local.api_invoke_arns["health"]
 }
 
 # Users - GET /users (solo GET, POST movido a auth)
@@ -187,7 +266,7 @@ resource "aws_api_gateway_integration" "users_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.users.invoke_arn
+  uri                     = local.api_invoke_arns["users"]
 }
 
 # Users by ID - GET /users/{user_id}
@@ -205,7 +284,7 @@ resource "aws_api_gateway_integration" "users_user_id_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.users.invoke_arn
+  uri                     = local.api_invoke_arns["users"]
 }
 
 # Users by ID - PUT /users/{user_id}
@@ -223,7 +302,7 @@ resource "aws_api_gateway_integration" "users_user_id_put_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.users.invoke_arn
+  uri                     = local.api_invoke_arns["users"]
 }
 
 # Users by ID - DELETE /users/{user_id}
@@ -241,7 +320,7 @@ resource "aws_api_gateway_integration" "users_user_id_delete_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.users.invoke_arn
+  uri                     = local.api_invoke_arns["users"]
 }
 
 # Transactions - GET/POST /transactions  
@@ -266,7 +345,7 @@ resource "aws_api_gateway_integration" "transactions_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.transactions.invoke_arn
+  uri                     = local.api_invoke_arns["transactions"]
 }
 
 resource "aws_api_gateway_integration" "transactions_post_integration" {
@@ -276,7 +355,7 @@ resource "aws_api_gateway_integration" "transactions_post_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.transactions.invoke_arn
+  uri                     = local.api_invoke_arns["transactions"]
 }
 
 # Transactions by ID - GET/PUT/DELETE /transactions/{transaction_id}
@@ -308,7 +387,7 @@ resource "aws_api_gateway_integration" "transactions_by_id_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.transactions.invoke_arn
+  uri                     = local.api_invoke_arns["transactions"]
 }
 
 resource "aws_api_gateway_integration" "transactions_by_id_put_integration" {
@@ -318,7 +397,7 @@ resource "aws_api_gateway_integration" "transactions_by_id_put_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.transactions.invoke_arn
+  uri                     = local.api_invoke_arns["transactions"]
 }
 
 resource "aws_api_gateway_integration" "transactions_by_id_delete_integration" {
@@ -328,7 +407,7 @@ resource "aws_api_gateway_integration" "transactions_by_id_delete_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.transactions.invoke_arn
+  uri                     = local.api_invoke_arns["transactions"]
 }
 
 # Transactions Summary - GET /transactions/summary
@@ -346,7 +425,7 @@ resource "aws_api_gateway_integration" "transactions_summary_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.transactions.invoke_arn
+  uri                     = local.api_invoke_arns["transactions"]
 }
 
 # Categories - GET/POST /categories
@@ -399,7 +478,7 @@ resource "aws_api_gateway_integration" "auth_login_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.auth.invoke_arn
+  uri                     = local.api_invoke_arns["auth"]
 }
 
 # Auth Register - POST /auth/register
@@ -417,7 +496,7 @@ resource "aws_api_gateway_integration" "auth_register_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.auth.invoke_arn
+  uri                     = local.api_invoke_arns["auth"]
 }
 
 # Auth Refresh - POST /auth/refresh
@@ -435,7 +514,7 @@ resource "aws_api_gateway_integration" "auth_refresh_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.auth.invoke_arn
+  uri                     = local.api_invoke_arns["auth"]
 }
 
 # -----------------------------------------------------------------------------
@@ -645,7 +724,7 @@ resource "aws_api_gateway_integration" "accounts_post_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.accounts.invoke_arn
+  uri                     = local.api_invoke_arns["accounts"]
 }
 
 # Accounts - GET /accounts (List accounts)
@@ -663,7 +742,7 @@ resource "aws_api_gateway_integration" "accounts_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.accounts.invoke_arn
+  uri                     = local.api_invoke_arns["accounts"]
 }
 
 # Account by ID - GET /accounts/{account_id}
@@ -681,7 +760,7 @@ resource "aws_api_gateway_integration" "accounts_account_id_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.accounts.invoke_arn
+  uri                     = local.api_invoke_arns["accounts"]
 }
 
 # Account by ID - PUT /accounts/{account_id} (Update account)
@@ -699,7 +778,7 @@ resource "aws_api_gateway_integration" "accounts_account_id_put_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.accounts.invoke_arn
+  uri                     = local.api_invoke_arns["accounts"]
 }
 
 # Account by ID - DELETE /accounts/{account_id} (Delete account)
@@ -717,7 +796,7 @@ resource "aws_api_gateway_integration" "accounts_account_id_delete_integration"
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.accounts.invoke_arn
+  uri                     = local.api_invoke_arns["accounts"]
 }
 
 # Account Balance - PATCH /accounts/{account_id}/balance (Update balance)
@@ -735,7 +814,7 @@ resource "aws_api_gateway_integration" "accounts_account_id_balance_patch_integr
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.accounts.invoke_arn
+  uri                     = local.api_invoke_arns["accounts"]
 }
 
 # -----------------------------------------------------------------------------
@@ -896,7 +975,7 @@ resource "aws_api_gateway_integration" "cards_post_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # Cards - GET /cards (List cards)
@@ -914,7 +993,7 @@ resource "aws_api_gateway_integration" "cards_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # Card by ID - GET /cards/{card_id}
@@ -932,7 +1011,7 @@ resource "aws_api_gateway_integration" "cards_card_id_get_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # Card by ID - PUT /cards/{card_id} (Update card)
@@ -950,7 +1029,7 @@ resource "aws_api_gateway_integration" "cards_card_id_put_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # Card by ID - DELETE /cards/{card_id} (Delete card)
@@ -968,7 +1047,7 @@ resource "aws_api_gateway_integration" "cards_card_id_delete_integration" {
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # Card Transactions - POST /cards/{card_id}/transactions (Add transaction)
@@ -986,7 +1065,25 @@ resource "aws_api_gateway_integration" "cards_card_id_transactions_post_integrat
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
+}
+
+# Card Transactions - GET /cards/{card_id}/transactions (Transactions of a billing cycle)
+resource "aws_api_gateway_method" "cards_card_id_transactions_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.cards_card_id_transactions.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "cards_card_id_transactions_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.cards_card_id_transactions.id
+  http_method = aws_api_gateway_method.cards_card_id_transactions_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # Card Payment - POST /cards/{card_id}/payment (Make payment)
@@ -1004,7 +1101,7 @@ resource "aws_api_gateway_integration" "cards_card_id_payment_post_integration"
 
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
-  uri                     = aws_lambda_function.cards.invoke_arn
+  uri                     = local.api_invoke_arns["cards"]
 }
 
 # -----------------------------------------------------------------------------
@@ -1141,7 +1238,7 @@ resource "aws_api_gateway_integration_response" "cards_card_id_transactions_opti
 
   response_parameters = {
     "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
-    "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,POST,OPTIONS'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
 }
@@ -1326,6 +1423,572 @@ resource "aws_api_gateway_integration_response" "transactions_summary_options" {
   }
 }
 
+# -----------------------------------------------------------------------------
+# Dashboard Endpoints
+# -----------------------------------------------------------------------------
+
+# Dashboard - GET /dashboard (cuentas, tarjetas, transacciones recientes y resumen del mes)
+resource "aws_api_gateway_method" "dashboard_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.dashboard.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "dashboard_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.dashboard.id
+  http_method = aws_api_gateway_method.dashboard_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["dashboard"]
+}
+
+# CORS Options for Dashboard - /dashboard
+resource "aws_api_gateway_method" "dashboard_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.dashboard.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "dashboard_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.dashboard.id
+  http_method = aws_api_gateway_method.dashboard_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "dashboard_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.dashboard.id
+  http_method = aws_api_gateway_method.dashboard_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "dashboard_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.dashboard.id
+  http_method = aws_api_gateway_method.dashboard_options.http_method
+  status_code = aws_api_gateway_method_response.dashboard_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Subscriptions - GET /subscriptions (pagos recurrentes detectados)
+resource "aws_api_gateway_method" "subscriptions_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.subscriptions.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "subscriptions_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.subscriptions.id
+  http_method = aws_api_gateway_method.subscriptions_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["dashboard"]
+}
+
+# CORS Options for Subscriptions - /subscriptions
+resource "aws_api_gateway_method" "subscriptions_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.subscriptions.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "subscriptions_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.subscriptions.id
+  http_method = aws_api_gateway_method.subscriptions_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "subscriptions_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.subscriptions.id
+  http_method = aws_api_gateway_method.subscriptions_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "subscriptions_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.subscriptions.id
+  http_method = aws_api_gateway_method.subscriptions_options.http_method
+  status_code = aws_api_gateway_method_response.subscriptions_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Forecast - GET /forecast (proyección diaria de saldos)
+resource "aws_api_gateway_method" "forecast_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.forecast.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "forecast_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.forecast.id
+  http_method = aws_api_gateway_method.forecast_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["dashboard"]
+}
+
+# CORS Options for Forecast - /forecast
+resource "aws_api_gateway_method" "forecast_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.forecast.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "forecast_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.forecast.id
+  http_method = aws_api_gateway_method.forecast_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "forecast_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.forecast.id
+  http_method = aws_api_gateway_method.forecast_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "forecast_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.forecast.id
+  http_method = aws_api_gateway_method.forecast_options.http_method
+  status_code = aws_api_gateway_method_response.forecast_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# -----------------------------------------------------------------------------
+# Budgets Endpoints
+# -----------------------------------------------------------------------------
+
+# Budgets - POST /budgets (crear presupuesto por categoría)
+resource "aws_api_gateway_method" "budgets_post" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets.id
+  http_method   = "POST"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "budgets_post_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets.id
+  http_method = aws_api_gateway_method.budgets_post.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["budgets"]
+}
+
+# Budgets - GET /budgets (presupuestos con gasto del mes)
+resource "aws_api_gateway_method" "budgets_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "budgets_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets.id
+  http_method = aws_api_gateway_method.budgets_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["budgets"]
+}
+
+# CORS Options for Budgets - /budgets
+resource "aws_api_gateway_method" "budgets_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "budgets_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets.id
+  http_method = aws_api_gateway_method.budgets_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "budgets_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets.id
+  http_method = aws_api_gateway_method.budgets_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "budgets_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets.id
+  http_method = aws_api_gateway_method.budgets_options.http_method
+  status_code = aws_api_gateway_method_response.budgets_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'POST,GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Budget by Category - GET /budgets/{category}
+resource "aws_api_gateway_method" "budgets_category_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets_category.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "budgets_category_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets_category.id
+  http_method = aws_api_gateway_method.budgets_category_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["budgets"]
+}
+
+# Budget by Category - PUT /budgets/{category} (límite o umbral de alerta)
+resource "aws_api_gateway_method" "budgets_category_put" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets_category.id
+  http_method   = "PUT"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "budgets_category_put_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets_category.id
+  http_method = aws_api_gateway_method.budgets_category_put.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["budgets"]
+}
+
+# Budget by Category - DELETE /budgets/{category}
+resource "aws_api_gateway_method" "budgets_category_delete" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets_category.id
+  http_method   = "DELETE"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "budgets_category_delete_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets_category.id
+  http_method = aws_api_gateway_method.budgets_category_delete.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["budgets"]
+}
+
+# CORS Options for Budget by Category - /budgets/{category}
+resource "aws_api_gateway_method" "budgets_category_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.budgets_category.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "budgets_category_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets_category.id
+  http_method = aws_api_gateway_method.budgets_category_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "budgets_category_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets_category.id
+  http_method = aws_api_gateway_method.budgets_category_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "budgets_category_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.budgets_category.id
+  http_method = aws_api_gateway_method.budgets_category_options.http_method
+  status_code = aws_api_gateway_method_response.budgets_category_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,PUT,DELETE,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Net worth - GET /net-worth (historial diario de patrimonio neto)
+resource "aws_api_gateway_method" "net_worth_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.net_worth.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "net_worth_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.net_worth.id
+  http_method = aws_api_gateway_method.net_worth_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["dashboard"]
+}
+
+# CORS Options for Net Worth - /net-worth
+resource "aws_api_gateway_method" "net_worth_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.net_worth.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "net_worth_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.net_worth.id
+  http_method = aws_api_gateway_method.net_worth_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "net_worth_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.net_worth.id
+  http_method = aws_api_gateway_method.net_worth_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "net_worth_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.net_worth.id
+  http_method = aws_api_gateway_method.net_worth_options.http_method
+  status_code = aws_api_gateway_method_response.net_worth_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Spending - GET /spending (distribución de montos por categoría)
+resource "aws_api_gateway_method" "spending_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.spending.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "spending_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.spending.id
+  http_method = aws_api_gateway_method.spending_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["dashboard"]
+}
+
+# CORS Options for Spending - /spending
+resource "aws_api_gateway_method" "spending_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.spending.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "spending_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.spending.id
+  http_method = aws_api_gateway_method.spending_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "spending_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.spending.id
+  http_method = aws_api_gateway_method.spending_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "spending_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.spending.id
+  http_method = aws_api_gateway_method.spending_options.http_method
+  status_code = aws_api_gateway_method_response.spending_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# transacciones marcadas como inusuales
+resource "aws_api_gateway_method" "alerts_get" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.alerts.id
+  http_method   = "GET"
+  authorization = "NONE" # JWT handled by Lambda function
+}
+
+resource "aws_api_gateway_integration" "alerts_get_integration" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.alerts.id
+  http_method = aws_api_gateway_method.alerts_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = local.api_invoke_arns["dashboard"]
+}
+
+# CORS Options for Alerts - /alerts
+resource "aws_api_gateway_method" "alerts_options" {
+  rest_api_id   = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id   = aws_api_gateway_resource.alerts.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "alerts_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.alerts.id
+  http_method = aws_api_gateway_method.alerts_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{ \"statusCode\": 200 }"
+  }
+}
+
+resource "aws_api_gateway_method_response" "alerts_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.alerts.id
+  http_method = aws_api_gateway_method.alerts_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "alerts_options" {
+  rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
+  resource_id = aws_api_gateway_resource.alerts.id
+  http_method = aws_api_gateway_method.alerts_options.http_method
+  status_code = aws_api_gateway_method_response.alerts_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Requested-With'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
 # -----------------------------------------------------------------------------
 # Lambda Permissions for API Gateway
 # -----------------------------------------------------------------------------
@@ -1386,6 +2049,32 @@ resource "aws_lambda_permission" "api_gateway_cards" {
   source_arn    = "${aws_api_gateway_rest_api.finance_tracker_api.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "api_gateway_budgets" {
+  statement_id  = "AllowExecutionFromAPIGateway-Budgets"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.budgets.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.finance_tracker_api.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "api_gateway_dashboard" {
+  statement_id  = "AllowExecutionFromAPIGateway-Dashboard"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.dashboard.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.finance_tracker_api.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "api_gateway_api" {
+  count = var.single_function_mode ? 1 : 0
+
+  statement_id  = "AllowExecutionFromAPIGateway-Api"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.api[0].function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.finance_tracker_api.execution_arn}/*/*"
+}
+
 # -----------------------------------------------------------------------------
 # API Gateway Deployment
 # -----------------------------------------------------------------------------
@@ -1420,7 +2109,19 @@ resource "aws_api_gateway_deployment" "finance_tracker_deployment" {
     aws_api_gateway_integration.cards_card_id_put_integration,
     aws_api_gateway_integration.cards_card_id_delete_integration,
     aws_api_gateway_integration.cards_card_id_transactions_post_integration,
+    aws_api_gateway_integration.cards_card_id_transactions_get_integration,
     aws_api_gateway_integration.cards_card_id_payment_post_integration,
+    aws_api_gateway_integration.dashboard_get_integration,
+    aws_api_gateway_integration.subscriptions_get_integration,
+    aws_api_gateway_integration.forecast_get_integration,
+    aws_api_gateway_integration.budgets_post_integration,
+    aws_api_gateway_integration.budgets_get_integration,
+    aws_api_gateway_integration.budgets_category_get_integration,
+    aws_api_gateway_integration.budgets_category_put_integration,
+    aws_api_gateway_integration.budgets_category_delete_integration,
+    aws_api_gateway_integration.net_worth_get_integration,
+    aws_api_gateway_integration.spending_get_integration,
+    aws_api_gateway_integration.alerts_get_integration,
     # CORS OPTIONS integrations
     aws_api_gateway_integration.users_user_id_options,
     aws_api_gateway_integration.accounts_options,
@@ -1433,6 +2134,14 @@ resource "aws_api_gateway_deployment" "finance_tracker_deployment" {
     aws_api_gateway_integration.cards_card_id_options,
     aws_api_gateway_integration.cards_card_id_transactions_options,
     aws_api_gateway_integration.cards_card_id_payment_options,
+    aws_api_gateway_integration.dashboard_options,
+    aws_api_gateway_integration.subscriptions_options,
+    aws_api_gateway_integration.forecast_options,
+    aws_api_gateway_integration.budgets_options,
+    aws_api_gateway_integration.budgets_category_options,
+    aws_api_gateway_integration.net_worth_options,
+    aws_api_gateway_integration.spending_options,
+    aws_api_gateway_integration.alerts_options,
   ]
 
   rest_api_id = aws_api_gateway_rest_api.finance_tracker_api.id
@@ -1457,6 +2166,14 @@ resource "aws_api_gateway_deployment" "finance_tracker_deployment" {
       aws_api_gateway_resource.cards_card_id.id,
       aws_api_gateway_resource.cards_card_id_transactions.id,
       aws_api_gateway_resource.cards_card_id_payment.id,
+      aws_api_gateway_resource.dashboard.id,
+      aws_api_gateway_resource.subscriptions.id,
+      aws_api_gateway_resource.forecast.id,
+      aws_api_gateway_resource.budgets.id,
+      aws_api_gateway_resource.budgets_category.id,
+      aws_api_gateway_resource.net_worth.id,
+      aws_api_gateway_resource.spending.id,
+      aws_api_gateway_resource.alerts.id,
       aws_api_gateway_method.health_get.id,
       aws_api_gateway_method.users_get.id,
       aws_api_gateway_method.users_user_id_get.id,
@@ -1492,11 +2209,31 @@ resource "aws_api_gateway_deployment" "finance_tracker_deployment" {
       aws_api_gateway_method.cards_card_id_put.id,
       aws_api_gateway_method.cards_card_id_delete.id,
       aws_api_gateway_method.cards_card_id_transactions_post.id,
+      aws_api_gateway_method.cards_card_id_transactions_get.id,
       aws_api_gateway_method.cards_card_id_payment_post.id,
       aws_api_gateway_method.cards_options.id,
       aws_api_gateway_method.cards_card_id_options.id,
       aws_api_gateway_method.cards_card_id_transactions_options.id,
       aws_api_gateway_method.cards_card_id_payment_options.id,
+      aws_api_gateway_method.dashboard_get.id,
+      aws_api_gateway_method.dashboard_options.id,
+      aws_api_gateway_method.subscriptions_get.id,
+      aws_api_gateway_method.subscriptions_options.id,
+      aws_api_gateway_method.forecast_get.id,
+      aws_api_gateway_method.forecast_options.id,
+      aws_api_gateway_method.budgets_post.id,
+      aws_api_gateway_method.budgets_get.id,
+      aws_api_gateway_method.budgets_options.id,
+      aws_api_gateway_method.budgets_category_get.id,
+      aws_api_gateway_method.budgets_category_put.id,
+      aws_api_gateway_method.budgets_category_delete.id,
+      aws_api_gateway_method.budgets_category_options.id,
+      aws_api_gateway_method.net_worth_get.id,
+      aws_api_gateway_method.net_worth_options.id,
+      aws_api_gateway_method.spending_get.id,
+      aws_api_gateway_method.spending_options.id,
+      aws_api_gateway_method.alerts_get.id,
+      aws_api_gateway_method.alerts_options.id,
       aws_api_gateway_integration.health_integration.id,
       aws_api_gateway_integration.users_get_integration.id,
       aws_api_gateway_integration.users_user_id_get_integration.id,
@@ -1535,11 +2272,32 @@ resource "aws_api_gateway_deployment" "finance_tracker_deployment" {
       aws_api_gateway_integration.cards_card_id_put_integration.id,
       aws_api_gateway_integration.cards_card_id_delete_integration.id,
       aws_api_gateway_integration.cards_card_id_transactions_post_integration.id,
+      aws_api_gateway_integration.cards_card_id_transactions_get_integration.id,
       aws_api_gateway_integration.cards_card_id_payment_post_integration.id,
       aws_api_gateway_integration.cards_options.id,
       aws_api_gateway_integration.cards_card_id_options.id,
       aws_api_gateway_integration.cards_card_id_transactions_options.id,
       aws_api_gateway_integration.cards_card_id_payment_options.id,
+      aws_api_gateway_integration.dashboard_get_integration.id,
+      aws_api_gateway_integration.dashboard_options.id,
+      aws_api_gateway_integration.subscriptions_get_integration.id,
+      aws_api_gateway_integration.subscriptions_options.id,
+      aws_api_gateway_integration.forecast_get_integration.id,
+      aws_api_gateway_integration.forecast_options.id,
+      aws_api_gateway_integration.budgets_post_integration.id,
+      aws_api_gateway_integration.budgets_get_integration.id,
+      aws_api_gateway_integration.budgets_options.id,
+      aws_api_gateway_integration.budgets_category_get_integration.id,
+      aws_api_gateway_integration.budgets_category_put_integration.id,
+      aws_api_gateway_integration.budgets_category_delete_integration.id,
+      aws_api_gateway_integration.budgets_category_options.id,
+      aws_api_gateway_integration.net_worth_get_integration.id,
+      aws_api_gateway_integration.net_worth_options.id,
+      aws_api_gateway_integration.spending_get_integration.id,
+      aws_api_gateway_integration.spending_options.id,
+      aws_api_gateway_integration.alerts_get_integration.id,
+      aws_api_gateway_integration.alerts_options.id,
+      values(local.api_invoke_arns),
     ]))
   }
 
@@ -47,6 +47,17 @@ resource "aws_dynamodb_table" "main" {
     type = "S"
   }
 
+  # Atributos para GSI3 (índice disperso de fechas de pago y alertas)
+  attribute {
+    name = "gsi3_pk"
+    type = "S"
+  }
+
+  attribute {
+    name = "gsi3_sk"
+    type = "S"
+  }
+
   # Capacidad para tabla principal
   read_capacity  = var.dynamodb_billing_mode == "PROVISIONED" ? var.dynamodb_read_capacity : null
   write_capacity = var.dynamodb_billing_mode == "PROVISIONED" ? var.dynamodb_write_capacity : null
@@ -66,6 +77,9 @@ resource "aws_dynamodb_table" "main" {
 
   # GSI2 - Para búsquedas por fecha, tipo, categoría
   # Ejemplo: USER#{user_id}#DATE -> {timestamp}
+  # Índice disperso de usuarios activos: ENTITY#user -> USER#{created_at}#{user_id}
+  # Índice disperso de tarjetas activas por día de corte: CUTOFF#{dd} -> CARD#{card_id}
+  # Índice disperso de transacciones recurrentes: RECUR#{next_run_date} -> USER#{user_id}#TRANSACTION#{id}
   global_secondary_index {
     name     = "GSI2"
     hash_key = "gsi2_pk"
@@ -77,6 +91,19 @@ resource "aws_dynamodb_table" "main" {
     projection_type = "ALL"
   }
 
+  # GSI3 - Índice disperso de tarjetas activas por día de pago (DUE#) y de transacciones inusuales (ALERT#)
+  # Ejemplo: DUE#{dd} -> CARD#{card_id} (recordatorios de pago)
+  global_secondary_index {
+    name     = "GSI3"
+    hash_key = "gsi3_pk"
+    range_key = "gsi3_sk"
+
+    read_capacity  = var.dynamodb_billing_mode == "PROVISIONED" ? var.dynamodb_read_capacity : null
+    write_capacity = var.dynamodb_billing_mode == "PROVISIONED" ? var.dynamodb_write_capacity : null
+
+    projection_type = "ALL"
+  }
+
   # Point-in-Time Recovery
   point_in_time_recovery {
     enabled = var.enable_point_in_time_recovery
@@ -102,16 +102,35 @@ resource "aws_iam_role_policy" "lambda_dynamodb_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchWriteItem"
         ]
         Resource = [
           aws_dynamodb_table.main.arn,
           "${aws_dynamodb_table.main.arn}/index/*"
         ]
+      },
+      {
+        # Borrado en cascada asíncrono desde users/accounts
+        Effect   = "Allow"
+        Action   = ["lambda:InvokeFunction"]
+        Resource = [aws_lambda_function.jobs.arn]
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["s3:PutObject"]
+        Resource = ["${aws_s3_bucket.exports.arn}/exports/*"]
+      },
+      {
+        # Recordatorios de pago (job payment_reminders)
+        Effect   = "Allow"
+        Action   = ["events:PutEvents"]
+        Resource = ["arn:aws:events:${var.aws_region}:*:event-bus/default"]
       }
     ]
   })
@@ -122,15 +141,18 @@ resource "aws_iam_role_policy" "lambda_dynamodb_policy" {
 # -----------------------------------------------------------------------------
 
 resource "aws_cloudwatch_log_group" "lambda_logs" {
-  for_each = toset([
+  for_each = toset(concat([
     "health",
     "users",
     "transactions",
     "categories",
     "auth",
     "accounts",
-    "cards"
-  ])
+    "cards",
+    "dashboard",
+    "budgets",
+    "jobs"
+  ], var.single_function_mode ? ["api"] : []))
 
   name              = "/aws/lambda/${local.name_prefix}-${each.key}"
   retention_in_days = var.environment == "prod" ? 30 : 7
@@ -156,6 +178,8 @@ locals {
     DYNAMODB_TABLE       = aws_dynamodb_table.main.name  # Single Table Design
     LOG_LEVEL            = var.environment == "prod" ? "INFO" : "DEBUG"
     CORS_ALLOWED_ORIGINS = join(",", var.cors_allowed_origins)
+    # Nombre construido (no referencia) para evitar un ciclo con la función jobs
+    CASCADE_FUNCTION_NAME = var.cascade_delete_enabled ? "${local.name_prefix}-jobs" : ""
   }, var.lambda_environment_variables, var.datadog_enabled ? {
     # Datadog Environment Variables (compatible con CLI de Datadog)
     DD_API_KEY           = var.datadog_api_key
@@ -240,6 +264,7 @@ resource "aws_lambda_function" "users" {
   environment {
     variables = merge(local.common_lambda_environment, {
       JWT_SECRET_KEY = var.jwt_secret_key
+      BCRYPT_ROUNDS  = tostring(var.bcrypt_rounds)
     }, var.datadog_enabled ? {
       DD_LAMBDA_HANDLER = "handlers.users.lambda_handler"
     } : {})
@@ -351,6 +376,7 @@ resource "aws_lambda_function" "auth" {
   environment {
     variables = merge(local.common_lambda_environment, {
       JWT_SECRET_KEY = var.jwt_secret_key
+      BCRYPT_ROUNDS  = tostring(var.bcrypt_rounds)
     }, var.datadog_enabled ? {
       DD_LAMBDA_HANDLER = "handlers.auth.lambda_handler"
     } : {})
@@ -440,3 +466,228 @@ resource "aws_lambda_function" "cards" {
     Type = "lambda-function"
   })
 }
+
+# Dashboard Function (una sola query sobre la partición USER#)
+resource "aws_lambda_function" "dashboard" {
+  function_name = "${local.name_prefix}-dashboard"
+  description   = "Dashboard for Finance Tracker API - ${var.environment}"
+
+  s3_bucket        = aws_s3_bucket.deployment_assets.bucket
+  s3_key           = aws_s3_object.code_zip.key
+  source_code_hash = aws_s3_object.code_zip.etag
+
+  handler     = var.datadog_enabled ? "datadog_lambda.handler.handler" : "handlers.dashboard.lambda_handler"
+  runtime     = var.lambda_runtime
+  timeout     = var.lambda_timeout
+  memory_size = var.lambda_memory_size
+
+  role = aws_iam_role.lambda_execution_role.arn
+
+  layers = local.common_layers
+
+  environment {
+    variables = merge(local.common_lambda_environment, {
+      JWT_SECRET_KEY = var.jwt_secret_key
+    }, var.datadog_enabled ? {
+      DD_LAMBDA_HANDLER = "handlers.dashboard.lambda_handler"
+    } : {})
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_cloudwatch_log_group.lambda_logs
+  ]
+
+  tags = merge(local.common_tags, {
+    Name = "${local.name_prefix}-dashboard"
+    Type = "lambda-function"
+  })
+}
+
+# Budgets Function (presupuestos por categoría con contador de gasto)
+resource "aws_lambda_function" "budgets" {
+  function_name = "${local.name_prefix}-budgets"
+  description   = "Budgets for Finance Tracker API - ${var.environment}"
+
+  s3_bucket        = aws_s3_bucket.deployment_assets.bucket
+  s3_key           = aws_s3_object.code_zip.key
+  source_code_hash = aws_s3_object.code_zip.etag
+
+  handler     = var.datadog_enabled ? "datadog_lambda.handler.handler" : "handlers.budgets.lambda_handler"
+  runtime     = var.lambda_runtime
+  timeout     = var.lambda_timeout
+  memory_size = var.lambda_memory_size
+
+  role = aws_iam_role.lambda_execution_role.arn
+
+  layers = local.common_layers
+
+  environment {
+    variables = merge(local.common_lambda_environment, {
+      JWT_SECRET_KEY = var.jwt_secret_key
+    }, var.datadog_enabled ? {
+      DD_LAMBDA_HANDLER = "handlers.budgets.lambda_handler"
+    } : {})
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_cloudwatch_log_group.lambda_logs
+  ]
+
+  tags = merge(local.common_tags, {
+    Name = "${local.name_prefix}-budgets"
+    Type = "lambda-function"
+  })
+}
+
+# Background Jobs Function (borrado en cascada, exportación GDPR, conciliación y estados de cuenta)
+# Invocada de forma asíncrona o por EventBridge; no está expuesta en API Gateway
+resource "aws_lambda_function" "jobs" {
+  function_name = "${local.name_prefix}-jobs"
+  description   = "Background jobs for Finance Tracker - ${var.environment}"
+
+  s3_bucket        = aws_s3_bucket.deployment_assets.bucket
+  s3_key           = aws_s3_object.code_zip.key
+  source_code_hash = aws_s3_object.code_zip.etag
+
+  handler     = var.datadog_enabled ? "datadog_lambda.handler.handler" : "handlers.jobs.lambda_handler"
+  runtime     = var.lambda_runtime
+  timeout     = 900
+  memory_size = var.lambda_memory_size
+
+  role = aws_iam_role.lambda_execution_role.arn
+
+  layers = local.common_layers
+
+  environment {
+    variables = merge(local.common_lambda_environment, {
+      EXPORT_BUCKET      = aws_s3_bucket.exports.bucket
+      REMINDER_EVENT_BUS = "default"
+    }, var.datadog_enabled ? {
+      DD_LAMBDA_HANDLER = "handlers.jobs.lambda_handler"
+    } : {})
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_cloudwatch_log_group.lambda_logs
+  ]
+
+  tags = merge(local.common_tags, {
+    Name = "${local.name_prefix}-jobs"
+    Type = "lambda-function"
+  })
+}
+
+# Jobs programados (EventBridge -> función jobs)
+# Cada entrada invoca handlers.jobs con su "action"
+locals {
+  scheduled_jobs = var.scheduled_jobs_enabled ? {
+    close_statements = {
+      description = "Cierra los ciclos de tarjetas cuyo corte fue ayer"
+      schedule    = "cron(15 6 * * ? *)"
+      input       = { action = "close_statements" }
+    }
+    accrue = {
+      description = "Carga intereses y anualidades de los ciclos cerrados ayer"
+      schedule    = "cron(45 6 * * ? *)"
+      input       = { action = "accrue" }
+    }
+    payment_reminders = {
+      description = "Publica recordatorios de las tarjetas con pago próximo"
+      schedule    = "cron(0 14 * * ? *)"
+      input       = { action = "payment_reminders" }
+    }
+    recurring = {
+      description = "Genera las transacciones recurrentes pendientes"
+      schedule    = "cron(0 7 * * ? *)"
+      input       = { action = "recurring" }
+    }
+    detect_subscriptions = {
+      description = "Detecta pagos recurrentes en el historial de cada usuario"
+      schedule    = "cron(0 8 ? * SUN *)"
+      input       = { action = "detect_subscriptions" }
+    }
+    rebuild_budgets = {
+      description = "Recalcula los presupuestos al iniciar el mes (cuenta los gastos con fecha futura)"
+      schedule    = "cron(5 0 1 * ? *)"
+      input       = { action = "rebuild_budgets" }
+    }
+    net_worth_snapshot = {
+      description = "Guarda el patrimonio neto del día de cada usuario"
+      schedule    = "cron(55 23 * * ? *)"
+      input       = { action = "net_worth_snapshot" }
+    }
+  } : {}
+}
+
+resource "aws_cloudwatch_event_rule" "jobs" {
+  for_each = local.scheduled_jobs
+
+  name                = "${local.name_prefix}-${replace(each.key, "_", "-")}"
+  description         = each.value.description
+  schedule_expression = each.value.schedule
+
+  tags = local.common_tags
+}
+
+resource "aws_cloudwatch_event_target" "jobs" {
+  for_each = local.scheduled_jobs
+
+  rule  = aws_cloudwatch_event_rule.jobs[each.key].name
+  arn   = aws_lambda_function.jobs.arn
+  input = jsonencode(each.value.input)
+}
+
+resource "aws_lambda_permission" "jobs_schedule" {
+  for_each = local.scheduled_jobs
+
+  statement_id  = "AllowEventBridge-${each.key}"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.jobs.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.jobs[each.key].arn
+}
+
+# Single API Function (single_function_mode)
+# Un solo pool caliente para todos los recursos; el router compilado en
+# handlers.app despacha cada ruta. Medir con backend/scripts/cold_start.py
+resource "aws_lambda_function" "api" {
+  count = var.single_function_mode ? 1 : 0
+
+  function_name = "${local.name_prefix}-api"
+  description   = "Single entry point for Finance Tracker API - ${var.environment}"
+
+  s3_bucket        = aws_s3_bucket.deployment_assets.bucket
+  s3_key           = aws_s3_object.code_zip.key
+  source_code_hash = aws_s3_object.code_zip.etag
+
+  handler     = var.datadog_enabled ? "datadog_lambda.handler.handler" : "handlers.app.lambda_handler"
+  runtime     = var.lambda_runtime
+  timeout     = var.lambda_timeout
+  memory_size = var.lambda_memory_size
+
+  role = aws_iam_role.lambda_execution_role.arn
+
+  layers = local.common_layers
+
+  environment {
+    variables = merge(local.common_lambda_environment, {
+      JWT_SECRET_KEY = var.jwt_secret_key
+      BCRYPT_ROUNDS  = tostring(var.bcrypt_rounds)
+    }, var.datadog_enabled ? {
+      DD_LAMBDA_HANDLER = "handlers.app.lambda_handler"
+    } : {})
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_cloudwatch_log_group.lambda_logs
+  ]
+
+  tags = merge(local.common_tags, {
+    Name = "${local.name_prefix}-api"
+    Type = "lambda-function"
+  })
+}
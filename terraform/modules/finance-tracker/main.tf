@@ -117,6 +117,51 @@ resource "aws_s3_bucket_public_access_block" "deployment_assets" {
   restrict_public_buckets = true
 }
 
+# -----------------------------------------------------------------------------
+# S3 Bucket para exportaciones GDPR (función jobs)
+# -----------------------------------------------------------------------------
+
+resource "aws_s3_bucket" "exports" {
+  bucket = "${local.name_prefix}-exports-${local.bucket_suffix}"
+  tags   = local.common_tags
+}
+
+resource "aws_s3_bucket_server_side_encryption_configuration" "exports" {
+  bucket = aws_s3_bucket.exports.id
+
+  rule {
+    apply_server_side_encryption_by_default {
+      sse_algorithm = "AES256"
+    }
+  }
+}
+
+resource "aws_s3_bucket_public_access_block" "exports" {
+  bucket = aws_s3_bucket.exports.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "exports" {
+  bucket = aws_s3_bucket.exports.id
+
+  rule {
+    id     = "expire-exports"
+    status = "Enabled"
+
+    filter {
+      prefix = "exports/"
+    }
+
+    expiration {
+      days = var.export_retention_days
+    }
+  }
+}
+
 # -----------------------------------------------------------------------------
 # Descargar y subir assets a S3
 # -----------------------------------------------------------------------------
@@ -72,6 +72,21 @@ output "lambda_functions" {
       arn           = aws_lambda_function.cards.arn
       invoke_arn    = aws_lambda_function.cards.invoke_arn
     }
+    dashboard = {
+      function_name = aws_lambda_function.dashboard.function_name
+      arn           = aws_lambda_function.dashboard.arn
+      invoke_arn    = aws_lambda_function.dashboard.invoke_arn
+    }
+    budgets = {
+      function_name = aws_lambda_function.budgets.function_name
+      arn           = aws_lambda_function.budgets.arn
+      invoke_arn    = aws_lambda_function.budgets.invoke_arn
+    }
+    jobs = {
+      function_name = aws_lambda_function.jobs.function_name
+      arn           = aws_lambda_function.jobs.arn
+      invoke_arn    = aws_lambda_function.jobs.invoke_arn
+    }
   }
 }
 
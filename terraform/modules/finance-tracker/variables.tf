@@ -120,6 +120,41 @@ variable "lambda_memory_size" {
   }
 }
 
+variable "single_function_mode" {
+  description = "Servir todos los endpoints desde una sola Lambda (handlers.app) en lugar de una función por recurso"
+  type        = bool
+  default     = false
+}
+
+variable "bcrypt_rounds" {
+  description = "Work factor de bcrypt para hashes de contraseñas (ver backend/scripts/bcrypt_cost.py según lambda_memory_size)"
+  type        = number
+  default     = 12
+
+  validation {
+    condition     = var.bcrypt_rounds >= 4 && var.bcrypt_rounds <= 16
+    error_message = "El work factor de bcrypt debe estar entre 4 y 16."
+  }
+}
+
+variable "cascade_delete_enabled" {
+  description = "Borrado en cascada asíncrono (función jobs) al eliminar usuarios y cuentas"
+  type        = bool
+  default     = true
+}
+
+variable "scheduled_jobs_enabled" {
+  description = "Programar con EventBridge los jobs diarios (cierre de estados de cuenta, etc.)"
+  type        = bool
+  default     = true
+}
+
+variable "export_retention_days" {
+  description = "Días que se conservan los archivos de exportación GDPR en S3"
+  type        = number
+  default     = 30
+}
+
 variable "lambda_environment_variables" {
   description = "Variables de entorno adicionales para las funciones Lambda"
   type        = map(string)